@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+バッチファイル書き込み ベンチマーク
+
+リネーム行（日本語ファイル名、--unencodable の割合で Shift_JIS に無い文字を含む）の
+バッチファイルを書き込む時間を計測する。
+  - per_line: 行ごとに f.write する（テキストモード、エンコーディングは writer と同じ）
+  - scan:     plan_encoding（エンコーディングの判定）
+  - writer:   write_batch_file（チャンクごとにエンコード）
+
+使用例:
+  python benchmarks/bench_batch_write.py
+  python benchmarks/bench_batch_write.py --lines 100000 --unencodable 0.01 --json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from typing import Dict, Any, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.utils.batch_writer import plan_encoding, write_batch_file  # noqa: E402
+
+
+def _make_lines(count: int, unencodable: float, rng: random.Random) -> List[str]:
+    lines = ["@echo off", "chcp 932 > nul"]
+    for i in range(count):
+        name = f"青軍_田中_{i:06d}.png" if rng.random() >= unencodable else f"青軍_😀_{i:06d}.png"
+        lines.append(f'ren "IMG_{i:06d}.png" "{name}"')
+    return lines
+
+
+def run_benchmark(count: int, unencodable: float) -> Dict[str, Any]:
+    lines = _make_lines(count, unencodable, random.Random(0))
+    content = "\n".join(lines)
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(temp_dir, "rename.bat")
+        start = time.perf_counter()
+        plan = plan_encoding(content)
+        scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(path, "w", encoding=plan.encoding) as f:
+            for line in lines:
+                f.write(line)
+                f.write("\n")
+        per_line = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_batch_file(path, content, plan=plan)
+        writer = time.perf_counter() - start
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        "lines": count,
+        "unencodable_ratio": unencodable,
+        "encoding": plan.encoding,
+        "reported_lines": len(plan.unencodable_lines),
+        "per_line_seconds": per_line,
+        "scan_seconds": scan,
+        "writer_seconds": writer,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan バッチファイル書き込み ベンチマーク")
+    parser.add_argument("--lines", type=int, default=100000, help="リネーム行の数 (デフォルト: 100000)")
+    parser.add_argument("--unencodable", type=float, default=0.01,
+                        help="Shift_JIS に無い文字を含む行の割合 (デフォルト: 0.01)")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    options = parser.parse_args()
+
+    results = run_benchmark(options.lines, options.unencodable)
+    if options.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"lines={results['lines']} encoding={results['encoding']} reported={results['reported_lines']}")
+    print(f"per_line {results['per_line_seconds']:6.3f} s")
+    print(f"scan     {results['scan_seconds']:6.3f} s")
+    print(f"writer   {results['writer_seconds']:6.3f} s")
+
+
+if __name__ == "__main__":
+    main()
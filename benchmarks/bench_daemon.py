@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+デーモン応答時間ベンチマーク
+
+同じ処理（プリセット一覧・バッチ生成）について以下を比較する:
+  - cold:    python src/main.py --no-daemon ... （毎回プロセス起動）
+  - client:  python src/main.py ...             （起動中のデーモンへ転送）
+  - request: デーモンへのHTTPリクエストのみ（プロセス起動なし）
+
+使用例:
+  python benchmarks/bench_daemon.py --runs 20
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, Any, List, Callable
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(REPO_ROOT, "src")
+MAIN_SCRIPT = os.path.join(SRC_DIR, "main.py")
+sys.path.insert(0, SRC_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from daemon import forward, read_state
+
+
+def _median_ms(func: Callable[[], Any], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _prepare_environment(work_dir: str) -> List[str]:
+    """プリセットと対象ファイルを作成"""
+    from services.preset_manager import PresetManager
+    from models.preset import Preset
+
+    PresetManager(os.path.join(work_dir, "presets")).save_preset(Preset(
+        name="bench",
+        fields=["陣営", "キャラ名"],
+        naming_pattern="{陣営}_{キャラ名}",
+        id="B3NCH1"
+    ))
+    files = []
+    for i in range(100):
+        path = os.path.join(work_dir, f"image{i:03d}.png")
+        with open(path, 'w') as f:
+            f.write("x")
+        files.append(path)
+    return files
+
+
+def run_benchmark(runs: int = 10) -> Dict[str, Any]:
+    """デーモン経由とコールド起動の応答時間を計測"""
+    work_dir = tempfile.mkdtemp()
+    state_file = os.path.join(work_dir, "daemon.json")
+    env = dict(os.environ, TADAKAN_DAEMON_STATE=state_file)
+    files = _prepare_environment(work_dir)
+
+    daemon_process = subprocess.Popen(
+        [sys.executable, MAIN_SCRIPT, "--serve", "--workspace", os.path.join(work_dir, "workspace")],
+        cwd=work_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.time() + 10
+        while read_state(state_file) is None:
+            if time.time() > deadline:
+                raise RuntimeError("デーモンが起動しませんでした")
+            time.sleep(0.05)
+
+        generate_args = ["--preset", "bench", "--values", "陣営=青軍,キャラ名=田中", "--files"] + files
+
+        def run_cli(args: List[str]):
+            subprocess.run([sys.executable, MAIN_SCRIPT] + args, cwd=work_dir, env=env,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+
+        generate_payload = {
+            "preset": "bench",
+            "values": {"陣営": "青軍", "キャラ名": "田中"},
+            "files": files,
+            "output": os.path.join(work_dir, "output"),
+            "batch_directory": os.path.join(work_dir, "batch_files")
+        }
+
+        results = {}
+        for name, cli_args, command, payload in (
+            ("list", ["--list"], "list", {}),
+            ("generate_100_files", generate_args, "generate", generate_payload),
+        ):
+            results[name] = {
+                "cold_ms": _median_ms(lambda: run_cli(cli_args + ["--no-daemon"]), runs),
+                "client_ms": _median_ms(lambda: run_cli(cli_args), runs),
+                "request_ms": _median_ms(
+                    lambda: forward(command, payload, state_file=state_file), runs
+                ),
+            }
+        return {"runs": runs, "results": results}
+    finally:
+        forward("shutdown", {}, state_file=state_file)
+        try:
+            daemon_process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            daemon_process.kill()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan デーモン応答時間ベンチマーク")
+    parser.add_argument("--runs", type=int, default=10, help="計測回数 (デフォルト: 10)")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    options = parser.parse_args()
+
+    report = run_benchmark(options.runs)
+    if options.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    for name, result in report["results"].items():
+        speedup = result["cold_ms"] / result["request_ms"] if result["request_ms"] else 0
+        print(f"{name:<20} cold={result['cold_ms']:.1f}ms client={result['client_ms']:.1f}ms "
+              f"request={result['request_ms']:.2f}ms (x{speedup:.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ドロップ取り込み ベンチマーク
+
+フォルダ階層に大量のファイルを生成してフォルダごとドロップし、
+展開・絞り込み・採番・移動の処理時間とピークメモリ（tracemalloc）を計測する。
+移動はアプリと同じく RenameEngine で行い、アンドゥ用ジャーナル・ファイル名項目インデックスに記録する。
+
+1つのバッチの連番は A99999 までのため、移動するファイル（対象拡張子の割合 × ファイル数）は
+99,999 件以下にする（50万ファイルの場合は --match-ratio 0.1 など）。
+
+使用例:
+  python benchmarks/bench_drop.py
+  python benchmarks/bench_drop.py --files 500000 --match-ratio 0.1 --json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from typing import Dict, Any
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.models.batch_file import BatchFile  # noqa: E402
+from src.services.drop_pipeline import DropPipeline  # noqa: E402
+from src.services.file_index import FileIndex, INDEX_FILENAME  # noqa: E402
+from src.services.rename_engine import RenameEngine  # noqa: E402
+from src.services.sequence_store import SequenceStore  # noqa: E402
+
+_FILES_PER_DIRECTORY = 5000
+
+
+def _create_tree(root: str, file_count: int, match_ratio: float):
+    """file_count 個のファイルを作成（match_ratio の割合を .png、残りを .txt にする）"""
+    match_every = max(1, round(1 / match_ratio)) if match_ratio > 0 else 0
+    for i in range(file_count):
+        directory = os.path.join(root, f"dir{i // _FILES_PER_DIRECTORY:03d}")
+        if i % _FILES_PER_DIRECTORY == 0:
+            os.makedirs(directory, exist_ok=True)
+        extension = ".png" if match_every and i % match_every == 0 else ".txt"
+        open(os.path.join(directory, f"file{i:07d}{extension}"), "wb").close()
+
+
+def run_benchmark(file_count: int, match_ratio: float, dry_run: bool, chunk_size: int) -> Dict[str, Any]:
+    root = tempfile.mkdtemp(prefix="tadakan_bench_drop_")
+    try:
+        drop = os.path.join(root, "drop")
+        _create_tree(drop, file_count, match_ratio)
+        batch_file = BatchFile("B63EF9", "ベンチマーク", {"陣営": "陣営", "キャラ名": "キャラ"},
+                               target_extensions=[".png"])
+        store = SequenceStore(os.path.join(root, "sequences.sqlite3"))
+        index = FileIndex(os.path.join(root, INDEX_FILENAME))
+        engine = RenameEngine.for_workspace(root, index=index)
+        pipeline = DropPipeline(batch_file, store, chunk_size=chunk_size, dry_run=dry_run,
+                                rename_engine=engine)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = pipeline.run([drop])
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        store.close()
+        index.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "files": file_count,
+        "dry_run": dry_run,
+        "chunk_size": chunk_size,
+        "scanned": result.scanned_count,
+        "moved": result.moved_count,
+        "skipped": result.skipped_count,
+        "errors": result.error_count,
+        "seconds": elapsed,
+        "files_per_second": result.scanned_count / elapsed if elapsed > 0 else float("inf"),
+        "peak_memory_mb": peak / (1024 * 1024),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan ドロップ取り込み ベンチマーク")
+    parser.add_argument("--files", type=int, default=100000, help="ファイル数 (デフォルト: 100000)")
+    parser.add_argument("--match-ratio", type=float, default=0.5,
+                        help="対象拡張子のファイルの割合 (デフォルト: 0.5)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="チャンクサイズ (デフォルト: 1000)")
+    parser.add_argument("--dry-run", action="store_true", help="移動せずに展開・絞り込み・採番のみ計測")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    options = parser.parse_args()
+
+    results = run_benchmark(options.files, options.match_ratio, options.dry_run, options.chunk_size)
+    if options.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    mode = "dry-run" if results["dry_run"] else "move"
+    print(f"files={results['files']} mode={mode} chunk={results['chunk_size']}")
+    print(f"scanned={results['scanned']} moved={results['moved']} skipped={results['skipped']} "
+          f"errors={results['errors']}")
+    print(f"time     {results['seconds']:8.2f} s ({results['files_per_second']:.0f} files/s)")
+    print(f"peak mem {results['peak_memory_mb']:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+フィルタ処理ベンチマーク
+
+作業用フォルダに大量のストック型ファイルを作成し、以下を比較する
+  - batch:  generate_filter_batch と同じ処理（条件ごとにフォルダ全体を *条件* で走査して移動）
+  - engine: FilterEngine（1回の走査で条件を評価し、並列に移動）
+  - index:  FileIndex を使った FilterEngine（インデックス構築時間と検索時間は別に表示）
+
+バッチファイル自体は Windows でしか実行できないため、batch 側は同じ走査・移動を
+Python で再現して計測する。
+
+使用例:
+  python benchmarks/bench_filter.py
+  python benchmarks/bench_filter.py --files 20000 --json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import fnmatch
+import argparse
+import tempfile
+from typing import Dict, Any, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.services.filter_engine import FilterEngine  # noqa: E402
+from src.services.file_index import FileIndex  # noqa: E402
+
+FACTIONS = ["青軍", "赤軍", "緑軍", "黄軍"]
+CHARACTERS = ["田中", "佐藤", "鈴木", "高橋", "伊藤", "渡辺", "山本", "中村"]
+EXTENSIONS = [".png", ".jpg", ".webp"]
+
+# 5条件（AND）
+CONDITIONS = {
+    "preset_id": "B63EF9",
+    "陣営": "青軍",
+    "キャラ名": ["田中", "佐藤"],
+    "sequence": "A0*",
+    "extension": ".png",
+}
+
+
+def create_files(directory: str, count: int):
+    """ストック型のファイル名で空ファイルを作成"""
+    for i in range(count):
+        faction = FACTIONS[i % len(FACTIONS)]
+        character = CHARACTERS[(i // len(FACTIONS)) % len(CHARACTERS)]
+        extension = EXTENSIONS[i % len(EXTENSIONS)]
+        preset_id = "B63EF9" if i % 2 == 0 else "C12345"
+        open(os.path.join(directory, f"{preset_id}_{faction}_{character}_A{i:05d}{extension}"), 'w').close()
+
+
+def _batch_patterns(conditions: Dict[str, Any]) -> List[str]:
+    """generate_filter_batch と同じく条件値ごとに *値* のパターンを作る"""
+    patterns = []
+    for value in conditions.values():
+        for v in ([value] if isinstance(value, str) else value):
+            patterns.append(f"*{v}*")
+    return patterns
+
+
+def run_batch_approach(source: str, display: str, conditions: Dict[str, Any]) -> int:
+    """条件ごとにフォルダを走査して移動（for %%f in (*条件*) do move と同等）"""
+    os.makedirs(display, exist_ok=True)
+    moved = 0
+    for pattern in _batch_patterns(conditions):
+        for name in os.listdir(source):
+            path = os.path.join(source, name)
+            if fnmatch.fnmatch(name, pattern) and os.path.isfile(path):
+                os.rename(path, os.path.join(display, name))
+                moved += 1
+    return moved
+
+
+def run_benchmark(file_count: int, workers: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {"files": file_count, "conditions": len(CONDITIONS)}
+    root = tempfile.mkdtemp(prefix="tadakan_bench_filter_")
+    try:
+        for name in ("batch", "engine", "index"):
+            source = os.path.join(root, name)
+            os.makedirs(source)
+            create_files(source, file_count)
+            display = os.path.join(source, "display")
+
+            index = None
+            if name == "index":
+                index = FileIndex.for_workspace(source)
+                start = time.perf_counter()
+                index.sync_directory(source)
+                build_seconds = time.perf_counter() - start
+                start = time.perf_counter()
+                index.query(source, CONDITIONS)
+                query_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            if name == "batch":
+                moved = run_batch_approach(source, display, CONDITIONS)
+            else:
+                engine = FilterEngine(max_workers=workers, index=index)
+                moved = len(engine.apply_filter(source, CONDITIONS).moved_files)
+            elapsed = time.perf_counter() - start
+
+            results[name] = {"seconds": elapsed, "moved": moved}
+            if index is not None:
+                results[name].update(build_seconds=build_seconds, query_ms=query_ms)
+                index.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    results["speedup"] = results["batch"]["seconds"] / max(results["engine"]["seconds"], 1e-9)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan フィルタ処理ベンチマーク")
+    parser.add_argument("--files", type=int, default=100000, help="ファイル数 (デフォルト: 100000)")
+    parser.add_argument("--workers", type=int, default=8, help="移動スレッド数 (デフォルト: 8)")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    options = parser.parse_args()
+
+    results = run_benchmark(options.files, options.workers)
+    if options.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"files={results['files']} conditions={results['conditions']}")
+    for name in ("batch", "engine", "index"):
+        print(f"{name:<7} {results[name]['seconds']:.2f}s moved={results[name]['moved']}")
+    print(f"index build={results['index']['build_seconds']:.2f}s "
+          f"query={results['index']['query_ms']:.1f}ms")
+    print(f"speedup x{results['speedup']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
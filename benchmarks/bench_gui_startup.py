@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GUI起動時間ベンチマーク
+
+MainWindow を作成し、最初の描画（time-to-first-paint）と
+起動時の読み込みがすべて反映されるまで（time-to-interactive）の時間を計測する。
+ディスプレイが必要（無い環境では終了コード 2 で終了する）。
+
+アプリ起動時にも環境変数 TADAKAN_STARTUP_METRICS に JSON Lines のパスを指定すると
+同じ計測結果が追記される。
+
+使用例:
+  python benchmarks/bench_gui_startup.py
+  python benchmarks/bench_gui_startup.py --runs 10 --json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from typing import Dict, Any
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+def measure_startup() -> Dict[str, Any]:
+    """MainWindow を1回起動して計測（Tk の作成から計測する）"""
+    import tkinter as tk
+    from src.gui.startup import StartupMetrics
+
+    metrics = StartupMetrics()
+    root = tk.Tk()
+    try:
+        from src.gui.main_window import MainWindow
+        main_window = MainWindow(root, startup_metrics=metrics)
+        if not main_window.wait_until_interactive(timeout=30):
+            raise RuntimeError("起動時の読み込みが完了しませんでした")
+        main_window.task_runner.shutdown(wait=True)
+    finally:
+        root.destroy()
+    return metrics.to_dict()
+
+
+def run_benchmark(runs: int) -> Dict[str, Any]:
+    samples = [measure_startup() for _ in range(runs)]
+    return {
+        "runs": runs,
+        "median_first_paint_ms": statistics.median(s["time_to_first_paint_ms"] for s in samples),
+        "median_interactive_ms": statistics.median(s["time_to_interactive_ms"] for s in samples),
+        "max_interactive_ms": max(s["time_to_interactive_ms"] for s in samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan GUI起動時間ベンチマーク")
+    parser.add_argument("--runs", type=int, default=5, help="計測回数 (デフォルト: 5)")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    options = parser.parse_args()
+
+    import tkinter as tk
+    try:
+        results = run_benchmark(options.runs)
+    except tk.TclError as e:
+        print(f"ディスプレイを使用できません: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if options.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"runs={results['runs']}")
+    print(f"first paint  {results['median_first_paint_ms']:8.1f} ms (median)")
+    print(f"interactive  {results['median_interactive_ms']:8.1f} ms (median, max {results['max_interactive_ms']:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
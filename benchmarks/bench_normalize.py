@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字列の正規化 ベンチマーク
+
+項目値・ファイル名（ASCII・日本語・全角/半角混在・NFD）を正規化する時間を
+100万件あたりの秒数で計測する。
+  - unicodedata: 毎回 unicodedata.normalize("NFKC") を呼ぶ
+  - cold:        TextNormalizer（すべて異なる文字列。ASCII の省略のみ効く）
+  - warm:        TextNormalizer（--distinct 種類の文字列の繰り返し。キャッシュが効く）
+
+使用例:
+  python benchmarks/bench_normalize.py
+  python benchmarks/bench_normalize.py --strings 1000000 --distinct 1000 --json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import unicodedata
+from typing import Dict, Any, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.utils.text_normalizer import TextNormalizer  # noqa: E402
+
+_SAMPLES = [
+    "IMG_{i}.jpg",                                   # ASCII
+    "青軍_田中_{i}",                                  # 日本語（NFC）
+    "ＲＥＤ軍_ｷｬﾗ名_{i}",                             # 全角英字・半角カナ
+    unicodedata.normalize("NFD", "ガイド_バッジ_{i}"),  # macOS の共有フォルダ（NFD）
+]
+
+
+def _make_strings(count: int, distinct: int, rng: random.Random) -> List[str]:
+    return [rng.choice(_SAMPLES).format(i=rng.randrange(distinct)) for _ in range(count)]
+
+
+def _per_million(seconds: float, count: int) -> float:
+    return seconds * 1_000_000 / count
+
+
+def run_benchmark(count: int, distinct: int) -> Dict[str, Any]:
+    rng = random.Random(0)
+    unique = _make_strings(count, count * 100, rng)
+    repeated = _make_strings(count, distinct, rng)
+
+    normalize = unicodedata.normalize
+    start = time.perf_counter()
+    for text in unique:
+        normalize("NFKC", text)
+    baseline = time.perf_counter() - start
+
+    normalizer = TextNormalizer(cache_size=count)
+    start = time.perf_counter()
+    for text in unique:
+        normalizer.normalize(text)
+    cold = time.perf_counter() - start
+
+    normalizer = TextNormalizer()
+    start = time.perf_counter()
+    for text in repeated:
+        normalizer.normalize(text)
+    warm = time.perf_counter() - start
+
+    return {
+        "strings": count,
+        "distinct": distinct,
+        "unicodedata_seconds_per_million": _per_million(baseline, count),
+        "cold_seconds_per_million": _per_million(cold, count),
+        "warm_seconds_per_million": _per_million(warm, count),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan 文字列正規化 ベンチマーク")
+    parser.add_argument("--strings", type=int, default=1000000, help="文字列の数 (デフォルト: 1000000)")
+    parser.add_argument("--distinct", type=int, default=1000,
+                        help="warm で繰り返す文字列の種類 (デフォルト: 1000)")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    options = parser.parse_args()
+
+    results = run_benchmark(options.strings, options.distinct)
+    if options.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"strings={results['strings']} distinct(warm)={results['distinct']}")
+    print(f"unicodedata {results['unicodedata_seconds_per_million']:6.3f} s / 1M strings")
+    print(f"cold        {results['cold_seconds_per_million']:6.3f} s / 1M strings")
+    print(f"warm        {results['warm_seconds_per_million']:6.3f} s / 1M strings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ファイル名プレビュー ベンチマーク
+
+フォームへの入力（1文字ずつ入力して最後に戻す）を模擬し、キー入力ごとに
+選択中の全ファイルのプレビュー名を作り直す時間を計測する。
+  - naive:  ファイルごとに FileRenamer.generate_filename を呼ぶ
+  - cached: FilenamePreviewCache（パターンは入力値ごとに1回だけ展開）
+
+使用例:
+  python benchmarks/bench_preview.py
+  python benchmarks/bench_preview.py --files 50000 --json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from typing import Dict, Any, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(1, os.path.join(REPO_ROOT, "src"))
+
+from src.models.preset import Preset  # noqa: E402
+from src.services.filename_preview import FilenamePreviewCache  # noqa: E402
+from services.file_renamer import FileRenamer  # noqa: E402
+
+
+def _keystrokes(text: str) -> List[str]:
+    """1文字ずつ入力し、最後に1文字消して戻す"""
+    typed = [text[:i] for i in range(1, len(text) + 1)]
+    return typed + [text[:-1], text]
+
+
+def run_benchmark(file_count: int) -> Dict[str, Any]:
+    preset = Preset(name="ベンチマーク", fields=["カテゴリ", "タイトル", "番号"],
+                    naming_pattern="{カテゴリ}_{タイトル}_{番号}", id="B63EF9")
+    file_names = [f"IMG_{i:06d}{'.JPG' if i % 2 else '.png'}" for i in range(file_count)]
+    extensions = [os.path.splitext(name)[1] for name in file_names]
+    renamer = FileRenamer()
+    cache = FilenamePreviewCache()
+    keystrokes = _keystrokes("夏の海辺")
+
+    naive_ms = []
+    cached_ms = []
+    for title in keystrokes:
+        values = {"カテゴリ": "写真", "タイトル": title}
+
+        start = time.perf_counter()
+        naive = []
+        for number, extension in enumerate(extensions, 1):
+            file_values = dict(values, 番号=f"{number:03d}")
+            naive.append(renamer.generate_filename(preset, file_values, extension))
+        naive_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        cached = cache.preview_names(preset, values, file_names)
+        cached_ms.append((time.perf_counter() - start) * 1000)
+        if cached != naive:
+            raise AssertionError("プレビュー名が一致しません")
+
+    return {
+        "files": file_count,
+        "keystrokes": len(keystrokes),
+        "naive_median_ms": statistics.median(naive_ms),
+        "cached_median_ms": statistics.median(cached_ms),
+        "cache_hits": cache.hits,
+        "cache_misses": cache.misses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan ファイル名プレビュー ベンチマーク")
+    parser.add_argument("--files", type=int, default=50000, help="ファイル数 (デフォルト: 50000)")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    options = parser.parse_args()
+
+    results = run_benchmark(options.files)
+    if options.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"files={results['files']} keystrokes={results['keystrokes']}")
+    print(f"naive   {results['naive_median_ms']:8.1f} ms / keystroke")
+    print(f"cached  {results['cached_median_ms']:8.1f} ms / keystroke "
+          f"(hits={results['cache_hits']} misses={results['cache_misses']})")
+
+
+if __name__ == "__main__":
+    main()
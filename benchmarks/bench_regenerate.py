@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+バッチファイル一括再生成 ベンチマーク
+
+rename_batches/ に --files 件（うち --preset-ratio の割合が対象プリセット）のバッチファイルを作成し、
+プリセットの対象拡張子を変更して再生成する時間を計測する。
+  - cold:      索引が無い状態（全ファイルを読んで索引を作成）から再生成
+  - unchanged: 索引作成済み・内容が同じ（stat のみで書き込まない）
+  - warm:      索引作成済みで対象拡張子を再度変更して再生成
+
+使用例:
+  python benchmarks/bench_regenerate.py
+  python benchmarks/bench_regenerate.py --files 5000 --workers 8 --json
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+from typing import Dict, Any
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.models.batch_file import BatchFile  # noqa: E402
+from src.models.preset import Preset  # noqa: E402
+from src.services.batch_regenerator import BatchRegenerator, RENAME_BATCHES_DIRNAME  # noqa: E402
+from src.utils.batch_writer import write_batch_file  # noqa: E402
+
+
+def _make_workspace(workspace: str, count: int, preset_ratio: float, preset: Preset):
+    directory = os.path.join(workspace, RENAME_BATCHES_DIRNAME)
+    os.makedirs(directory)
+    target_count = int(count * preset_ratio)
+    for i in range(count):
+        preset_id = preset.id if i < target_count else f"Z{i % 10:05d}"
+        batch_file = BatchFile(preset_id, preset.name, {"陣営": f"陣営{i % 7}", "キャラ名": f"キャラ{i:06d}"},
+                               list(preset.target_extensions))
+        write_batch_file(os.path.join(directory, batch_file.get_batch_filename()),
+                         batch_file.generate_batch_content())
+    return target_count
+
+
+def run_benchmark(count: int, preset_ratio: float, workers: int) -> Dict[str, Any]:
+    preset = Preset(name="キャラ", fields=["陣営", "キャラ名"], naming_pattern="{陣営}_{キャラ名}",
+                    target_extensions=[".png", ".jpg"], id="B63EF9")
+    workspace = tempfile.mkdtemp()
+    try:
+        target_count = _make_workspace(workspace, count, preset_ratio, preset)
+        regenerator = BatchRegenerator.for_workspace(workspace, workers)
+        try:
+            preset.target_extensions = [".png", ".jpg", ".webp"]
+            cold = regenerator.regenerate(preset)
+            unchanged = regenerator.regenerate(preset)
+            preset.target_extensions = [".png"]
+            warm = regenerator.regenerate(preset)
+        finally:
+            regenerator.close()
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    return {
+        "files": count,
+        "preset_files": target_count,
+        "workers": workers,
+        "cold": cold.to_dict(),
+        "unchanged": unchanged.to_dict(),
+        "warm": warm.to_dict(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan バッチファイル一括再生成 ベンチマーク")
+    parser.add_argument("--files", type=int, default=5000, help="バッチファイルの数 (デフォルト: 5000)")
+    parser.add_argument("--preset-ratio", type=float, default=0.8,
+                        help="対象プリセットのバッチファイルの割合 (デフォルト: 0.8)")
+    parser.add_argument("--workers", type=int, default=8, help="並列数 (デフォルト: 8)")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    options = parser.parse_args()
+
+    results = run_benchmark(options.files, options.preset_ratio, options.workers)
+    if options.json:
+        for key in ("cold", "unchanged", "warm"):
+            results[key].pop("errors")
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"files={results['files']} preset_files={results['preset_files']} workers={results['workers']}")
+    for key in ("cold", "unchanged", "warm"):
+        result = results[key]
+        print(f"{key:9s} {result['elapsed_seconds']:6.3f} s  regenerated={result['regenerated_count']} "
+              f"unchanged={result['unchanged_count']} errors={result['error_count']} "
+              f"index_read={result['index_refreshed_count']}")
+
+
+if __name__ == "__main__":
+    main()
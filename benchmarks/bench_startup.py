@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLI起動時間ベンチマーク
+
+`python -X importtime src/main.py <args>` を実行し、インポート時間と実行時間を計測する
+
+使用例:
+  python benchmarks/bench_startup.py
+  python benchmarks/bench_startup.py --runs 20 --args --list
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, Any, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(REPO_ROOT, "src", "main.py")
+
+# コマンドごとのインポート時間予算（ミリ秒, -X importtime の累積値）
+STARTUP_BUDGET_MS = 100.0
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """-X importtime の出力を解析（depth 0 がトップレベルのインポート）"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        raw_name = fields[2]
+        name = raw_name.strip()
+        depth = (len(raw_name) - len(raw_name.lstrip(" ")) - 1) // 2
+        entries.append({
+            "module": name,
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+            "depth": depth
+        })
+    return entries
+
+
+def _run_importtime(argv: List[str], cwd: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime"] + argv,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        encoding="utf-8"
+    )
+
+
+_interpreter_modules = None
+
+
+def interpreter_modules() -> set:
+    """素のインタプリタ起動で読み込まれるモジュール（site/.pth 由来を含む。アプリの予算から除外）"""
+    global _interpreter_modules
+    if _interpreter_modules is None:
+        completed = _run_importtime(["-c", "pass"], REPO_ROOT)
+        _interpreter_modules = {e["module"] for e in parse_importtime(completed.stderr)}
+    return _interpreter_modules
+
+
+def measure_startup(args: List[str], cwd: Optional[str] = None) -> Dict[str, Any]:
+    """CLIを1回起動してインポート時間・実行時間を計測"""
+    baseline = interpreter_modules()
+    start = time.perf_counter()
+    completed = _run_importtime([MAIN_SCRIPT] + args, cwd or REPO_ROOT)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    entries = parse_importtime(completed.stderr)
+    top_level = [e for e in entries if e["depth"] == 0 and e["module"] not in baseline]
+    import_ms = sum(e["cumulative_us"] for e in top_level) / 1000
+
+    return {
+        "args": args,
+        "returncode": completed.returncode,
+        "wall_ms": wall_ms,
+        "import_ms": import_ms,
+        "modules": [e["module"] for e in entries]
+    }
+
+
+def run_benchmark(args: List[str], runs: int = 10, cwd: Optional[str] = None) -> Dict[str, Any]:
+    """複数回計測して中央値を返す"""
+    samples = [measure_startup(args, cwd) for _ in range(runs)]
+    return {
+        "args": args,
+        "runs": runs,
+        "median_wall_ms": statistics.median(s["wall_ms"] for s in samples),
+        "median_import_ms": statistics.median(s["import_ms"] for s in samples),
+        "budget_ms": STARTUP_BUDGET_MS,
+        "modules": samples[-1]["modules"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan CLI 起動時間ベンチマーク")
+    parser.add_argument("--runs", type=int, default=10, help="計測回数 (デフォルト: 10)")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    parser.add_argument("--args", nargs=argparse.REMAINDER, default=None,
+                        help="CLIに渡す引数 (デフォルト: --help と --list を計測)")
+    options = parser.parse_args()
+
+    commands = [options.args] if options.args else [["--help"], ["--list"]]
+    results = [run_benchmark(args, options.runs) for args in commands]
+
+    if options.json:
+        for result in results:
+            result.pop("modules")
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    for result in results:
+        status = "OK" if result["median_import_ms"] <= result["budget_ms"] else "OVER BUDGET"
+        print(f"{' '.join(result['args']):<12} wall={result['median_wall_ms']:.1f}ms "
+              f"import={result['median_import_ms']:.1f}ms "
+              f"(budget {result['budget_ms']:.0f}ms) {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ホットパスのベンチマークスイート
+
+合成データ（プリセット・ファイルツリー・バッチファイルのストック）で主要な処理を計測し、
+結果を JSON で保存する。保存した結果を --compare で渡すと、しきい値を超えて遅くなった
+ケースを表示して終了コード 1 を返す（CI・リリース前の比較用）。
+
+各ケースは pytest-benchmark と同じ形（benchmark(関数, *引数) / benchmark.pedantic(...)）で書き、
+標準ライブラリの timeit で実行する。pytest-benchmark がある場合は
+benchmarks/test_hot_paths.py から同じケースを pytest で実行できる。
+
+使用例:
+  python benchmarks/bench_suite.py
+  python benchmarks/bench_suite.py --scale 0.1 --rounds 3 --output results.json
+  python benchmarks/bench_suite.py --compare baseline.json --threshold 0.2
+  python benchmarks/bench_suite.py --filter batch --json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import timeit
+import argparse
+import platform
+import statistics
+import tempfile
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(1, os.path.join(REPO_ROOT, "src"))
+
+from benchmarks import synthetic  # noqa: E402
+from src.services.batch_manager import BatchManager  # noqa: E402
+from src.services.filename_preview import FilenamePreviewCache  # noqa: E402
+from src.services.name_validator import NameValidator  # noqa: E402
+from src.services.preset_manager import PresetManager  # noqa: E402
+from src.services.workspace_manager import WorkspaceManager  # noqa: E402
+from src.utils.atomic_write import atomic_write  # noqa: E402
+from src.utils.batch_writer import write_batch_file  # noqa: E402
+from services.batch_generator import BatchGenerator  # noqa: E402
+from services.file_renamer import FileRenamer  # noqa: E402
+
+RESULT_FORMAT_VERSION = 1
+
+# 比較に使う統計値（min はノイズの影響が小さい）
+DEFAULT_COMPARE_STAT = "min"
+DEFAULT_THRESHOLD = 0.2
+
+# scale=1.0 のデータ量
+DEFAULT_SIZES = {
+    "files": 10000,
+    "presets": 200,
+    "batches": 2000,
+    "names": 1000,
+    "numbered": 200,
+}
+
+
+class TimeitBenchmark:
+    """pytest-benchmark の benchmark フィクスチャと同じ呼び出し方で timeit を使って計測する"""
+
+    def __init__(self, rounds: int = 5, min_time: float = 0.2):
+        self.rounds = rounds
+        self.min_time = min_time
+        self.stats: Optional[Dict[str, Any]] = None
+
+    def __call__(self, target: Callable, *args, **kwargs):
+        """target を繰り返し実行して1回あたりの時間を計測し、target の戻り値を返す"""
+        timer = timeit.Timer(lambda: target(*args, **kwargs))
+        iterations = _calibrate(timer, self.min_time)
+        times = [elapsed / iterations for elapsed in timer.repeat(self.rounds, iterations)]
+        self.stats = _stats(times, iterations)
+        return target(*args, **kwargs)
+
+    def pedantic(self, target: Callable, args: Tuple = (), kwargs: Optional[Dict[str, Any]] = None,
+                 setup: Optional[Callable] = None, rounds: Optional[int] = None, iterations: int = 1):
+        """setup をラウンドごとに実行してから計測する（setup の時間は含めない）"""
+        kwargs = kwargs or {}
+        times = []
+        result = None
+        for _ in range(rounds or self.rounds):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = target(*args, **kwargs)
+            times.append((time.perf_counter() - start) / iterations)
+        self.stats = _stats(times, iterations)
+        return result
+
+
+def _calibrate(timer: timeit.Timer, min_time: float) -> int:
+    """1ラウンドが min_time 秒以上になる実行回数（timeit.Timer.autorange と同じく 1, 2, 5, 10, ...）"""
+    scale = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            iterations = multiplier * scale
+            if timer.timeit(iterations) >= min_time:
+                return iterations
+        scale *= 10
+
+
+def _stats(times: List[float], iterations: int) -> Dict[str, Any]:
+    return {
+        "min": min(times),
+        "max": max(times),
+        "mean": statistics.mean(times),
+        "median": statistics.median(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "rounds": len(times),
+        "iterations": iterations,
+    }
+
+
+class Workload:
+    """全ケースで共有する合成データ（一時フォルダに作成）"""
+
+    def __init__(self, scale: float = 1.0, seed: int = 0):
+        self.sizes = {key: max(10, int(value * scale)) for key, value in DEFAULT_SIZES.items()}
+        self.seed = seed
+        self.root = tempfile.mkdtemp(prefix="tadakan_bench_")
+        rng = random.Random(seed)
+
+        self.preset = synthetic.make_preset()
+        self.values = [dict(synthetic.make_values(rng, self.preset), 番号=f"{i:03d}")
+                       for i in range(self.sizes["names"])]
+        self.file_paths = synthetic.make_file_tree(os.path.join(self.root, "tree"), self.sizes["files"],
+                                                   seed=seed)
+        self.file_items = synthetic.make_file_items(self.sizes["files"], seed=seed)
+        self.numbered_directory = os.path.join(self.root, "numbered")
+        self.numbered_values = synthetic.make_values(rng, self.preset)
+        synthetic.make_numbered_files(self.numbered_directory, self.preset, self.numbered_values,
+                                      self.sizes["numbered"])
+        self.workspace = os.path.join(self.root, "workspace")
+        self.presets = synthetic.make_workspace(self.workspace, self.sizes["presets"],
+                                                self.sizes["batches"], seed)
+        self.presets_directory = os.path.join(self.workspace, "presets")
+
+    def close(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+# --- ケース（benchmark, workload を受け取り、計測した処理の件数を返す） ---
+
+CASES: List[Tuple[str, Callable[[Any, Workload], int]]] = []
+
+
+def case(name: str):
+    def register(function):
+        CASES.append((name, function))
+        return function
+    return register
+
+
+@case("file_renamer.generate_filename")
+def bench_generate_filename(benchmark, workload: Workload) -> int:
+    renamer = FileRenamer()
+    preset = workload.preset
+
+    def run():
+        for values in workload.values:
+            renamer.generate_filename(preset, values, ".PNG")
+
+    benchmark(run)
+    return len(workload.values)
+
+
+@case("file_renamer.generate_preview_list")
+def bench_generate_preview_list(benchmark, workload: Workload) -> int:
+    renamer = FileRenamer()
+    result = benchmark(renamer.generate_preview_list, workload.preset, workload.file_paths, workload.values[0])
+    assert len(result) == len(workload.file_paths)
+    return len(workload.file_paths)
+
+
+@case("file_renamer.generate_filename_with_auto_number")
+def bench_generate_filename_with_auto_number(benchmark, workload: Workload) -> int:
+    renamer = FileRenamer()
+    name = benchmark(renamer.generate_filename_with_auto_number, workload.preset, workload.numbered_values,
+                     ".png", workload.numbered_directory)
+    assert f"{workload.sizes['numbered'] + 1:03d}" in name
+    return 1
+
+
+@case("filename_preview.preview_names")
+def bench_preview_names(benchmark, workload: Workload) -> int:
+    cache = FilenamePreviewCache()
+    names = [os.path.basename(path) for path in workload.file_paths]
+    benchmark(cache.preview_names, workload.preset, workload.values[0], names)
+    return len(names)
+
+
+@case("name_validator.validate_names")
+def bench_validate_names(benchmark, workload: Workload) -> int:
+    validator = NameValidator([f"NG{i:03d}" for i in range(100)])
+    names = [item.new_name for item in workload.file_items]
+    benchmark(validator.validate_names, names)
+    return len(names)
+
+
+@case("batch_generator.generate_rename_batch")
+def bench_generate_rename_batch(benchmark, workload: Workload) -> int:
+    generator = BatchGenerator()
+    benchmark(generator.generate_rename_batch, workload.file_items, "C:\\target")
+    return len(workload.file_items)
+
+
+@case("batch_writer.write_batch_file")
+def bench_write_batch_file(benchmark, workload: Workload) -> int:
+    content = BatchGenerator().generate_rename_batch(workload.file_items, "C:\\target")
+    path = os.path.join(workload.root, "rename.bat")
+    benchmark(write_batch_file, path, content)
+    return len(workload.file_items)
+
+
+@case("preset_manager.list_presets")
+def bench_list_presets(benchmark, workload: Workload) -> int:
+    manager = PresetManager(workload.presets_directory)
+    manager.list_presets()
+    result = benchmark(manager.list_presets)
+    assert len(result) == len(workload.presets)
+    return len(result)
+
+
+@case("preset_manager.list_presets_cold")
+def bench_list_presets_cold(benchmark, workload: Workload) -> int:
+    result = benchmark(lambda: PresetManager(workload.presets_directory).list_presets())
+    return len(result)
+
+
+@case("batch_manager.load_batch_files")
+def bench_load_batch_files(benchmark, workload: Workload) -> int:
+    manager = BatchManager(workload.workspace)
+    try:
+        result = benchmark(manager.load_batch_files)
+    finally:
+        manager.close()
+    return len(result)
+
+
+@case("batch_manager.search_batch_files")
+def bench_search_batch_files(benchmark, workload: Workload) -> int:
+    manager = BatchManager(workload.workspace)
+    try:
+        count = len(manager.load_batch_files())
+        benchmark(manager.search_batch_files, {"陣営": "red", "キャラ名": "田中"})
+    finally:
+        manager.close()
+    return count
+
+
+@case("workspace_manager.create_backup")
+def bench_create_backup(benchmark, workload: Workload) -> int:
+    manager = WorkspaceManager()
+    parent = os.path.dirname(workload.workspace)
+
+    def remove_backups():
+        # バックアップ名は秒単位のため、前のラウンドのバックアップを消しておく
+        for name in os.listdir(parent):
+            if name.startswith("tadakan_backup_"):
+                shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+
+    result = benchmark.pedantic(manager.create_backup, args=(workload.workspace,), setup=remove_backups)
+    remove_backups()
+    if not result.success:
+        raise RuntimeError(f"バックアップに失敗しました: {result.error_message}")
+    return len(os.listdir(os.path.join(workload.workspace, "rename_batches")))
+
+
+# --- 実行・比較 ---
+
+def select_cases(pattern: Optional[str] = None) -> List[Tuple[str, Callable]]:
+    return [(name, function) for name, function in CASES if not pattern or pattern in name]
+
+
+def run_suite(scale: float = 1.0, rounds: int = 5, min_time: float = 0.2, pattern: Optional[str] = None,
+              seed: int = 0, progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """ケースを実行して結果（JSON 互換の辞書）を返す"""
+    workload = Workload(scale, seed)
+    results: Dict[str, Any] = {}
+    try:
+        for name, function in select_cases(pattern):
+            benchmark = TimeitBenchmark(rounds, min_time)
+            items = function(benchmark, workload)
+            stats = dict(benchmark.stats, items=items)
+            stats["per_item"] = stats["median"] / items if items else stats["median"]
+            results[name] = stats
+            if progress:
+                progress(name, stats)
+    finally:
+        workload.close()
+
+    return {
+        "version": RESULT_FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "scale": scale,
+        "sizes": workload.sizes,
+        "results": results,
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+                    stat: str = DEFAULT_COMPARE_STAT) -> List[Dict[str, Any]]:
+    """両方にあるケースを比較し、(現在 / 基準) が 1 + threshold を超えたケースを返す
+
+    データ量（sizes）が違う結果は比較できないため ValueError を送出する。
+    """
+    if current.get("sizes") != baseline.get("sizes"):
+        raise ValueError(f"データ量が違う結果は比較できません: {baseline.get('sizes')} / {current.get('sizes')}")
+    regressions = []
+    for name, stats in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base.get(stat):
+            continue
+        ratio = stats[stat] / base[stat]
+        if ratio > 1 + threshold:
+            regressions.append({"name": name, "baseline": base[stat], "current": stats[stat], "ratio": ratio})
+    return regressions
+
+
+def _print_stats(name: str, stats: Dict[str, Any]):
+    print(f"{name:48s} min {stats['min'] * 1000:10.3f} ms  median {stats['median'] * 1000:10.3f} ms"
+          f"  ({stats['items']} items, {stats['per_item'] * 1e6:8.2f} us/item)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan ホットパス ベンチマークスイート")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="データ量の倍率 (デフォルト: 1.0 = 10,000ファイル・200プリセット・2,000バッチ)")
+    parser.add_argument("--rounds", type=int, default=5, help="計測ラウンド数 (デフォルト: 5)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="1ラウンドの最小秒数 (デフォルト: 0.2)")
+    parser.add_argument("--filter", help="名前にこの文字列を含むケースだけ実行")
+    parser.add_argument("--output", help="結果のJSONを保存するファイル")
+    parser.add_argument("--compare", help="比較する基準の結果のJSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="遅くなったとみなす割合 (デフォルト: 0.2 = 20%%)")
+    parser.add_argument("--stat", default=DEFAULT_COMPARE_STAT, choices=["min", "median", "mean"],
+                        help="比較に使う統計値 (デフォルト: min)")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    options = parser.parse_args()
+
+    results = run_suite(options.scale, options.rounds, options.min_time, options.filter,
+                        progress=None if options.json else _print_stats)
+    if options.output:
+        atomic_write(options.output, json.dumps(results, ensure_ascii=False, indent=2))
+
+    regressions = []
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, options.threshold, options.stat)
+        results["regressions"] = regressions
+
+    if options.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    elif options.compare:
+        if regressions:
+            print(f"\n{len(regressions)} 件のケースが {options.threshold:.0%} 以上遅くなりました（{options.stat}）:")
+            for regression in regressions:
+                print(f"  {regression['name']:46s} {regression['baseline'] * 1000:10.3f} ms -> "
+                      f"{regression['current'] * 1000:10.3f} ms  (x{regression['ratio']:.2f})")
+        else:
+            print(f"\nしきい値 {options.threshold:.0%} を超えて遅くなったケースはありません（{options.stat}）")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+リネームのアンドゥ ベンチマーク
+
+大量のファイルを RenameEngine でリネームし（ジャーナル記録あり）、
+ネイティブなアンドゥとアンドゥ用バッチファイル生成の時間を計測する。
+
+使用例:
+  python benchmarks/bench_undo.py
+  python benchmarks/bench_undo.py --files 20000 --directories 4 --json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from typing import Dict, Any
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from src.services.rename_engine import RenameEngine  # noqa: E402
+
+
+def run_benchmark(file_count: int, directory_count: int) -> Dict[str, Any]:
+    root = tempfile.mkdtemp(prefix="tadakan_bench_undo_")
+    try:
+        operations = []
+        for d in range(directory_count):
+            directory = os.path.join(root, f"dir{d}")
+            os.makedirs(directory)
+            for i in range(d, file_count, directory_count):
+                name = f"IMG_{i:06d}.png"
+                open(os.path.join(directory, name), 'w').close()
+                operations.append((directory, name, f"B63EF9_青軍_田中_A{i:05d}.png"))
+
+        engine = RenameEngine.for_workspace(root)
+
+        start = time.perf_counter()
+        result = engine.execute(operations, label="bench")
+        rename_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_content = engine.generate_undo_batch(result.execution_id)
+        batch_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        undo = engine.undo(result.execution_id)
+        undo_seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "files": file_count,
+        "directories": directory_count,
+        "rename_seconds": rename_seconds,
+        "undo_seconds": undo_seconds,
+        "undo_batch_seconds": batch_seconds,
+        "undo_batch_cd_count": batch_content.count("cd /d "),
+        "undone": undo.renamed_count,
+        "errors": len(undo.errors)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan リネームアンドゥ ベンチマーク")
+    parser.add_argument("--files", type=int, default=100000, help="ファイル数 (デフォルト: 100000)")
+    parser.add_argument("--directories", type=int, default=8, help="フォルダ数 (デフォルト: 8)")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    options = parser.parse_args()
+
+    results = run_benchmark(options.files, options.directories)
+    if options.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"files={results['files']} directories={results['directories']}")
+    print(f"rename      {results['rename_seconds']:.2f}s")
+    print(f"undo        {results['undo_seconds']:.2f}s undone={results['undone']} errors={results['errors']}")
+    print(f"undo batch  {results['undo_batch_seconds']:.2f}s cd={results['undo_batch_cd_count']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ファイル名の一括検証 ベンチマーク
+
+NGワード（デフォルト1,000語）でファイル名（デフォルト100万件）を検証する時間を計測する。
+  - naive:  ファイル名ごとに無効な文字の正規表現 + NGワードごとの部分一致
+            （FileRenamer.generate_filename の従来の判定。時間がかかるため --naive-sample 件で計測し換算）
+  - engine: NameValidator.validate_names（1回の呼び出しで全件。予約名・長さの判定を含む）
+
+使用例:
+  python benchmarks/bench_validation.py
+  python benchmarks/bench_validation.py --names 1000000 --ng-words 1000 --json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+from typing import Dict, Any, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.services.name_validator import INVALID_CHARS, NameValidator  # noqa: E402
+
+_WORDS = ["写真", "動画", "夏", "海", "山", "旅行", "cat", "dog", "IMG", "DSC", "final", "draft"]
+
+
+def _make_names(count: int, rng: random.Random) -> List[str]:
+    return [f"{rng.choice(_WORDS)}_{rng.choice(_WORDS)}_{i:07d}.jpg" for i in range(count)]
+
+
+def _make_ng_words(count: int, rng: random.Random) -> List[str]:
+    alphabet = "abcdefghijklmnopqrstuvwxyzあいうえおかきくけこ"
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(3, 8))) for _ in range(count)]
+
+
+def _naive_errors(names: List[str], ng_words: List[str]) -> int:
+    invalid_char_pattern = re.compile(f'[{re.escape(INVALID_CHARS)}]')
+    errors = 0
+    for name in names:
+        if invalid_char_pattern.search(name):
+            errors += 1
+            continue
+        for ng_word in ng_words:
+            if ng_word in name:
+                errors += 1
+                break
+    return errors
+
+
+def run_benchmark(name_count: int, ng_word_count: int, naive_sample: int) -> Dict[str, Any]:
+    rng = random.Random(0)
+    names = _make_names(name_count, rng)
+    ng_words = _make_ng_words(ng_word_count, rng)
+
+    start = time.perf_counter()
+    validator = NameValidator(ng_words)
+    compile_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    errors = validator.validate_names(names)
+    engine_seconds = time.perf_counter() - start
+
+    sample = names[:naive_sample]
+    start = time.perf_counter()
+    _naive_errors(sample, ng_words)
+    naive_sample_seconds = time.perf_counter() - start
+    naive_seconds = naive_sample_seconds * name_count / max(1, len(sample))
+
+    return {
+        "names": name_count,
+        "ng_words": ng_word_count,
+        "errors": len(errors),
+        "compile_seconds": compile_seconds,
+        "engine_seconds": engine_seconds,
+        "naive_sample": len(sample),
+        "naive_seconds_estimated": naive_seconds,
+        "speedup": naive_seconds / engine_seconds if engine_seconds > 0 else float("inf"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tadakan ファイル名一括検証 ベンチマーク")
+    parser.add_argument("--names", type=int, default=1000000, help="ファイル名の数 (デフォルト: 1000000)")
+    parser.add_argument("--ng-words", type=int, default=1000, help="NGワードの数 (デフォルト: 1000)")
+    parser.add_argument("--naive-sample", type=int, default=20000,
+                        help="従来方式で計測するファイル名の数 (デフォルト: 20000)")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    options = parser.parse_args()
+
+    results = run_benchmark(options.names, options.ng_words, options.naive_sample)
+    if options.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"names={results['names']} ng_words={results['ng_words']} errors={results['errors']}")
+    print(f"compile  {results['compile_seconds']:8.3f} s")
+    print(f"engine   {results['engine_seconds']:8.2f} s")
+    print(f"naive    {results['naive_seconds_estimated']:8.2f} s "
+          f"(estimated from {results['naive_sample']} names)")
+    print(f"speedup  {results['speedup']:8.1f} x")
+
+
+if __name__ == "__main__":
+    main()
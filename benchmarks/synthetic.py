@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+ベンチマーク用の合成データ
+
+プリセット・ファイルツリー・バッチファイルのストックを一時フォルダに作成する。
+乱数のシードを固定するため、同じ引数なら毎回同じデータになる（結果の比較用）。
+"""
+
+import os
+import sys
+import random
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+if os.path.join(REPO_ROOT, "src") not in sys.path:
+    sys.path.insert(1, os.path.join(REPO_ROOT, "src"))
+
+from src.models.preset import Preset  # noqa: E402
+from src.services.batch_manager import BatchManager  # noqa: E402
+from src.services.preset_manager import PresetManager  # noqa: E402
+from src.services.workspace_manager import WorkspaceManager  # noqa: E402
+from models.file_item import FileItem  # noqa: E402
+
+FACTIONS = ["赤", "青", "緑", "黄", "ＲＥＤ", "ｷｬﾗ"]
+CHARACTERS = ["田中", "佐藤", "鈴木", "高橋", "伊藤", "渡辺", "山本", "中村"]
+EXTENSIONS = [".png", ".jpg", ".JPG", ".gif", ".mp4", ".txt"]
+
+# プリセットの番号から作る6桁のID（PresetIDGenerator と同じ英数字の形式）
+_ID_FORMAT = "B{:05X}"
+
+
+def make_preset(index: int = 0, field_count: int = 3) -> Preset:
+    """項目が field_count 個（最後は「番号」）のプリセット"""
+    fields = ["陣営", "キャラ名", "カテゴリ", "タイトル"][:max(field_count - 1, 1)] + ["番号"]
+    return Preset(
+        name=f"ベンチマーク{index:04d}",
+        fields=fields,
+        naming_pattern="_".join(f"{{{field}}}" for field in fields),
+        target_extensions=[".png", ".jpg", ".gif"],
+        id=_ID_FORMAT.format(index),
+    )
+
+
+def make_values(rng: random.Random, preset: Preset) -> Dict[str, str]:
+    """プリセットの項目値（番号以外）"""
+    pools = {"陣営": FACTIONS, "キャラ名": CHARACTERS}
+    return {field: rng.choice(pools.get(field, CHARACTERS)) for field in preset.fields if field != "番号"}
+
+
+def make_presets(directory: str, count: int) -> List[Preset]:
+    """プリセットを count 件保存"""
+    manager = PresetManager(directory)
+    presets = [make_preset(i) for i in range(count)]
+    for preset in presets:
+        manager.save_preset(preset)
+    return presets
+
+
+def make_file_tree(root: str, count: int, folders: int = 10, size: int = 0,
+                   seed: int = 0) -> List[str]:
+    """root 以下の folders 個のフォルダに count 件のファイルを作成し、パスを返す"""
+    rng = random.Random(seed)
+    data = b"x" * size
+    paths = []
+    for i in range(count):
+        directory = os.path.join(root, f"folder{i % folders:03d}")
+        if i < folders:
+            os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"IMG_{i:06d}{rng.choice(EXTENSIONS)}")
+        with open(path, "wb") as f:
+            f.write(data)
+        paths.append(path)
+    return paths
+
+
+def make_file_items(count: int, seed: int = 0) -> List[FileItem]:
+    """リネーム後の名前を設定済みの FileItem（ディスクには作成しない）"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        extension = rng.choice(EXTENSIONS)
+        name = f"IMG_{i:06d}{extension}"
+        new_name = f"{rng.choice(FACTIONS)}_{rng.choice(CHARACTERS)}_{i:06d}{extension.lower()}"
+        items.append(FileItem(os.path.join("C:\\photos", name), name, new_name))
+    return items
+
+
+def make_numbered_files(directory: str, preset: Preset, values: Dict[str, str], count: int,
+                        extension: str = ".png") -> List[str]:
+    """番号 001〜count のファイル（自動採番の既存ファイル）"""
+    os.makedirs(directory, exist_ok=True)
+    names = []
+    for number in range(1, count + 1):
+        name = "_".join(values.get(field, f"{number:03d}") for field in preset.fields) + extension
+        open(os.path.join(directory, name), "wb").close()
+        names.append(name)
+    return names
+
+
+def make_workspace(workspace: str, preset_count: int, batch_count: int,
+                   seed: int = 0, presets: Optional[List[Preset]] = None) -> List[Preset]:
+    """ワークスペースを初期化し、プリセット・バッチファイルのストックを作成"""
+    WorkspaceManager().initialize_workspace(workspace)
+    presets = presets or make_presets(os.path.join(workspace, "presets"), preset_count)
+    rng = random.Random(seed)
+    manager = BatchManager(workspace)
+    try:
+        batch_files = []
+        seen = set()
+        for i in range(batch_count):
+            preset = presets[i % len(presets)]
+            values = {"陣営": rng.choice(FACTIONS), "キャラ名": f"{rng.choice(CHARACTERS)}{i:05d}"}
+            batch_file = manager.create_batch_file(preset, values)
+            if batch_file.get_batch_filename() not in seen:
+                seen.add(batch_file.get_batch_filename())
+                batch_files.append(batch_file)
+        manager.save_batch_files(batch_files)
+    finally:
+        manager.close()
+    return presets
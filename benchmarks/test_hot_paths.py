@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+ホットパスのベンチマーク（pytest-benchmark 用）
+
+bench_suite.py のケースを pytest-benchmark の benchmark フィクスチャで実行する。
+pytest-benchmark が無い場合はスキップする（標準ライブラリだけで実行する場合は bench_suite.py）。
+
+使用例:
+  python -m pytest benchmarks/test_hot_paths.py --benchmark-autosave
+  TADAKAN_BENCH_SCALE=0.1 python -m pytest benchmarks/test_hot_paths.py --benchmark-compare
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.bench_suite import CASES, Workload  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def workload():
+    workload = Workload(float(os.environ.get("TADAKAN_BENCH_SCALE", "1.0")))
+    yield workload
+    workload.close()
+
+
+@pytest.mark.parametrize("function", [function for _, function in CASES], ids=[name for name, _ in CASES])
+def test_hot_path(benchmark, workload, function):
+    function(benchmark, workload)
@@ -4,13 +4,151 @@ Tadakan 設定管理システム
 
 import os
 import json
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
 
+from src.utils.atomic_write import atomic_open
+
+
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """baseを変更せずにoverrideを再帰的にマージした新しい辞書を返す"""
+    merged = dict(base)
+    for key, value in override.items():
+        if key in merged and isinstance(merged[key], dict) and isinstance(value, dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _deep_copy(value: Any) -> Any:
+    """JSON互換値のディープコピー（copy.deepcopyより高速）"""
+    if isinstance(value, dict):
+        return {k: _deep_copy(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_deep_copy(v) for v in value]
+    return value
+
+
+def _freeze(value: Any) -> Any:
+    """読み取り専用の値に変換（dict→MappingProxyType, list→tuple）"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _flatten(data: Dict[str, Any]) -> Dict[str, Any]:
+    """全階層のドット区切りキー → 値のフラットマップを生成"""
+    flat: Dict[str, Any] = {}
+
+    def walk(prefix: str, node: Dict[str, Any]):
+        for key, value in node.items():
+            path = f"{prefix}.{key}" if prefix else key
+            flat[path] = _freeze(value)
+            if isinstance(value, dict):
+                walk(path, value)
+
+    walk("", data)
+    return flat
+
+
+class SettingsSnapshot:
+    """設定の不変スナップショット
+
+    生成時にドット区切りキーのフラットマップを構築するため get は O(1)。
+    更新は with_value による書き込み時コピーで新しいスナップショットを返す。
+    """
+
+    __slots__ = ("_data", "_flat")
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+        self._flat = _flatten(data)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SettingsSnapshot':
+        """辞書からスナップショットを作成（呼び出し元の辞書とは共有しない）"""
+        return cls(_deep_copy(data))
+
+    def get(self, key_path: str, default=None):
+        """設定値を取得（読み取り専用の値を返す）"""
+        return self._flat.get(key_path, default)
+
+    def with_value(self, key_path: str, value: Any) -> 'SettingsSnapshot':
+        """指定キーを変更した新しいスナップショットを返す（経路上の辞書のみコピー）"""
+        keys = key_path.split('.')
+        root = dict(self._data)
+        target = root
+        for key in keys[:-1]:
+            child = target.get(key)
+            child = dict(child) if isinstance(child, dict) else {}
+            target[key] = child
+            target = child
+        target[keys[-1]] = _deep_copy(value)
+        return SettingsSnapshot(root)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """変更可能なディープコピーを返す"""
+        return _deep_copy(self._data)
+
+
+class SettingsStore:
+    """JSON設定ファイルの読み書き
+
+    デフォルト値とのディープマージ結果をスナップショットとしてキャッシュし、
+    ファイルの mtime/サイズが変わったときだけ再読み込みする。
+    保存は atomic_open で同一ディレクトリの一時ファイルに書き込んでから置き換える。
+    """
+
+    def __init__(self, path: Union[str, Path], defaults: Optional[Dict[str, Any]] = None):
+        self.path = Path(path)
+        self._defaults = _deep_copy(defaults or {})
+        self._snapshot: Optional[SettingsSnapshot] = None
+        self._signature: Optional[Tuple[int, int]] = None
+
+    def _stat_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self, force: bool = False) -> SettingsSnapshot:
+        """スナップショットを取得（ファイル未変更ならキャッシュを返す）"""
+        signature = self._stat_signature()
+        if not force and self._snapshot is not None and signature == self._signature:
+            return self._snapshot
+
+        data = self._defaults
+        if signature is not None:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                user_settings = json.load(f)
+            if isinstance(user_settings, dict):
+                data = _deep_merge(self._defaults, user_settings)
+
+        self._snapshot = SettingsSnapshot(_deep_copy(data))
+        self._signature = signature
+        return self._snapshot
+
+    def is_stale(self) -> bool:
+        """ファイルがキャッシュ後に変更されたか判定"""
+        return self._snapshot is None or self._stat_signature() != self._signature
+
+    def save(self, snapshot: SettingsSnapshot):
+        """スナップショットをアトミックに保存"""
+        with atomic_open(str(self.path), 'w', encoding='utf-8') as f:
+            json.dump(snapshot.to_dict(), f, ensure_ascii=False, indent=2)
+
+        self._snapshot = SettingsSnapshot(_deep_merge(self._defaults, snapshot.to_dict()))
+        self._signature = self._stat_signature()
+
 
 class Settings:
     """アプリケーション設定管理"""
-    
+
     # デフォルト設定
     DEFAULT_SETTINGS = {
         "app": {
@@ -21,15 +159,17 @@ class Settings:
             "default_output_dir": "output"
         },
         "file_processing": {
-            "supported_extensions": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", 
+            "supported_extensions": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp",
                                    ".mp3", ".wav", ".flac", ".aac", ".ogg",
                                    ".txt", ".md", ".csv", ".json", ".xml",
                                    ".mp4", ".avi", ".mkv", ".mov", ".wmv"],
             "auto_numbering_limit": 9999,
             "invalid_chars": "<>:\"/\\|?*",
-            "default_ng_words": ["CON", "PRN", "AUX", "NUL", "COM1", "COM2", "COM3", 
-                               "COM4", "COM5", "COM6", "COM7", "COM8", "COM9", 
-                               "LPT1", "LPT2", "LPT3", "LPT4", "LPT5", "LPT6", 
+            # 項目値・ファイル名の Unicode 正規化（NFKC: 全角・半角も統一 / NFC: 結合文字の合成のみ）
+            "unicode_normalization": "NFKC",
+            "default_ng_words": ["CON", "PRN", "AUX", "NUL", "COM1", "COM2", "COM3",
+                               "COM4", "COM5", "COM6", "COM7", "COM8", "COM9",
+                               "LPT1", "LPT2", "LPT3", "LPT4", "LPT5", "LPT6",
                                "LPT7", "LPT8", "LPT9"]
         },
         "batch": {
@@ -44,111 +184,112 @@ class Settings:
             "window_size": [800, 600]
         }
     }
-    
+
     def __init__(self, config_file: str = "tadakan_config.json"):
         self.config_file = Path(config_file)
-        self._settings = self.DEFAULT_SETTINGS.copy()
-        self.load()
-    
+        self._store = SettingsStore(self.config_file, self.DEFAULT_SETTINGS)
+        self._snapshot: Optional[SettingsSnapshot] = None
+
+    @property
+    def snapshot(self) -> SettingsSnapshot:
+        """現在の設定スナップショット（初回アクセス時に読み込み）"""
+        if self._snapshot is None:
+            self.load()
+        return self._snapshot
+
     def load(self):
         """設定ファイルを読み込み"""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    user_settings = json.load(f)
-                    self._merge_settings(user_settings)
-            except Exception as e:
-                print(f"設定ファイル読み込みエラー: {e}")
-                print("デフォルト設定を使用します")
-    
+        try:
+            self._snapshot = self._store.load()
+        except Exception as e:
+            print(f"設定ファイル読み込みエラー: {e}")
+            print("デフォルト設定を使用します")
+            self._snapshot = SettingsSnapshot(_deep_copy(self.DEFAULT_SETTINGS))
+
+    def reload_if_changed(self) -> bool:
+        """設定ファイルが変更されていれば再読み込み"""
+        if self._snapshot is not None and not self._store.is_stale():
+            return False
+        self.load()
+        return True
+
     def save(self):
         """設定ファイルに保存"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._settings, f, ensure_ascii=False, indent=2)
+            self._store.save(self.snapshot)
         except Exception as e:
             print(f"設定ファイル保存エラー: {e}")
-    
-    def _merge_settings(self, user_settings: Dict[str, Any]):
-        """ユーザー設定をデフォルト設定にマージ"""
-        def merge_dict(default: dict, user: dict):
-            for key, value in user.items():
-                if key in default and isinstance(default[key], dict) and isinstance(value, dict):
-                    merge_dict(default[key], value)
-                else:
-                    default[key] = value
-        
-        merge_dict(self._settings, user_settings)
-    
+
     def get(self, key_path: str, default=None):
         """設定値を取得 (例: "app.name" または "file_processing.supported_extensions")"""
-        keys = key_path.split('.')
-        value = self._settings
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        
-        return value
-    
+        return self.snapshot.get(key_path, default)
+
     def set(self, key_path: str, value):
         """設定値を設定"""
-        keys = key_path.split('.')
-        target = self._settings
-        
-        for key in keys[:-1]:
-            if key not in target:
-                target[key] = {}
-            target = target[key]
-        
-        target[keys[-1]] = value
-    
+        self._snapshot = self.snapshot.with_value(key_path, value)
+
     def get_app_name(self) -> str:
         """アプリケーション名取得"""
         return self.get("app.name", "Tadakan")
-    
+
     def get_version(self) -> str:
         """バージョン取得"""
         return self.get("app.version", "0.1.0")
-    
+
     def get_supported_extensions(self) -> List[str]:
         """サポート拡張子一覧取得"""
-        return self.get("file_processing.supported_extensions", [])
-    
+        return list(self.get("file_processing.supported_extensions", ()))
+
     def get_default_preset_dir(self) -> str:
         """デフォルトプリセットディレクトリ取得"""
         return self.get("app.default_preset_dir", "presets")
-    
+
     def get_default_batch_dir(self) -> str:
         """デフォルトバッチディレクトリ取得"""
         return self.get("app.default_batch_dir", "batch_files")
-    
+
     def get_auto_numbering_limit(self) -> int:
         """自動採番上限取得"""
         return self.get("file_processing.auto_numbering_limit", 9999)
-    
+
     def get_invalid_chars(self) -> str:
         """無効文字取得"""
         return self.get("file_processing.invalid_chars", "<>:\"/\\|?*")
-    
+
     def get_ng_words(self) -> List[str]:
         """NGワード一覧取得"""
-        return self.get("file_processing.default_ng_words", [])
-    
+        return list(self.get("file_processing.default_ng_words", ()))
+
+    def get_unicode_normalization(self) -> str:
+        """Unicode 正規化の方式取得（NFKC / NFC）"""
+        return self.get("file_processing.unicode_normalization", "NFKC")
+
     def get_batch_encoding(self) -> str:
         """バッチファイルエンコーディング取得"""
         return self.get("batch.encoding", "shift_jis")
-    
+
     def is_error_handling_enabled(self) -> bool:
         """エラーハンドリング有効判定"""
         return self.get("batch.include_error_handling", True)
-    
+
     def is_logging_enabled(self) -> bool:
         """ログ出力有効判定"""
         return self.get("batch.include_logging", False)
 
 
-# グローバル設定インスタンス
-settings = Settings()
\ No newline at end of file
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """グローバル設定インスタンスを取得（初回呼び出し時に生成）"""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def __getattr__(name: str):
+    # 旧来の `from config.settings import settings` を遅延生成で維持
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
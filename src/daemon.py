@@ -0,0 +1,382 @@
+"""
+Tadakan 常駐デーモン
+
+プリセット・バッチファイル一覧・ワークスペースをメモリに保持したまま
+localhost の HTTP (標準ライブラリのみ) で generate / search / execute を提供する。
+CLI は状態ファイルからデーモンを見つけ、起動中であれば処理を転送する。
+
+状態ファイル（既定: ~/.tadakan/daemon.json, 環境変数 TADAKAN_DAEMON_STATE で変更可）には
+接続先ポートと認証トークンを書き込み、本人のみ読み書きできる権限で作成する。
+
+転送の結果は「デーモンに届かなかった」（forward が None を返し、CLI はローカルで実行する）と
+「リクエストを送った後に失敗・タイムアウトした」（DaemonRequestError）を区別する。
+後者はデーモンが処理を続けている可能性があるため、CLI は同じ処理をローカルで再実行しない。
+"""
+
+import os
+import sys
+import json
+from typing import Dict, Any, List, Optional
+
+# CLIのクライアント側（forward）の起動を軽くするため、
+# サーバー側でのみ使うモジュール（http.server, threading 等）は関数内でインポートする
+
+DEFAULT_HOST = "127.0.0.1"
+TOKEN_HEADER = "X-Tadakan-Token"
+
+# デーモンへの接続のタイムアウト（秒）。応答待ちのタイムアウトは forward の timeout
+CONNECT_TIMEOUT = 2.0
+
+# コマンドごとの必須キー
+REQUIRED_KEYS = {
+    "generate": ("preset", "output"),
+    "execute": ("batch_filename",),
+}
+
+
+class InvalidPayloadError(ValueError):
+    """リクエストの内容が不正（HTTP 400）"""
+
+
+class DaemonRequestError(RuntimeError):
+    """デーモンにリクエストを送った後に失敗した（タイムアウト・エラー応答）
+
+    デーモンが処理を実行した・実行中の可能性があるため、ローカルで再実行してはならない。
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        self.status = status
+        super().__init__(message)
+
+
+def validate_payload(command: str, payload: Any):
+    """コマンドの必須キーを確認（不足していれば InvalidPayloadError）"""
+    if not isinstance(payload, dict):
+        raise InvalidPayloadError("リクエストの内容はJSONオブジェクトにしてください")
+    missing = [key for key in REQUIRED_KEYS.get(command, ()) if key not in payload]
+    if missing:
+        raise InvalidPayloadError(f"必須の項目がありません: {', '.join(missing)}")
+    if command == "generate" and not payload.get("files") and not payload.get("manifest"):
+        raise InvalidPayloadError("files または manifest を指定してください")
+
+
+def get_state_file_path() -> str:
+    """デーモン状態ファイルのパスを取得"""
+    env_path = os.environ.get("TADAKAN_DAEMON_STATE")
+    if env_path:
+        return env_path
+    return os.path.join(os.path.expanduser("~"), ".tadakan", "daemon.json")
+
+
+def read_state(state_file: str) -> Optional[Dict[str, Any]]:
+    """状態ファイルを読み込み（存在しない・壊れている場合はNone）"""
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_state(state_file: str, state: Dict[str, Any]):
+    """状態ファイルを本人のみアクセス可能な権限で書き込み"""
+    directory = os.path.dirname(state_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{state_file}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_file)
+
+
+class TadakanDaemon:
+    """メモリ常駐サービス
+
+    CLI インスタンス（プリセット管理・リネーム・バッチ生成）とバッチ管理を保持する。
+    各サービスはスレッドセーフではないため、リクエストはロックで直列化する。
+    """
+
+    def __init__(self, cli, workspace_path: str):
+        import threading
+        from services.batch_manager import BatchManager
+        from services.workspace_manager import WorkspaceManager
+
+        self.cli = cli
+        self.workspace_path = workspace_path
+        self.workspace_manager = WorkspaceManager()
+        self.batch_manager = BatchManager(workspace_path)
+        self._lock = threading.Lock()
+        self._batch_index_signature = None
+
+    def warm_up(self):
+        """ワークスペース初期化とプリセット・バッチ一覧の事前読み込み"""
+        with self._lock:
+            self.workspace_manager.initialize_workspace(self.workspace_path)
+            self.workspace_manager.set_current_workspace(self.workspace_path)
+            self.cli.preset_manager.list_presets()
+            # FileRenamer / BatchGenerator も事前に生成しておく
+            self.cli.file_renamer
+            self.cli.batch_generator
+            self._refresh_batch_index()
+
+    def _refresh_batch_index(self):
+        """rename_batches が変更されていればバッチ一覧を読み直す"""
+        rename_batches_dir = os.path.join(self.workspace_path, "rename_batches")
+        try:
+            st = os.stat(rename_batches_dir)
+            signature = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            signature = None
+        if signature != self._batch_index_signature:
+            self.batch_manager.load_batch_files()
+            self._batch_index_signature = signature
+
+    def _run_cli(self, method, *args) -> Dict[str, Any]:
+        """CLIメソッドを実行し、標準出力を結果と一緒に返す"""
+        import io
+        from contextlib import redirect_stdout
+
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            result = method(*args)
+        return {"result": result, "output": buffer.getvalue()}
+
+    def handle_list(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """プリセット一覧"""
+        with self._lock:
+            return self._run_cli(self.cli.list_presets)
+
+    def handle_generate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """バッチファイル生成（files または manifest）"""
+        with self._lock:
+            original_batch_directory = self.cli.batch_directory
+            self.cli.batch_directory = payload.get("batch_directory", original_batch_directory)
+            try:
+                if payload.get("manifest"):
+                    return self._run_cli(
+                        self.cli.generate_batch_from_manifest,
+                        payload["preset"], payload.get("values", {}), payload["manifest"],
+                        payload["output"], payload.get("batch_size", 0), payload.get("extensions")
+                    )
+                return self._run_cli(
+                    self.cli.generate_batch,
+                    payload["preset"], payload.get("values", {}), payload["files"], payload["output"],
+                    payload.get("extensions")
+                )
+            finally:
+                self.cli.batch_directory = original_batch_directory
+
+    def handle_search(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """バッチファイル検索"""
+        with self._lock:
+            self._refresh_batch_index()
+            results = self.batch_manager.search_batch_files(payload.get("criteria", {}))
+            return {"result": [
+                {"filename": b.get_batch_filename(), "preset_id": b.preset_id,
+                 "field_values": b.field_values}
+                for b in results
+            ]}
+
+    def handle_execute(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """バッチファイルをファイルリストで実行"""
+        with self._lock:
+            self._refresh_batch_index()
+            filename = payload["batch_filename"]
+            batch_file = self.batch_manager.find_batch_file(filename)
+            if batch_file is None:
+                raise ValueError(f"バッチファイルが見つかりません: {filename}")
+
+            result = self.batch_manager.execute_batch_with_files(batch_file, payload.get("files", []))
+            self.batch_manager.record_execution_result(result)
+            return {"result": result.to_dict()}
+
+    @property
+    def handlers(self):
+        """コマンド名とハンドラの対応"""
+        return {
+            "list": self.handle_list,
+            "generate": self.handle_generate,
+            "search": self.handle_search,
+            "execute": self.handle_execute,
+        }
+
+    def dispatch(self, command: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """コマンドを対応するハンドラに振り分け（未知のコマンドは KeyError、不正な内容は InvalidPayloadError）"""
+        handlers = self.handlers
+        if command not in handlers:
+            raise KeyError(command)
+        validate_payload(command, payload)
+        return handlers[command](payload)
+
+
+def _make_handler(daemon: TadakanDaemon, token: str, server_holder: List):
+    """リクエストハンドラクラスを生成"""
+    import secrets
+    import threading
+    from http.server import BaseHTTPRequestHandler
+
+    class DaemonRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, body: Dict[str, Any]):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _authorized(self) -> bool:
+            if not secrets.compare_digest(self.headers.get(TOKEN_HEADER, ""), token):
+                self._send_json(403, {"error": "forbidden"})
+                return False
+            return True
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path == "/ping":
+                self._send_json(200, {"status": "ok", "pid": os.getpid()})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            command = self.path.strip("/")
+
+            if command == "shutdown":
+                self._send_json(200, {"status": "shutting down"})
+                threading.Thread(target=server_holder[0].shutdown, daemon=True).start()
+                return
+
+            if command not in daemon.handlers:
+                self._send_json(404, {"error": f"unknown command: {command}"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                validate_payload(command, payload)
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+
+            try:
+                self._send_json(200, daemon.dispatch(command, payload))
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            # 標準エラーへのアクセスログは出さない
+            pass
+
+    return DaemonRequestHandler
+
+
+def create_server(daemon: TadakanDaemon, state_file: str, host: str = DEFAULT_HOST, port: int = 0):
+    """HTTPサーバーを作成し、状態ファイルに接続情報を書き込む"""
+    import secrets
+    from http.server import ThreadingHTTPServer
+
+    token = secrets.token_hex(16)
+    server_holder: List = []
+    server = ThreadingHTTPServer((host, port), _make_handler(daemon, token, server_holder))
+    server.daemon_threads = True
+    server_holder.append(server)
+
+    _write_state(state_file, {
+        "pid": os.getpid(),
+        "host": host,
+        "port": server.server_address[1],
+        "token": token,
+        "presets_directory": os.path.abspath(daemon.cli.presets_directory),
+        "workspace_path": os.path.abspath(daemon.workspace_path)
+    })
+    return server
+
+
+def serve(cli, workspace_path: str, port: int = 0, state_file: Optional[str] = None):
+    """デーモンを起動（Ctrl+C または /shutdown で終了）"""
+    state_file = state_file or get_state_file_path()
+    daemon = TadakanDaemon(cli, workspace_path)
+    daemon.warm_up()
+    server = create_server(daemon, state_file, port=port)
+
+    host, bound_port = server.server_address[:2]
+    print(f"Tadakan デーモンを起動しました: http://{host}:{bound_port} (状態ファイル: {state_file})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        state = read_state(state_file)
+        if state and state.get("pid") == os.getpid():
+            try:
+                os.remove(state_file)
+            except OSError:
+                pass
+        print("Tadakan デーモンを停止しました")
+
+
+def forward(command: str, payload: Dict[str, Any], state_file: Optional[str] = None,
+            presets_directory: Optional[str] = None, timeout: float = 30.0) -> Optional[Dict[str, Any]]:
+    """起動中のデーモンにコマンドを転送
+
+    デーモンに届かなかった場合（状態ファイルが無い・接続できない・認証や未知のコマンドで
+    実行前に拒否された）は None を返す。リクエストを送った後の失敗（応答のタイムアウト・
+    400/500 の応答・壊れた応答）は DaemonRequestError を送出する。
+    presets_directory を指定した場合、デーモンが同じプリセットディレクトリを
+    使っているときだけ転送する。
+    """
+    import socket
+
+    state = read_state(state_file or get_state_file_path())
+    if not state:
+        return None
+    if presets_directory and os.path.abspath(presets_directory) != state.get("presets_directory"):
+        return None
+
+    # http.client は読み込みに時間がかかるため、HTTP/1.0 のリクエストを直接送る
+    try:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        request = (
+            f"POST /{command} HTTP/1.0\r\n"
+            f"Host: {state['host']}:{state['port']}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"{TOKEN_HEADER}: {state['token']}\r\n"
+            "\r\n"
+        ).encode('ascii') + body
+        sock = socket.create_connection((state["host"], state["port"]), timeout=CONNECT_TIMEOUT)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    # ここから先はデーモンが処理を始めている可能性がある
+    try:
+        chunks = []
+        with sock:
+            sock.settimeout(timeout)
+            sock.sendall(request)
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except socket.timeout:
+        raise DaemonRequestError(f"デーモンの応答が{timeout:g}秒以内にありませんでした（処理は継続している可能性があります）")
+    except OSError as e:
+        raise DaemonRequestError(f"デーモンとの通信に失敗しました: {e}")
+
+    try:
+        head, _, response_body = b"".join(chunks).partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        data = json.loads(response_body or b"{}")
+    except (ValueError, IndexError):
+        raise DaemonRequestError("デーモンの応答を解析できませんでした")
+
+    if status in (403, 404):
+        # 実行前に拒否された（別のデーモンの状態ファイル・古いバージョンのデーモン）
+        return None
+    if status != 200:
+        raise DaemonRequestError(f"デーモンエラー: {data.get('error', status)}", status)
+    return data
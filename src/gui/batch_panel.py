@@ -6,9 +6,10 @@
 
 import tkinter as tk
 from tkinter import ttk
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 
 from src.models.preset import Preset
+from src.gui.drop_ingestion import submit_drop
 
 
 class BatchPanel(ttk.Frame):
@@ -18,6 +19,14 @@ class BatchPanel(ttk.Frame):
         super().__init__(parent)
         self.current_preset: Optional[Preset] = None
         self._drag_drop_enabled = False
+        # 一覧の各行に対応するバッチファイル情報（BatchManager.list_batch_index の形式）
+        self._batch_entries: List[Dict[str, Any]] = []
+        # ドロップの取り込み用（MainWindow が設定する）
+        self.task_runner = None
+        self.batch_manager = None
+        self.on_drop_completed: Optional[Callable] = None
+        self.on_drop_error: Optional[Callable[[BaseException], None]] = None
+        self.on_drop_progress: Optional[Callable[[int], None]] = None
         self._create_widgets()
         self._setup_layout()
     
@@ -67,9 +76,18 @@ class BatchPanel(ttk.Frame):
         self.delete_button.pack(side=tk.LEFT, padx=2)
         self.execute_button.pack(side=tk.LEFT, padx=2)
     
+    def show_loading(self):
+        """読み込み中の表示（読み込みが終わるまで一覧は選択できない）"""
+        self.batch_listbox.config(state=tk.NORMAL)
+        self.batch_listbox.delete(0, tk.END)
+        self.batch_listbox.insert(tk.END, "読み込み中...")
+        self.batch_listbox.config(state=tk.DISABLED)
+    
     def load_batch_files(self, batch_files: List[Dict[str, Any]]):
         """バッチファイル一覧を読み込み"""
+        self.batch_listbox.config(state=tk.NORMAL)
         self.batch_listbox.delete(0, tk.END)
+        self._batch_entries = list(batch_files)
         
         for batch_data in batch_files:
             filename = batch_data["filename"]
@@ -101,15 +119,44 @@ class BatchPanel(ttk.Frame):
         self._drag_drop_enabled = True
         # 実際のドラッグ&ドロップ設定は省略
     
+    def get_selected_batch_path(self) -> Optional[str]:
+        """選択中のバッチファイルのパス（未選択・パス不明の場合は None）"""
+        selection = self.batch_listbox.curselection()
+        if not selection or selection[0] >= len(self._batch_entries):
+            return None
+        return self._batch_entries[selection[0]].get("path")
+    
     def handle_file_drop(self, file_list: List[str]) -> bool:
-        """ファイルドロップを処理"""
+        """ファイルドロップを処理
+        
+        選択中のバッチファイルの規則で、ドロップされたファイルをバックグラウンドで
+        移動・リネームする。進捗・失敗は on_drop_progress・on_drop_error に渡す。
+        取り込みが設定されていない（ランナー・BatchManager が未設定）場合は False。
+        """
         if not self._drag_drop_enabled:
             return False
+        if self.task_runner is None or self.batch_manager is None:
+            return False
         
-        # ファイル処理（実際の処理はここで実装）
-        print(f"Dropped files: {file_list}")
+        batch_path = self.get_selected_batch_path()
+        if batch_path is None:
+            return False
+        submit_drop(self.task_runner, self.batch_manager, batch_path, file_list,
+                    on_success=self.on_drop_completed,
+                    on_error=self._on_drop_failed,
+                    on_progress=self._on_drop_progress)
         return True
     
+    def _on_drop_progress(self, done: int, total: int, message: str):
+        """UIスレッド: 取り込みの進捗（移動済み件数）を通知"""
+        if self.on_drop_progress is not None:
+            self.on_drop_progress(done)
+    
+    def _on_drop_failed(self, error: BaseException):
+        """UIスレッド: 取り込みの失敗（バッチファイルを読み込めない等）を通知"""
+        if self.on_drop_error is not None:
+            self.on_drop_error(error)
+    
     def _on_search_changed(self, event):
         """検索文字列変更時のハンドラ"""
         # リアルタイム検索（実装は省略）
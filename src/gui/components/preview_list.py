@@ -0,0 +1,121 @@
+"""
+プレビュー一覧
+
+リネーム後のファイル名を表示する一覧。ファイル数にかかわらず表示中の行
+（visible_rows 行）だけをリストボックスに持ち、スクロールでは表示範囲の行を書き換える。
+プレビューの更新では、変わった行のうち表示中の行だけを書き換える。
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from src.services.live_preview import rows_in_range
+
+_ERROR_COLOR = "red"
+_NORMAL_COLOR = "black"
+
+
+class VirtualPreviewList(ttk.Frame):
+    """表示中の行だけを描画するプレビュー一覧"""
+
+    def __init__(self, parent, visible_rows: int = 10):
+        super().__init__(parent)
+        self.visible_rows = visible_rows
+        self.state = None
+        self.first_row = 0
+        self._create_widgets()
+        self._setup_layout()
+
+    def _create_widgets(self):
+        """ウィジェットを作成"""
+        self.summary_label = ttk.Label(self, text="プレビュー: ファイル未選択")
+        self.listbox = tk.Listbox(self, height=self.visible_rows, activestyle=tk.NONE)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+
+        self.listbox.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.listbox.bind("<Button-4>", lambda event: self._scroll_by(-3))
+        self.listbox.bind("<Button-5>", lambda event: self._scroll_by(3))
+
+    def _setup_layout(self):
+        """レイアウトを設定"""
+        self.summary_label.pack(side=tk.TOP, anchor=tk.W)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    @property
+    def row_count(self) -> int:
+        return len(self.state) if self.state is not None else 0
+
+    def show_preview(self, state, changed_rows):
+        """プレビューを反映（変わった行のうち表示中の行だけを書き換える）"""
+        resized = state is None or self.state is None or len(state) != len(self.state)
+        self.state = state
+        self._update_summary()
+        if resized:
+            self.first_row = min(self.first_row, max(0, self.row_count - self.visible_rows))
+            self._redraw()
+            return
+        for index in rows_in_range(changed_rows, self.first_row, self.first_row + self.visible_rows):
+            self._draw_row(index)
+
+    def _update_summary(self):
+        if self.state is None:
+            self.summary_label.config(text="プレビュー: ファイル未選択")
+        elif self.state.form_error is not None:
+            self.summary_label.config(text=f"プレビュー: {self.state.form_error}")
+        else:
+            text = f"プレビュー: {len(self.state)}件"
+            if self.state.error_count:
+                text += f"（エラー {self.state.error_count}件）"
+            self.summary_label.config(text=text)
+
+    def _row_text(self, index: int) -> str:
+        original_name, new_name, error = self.state.row(index)
+        if error is not None:
+            return f"{index + 1:>6}  {original_name}  ⚠ {error}"
+        return f"{index + 1:>6}  {original_name} → {new_name}"
+
+    def _draw_row(self, index: int):
+        """1行を書き換え（index は全体での行番号）"""
+        position = index - self.first_row
+        self.listbox.delete(position)
+        self.listbox.insert(position, self._row_text(index))
+        color = _ERROR_COLOR if self.state.error_for(index) is not None else _NORMAL_COLOR
+        self.listbox.itemconfig(position, fg=color)
+
+    def _redraw(self):
+        """表示範囲の行をすべて描画"""
+        self.listbox.delete(0, tk.END)
+        last_row = min(self.first_row + self.visible_rows, self.row_count)
+        for index in range(self.first_row, last_row):
+            self.listbox.insert(tk.END, self._row_text(index))
+            if self.state.error_for(index) is not None:
+                self.listbox.itemconfig(tk.END, fg=_ERROR_COLOR)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        if self.row_count <= self.visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.scrollbar.set(self.first_row / self.row_count,
+                           (self.first_row + self.visible_rows) / self.row_count)
+
+    def scroll_to(self, row: int):
+        """row が先頭になるよう表示範囲を移動"""
+        row = max(0, min(row, self.row_count - self.visible_rows))
+        if row != self.first_row:
+            self.first_row = row
+            self._redraw()
+
+    def _scroll_by(self, rows: int):
+        self.scroll_to(self.first_row + rows)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == tk.MOVETO:
+            self.scroll_to(int(float(amount) * self.row_count))
+        elif action == tk.SCROLL:
+            step = self.visible_rows if unit == tk.PAGES else 1
+            self._scroll_by(int(amount) * step)
+
+    def _on_mouse_wheel(self, event):
+        self._scroll_by(-3 if event.delta > 0 else 3)
@@ -29,6 +29,11 @@ class WorkspaceStatusIndicator(ttk.Frame):
         
         # 詳細情報ラベル
         self.detail_text = ttk.Label(self, text="", font=("Arial", 8))
+        
+        # バックグラウンド処理の進捗（処理中のみ表示）
+        self.progress_bar = ttk.Progressbar(self, length=120, mode="determinate")
+        self.progress_text = ttk.Label(self, text="", font=("Arial", 8))
+        self.progress_visible = False
     
     def _setup_layout(self):
         """レイアウトを設定"""
@@ -61,4 +66,25 @@ class WorkspaceStatusIndicator(ttk.Frame):
         
         status_name = status_names.get(status, "不明")
         self.status_text.config(text=f"状態: {status_name}")
-        self.detail_text.config(text=message)
\ No newline at end of file
+        self.detail_text.config(text=message)
+    
+    def show_progress(self, message: str, done: int, total: int):
+        """バックグラウンド処理の進捗を表示（total が0の場合は件数不明として表示）"""
+        if not self.progress_visible:
+            self.progress_bar.pack(side=tk.LEFT, padx=5)
+            self.progress_text.pack(side=tk.LEFT, padx=2)
+            self.progress_visible = True
+        if total > 0:
+            self.progress_bar.config(mode="determinate", maximum=total, value=min(done, total))
+            self.progress_text.config(text=f"{message} ({done}/{total})")
+        else:
+            self.progress_bar.config(mode="indeterminate")
+            self.progress_bar.step()
+            self.progress_text.config(text=message)
+    
+    def clear_progress(self):
+        """進捗表示を消す"""
+        if self.progress_visible:
+            self.progress_bar.pack_forget()
+            self.progress_text.pack_forget()
+            self.progress_visible = False
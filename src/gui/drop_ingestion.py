@@ -0,0 +1,43 @@
+"""
+ドロップ取り込みのバックグラウンド実行
+
+DropZone・BatchPanel にドロップされたパスを BatchManager.ingest_dropped_files で
+取り込む処理を GuiTaskRunner に渡す。展開・移動はすべてワーカーで行い、
+UIスレッドには進捗（移動済み件数）と結果だけが返る。
+
+tkinter に依存しないため、HeadlessEventLoop（src.gui.headless）と組み合わせて
+ディスプレイなしでパイプライン全体を動かせる。
+"""
+
+from typing import Callable, List, Optional, Union
+
+from src.models.batch_file import BatchFile
+from src.services.drop_pipeline import DropIngestionResult
+
+
+def submit_drop(task_runner, batch_manager, batch: Union[BatchFile, str], paths: List[str],
+                on_success: Optional[Callable[[DropIngestionResult], None]] = None,
+                on_error: Optional[Callable[[BaseException], None]] = None,
+                on_progress: Optional[Callable[[int, int, str], None]] = None,
+                on_cancelled: Optional[Callable[[], None]] = None):
+    """ドロップの取り込みをバックグラウンドで開始し、TaskHandle を返す
+
+    batch はバッチファイル、または保存済みバッチファイルのパス（ワーカーで読み込む）。
+    """
+    paths = list(paths)
+
+    def ingest(handle):
+        batch_file = batch
+        if isinstance(batch, str):
+            batch_file = batch_manager.load_batch_file(batch)
+            if batch_file is None:
+                raise ValueError(f"バッチファイルを読み込めません: {batch}")
+        return batch_manager.ingest_dropped_files(
+            batch_file, paths,
+            progress=handle.report_progress,
+            cancel_check=lambda: handle.cancelled
+        )
+
+    return task_runner.submit(ingest, on_success=on_success, on_error=on_error,
+                              on_progress=on_progress, on_cancelled=on_cancelled,
+                              name="ドロップの取り込み")
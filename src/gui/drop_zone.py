@@ -6,9 +6,11 @@
 
 import tkinter as tk
 from tkinter import ttk
-from typing import List
+from typing import Callable, Iterable, List, Optional
 from dataclasses import dataclass
 
+from src.utils.extension_matcher import ExtensionMatcher
+
 
 @dataclass
 class DropResult:
@@ -16,6 +18,7 @@ class DropResult:
     processed_count: int
     success: bool = True
     error_message: str = ""
+    skipped_count: int = 0
 
 
 class DropZone(ttk.Frame):
@@ -24,6 +27,10 @@ class DropZone(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.is_highlighted = False
+        # 対象拡張子（None の場合はすべてのファイルを受け付ける）
+        self.extension_matcher: Optional[ExtensionMatcher] = None
+        # 取り込みハンドラ（設定時はドロップされたパスをそのまま渡し、展開・移動はバックグラウンドで行う）
+        self.ingest_handler: Optional[Callable[[List[str]], None]] = None
         self._create_widgets()
         self._setup_layout()
     
@@ -72,19 +79,33 @@ class DropZone(ttk.Frame):
         self.preview_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.preview_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
     
+    def set_target_extensions(self, extensions: Optional[Iterable[str]]):
+        """受け付ける拡張子を設定（None で制限なし）"""
+        self.extension_matcher = ExtensionMatcher(extensions) if extensions is not None else None
+    
     def handle_file_drop(self, file_list: List[str]) -> DropResult:
         """ファイルドロップを処理"""
+        if self.ingest_handler is not None:
+            return self._start_ingest(list(file_list))
         try:
+            # 対象拡張子以外のファイルを除外
+            target_files = (self.extension_matcher.filter(file_list)
+                            if self.extension_matcher is not None else list(file_list))
+            skipped_count = len(file_list) - len(target_files)
+            
             # ファイル一覧をプレビューエリアに表示
             self.preview_area.delete(0, tk.END)
-            for file_path in file_list:
+            for file_path in target_files:
                 self.preview_area.insert(tk.END, file_path)
             
             # ステータス更新
-            self.status_label.config(text=f"{len(file_list)}個のファイルが選択されました", 
-                                   fg="blue")
+            status = f"{len(target_files)}個のファイルが選択されました"
+            if skipped_count:
+                status += f"（対象外の拡張子 {skipped_count}個を除外）"
+            self.status_label.config(text=status, fg="blue")
             
-            return DropResult(processed_count=len(file_list), success=True)
+            return DropResult(processed_count=len(target_files), success=True,
+                              skipped_count=skipped_count)
         
         except Exception as e:
             self.status_label.config(text=f"エラー: {str(e)}", fg="red")
@@ -92,12 +113,16 @@ class DropZone(ttk.Frame):
     
     def handle_folder_drop(self, folder_path: str) -> DropResult:
         """フォルダドロップを処理"""
+        if self.ingest_handler is not None:
+            return self._start_ingest([folder_path])
         try:
             # フォルダ内のファイルを取得（再帰的処理はモック）
             import os
             file_count = 0
             if os.path.exists(folder_path):
                 for root, dirs, files in os.walk(folder_path):
+                    if self.extension_matcher is not None:
+                        files = self.extension_matcher.filter(files)
                     file_count += len(files)
             
             # プレビューエリアに情報表示
@@ -115,6 +140,40 @@ class DropZone(ttk.Frame):
             self.status_label.config(text=f"エラー: {str(e)}", fg="red")
             return DropResult(processed_count=0, success=False, error_message=str(e))
     
+    def _start_ingest(self, paths: List[str]) -> DropResult:
+        """取り込みハンドラに渡す（件数は取り込み完了時に show_ingest_result で表示）"""
+        try:
+            self.ingest_handler(paths)
+        except Exception as e:
+            self.status_label.config(text=f"エラー: {str(e)}", fg="red")
+            return DropResult(processed_count=0, success=False, error_message=str(e))
+        self.status_label.config(text="取り込み中...", fg="blue")
+        return DropResult(processed_count=0, success=True)
+    
+    def show_ingest_progress(self, moved_count: int):
+        """取り込みの進捗を表示"""
+        self.status_label.config(text=f"取り込み中...（{moved_count}件を移動）", fg="blue")
+    
+    def show_ingest_result(self, result):
+        """取り込み結果（DropIngestionResult）を表示"""
+        status = f"{result.moved_count}件を移動しました"
+        if result.skipped_count:
+            status += f"（対象外の拡張子 {result.skipped_count}個を除外）"
+        if result.duplicate_count:
+            status += f"（内容が同じファイル {result.duplicate_count}個を除外）"
+        if result.error_count:
+            status += f" エラー {result.error_count}件"
+        self.status_label.config(text=status, fg="red" if result.error_count else "green")
+        self.preview_area.delete(0, tk.END)
+        if result.first_sequence:
+            self.preview_area.insert(tk.END, f"連番: {result.first_sequence} - {result.last_sequence}")
+        for message in result.error_messages:
+            self.preview_area.insert(tk.END, message)
+    
+    def show_ingest_error(self, error: BaseException):
+        """取り込みの失敗を表示"""
+        self.status_label.config(text=f"エラー: {str(error)}", fg="red")
+    
     def show_drop_feedback(self, is_highlighted: bool):
         """ドラッグオーバー時のビジュアルフィードバック"""
         self.is_highlighted = is_highlighted
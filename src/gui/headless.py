@@ -0,0 +1,148 @@
+"""
+ヘッドレスGUIテスト用ハーネス
+
+  - HeadlessEventLoop: tkinter.Tk の after / after_cancel / update 互換の最小イベントループ
+  - StallMonitor: 一定間隔のハートビートの遅れからメインループの停止時間を計測する
+    （tkinter.Tk・HeadlessEventLoop のどちらにも使える）
+  - UiThreadIoMonitor: 監査フック（sys.addaudithook）でUIスレッド上のディスクI/Oを検出する
+"""
+
+import sys
+import time
+import heapq
+import itertools
+import threading
+from typing import Callable, List, Optional, Tuple
+
+# UIスレッドで発生してはならない監査イベント（ファイル・フォルダ・データベースの操作）
+IO_AUDIT_EVENTS = frozenset({
+    "open", "os.listdir", "os.scandir", "os.rename", "os.remove", "os.mkdir", "os.rmdir",
+    "os.truncate", "os.utime", "os.chmod", "shutil.copyfile", "shutil.move", "shutil.rmtree",
+    "sqlite3.connect",
+})
+
+
+class HeadlessEventLoop:
+    """ディスプレイなしで after コールバックを実行するイベントループ"""
+
+    def __init__(self):
+        self._queue: List[Tuple[float, int, str]] = []
+        self._callbacks = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.longest_callback_seconds = 0.0
+
+    def after(self, ms: int, func: Optional[Callable] = None, *args) -> str:
+        """ms ミリ秒後に func(*args) を実行するよう登録"""
+        sequence = next(self._ids)
+        after_id = f"after#{sequence}"
+        with self._lock:
+            self._callbacks[after_id] = (func, args)
+            heapq.heappush(self._queue, (time.perf_counter() + ms / 1000.0, sequence, after_id))
+        return after_id
+
+    def after_idle(self, func: Callable, *args) -> str:
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id: str):
+        with self._lock:
+            self._callbacks.pop(after_id, None)
+
+    def update(self):
+        """実行時刻を過ぎたコールバックをすべて実行"""
+        now = time.perf_counter()
+        while True:
+            with self._lock:
+                if not self._queue or self._queue[0][0] > now:
+                    return
+                _, _, after_id = heapq.heappop(self._queue)
+                entry = self._callbacks.pop(after_id, None)
+            if entry is None:
+                continue
+            func, args = entry
+            start = time.perf_counter()
+            func(*args)
+            self.longest_callback_seconds = max(self.longest_callback_seconds, time.perf_counter() - start)
+
+    def update_idletasks(self):
+        self.update()
+
+    def run(self, until: Callable[[], bool], timeout: float = 60.0) -> bool:
+        """until() が真になるまでイベントループを回す（タイムアウトした場合 False）"""
+        deadline = time.perf_counter() + timeout
+        while not until():
+            now = time.perf_counter()
+            if now > deadline:
+                return False
+            self.update()
+            with self._lock:
+                next_due = self._queue[0][0] if self._queue else now + 0.001
+            time.sleep(min(max(next_due - time.perf_counter(), 0.0), 0.005))
+        return True
+
+
+class StallMonitor:
+    """ハートビートの遅れでメインループの停止時間を計測する"""
+
+    def __init__(self, root, interval_ms: int = 10):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.samples: List[float] = []
+        self._expected: Optional[float] = None
+        self._after_id = None
+
+    def start(self):
+        self._expected = time.perf_counter() + self.interval_ms / 1000.0
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _beat(self):
+        now = time.perf_counter()
+        self.samples.append(max(0.0, now - self._expected))
+        self._expected = now + self.interval_ms / 1000.0
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    @property
+    def max_stall_seconds(self) -> float:
+        return max(self.samples, default=0.0)
+
+    def percentile(self, ratio: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+class UiThreadIoMonitor:
+    """UIスレッドでのディスクI/Oを検出する（with 文の間だけ記録）"""
+
+    _installed = False
+    _active: List['UiThreadIoMonitor'] = []
+
+    def __init__(self, ui_thread: Optional[threading.Thread] = None):
+        self.ui_thread = ui_thread or threading.current_thread()
+        self.violations: List[Tuple[str, object]] = []
+
+    @classmethod
+    def _hook(cls, event: str, args):
+        if event in IO_AUDIT_EVENTS and cls._active:
+            current = threading.current_thread()
+            for monitor in cls._active:
+                if current is monitor.ui_thread:
+                    monitor.violations.append((event, args[0] if args else None))
+
+    def __enter__(self) -> 'UiThreadIoMonitor':
+        # 監査フックは削除できないため、プロセスで1回だけ登録する
+        if not UiThreadIoMonitor._installed:
+            sys.addaudithook(UiThreadIoMonitor._hook)
+            UiThreadIoMonitor._installed = True
+        UiThreadIoMonitor._active.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        UiThreadIoMonitor._active.remove(self)
+        return False
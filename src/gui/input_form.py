@@ -6,10 +6,14 @@
 
 import tkinter as tk
 from tkinter import ttk
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
 from src.models.preset import Preset
 from src.models.batch_file import BatchFile
+from src.config.settings import get_settings
+from src.services.filename_preview import FilenamePreviewCache
+from src.gui.components.preview_list import VirtualPreviewList
+from src.gui.live_preview import LivePreviewController
 
 
 class DynamicInputForm(ttk.Frame):
@@ -20,6 +24,16 @@ class DynamicInputForm(ttk.Frame):
         self.input_fields: Dict[str, tk.StringVar] = {}
         self.current_preset: Optional[Preset] = None
         self._suggestion_data: Dict[str, List[str]] = {}
+        # バックグラウンド保存用（MainWindow が設定する）
+        self.task_runner = None
+        self.batch_manager = None
+        self.on_batch_saved: Optional[Callable[[str], None]] = None
+        # ファイル名プレビュー（入力値の組み合わせごとに展開済みのパターンを保持）
+        self.preview_cache = FilenamePreviewCache()
+        # ライブプレビュー（task_runner の設定後、最初に使うときに作成する）
+        self._live_preview: Optional[LivePreviewController] = None
+        # プレビューで行ごとに判定するNGワード（MainWindow が設定の読み込み後に set_ng_words で設定する）
+        self.ng_words: Optional[List[str]] = None
         self._create_base_widgets()
     
     def _create_base_widgets(self):
@@ -28,12 +42,16 @@ class DynamicInputForm(ttk.Frame):
         self.form_frame = ttk.Frame(self)
         self.form_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+        # リネーム後のファイル名のプレビュー
+        self.preview_list = VirtualPreviewList(self)
+        self.preview_list.pack(fill=tk.BOTH, expand=True, padx=5)
+        
         # バッチ作成ボタン
         button_frame = ttk.Frame(self)
         button_frame.pack(fill=tk.X, pady=5)
         
         self.create_batch_button = ttk.Button(button_frame, text="バッチファイル作成",
-                                            command=self.create_batch_from_form)
+                                            command=self.on_create_batch_clicked)
         self.create_batch_button.pack(side=tk.RIGHT)
     
     def generate_form_from_preset(self, preset: Preset):
@@ -61,9 +79,11 @@ class DynamicInputForm(ttk.Frame):
                 var.set(preset.default_values[field_name])
             
             self.input_fields[field_name] = var
+            var.trace_add("write", self._on_field_changed)
         
         # 列の重みを設定
         self.form_frame.columnconfigure(1, weight=1)
+        self._request_preview()
     
     def enable_suggestions(self, field_name: str, suggestions: List[str]):
         """指定フィールドにサジェスト機能を有効化"""
@@ -92,15 +112,65 @@ class DynamicInputForm(ttk.Frame):
             if field_name in self.input_fields:
                 self.input_fields[field_name].set(value)
     
+    def get_form_values(self) -> Dict[str, str]:
+        """フォームの入力値を取得"""
+        return {field_name: var.get() for field_name, var in self.input_fields.items()}
+    
+    def preview_filenames(self, file_names: List[str]) -> List[str]:
+        """現在の入力値でのリネーム後のファイル名（番号は先頭から1, 2, ...）
+        
+        入力値が不正な場合は ValueError。
+        """
+        if not self.current_preset:
+            return []
+        return self.preview_cache.preview_names(self.current_preset, self.get_form_values(), file_names)
+    
+    @property
+    def live_preview(self) -> Optional[LivePreviewController]:
+        """ライブプレビュー（task_runner が未設定の場合は None）"""
+        if self._live_preview is None and self.task_runner is not None:
+            if self.ng_words is None:
+                self.ng_words = get_settings().get_ng_words()
+            self._live_preview = LivePreviewController(self, self.task_runner, self.preview_list,
+                                                       cache=self.preview_cache, ng_words=self.ng_words)
+            self._live_preview.duplicate_detector_factory = self._duplicate_detector
+        return self._live_preview
+    
+    def _duplicate_detector(self):
+        """ワーカー: ワークスペースの重複ファイル検出（BatchManager が未設定の場合は None）"""
+        batch_manager = self.batch_manager
+        return batch_manager.duplicate_detector if batch_manager is not None else None
+    
+    def set_ng_words(self, ng_words: Iterable[str]):
+        """プレビューのNGワードを設定（ライブプレビューが作成済みなら再計算する）"""
+        self.ng_words = list(ng_words)
+        if self._live_preview is not None:
+            self._live_preview.set_ng_words(self.ng_words)
+    
+    def set_preview_files(self, paths: Iterable[str], target_extensions: Optional[Iterable[str]] = None,
+                          on_loaded: Optional[Callable[[], None]] = None):
+        """プレビュー対象のファイル（ドロップされたパス）を設定"""
+        if self.live_preview is None:
+            if on_loaded:
+                on_loaded()
+            return
+        self.live_preview.set_files(paths, target_extensions, on_loaded)
+        self._request_preview()
+    
+    def _on_field_changed(self, *args):
+        self._request_preview()
+    
+    def _request_preview(self):
+        if self.current_preset is not None and self.live_preview is not None:
+            self.live_preview.request_update(self.current_preset, self.get_form_values())
+    
     def create_batch_from_form(self) -> Optional[BatchFile]:
         """フォームからバッチファイルを作成"""
         if not self.current_preset:
             return None
         
         # フォームの値を取得
-        values = {}
-        for field_name, var in self.input_fields.items():
-            values[field_name] = var.get()
+        values = self.get_form_values()
         
         # バッチファイルを作成
         batch_file = BatchFile(
@@ -110,4 +180,25 @@ class DynamicInputForm(ttk.Frame):
             target_extensions=self.current_preset.target_extensions
         )
         
-        return batch_file
\ No newline at end of file
+        return batch_file
+    
+    def on_create_batch_clicked(self):
+        """バッチ作成ボタン: フォームから作成し、保存はバックグラウンドで行う"""
+        batch_file = self.create_batch_from_form()
+        if batch_file is None or self.task_runner is None or self.batch_manager is None:
+            return batch_file
+        
+        self.create_batch_button.config(state=tk.DISABLED)
+        self.task_runner.submit(
+            lambda handle: self.batch_manager.save_batch_file(batch_file),
+            on_success=self._on_batch_saved,
+            on_error=lambda error: self.create_batch_button.config(state=tk.NORMAL),
+            on_cancelled=lambda: self.create_batch_button.config(state=tk.NORMAL),
+            name="バッチファイル保存"
+        )
+        return batch_file
+    
+    def _on_batch_saved(self, file_path: str):
+        self.create_batch_button.config(state=tk.NORMAL)
+        if self.on_batch_saved:
+            self.on_batch_saved(file_path)
@@ -0,0 +1,143 @@
+"""
+入力フォームのライブプレビュー
+
+フォームの入力値が変わるたびにプレビューを更新する。
+  - 入力が続いている間は計算しない（最後の入力から debounce_ms 後に1回だけ計算する）
+  - 計算は GuiTaskRunner のワーカーで行い、新しい入力があれば計算中のものはキャンセルする
+  - UIスレッドには (PreviewState, 変わった行) だけが返り、view.show_preview で反映する
+
+tkinter に依存しないため、HeadlessEventLoop（src.gui.headless）と組み合わせて
+ディスプレイなしで動かせる。
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.services.filename_preview import FilenamePreviewCache
+from src.services.live_preview import PreviewSource, PreviewState, build_preview
+
+# 最後の入力から計算を始めるまでの時間（ミリ秒）
+DEFAULT_DEBOUNCE_MS = 150
+
+
+class LivePreviewController:
+    """入力値の変更 → デバウンス → ワーカーでの計算 → view への差分反映"""
+
+    def __init__(self, root, task_runner, view, cache: Optional[FilenamePreviewCache] = None,
+                 debounce_ms: int = DEFAULT_DEBOUNCE_MS, ng_words: Optional[Iterable[str]] = None):
+        self.root = root
+        self.task_runner = task_runner
+        # show_preview(state, changed_rows) を持つオブジェクト（VirtualPreviewList）
+        self.view = view
+        self.cache = cache or FilenamePreviewCache()
+        self.debounce_ms = debounce_ms
+        # 行ごとに判定するNGワード（設定のNGワード。含まれる予約名は名前全体の一致で判定する）
+        self.ng_words: Optional[List[str]] = list(ng_words) if ng_words is not None else None
+        # 内容が同じファイルを検出する DuplicateDetector を返す関数（ワーカーで呼ぶ。None なら検出しない）
+        self.duplicate_detector_factory: Optional[Callable[[], object]] = None
+        self.source: Optional[PreviewSource] = None
+        self.state: Optional[PreviewState] = None
+        self.update_count = 0
+        self._preset = None
+        self._values: Dict[str, str] = {}
+        self._after_id = None
+        self._handle = None
+        self._generation = 0
+        self._source_generation = 0
+
+    @property
+    def busy(self) -> bool:
+        """計算待ち・計算中か"""
+        return self._after_id is not None or self._handle is not None
+
+    def set_files(self, paths: Iterable[str], target_extensions: Optional[Iterable[str]] = None,
+                  on_loaded: Optional[Callable[[], None]] = None):
+        """プレビュー対象を設定（展開・既存ファイル名の読み込みはワーカーで行う）
+
+        on_loaded は読み込みの成否にかかわらず完了時にUIスレッドで呼ばれる。
+        """
+        paths = list(paths)
+        extensions = list(target_extensions) if target_extensions is not None else None
+        self._source_generation += 1
+        generation = self._source_generation
+
+        def loaded(source: PreviewSource):
+            # 後から設定された対象の読み込みが先に終わっていれば反映しない
+            if generation == self._source_generation:
+                self.source = source
+                self.state = None
+                self._schedule(0)
+            if on_loaded:
+                on_loaded()
+
+        def failed(error: BaseException):
+            if on_loaded:
+                on_loaded()
+
+        detector_factory = self.duplicate_detector_factory
+
+        def scan(handle):
+            detector = detector_factory() if detector_factory is not None else None
+            return PreviewSource.scan(paths, extensions, handle.check_cancelled, detector)
+
+        self.task_runner.submit(scan, on_success=loaded, on_error=failed,
+                                name="プレビュー対象の読み込み")
+
+    def request_update(self, preset, input_values: Dict[str, str]):
+        """入力値の変更を通知（最後の通知から debounce_ms 後に計算する）"""
+        self._preset = preset
+        self._values = dict(input_values)
+        self._schedule(self.debounce_ms)
+
+    def set_ng_words(self, ng_words: Optional[Iterable[str]]):
+        """NGワードを変更し、表示中のプレビューがあれば再計算する"""
+        self.ng_words = list(ng_words) if ng_words is not None else None
+        if self._preset is not None:
+            self._schedule(0)
+
+    def _schedule(self, delay_ms: int):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after(delay_ms, self._start)
+
+    def _start(self):
+        self._after_id = None
+        if self.source is None or self._preset is None:
+            return
+        if self._handle is not None:
+            self._handle.cancel()
+
+        self._generation += 1
+        generation = self._generation
+        source, preset, values, ng_words = self.source, self._preset, self._values, self.ng_words
+        # 差分の基準は表示中の状態（古い計算の結果は反映しないため、表示中の状態は変わらない）
+        base = self.state
+        self._handle = self.task_runner.submit(
+            lambda handle: build_preview(self.cache, source, preset, values, ng_words,
+                                         base, handle.check_cancelled),
+            on_success=lambda result: self._apply(generation, result),
+            on_error=lambda error: self._finish(generation),
+            on_cancelled=lambda: self._finish(generation),
+            name="プレビュー"
+        )
+
+    def _finish(self, generation: int):
+        if generation == self._generation:
+            self._handle = None
+
+    def _apply(self, generation: int, result):
+        if generation != self._generation:
+            return
+        self._handle = None
+        self.state, changed = result
+        self.update_count += 1
+        self.view.show_preview(self.state, changed)
+
+    def cancel(self):
+        """計算待ち・計算中のプレビューを取り消す"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._generation += 1
@@ -4,6 +4,8 @@
 統合GUIインターフェースのメインウィンドウ
 """
 
+import os
+import time
 import tkinter as tk
 from tkinter import ttk
 from typing import Optional
@@ -12,39 +14,171 @@ from src.gui.preset_panel import PresetPanel
 from src.gui.input_form import DynamicInputForm
 from src.gui.batch_panel import BatchPanel
 from src.gui.drop_zone import DropZone
+from src.gui.task_runner import GuiTaskRunner
+from src.gui.drop_ingestion import submit_drop
+from src.gui.startup import (DeferredStartup, StartupMetrics, FIRST_PAINT,
+                             STARTUP_METRICS_ENV)
+from src.gui.components.workspace_status import WorkspaceStatusIndicator
 from src.services.workspace_manager import WorkspaceManager
+from src.services.batch_manager import BatchManager
 from src.models.preset import Preset
+from src.config.settings import get_settings
+from src.utils.text_normalizer import TextNormalizer, set_default_normalizer
 
 
 class MainWindow:
-    """メインウィンドウクラス"""
+    """メインウィンドウクラス
     
-    def __init__(self, root: tk.Tk):
+    ディスクI/O（ワークスペースの初期化・プリセットの読み込み・バッチファイルの保存）は
+    GuiTaskRunner でバックグラウンド実行し、UIスレッドでは行わない。
+    起動時は読み込み中表示のパネルで先に描画し、読み込みが終わったパネルから順に表示を更新する。
+    """
+    
+    def __init__(self, root: tk.Tk, task_runner: Optional[GuiTaskRunner] = None,
+                 preset_manager=None, startup_metrics: Optional[StartupMetrics] = None):
         self.root = root
         self.root.title("Tadakan - フルGUI版")
+        self.startup_metrics = startup_metrics or StartupMetrics()
         
         # ワークスペース管理
         self.workspace_manager = WorkspaceManager()
+        self.preset_manager = preset_manager
         self.current_workspace = None
         self.workspace_initialized = False
         
-        # 初期化
-        self._initialize_workspace()
+        # 読み込み中表示のパネルを作成（ディスクI/Oは行わない）
         self._create_components()
         self.setup_layout()
+        self.preset_panel.show_loading()
+        self.batch_panel.show_loading()
+        self.status_indicator.show_status("unknown", "読み込み中...")
+        
+        self.task_runner = task_runner or GuiTaskRunner(root, status_indicator=self.status_indicator)
+        if self.task_runner.status_indicator is None:
+            self.task_runner.status_indicator = self.status_indicator
+        self.input_form.task_runner = self.task_runner
+        self.batch_panel.task_runner = self.task_runner
+        self.batch_panel.on_drop_completed = self.drop_zone.show_ingest_result
+        self.batch_panel.on_drop_error = self.drop_zone.show_ingest_error
+        self.batch_panel.on_drop_progress = self.drop_zone.show_ingest_progress
+        
+        # 読み込みは最初の描画の後に開始する
+        self.startup = DeferredStartup(self.task_runner, self.startup_metrics)
+        # 正規化・プレビューのNGワードはプリセット・バッチファイルの読み込みより先に設定に合わせる（失敗時はデフォルトのまま）
+        self.startup.add_stage("settings", self._load_settings, self._apply_settings)
+        self.startup.add_stage("workspace", self._load_workspace, self._on_workspace_loaded,
+                               on_error=self._on_workspace_failed)
+        self.startup.add_stage("presets", self._load_presets, self.preset_panel.set_presets,
+                               on_error=lambda error: self.preset_panel.load_presets([]))
+        self.startup.add_stage("batch_index", self._load_batch_index, self.batch_panel.load_batch_files,
+                               on_error=lambda error: self.batch_panel.load_batch_files([]))
+        self._register_metrics_log()
+        self.root.after_idle(self._on_first_paint)
+    
+    def _on_first_paint(self):
+        """UIスレッド: 最初の描画の後に計測を記録し、バックグラウンドの読み込みを開始"""
+        self.startup_metrics.mark(FIRST_PAINT)
+        self.startup.start()
+    
+    def _register_metrics_log(self):
+        """環境変数で記録先が指定されていれば、操作可能になった時点の計測結果を追記する"""
+        log_path = os.environ.get(STARTUP_METRICS_ENV)
+        if log_path:
+            self.startup_metrics.add_listener(
+                lambda metrics: self.task_runner.submit(lambda handle: metrics.append_to(log_path),
+                                                        name="起動時間の記録")
+            )
+    
+    def wait_until_interactive(self, timeout: float = 10.0) -> bool:
+        """起動時の読み込みがすべて反映されるまでイベントループを回す（テスト・計測用）"""
+        deadline = time.monotonic() + timeout
+        while not self.startup.finished:
+            if time.monotonic() > deadline:
+                return False
+            self.root.update()
+            time.sleep(0.005)
+        return True
+    
+    def _load_settings(self, handle):
+        """ワーカー: 設定ファイルを読み込み、(正規化, NGワード) を返す"""
+        settings = get_settings()
+        return TextNormalizer.from_settings(settings), settings.get_ng_words()
+    
+    def _apply_settings(self, loaded):
+        """UIスレッド: 設定の正規化を共通の正規化にし、NGワードをプレビューに反映"""
+        normalizer, ng_words = loaded
+        set_default_normalizer(normalizer)
+        self.input_form.set_ng_words(ng_words)
+    
+    def _load_workspace(self, handle):
+        """ワーカー: デフォルトワークスペースを初期化（失敗時は None）"""
+        default_path = self.workspace_manager.get_default_workspace_path()
+        result = self.workspace_manager.initialize_workspace(default_path)
+        if not result.success:
+            return None
+        self.workspace_manager.set_current_workspace(default_path)
+        return default_path
+    
+    def _on_workspace_loaded(self, workspace_path: Optional[str]):
+        """UIスレッド: ワークスペース初期化の完了を反映"""
+        if workspace_path is None:
+            self._on_workspace_failed(None)
+            return
+        self.current_workspace = self.workspace_manager.current_workspace
+        self.workspace_initialized = True
+        self.current_workspace_path = workspace_path
+        self.workspace_path_label.config(text=f"ワークスペース: {workspace_path}")
+        self.status_indicator.show_status("healthy", "")
+        self._set_batch_manager(self._create_batch_manager(workspace_path))
+        self.drop_zone.ingest_handler = self._ingest_drop
     
-    def _initialize_workspace(self):
-        """ワークスペースの初期化"""
-        try:
-            default_path = self.workspace_manager.get_default_workspace_path()
-            result = self.workspace_manager.initialize_workspace(default_path)
-            if result.success:
-                self.workspace_manager.set_current_workspace(default_path)
-                self.current_workspace = self.workspace_manager.current_workspace
-                self.workspace_initialized = True
-                self.current_workspace_path = default_path
-        except Exception:
-            self.workspace_initialized = False
+    def _on_workspace_failed(self, error):
+        """UIスレッド: ワークスペース初期化の失敗を反映"""
+        self.workspace_initialized = False
+        self.status_indicator.show_status("error", "ワークスペースを初期化できません")
+    
+    def _load_presets(self, handle):
+        """ワーカー: プリセット一覧を読み込み"""
+        if self.preset_manager is None:
+            return []
+        return self.preset_manager.list_presets()
+    
+    def _load_batch_index(self, handle):
+        """ワーカー: 保存済みバッチファイルの一覧を読み込み（ワークスペースが無い場合は空）"""
+        batch_manager = self.input_form.batch_manager
+        if batch_manager is None:
+            return []
+        return batch_manager.list_batch_index()
+    
+    @staticmethod
+    def _create_batch_manager(workspace_path: str) -> BatchManager:
+        """ワークスペースのバッチ管理（構築時にディスクI/Oは行わない）"""
+        return BatchManager(workspace_path)
+    
+    def _set_batch_manager(self, batch_manager: BatchManager):
+        self.input_form.batch_manager = batch_manager
+        self.batch_panel.batch_manager = batch_manager
+    
+    def _ingest_drop(self, paths):
+        """ドロップゾーン: 入力フォームのバッチ規則でドロップされたファイルを取り込む"""
+        batch_manager = self.input_form.batch_manager
+        if batch_manager is None:
+            raise ValueError("ワークスペースが初期化されていません")
+        batch_file = self.input_form.create_batch_from_form()
+        if batch_file is None:
+            raise ValueError("プリセットを選択してください")
+
+        def ingest():
+            submit_drop(
+                self.task_runner, batch_manager, batch_file, paths,
+                on_success=self.drop_zone.show_ingest_result,
+                on_error=self.drop_zone.show_ingest_error,
+                on_progress=lambda done, total, message: self.drop_zone.show_ingest_progress(done)
+            )
+
+        # プレビュー対象は移動される前に展開する（展開の完了後に取り込みを開始する）
+        self.input_form.set_preview_files(paths, self.input_form.current_preset.target_extensions,
+                                          on_loaded=ingest)
     
     def _create_components(self):
         """GUIコンポーネントを作成"""
@@ -64,15 +198,17 @@ class MainWindow:
         # ワークスペースパス表示ラベル
         self.workspace_path_label = tk.Label(self.root, text="ワークスペース: 未設定")
         
-        # 初期表示更新
-        if self.workspace_initialized:
-            self.workspace_path_label.config(text=f"ワークスペース: {self.current_workspace_path}")
+        # ワークスペース状態・バックグラウンド処理の進捗
+        self.status_indicator = WorkspaceStatusIndicator(self.root)
     
     def setup_layout(self):
         """レイアウトを設定"""
         # ワークスペースパス表示（上部）
         self.workspace_path_label.pack(side=tk.TOP, fill=tk.X, padx=5, pady=2)
         
+        # 状態表示（下部）
+        self.status_indicator.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=2)
+        
         # メインフレーム
         main_frame = ttk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -105,15 +241,19 @@ class MainWindow:
         
         # バッチパネルにプリセット情報を反映
         self.batch_panel.current_preset = preset
+        
+        # ドロップゾーンはプリセットの対象拡張子のファイルだけを受け付ける
+        self.drop_zone.set_target_extensions(preset.target_extensions)
     
     def switch_workspace(self, new_workspace_path: str):
-        """ワークスペースを切り替え"""
+        """ワークスペースを切り替え（WorkspaceManager.switch_workspace はディスクI/Oを行わない）"""
         result = self.workspace_manager.switch_workspace(new_workspace_path)
         if result.success:
             self.current_workspace_path = new_workspace_path
             self.current_workspace = self.workspace_manager.current_workspace
             if hasattr(self, 'workspace_path_label'):
                 self.workspace_path_label.config(text=f"ワークスペース: {new_workspace_path}")
+            self._set_batch_manager(self._create_batch_manager(new_workspace_path))
         return result
     
     def get_displayed_workspace_path(self) -> str:
@@ -17,6 +17,8 @@ class PresetPanel(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self._selection_handler: Optional[Callable] = None
+        # 一覧の各行に対応するプリセット（load_presets_async で読み込んだ場合）
+        self._presets: List[Preset] = []
         self._create_widgets()
         self._setup_layout()
     
@@ -57,9 +59,18 @@ class PresetPanel(ttk.Frame):
         self.edit_button.pack(side=tk.LEFT, padx=2)
         self.delete_button.pack(side=tk.LEFT, padx=2)
     
+    def show_loading(self):
+        """読み込み中の表示（読み込みが終わるまで一覧は選択できない）"""
+        self.preset_listbox.config(state=tk.NORMAL)
+        self.preset_listbox.delete(0, tk.END)
+        self.preset_listbox.insert(tk.END, "読み込み中...")
+        self.preset_listbox.config(state=tk.DISABLED)
+    
     def load_presets(self, presets: List[Dict[str, Any]]):
         """プリセット一覧を読み込み"""
+        self.preset_listbox.config(state=tk.NORMAL)
         self.preset_listbox.delete(0, tk.END)
+        self._presets = []
         
         for preset_data in presets:
             display_text = f"{preset_data['id']} - {preset_data['name']}"
@@ -67,6 +78,23 @@ class PresetPanel(ttk.Frame):
                 display_text += f" ({preset_data['created_at'][:10]})"
             self.preset_listbox.insert(tk.END, display_text)
     
+    def load_presets_async(self, task_runner, preset_manager):
+        """プリセットファイルをバックグラウンドで読み込み、完了後に一覧を更新"""
+        self.show_loading()
+        return task_runner.submit(
+            lambda handle: preset_manager.list_presets(),
+            on_success=self.set_presets,
+            on_error=lambda error: self.load_presets([]),
+            name="プリセット読み込み"
+        )
+    
+    def set_presets(self, presets: List[Preset]):
+        """読み込み済みのプリセットで一覧を更新"""
+        self.load_presets([
+            {"id": preset.id, "name": preset.name} for preset in presets
+        ])
+        self._presets = list(presets)
+    
     def set_selection_handler(self, handler: Callable):
         """選択イベントハンドラーを設定"""
         self._selection_handler = handler
@@ -75,6 +103,9 @@ class PresetPanel(ttk.Frame):
         """プリセット選択イベント"""
         selection = self.preset_listbox.curselection()
         if selection and self._selection_handler:
+            if selection[0] < len(self._presets):
+                self._selection_handler(self._presets[selection[0]])
+                return
             # 実際のプリセットオブジェクトを作成
             # 実装では適切なプリセットデータから作成する
             selected_preset = Preset(
@@ -0,0 +1,142 @@
+"""
+GUI起動の段階実行と計測
+
+ウィンドウは空のパネル（読み込み中表示）で先に描画し、ワークスペース・プリセット・
+バッチ一覧の読み込みは GuiTaskRunner でバックグラウンド実行して、終わったものから
+順にパネルへ反映する。
+
+  - StartupMetrics: 起動からの経過時間を記録する（最初の描画・操作可能になるまでの時間）
+  - DeferredStartup: 読み込み（ワーカー）→ 反映（UIスレッド）の段階を順に実行する
+"""
+
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# 計測イベント名
+FIRST_PAINT = "first_paint"
+INTERACTIVE = "interactive"
+
+# 起動時間の記録先（JSON Lines）を指定する環境変数
+STARTUP_METRICS_ENV = "TADAKAN_STARTUP_METRICS"
+
+
+class StartupMetrics:
+    """起動時間の計測（経過時間は origin からのミリ秒）"""
+
+    def __init__(self, origin: Optional[float] = None, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.origin = clock() if origin is None else origin
+        self.marks: Dict[str, float] = {}
+        self._listeners: List[Callable[['StartupMetrics'], None]] = []
+
+    def mark(self, event: str) -> float:
+        """イベントの経過時間を記録（同じイベントは最初の1回だけ）。INTERACTIVE でリスナーを呼ぶ"""
+        if event not in self.marks:
+            self.marks[event] = (self._clock() - self.origin) * 1000.0
+            if event == INTERACTIVE:
+                for listener in list(self._listeners):
+                    listener(self)
+        return self.marks[event]
+
+    def add_listener(self, listener: Callable[['StartupMetrics'], None]):
+        """操作可能になった時点で呼ばれるフックを登録（回帰計測用）"""
+        self._listeners.append(listener)
+
+    @property
+    def time_to_first_paint_ms(self) -> Optional[float]:
+        return self.marks.get(FIRST_PAINT)
+
+    @property
+    def time_to_interactive_ms(self) -> Optional[float]:
+        return self.marks.get(INTERACTIVE)
+
+    @property
+    def is_interactive(self) -> bool:
+        return INTERACTIVE in self.marks
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "time_to_first_paint_ms": self.time_to_first_paint_ms,
+            "time_to_interactive_ms": self.time_to_interactive_ms,
+            "marks": dict(self.marks),
+        }
+
+    def append_to(self, path: str):
+        """計測結果を JSON Lines として追記（ワーカーから呼ぶ）"""
+        record = dict(self.to_dict(), recorded_at=time.time())
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class _Stage:
+    def __init__(self, name, load, apply, on_error):
+        self.name = name
+        self.load = load
+        self.apply = apply
+        self.on_error = on_error
+
+
+class DeferredStartup:
+    """起動時の読み込みを段階ごとにバックグラウンド実行し、順にUIへ反映する
+
+    段階が失敗しても次の段階に進む（失敗は "<段階名>_failed" として記録）。
+    すべての段階が終わった時点で INTERACTIVE を記録する。
+    """
+
+    def __init__(self, task_runner, metrics: Optional[StartupMetrics] = None):
+        self.task_runner = task_runner
+        self.metrics = metrics or StartupMetrics()
+        self._stages: List[_Stage] = []
+        self._next_index = 0
+        self.started = False
+        self.cancelled = False
+
+    def add_stage(self, name: str, load: Callable[[Any], Any], apply: Callable[[Any], None],
+                  on_error: Optional[Callable[[BaseException], None]] = None):
+        """load(handle) をワーカーで実行し、結果を apply(result) でUIに反映する段階を追加"""
+        self._stages.append(_Stage(name, load, apply, on_error))
+
+    @property
+    def finished(self) -> bool:
+        return self.metrics.is_interactive or self.cancelled
+
+    def start(self):
+        """最初の段階を開始（最初の描画の後に呼ぶ）"""
+        if self.started:
+            return
+        self.started = True
+        self._run_next()
+
+    def _run_next(self):
+        if self._next_index >= len(self._stages):
+            self.metrics.mark(INTERACTIVE)
+            return
+        stage = self._stages[self._next_index]
+        self._next_index += 1
+        self.task_runner.submit(
+            stage.load,
+            on_success=lambda result: self._on_loaded(stage, result),
+            on_error=lambda error: self._on_failed(stage, error),
+            on_cancelled=self._on_cancelled,
+            name=stage.name
+        )
+
+    def _on_loaded(self, stage: _Stage, result):
+        try:
+            stage.apply(result)
+        except Exception as e:
+            self._on_failed(stage, e)
+            return
+        self.metrics.mark(stage.name)
+        self._run_next()
+
+    def _on_failed(self, stage: _Stage, error: BaseException):
+        self.metrics.mark(f"{stage.name}_failed")
+        if stage.on_error:
+            stage.on_error(error)
+        self._run_next()
+
+    def _on_cancelled(self):
+        # ウィンドウを閉じた場合など。以降の段階は実行しない
+        self.cancelled = True
@@ -0,0 +1,213 @@
+"""
+GUIバックグラウンドタスク実行
+
+ディスクI/Oを伴う処理をスレッドプールで実行し、結果・進捗をキュー経由で
+UIスレッド（root.after で定期的にキューを確認）に戻す。
+UIスレッドではディスクI/Oを行わない。ファイル操作・ワークスペースの読み込みは
+すべて submit でワーカーに渡し、UIの更新は完了時・進捗時のコールバックで行う。
+
+root は after / after_cancel を持つオブジェクトであればよく、tkinter.Tk の代わりに
+HeadlessEventLoop（src.gui.headless）を渡してディスプレイなしでテストできる。
+"""
+
+import time
+import queue
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# キューを確認する間隔（ミリ秒）
+DEFAULT_POLL_INTERVAL_MS = 30
+
+# 1回の確認でイベント処理に使う最大時間（秒）。超えた分は次回に回す
+POLL_TIME_BUDGET_SECONDS = 0.008
+
+_SUCCESS = "success"
+_ERROR = "error"
+_CANCELLED = "cancelled"
+_PROGRESS = "progress"
+
+
+class TaskCancelled(Exception):
+    """タスクがキャンセルされた"""
+
+
+class TaskHandle:
+    """実行中タスクのハンドル（ワーカー側では進捗報告・キャンセル確認に使う）"""
+
+    def __init__(self, runner: 'GuiTaskRunner', task_id: int, name: str):
+        self._runner = runner
+        self.task_id = task_id
+        self.name = name
+        self._cancel_event = threading.Event()
+        self.future = None
+        self.done = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """キャンセルを要求（未開始なら実行しない。実行中は check_cancelled で中断される）"""
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check_cancelled(self):
+        """ワーカー側: キャンセルされていれば TaskCancelled を送出"""
+        if self._cancel_event.is_set():
+            raise TaskCancelled(self.name)
+
+    def report_progress(self, done: int, total: int, message: str = ""):
+        """ワーカー側: 進捗を報告（UIスレッドにはまとめて反映される）"""
+        self._runner._post(_PROGRESS, self, (done, total, message))
+
+
+class _TaskCallbacks:
+    def __init__(self, on_success, on_error, on_progress, on_cancelled):
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancelled = on_cancelled
+
+
+class GuiTaskRunner:
+    """スレッドプール + root.after によるGUIタスク実行"""
+
+    def __init__(self, root, max_workers: int = 4, poll_interval_ms: int = DEFAULT_POLL_INTERVAL_MS,
+                 status_indicator=None):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        # WorkspaceStatusIndicator（show_progress / clear_progress）
+        self.status_indicator = status_indicator
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tadakan-gui")
+        self._events: "queue.Queue" = queue.Queue()
+        self._tasks: Dict[int, TaskHandle] = {}
+        self._callbacks: Dict[int, _TaskCallbacks] = {}
+        self._ids = itertools.count(1)
+        self._poll_id = None
+        self.ui_thread = threading.current_thread()
+
+    @property
+    def active_count(self) -> int:
+        """完了（UIへの反映）していないタスク数"""
+        return len(self._tasks)
+
+    def submit(self, func: Callable[..., Any], *args,
+               on_success: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               on_progress: Optional[Callable[[int, int, str], None]] = None,
+               on_cancelled: Optional[Callable[[], None]] = None,
+               name: str = "") -> TaskHandle:
+        """func(handle, *args) をワーカーで実行（コールバックはUIスレッドで呼ばれる）"""
+        handle = TaskHandle(self, next(self._ids), name or getattr(func, "__name__", "task"))
+        self._tasks[handle.task_id] = handle
+        self._callbacks[handle.task_id] = _TaskCallbacks(on_success, on_error, on_progress, on_cancelled)
+        handle.future = self._executor.submit(self._run, handle, func, args)
+        handle.future.add_done_callback(
+            lambda future: future.cancelled() and self._post(_CANCELLED, handle, None)
+        )
+        self._schedule_poll()
+        return handle
+
+    def cancel_all(self):
+        """すべてのタスクのキャンセルを要求"""
+        for handle in list(self._tasks.values()):
+            handle.cancel()
+
+    def shutdown(self, wait: bool = False):
+        """タスクをキャンセルしてスレッドプールを終了
+
+        未開始のタスクは cancel_all で Future ごとキャンセル済みなので、shutdown の
+        cancel_futures（Python 3.9 以降）は使わない。
+        """
+        self.cancel_all()
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._executor.shutdown(wait=wait)
+
+    def run_until_idle(self, timeout: float = 10.0) -> bool:
+        """すべてのタスクの完了がUIに反映されるまでイベントループを回す（テスト・終了処理用）"""
+        deadline = time.monotonic() + timeout
+        while self._tasks:
+            if time.monotonic() > deadline:
+                return False
+            self.root.update()
+            time.sleep(0.005)
+        return True
+
+    def _run(self, handle: TaskHandle, func, args):
+        if handle.cancelled:
+            self._post(_CANCELLED, handle, None)
+            return
+        try:
+            result = func(handle, *args)
+        except TaskCancelled:
+            self._post(_CANCELLED, handle, None)
+        except Exception as e:
+            self._post(_ERROR, handle, e)
+        else:
+            if handle.cancelled:
+                self._post(_CANCELLED, handle, None)
+            else:
+                self._post(_SUCCESS, handle, result)
+
+    def _post(self, kind: str, handle: TaskHandle, payload):
+        self._events.put((kind, handle, payload))
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    def _poll(self):
+        """UIスレッド: キューのイベントを処理（進捗はタスクごとに最新の1件だけ反映）"""
+        self._poll_id = None
+        deadline = time.perf_counter() + POLL_TIME_BUDGET_SECONDS
+        latest_progress: Dict[int, tuple] = {}
+        while time.perf_counter() < deadline:
+            try:
+                kind, handle, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == _PROGRESS:
+                latest_progress[handle.task_id] = (handle, payload)
+                continue
+            latest_progress.pop(handle.task_id, None)
+            self._finish(kind, handle, payload)
+
+        for handle, (done, total, message) in latest_progress.values():
+            if handle.task_id not in self._tasks:
+                continue
+            callbacks = self._callbacks[handle.task_id]
+            if callbacks.on_progress:
+                callbacks.on_progress(done, total, message)
+            if self.status_indicator is not None:
+                self.status_indicator.show_progress(message or handle.name, done, total)
+
+        if self._tasks or not self._events.empty():
+            self._schedule_poll()
+
+    def _finish(self, kind: str, handle: TaskHandle, payload):
+        """UIスレッド: タスクの完了をコールバックに通知"""
+        if handle.task_id not in self._tasks:
+            return
+        del self._tasks[handle.task_id]
+        callbacks = self._callbacks.pop(handle.task_id)
+        handle.done = True
+        if kind == _SUCCESS:
+            handle.result = payload
+            if callbacks.on_success:
+                callbacks.on_success(payload)
+        elif kind == _ERROR:
+            handle.error = payload
+            if callbacks.on_error:
+                callbacks.on_error(payload)
+        elif callbacks.on_cancelled:
+            callbacks.on_cancelled()
+
+        if not self._tasks and self.status_indicator is not None:
+            self.status_indicator.clear_progress()
@@ -7,27 +7,57 @@ Tadakan - ファイル名一括変更ツール
 
 import sys
 import os
+import time
 import argparse
-from pathlib import Path
 
 # プロジェクトルートをPythonパスに追加
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+# （services は "models.xxx" と "src.models.xxx" の両方の形式でインポートするため両方を登録）
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.dirname(project_root))
 
-from services.preset_manager import PresetManager
-from services.file_renamer import FileRenamer
-from services.batch_generator import BatchGenerator
-from models.preset import Preset
-from models.file_item import FileItem
+# サービス・モデルは起動時間短縮のため、各コマンドで必要になった時点でインポートする
+
+# マニフェストモードで1バッチファイルに含める最大ファイル数
+DEFAULT_MANIFEST_BATCH_SIZE = 5000
 
 
 class TadakanCLI:
-    """Tadakan コマンドラインインターフェース"""
+    """Tadakan コマンドラインインターフェース
+    
+    各サービスは初回アクセス時に生成する（--list で BatchGenerator を読み込まない等）
+    """
+    
+    def __init__(self, presets_directory: str = "presets", batch_directory: str = "batch_files"):
+        self.presets_directory = presets_directory
+        self.batch_directory = batch_directory
+        self._preset_manager = None
+        self._file_renamer = None
+        self._batch_generator = None
     
-    def __init__(self):
-        self.preset_manager = PresetManager()
-        self.file_renamer = FileRenamer()
-        self.batch_generator = BatchGenerator()
+    @property
+    def preset_manager(self):
+        """プリセット管理（遅延生成）"""
+        if self._preset_manager is None:
+            from services.preset_manager import PresetManager
+            self._preset_manager = PresetManager(self.presets_directory)
+        return self._preset_manager
+    
+    @property
+    def file_renamer(self):
+        """ファイルリネーム（遅延生成）"""
+        if self._file_renamer is None:
+            from services.file_renamer import FileRenamer
+            self._file_renamer = FileRenamer()
+        return self._file_renamer
+    
+    @property
+    def batch_generator(self):
+        """バッチ生成（遅延生成）"""
+        if self._batch_generator is None:
+            from services.batch_generator import BatchGenerator
+            self._batch_generator = BatchGenerator()
+        return self._batch_generator
     
     def create_preset(self, name: str, fields: list, pattern: str, defaults: dict = None):
         """プリセット作成"""
@@ -56,8 +86,9 @@ class TadakanCLI:
         for preset in presets:
             print(f"  - {preset.name}: {preset.naming_pattern}")
     
-    def generate_batch(self, preset_name: str, input_values: dict, target_files: list, output_dir: str):
-        """バッチファイル生成"""
+    def generate_batch(self, preset_name: str, input_values: dict, target_files: list, output_dir: str,
+                       extensions: list = None):
+        """バッチファイル生成（extensions 指定時はその拡張子のファイルだけを対象にする）"""
         try:
             # プリセット取得
             preset = self.preset_manager.get_preset_by_name(preset_name)
@@ -65,23 +96,7 @@ class TadakanCLI:
                 print(f"プリセット '{preset_name}' が見つかりません")
                 return None
             
-            # ファイル処理
-            file_items = []
-            for file_path in target_files:
-                if os.path.exists(file_path):
-                    file_item = FileItem.from_path(file_path)
-                    # 新しいファイル名生成
-                    try:
-                        new_name = self.file_renamer.generate_filename(
-                            preset, input_values, file_item.get_original_extension()
-                        )
-                        file_item.new_name = new_name
-                        file_items.append(file_item)
-                    except Exception as e:
-                        print(f"ファイル {file_path} の処理エラー: {e}")
-                else:
-                    print(f"ファイルが見つかりません: {file_path}")
-            
+            file_items = self._create_file_items(preset, input_values, target_files, extensions)
             if not file_items:
                 print("処理可能なファイルが見つかりません")
                 return None
@@ -90,7 +105,7 @@ class TadakanCLI:
             batch_content = self.batch_generator.generate_rename_batch(file_items, output_dir)
             batch_path = self.batch_generator.save_batch_file(
                 batch_content, 
-                "batch_files", 
+                self.batch_directory, 
                 f"{preset_name}_rename.bat"
             )
             
@@ -102,6 +117,185 @@ class TadakanCLI:
             print(f"バッチ生成エラー: {e}")
             return None
     
+    def rename_files(self, preset_name: str, input_values: dict, target_files: list, workspace_path: str,
+                     extensions: list = None):
+        """バッチファイルを作らずにその場でリネーム（ワークスペースのアンドゥ用ジャーナルに記録）"""
+        from services.batch_manager import BatchManager
+        
+        try:
+            preset = self.preset_manager.get_preset_by_name(preset_name)
+            if not preset:
+                print(f"プリセット '{preset_name}' が見つかりません")
+                return None
+            
+            file_items = self._create_file_items(preset, input_values, target_files, extensions)
+            if not file_items:
+                print("処理可能なファイルが見つかりません")
+                return None
+            
+            manager = BatchManager(workspace_path)
+            try:
+                result = manager.rename_files(file_items, label=preset_name)
+            finally:
+                manager.close()
+            
+            for error in result.errors:
+                print(f"リネームエラー: {error}")
+            print(f"リネームしたファイル数: {result.renamed_count}")
+            if result.execution_id:
+                print(f"アンドゥ: {self._undo_command(workspace_path, result.execution_id)}")
+            return result
+        
+        except Exception as e:
+            print(f"リネームエラー: {e}")
+            return None
+    
+    @staticmethod
+    def _undo_command(workspace_path: str, execution_id: str) -> str:
+        """アンドゥのコマンド例（デフォルト以外のワークスペースは --workspace を付ける）"""
+        from services.workspace_manager import WorkspaceManager
+        
+        command = f"python src/main.py --undo {execution_id}"
+        default_path = WorkspaceManager().get_default_workspace_path()
+        if os.path.normcase(os.path.abspath(workspace_path)) != os.path.normcase(os.path.abspath(default_path)):
+            command += f' --workspace "{workspace_path}"'
+        return command
+    
+    def undo_rename(self, workspace_path: str, execution_id: str = None):
+        """リネームをアンドゥ（省略時はアンドゥしていない最新の実行）"""
+        from services.batch_manager import BatchManager
+        
+        manager = BatchManager(workspace_path)
+        try:
+            result = manager.undo_rename(execution_id)
+        except Exception as e:
+            print(f"アンドゥエラー: {e}")
+            return None
+        finally:
+            manager.close()
+        
+        if result.execution_id is None:
+            print("アンドゥできるリネームがありません")
+            return result
+        for error in result.errors:
+            print(f"アンドゥエラー: {error}")
+        print(f"元に戻したファイル数: {result.renamed_count} (実行ID: {result.execution_id})")
+        return result
+    
+    def _create_file_items(self, preset, input_values: dict, target_files: list, extensions: list = None) -> list:
+        """対象ファイル（extensions 指定時はその拡張子のみ）の新しいファイル名付き FileItem を作成"""
+        if extensions:
+            from utils.extension_matcher import ExtensionMatcher
+            matched_files = ExtensionMatcher(extensions).filter(target_files)
+            if len(matched_files) < len(target_files):
+                print(f"対象外の拡張子のファイルを除外しました: {len(target_files) - len(matched_files)}個")
+            target_files = matched_files
+        
+        file_items = []
+        for file_path in target_files:
+            file_item = self._create_file_item(preset, input_values, file_path)
+            if file_item:
+                file_items.append(file_item)
+        return file_items
+    
+    def _create_file_item(self, preset, input_values: dict, file_path: str):
+        """ファイルパスから新しいファイル名付きのFileItemを作成（失敗時はNone）"""
+        from models.file_item import FileItem
+        
+        if not os.path.exists(file_path):
+            print(f"ファイルが見つかりません: {file_path}")
+            return None
+        
+        file_item = FileItem.from_path(file_path)
+        # 新しいファイル名生成
+        try:
+            new_name = self.file_renamer.generate_filename(
+                preset, input_values, file_item.get_original_extension()
+            )
+            file_item.new_name = new_name
+            return file_item
+        except Exception as e:
+            print(f"ファイル {file_path} の処理エラー: {e}")
+            return None
+    
+    def generate_batch_from_manifest(self, preset_name: str, input_values: dict, manifest_path: str,
+                                     output_dir: str, batch_size: int = DEFAULT_MANIFEST_BATCH_SIZE,
+                                     extensions: list = None):
+        """マニフェスト（ファイル一覧）からバッチファイルを生成
+        
+        マニフェストは1行ずつ読み込み、batch_size件ごとにバッチファイルを出力する。
+        manifest_path に "-" を指定すると標準入力から読み込む。
+        extensions 指定時はその拡張子のファイルだけを対象にする。
+        解析できない行は行番号を表示して読み飛ばす。途中でエラーになった場合も、
+        それまでに出力したバッチファイルのパスを返す。
+        """
+        from utils.manifest import iter_manifest, iter_chunks
+        
+        start_time = time.perf_counter()
+        batch_paths = []
+        skipped_lines = []
+        
+        def skip_line(error):
+            skipped_lines.append(error.line_number)
+            print(f"マニフェストの行を読み飛ばしました: {error}")
+        
+        try:
+            # プリセットは1回だけ読み込む
+            preset = self.preset_manager.get_preset_by_name(preset_name)
+            if not preset:
+                print(f"プリセット '{preset_name}' が見つかりません")
+                return []
+            
+            if manifest_path == '-':
+                stream = sys.stdin
+            else:
+                stream = open(manifest_path, 'r', encoding='utf-8')
+            
+            total_files = 0
+            try:
+                entries = iter_manifest(stream, on_error=skip_line)
+                if extensions:
+                    from utils.extension_matcher import ExtensionMatcher
+                    matcher = ExtensionMatcher(extensions)
+                    entries = (entry for entry in entries if matcher.matches(entry.path))
+                file_items = (
+                    self._create_file_item(preset, dict(input_values, **entry.values), entry.path)
+                    for entry in entries
+                )
+                valid_items = (item for item in file_items if item)
+                
+                for index, chunk in enumerate(iter_chunks(valid_items, batch_size), 1):
+                    batch_content = self.batch_generator.generate_rename_batch(chunk, output_dir)
+                    batch_path = self.batch_generator.save_batch_file(
+                        batch_content,
+                        self.batch_directory,
+                        f"{preset_name}_rename_{index:03d}.bat"
+                    )
+                    batch_paths.append(batch_path)
+                    total_files += len(chunk)
+                    print(f"バッチファイルを生成しました: {batch_path} ({len(chunk)}ファイル)")
+            finally:
+                if stream is not sys.stdin:
+                    stream.close()
+            
+            if not batch_paths:
+                print("処理可能なファイルが見つかりません")
+                return []
+            
+            elapsed = time.perf_counter() - start_time
+            throughput = total_files / elapsed if elapsed > 0 else float(total_files)
+            print(f"処理ファイル数: {total_files} (バッチファイル {len(batch_paths)}個)")
+            if skipped_lines:
+                print(f"読み飛ばした行: {len(skipped_lines)}行")
+            print(f"処理時間: {elapsed:.2f}秒 ({throughput:.0f} files/秒)")
+            return batch_paths
+        
+        except Exception as e:
+            print(f"バッチ生成エラー: {e}")
+            if batch_paths:
+                print(f"エラーまでに生成したバッチファイル: {len(batch_paths)}個")
+            return batch_paths
+    
     def demo_usage(self):
         """デモ実行"""
         print("\n=== Tadakan デモ実行 ===")
@@ -126,6 +320,79 @@ class TadakanCLI:
         print(f"   python src/main.py --preset デモ用 --values タイトル=テスト --files file1.jpg file2.png")
 
 
+def _build_daemon_request(args, cli: TadakanCLI):
+    """引数からデーモンへの転送リクエストを作成（転送対象外ならNone）
+    
+    デーモンは別のカレントディレクトリで動作するため、パスはすべて絶対パスにする。
+    """
+    from utils.manifest import parse_field_values
+    from utils.extension_matcher import parse_extensions
+    
+    if args.list:
+        return "list", {}
+    
+    # リネームの実行・アンドゥはローカルで行う
+    if not args.preset or args.execute or args.undo:
+        return None
+    
+    payload = {
+        "preset": args.preset,
+        "values": parse_field_values(args.values) if args.values else {},
+        "output": os.path.abspath(args.output),
+        "batch_directory": os.path.abspath(cli.batch_directory)
+    }
+    if args.extensions:
+        payload["extensions"] = parse_extensions(args.extensions)
+    # 標準入力のマニフェストは転送せずローカルで処理する
+    if args.manifest and args.manifest != '-':
+        payload["manifest"] = os.path.abspath(args.manifest)
+        payload["batch_size"] = args.batch_size
+        return "generate", payload
+    if args.values and args.files and not args.manifest:
+        payload["files"] = [os.path.abspath(path) for path in args.files]
+        return "generate", payload
+    
+    return None
+
+
+def _forward_to_daemon(args, cli: TadakanCLI) -> bool:
+    """起動中のデーモンに処理を転送（転送した場合True）
+    
+    デーモンに届かなかった場合だけ False を返してローカルで実行する。
+    送信後に失敗・タイムアウトした場合はデーモンが処理している可能性があるため、
+    エラーを表示して True を返す（同じ処理を二重に実行しない）。
+    """
+    from daemon import get_state_file_path, forward, DaemonRequestError
+    
+    # 状態ファイルがなければ転送を試みない
+    if not os.path.exists(get_state_file_path()):
+        return False
+    
+    request = _build_daemon_request(args, cli)
+    if request is None:
+        return False
+    
+    command, payload = request
+    try:
+        response = forward(command, payload, presets_directory=cli.presets_directory)
+    except DaemonRequestError as e:
+        print(f"{e}", file=sys.stderr)
+        print("ローカルでは再実行しません（デーモンを使わずに実行する場合は --no-daemon を指定）", file=sys.stderr)
+        return True
+    if response is None:
+        return False
+    
+    print(response.get("output", ""), end="")
+    return True
+
+
+def configure_text_normalizer(settings=None):
+    """共通の正規化（ファイル名の生成・インデックス・検索）を設定の unicode_normalization に合わせる"""
+    from src.config.settings import get_settings
+    from src.utils.text_normalizer import TextNormalizer, set_default_normalizer
+    set_default_normalizer(TextNormalizer.from_settings(settings or get_settings()))
+
+
 def main():
     """メイン関数"""
     parser = argparse.ArgumentParser(
@@ -141,6 +408,17 @@ def main():
 
   # バッチファイル生成
   python src/main.py --preset "プリセット名" --values "フィールド1=値1,フィールド2=値2" --files file1.jpg file2.png --output ./renamed/
+
+  # マニフェスト（1行1パス）からバッチファイル生成（- で標準入力）
+  python src/main.py --preset "プリセット名" --values "フィールド1=値1" --manifest files.txt --batch-size 10000
+  dir /b /s *.png | python src/main.py --preset "プリセット名" --manifest -
+
+  # バッチファイルを作らずにその場でリネームし、アンドゥする
+  python src/main.py --preset "プリセット名" --values "フィールド1=値1" --files file1.jpg --execute
+  python src/main.py --undo
+
+  # 常駐デーモンを起動（以降の --list / バッチ生成はデーモンに転送される）
+  python src/main.py --serve
         """
     )
     
@@ -149,32 +427,87 @@ def main():
     parser.add_argument('--preset', type=str, help='使用するプリセット名')
     parser.add_argument('--values', type=str, help='フィールド値 (例: "カテゴリ=写真,タイトル=テスト")')
     parser.add_argument('--files', nargs='+', help='対象ファイルリスト')
+    parser.add_argument('--manifest', type=str,
+                        help='対象ファイル一覧のマニフェスト (1行1パス, タブ区切りで個別の値, - で標準入力)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_MANIFEST_BATCH_SIZE,
+                        help=f'マニフェストモードの1バッチあたりの最大ファイル数 (0で無制限, デフォルト: {DEFAULT_MANIFEST_BATCH_SIZE})')
+    parser.add_argument('--extensions', type=str,
+                        help='対象拡張子 (カンマ区切り, 例: ".png,.jpg,.tar.gz")。指定した拡張子のファイルだけを処理')
     parser.add_argument('--output', type=str, default='./output', help='出力ディレクトリ (デフォルト: ./output)')
+    parser.add_argument('--execute', action='store_true',
+                        help='バッチファイルを作らずにその場でリネーム (ワークスペースのアンドゥ用ジャーナルに記録)')
+    parser.add_argument('--undo', nargs='?', const='latest', metavar='EXECUTION_ID',
+                        help='リネームをアンドゥ (実行ID省略時はアンドゥしていない最新の実行)')
+    parser.add_argument('--serve', action='store_true', help='常駐デーモンを起動 (localhost HTTP)')
+    parser.add_argument('--port', type=int, default=0, help='デーモンの待ち受けポート (デフォルト: 自動)')
+    parser.add_argument('--workspace', type=str, help='デーモン・リネームの実行が使用するワークスペースのパス')
+    parser.add_argument('--no-daemon', action='store_true', help='起動中のデーモンに転送せずに実行')
     
     args = parser.parse_args()
     
     cli = TadakanCLI()
     
+    def resolve_workspace() -> str:
+        if args.workspace:
+            return args.workspace
+        from services.workspace_manager import WorkspaceManager
+        return WorkspaceManager().get_default_workspace_path()
+    
+    # デーモン起動
+    if args.serve:
+        from daemon import serve
+        configure_text_normalizer()
+        serve(cli, resolve_workspace(), port=args.port)
+        return
+    
+    # 起動中のデーモンがあれば転送
+    if not args.no_daemon and _forward_to_daemon(args, cli):
+        return
+    
     # プリセット一覧表示
     if args.list:
         cli.list_presets()
         return
     
+    # 以降はファイル名の生成・検索を行うため、設定の正規化を反映する
+    configure_text_normalizer()
+    
     # デモ実行
     if args.demo:
         cli.demo_usage()
         return
     
+    # リネームのアンドゥ
+    if args.undo:
+        cli.undo_rename(resolve_workspace(), None if args.undo == 'latest' else args.undo)
+        return
+    
+    # その場でリネーム
+    if args.preset and args.values and args.files and args.execute:
+        from utils.manifest import parse_field_values
+        from utils.extension_matcher import parse_extensions
+        cli.rename_files(args.preset, parse_field_values(args.values), args.files, resolve_workspace(),
+                         parse_extensions(args.extensions) if args.extensions else None)
+        return
+    
+    # マニフェストからのバッチ生成
+    if args.preset and args.manifest:
+        from utils.manifest import parse_field_values
+        from utils.extension_matcher import parse_extensions
+        input_values = parse_field_values(args.values) if args.values else {}
+        cli.generate_batch_from_manifest(args.preset, input_values, args.manifest,
+                                         args.output, args.batch_size,
+                                         parse_extensions(args.extensions) if args.extensions else None)
+        return
+    
     # バッチ生成
     if args.preset and args.values and args.files:
-        # 値の解析
-        input_values = {}
-        for pair in args.values.split(','):
-            if '=' in pair:
-                key, value = pair.split('=', 1)
-                input_values[key.strip()] = value.strip()
-        
-        cli.generate_batch(args.preset, input_values, args.files, args.output)
+        from utils.manifest import parse_field_values
+        from utils.extension_matcher import parse_extensions
+        input_values = parse_field_values(args.values)
+        
+        cli.generate_batch(args.preset, input_values, args.files, args.output,
+                           parse_extensions(args.extensions) if args.extensions else None)
         return
     
     # ヘルプ表示
@@ -8,25 +8,48 @@ import os
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+from src.utils.extension_matcher import ExtensionMatcher
+from src.utils.text_normalizer import normalize_text
+
 
 class BatchFile:
     """バッチファイルオブジェクト"""
     
     def __init__(self, preset_id: str, preset_name: str, field_values: Dict[str, str], 
-                 target_extensions: Optional[List[str]] = None, workspace_path: Optional[str] = None):
+                 target_extensions: Optional[List[str]] = None, workspace_path: Optional[str] = None,
+                 sequence_store=None):
         self.preset_id = preset_id
         self.preset_name = preset_name
         self.field_values = field_values
         self.target_extensions = target_extensions or []
         self.workspace_path = workspace_path or ""
         self.current_sequence = 0
+        # 連番ストア（SequenceStore）。指定時は連番を実行をまたいで継続する
+        self.sequence_store = sequence_store
         self.created_at = datetime.now()
+        self._extension_matcher: Optional[ExtensionMatcher] = None
+        self._extension_matcher_key: Optional[tuple] = None
+    
+    @staticmethod
+    def field_values_from_filename(filename: str) -> Optional[Dict[str, str]]:
+        """バッチファイル名（プリセットID_陣営_キャラ名.bat）から項目値を推定（形式が違う場合は None）
+
+        項目値に _ が含まれる場合、陣営とキャラ名の境目は決められないため、2つ目以降の _ は
+        キャラ名に含める（get_batch_filename で元のファイル名・移動先フォルダ名に戻る）。
+        """
+        name = os.path.basename(filename)
+        if name.lower().endswith('.bat'):
+            name = name[:-4]
+        parts = name.split('_', 2)
+        if len(parts) < 3:
+            return None
+        return {"陣営": parts[1], "キャラ名": parts[2]}
     
     def get_batch_filename(self) -> str:
-        """バッチファイル名を生成（プリセットID_陣営_キャラ名.bat形式）"""
+        """バッチファイル名を生成（プリセットID_陣営_キャラ名.bat形式、項目値は正規化する）"""
         faction = self.field_values.get("陣営", "")
         character = self.field_values.get("キャラ名", "")
-        return f"{self.preset_id}_{faction}_{character}.bat"
+        return normalize_text(f"{self.preset_id}_{faction}_{character}.bat")
     
     def generate_batch_content(self) -> str:
         """バッチファイルの内容を生成"""
@@ -60,18 +83,31 @@ class BatchFile:
     
     def get_next_sequence(self) -> str:
         """次の連番を取得（A00001形式）"""
+        if self.sequence_store is not None:
+            sequence = self.sequence_store.next_sequence(self.get_batch_filename())
+            self.current_sequence = int(sequence[1:])
+            return sequence
         self.current_sequence += 1
         return f"A{self.current_sequence:05d}"
     
+    def reserve_sequences(self, count: int) -> List[str]:
+        """連番を count 件まとめて取得（大量処理用）"""
+        if self.sequence_store is not None:
+            sequences = self.sequence_store.reserve_sequences(self.get_batch_filename(), count)
+            if sequences:
+                self.current_sequence = int(sequences[-1][1:])
+            return sequences
+        return [self.get_next_sequence() for _ in range(count)]
+    
+    @property
+    def extension_matcher(self) -> ExtensionMatcher:
+        """対象拡張子のマッチャー（target_extensions が変わった場合は作り直す）"""
+        key = tuple(self.target_extensions)
+        if self._extension_matcher_key != key:
+            self._extension_matcher = ExtensionMatcher(key)
+            self._extension_matcher_key = key
+        return self._extension_matcher
+    
     def filter_target_files(self, file_list: List[str]) -> List[str]:
-        """対象拡張子でファイルをフィルタリング"""
-        if "*" in self.target_extensions:
-            return file_list
-        
-        filtered_files = []
-        for file_path in file_list:
-            file_ext = os.path.splitext(file_path)[1].lower()
-            if file_ext in self.target_extensions:
-                filtered_files.append(file_path)
-        
-        return filtered_files
\ No newline at end of file
+        """対象拡張子でファイルをフィルタリング（大文字小文字・ドット有無を区別しない）"""
+        return self.extension_matcher.filter(file_list)
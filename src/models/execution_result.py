@@ -5,7 +5,7 @@
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict, Any
 
 
 class ExecutionResult:
@@ -14,7 +14,8 @@ class ExecutionResult:
     def __init__(self, batch_filename: str, executed_at: Optional[str] = None,
                  processed_files_count: int = 0, success_count: int = 0, 
                  error_count: int = 0, processing_time_seconds: float = 0.0,
-                 started_at: Optional[str] = None, completed_at: Optional[str] = None):
+                 started_at: Optional[str] = None, completed_at: Optional[str] = None,
+                 error_messages: Optional[List[str]] = None):
         self.batch_filename = batch_filename
         self.executed_at = executed_at or datetime.now().isoformat()
         self.processed_files_count = processed_files_count
@@ -23,6 +24,7 @@ class ExecutionResult:
         self.processing_time_seconds = processing_time_seconds
         self.started_at = started_at
         self.completed_at = completed_at
+        self.error_messages = error_messages or []
     
     def get_success_rate(self) -> float:
         """成功率を計算"""
@@ -40,4 +42,33 @@ class ExecutionResult:
             end = datetime.fromisoformat(self.completed_at)
             return (end - start).total_seconds()
         except:
-            return self.processing_time_seconds
\ No newline at end of file
+            return self.processing_time_seconds
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """ExecutionResultをDict形式に変換"""
+        return {
+            "batch_filename": self.batch_filename,
+            "executed_at": self.executed_at,
+            "processed_files_count": self.processed_files_count,
+            "success_count": self.success_count,
+            "error_count": self.error_count,
+            "processing_time_seconds": self.processing_time_seconds,
+            "started_at": self.started_at,
+            "completed_at": self.completed_at,
+            "error_messages": self.error_messages
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ExecutionResult':
+        """Dict形式からExecutionResultを作成"""
+        return cls(
+            batch_filename=data["batch_filename"],
+            executed_at=data.get("executed_at"),
+            processed_files_count=data.get("processed_files_count", 0),
+            success_count=data.get("success_count", 0),
+            error_count=data.get("error_count", 0),
+            processing_time_seconds=data.get("processing_time_seconds", 0.0),
+            started_at=data.get("started_at"),
+            completed_at=data.get("completed_at"),
+            error_messages=data.get("error_messages")
+        )
\ No newline at end of file
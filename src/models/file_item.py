@@ -9,13 +9,21 @@ class FileItem:
         original_name: str,
         new_name: Optional[str] = None,
         file_size: Optional[int] = None,
-        file_type: Optional[str] = None
+        file_type: Optional[str] = None,
+        duplicate_of: Optional[str] = None
     ):
         self.original_path = original_path
         self.original_name = original_name
         self.new_name = new_name
         self.file_size = file_size
         self.file_type = file_type
+        # 内容が同じ既存ファイル（または先に指定されたファイル）のパス
+        self.duplicate_of = duplicate_of
+    
+    @property
+    def is_duplicate(self) -> bool:
+        """内容が同じファイルが既にあるか"""
+        return self.duplicate_of is not None
     
     def get_original_extension(self, normalize: bool = False) -> str:
         """元ファイルの拡張子を取得"""
@@ -36,7 +44,8 @@ class FileItem:
             "original_name": self.original_name,
             "new_name": self.new_name,
             "file_size": self.file_size,
-            "file_type": self.file_type
+            "file_type": self.file_type,
+            "duplicate_of": self.duplicate_of
         }
     
     @classmethod
@@ -47,7 +56,8 @@ class FileItem:
             original_name=data["original_name"],
             new_name=data.get("new_name"),
             file_size=data.get("file_size"),
-            file_type=data.get("file_type")
+            file_type=data.get("file_type"),
+            duplicate_of=data.get("duplicate_of")
         )
     
     def validate_file_exists(self) -> bool:
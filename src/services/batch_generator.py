@@ -2,11 +2,16 @@ import os
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from models.file_item import FileItem
+from src.utils.batch_writer import EncodingPlan, chcp_line, write_batch_file
 
 
 class BatchGenerator:
     def __init__(self):
         self.encoding = 'shift_jis'  # Windows batファイル用
+        # 表せない文字がある場合は CP932 → UTF-8 に切り替えて保存する（False の場合はエラー）
+        self.allow_utf8_fallback = True
+        # 最後に保存したバッチファイルのエンコーディングの判定結果
+        self.last_encoding_plan: Optional[EncodingPlan] = None
     
     def generate_rename_batch(
         self,
@@ -24,7 +29,7 @@ class BatchGenerator:
         
         lines = []
         lines.append("@echo off")
-        lines.append("chcp 65001 > nul")  # UTF-8コードページ設定
+        lines.append(chcp_line(self.encoding))  # 保存するエンコーディングのコードページ
         
         # ログ開始
         if log_file:
@@ -84,7 +89,7 @@ class BatchGenerator:
         """フィルタ用バッチファイルを生成"""
         lines = []
         lines.append("@echo off")
-        lines.append("chcp 65001 > nul")
+        lines.append(chcp_line(self.encoding))
         
         # 表示用ディレクトリ作成
         lines.append(f'if not exist "{temp_directory}" mkdir "{temp_directory}"')
@@ -119,7 +124,7 @@ class BatchGenerator:
         """フィルタ解除（復元）用バッチファイルを生成"""
         lines = []
         lines.append("@echo off")
-        lines.append("chcp 65001 > nul")
+        lines.append(chcp_line(self.encoding))
         
         # 各ファイルを元のディレクトリに戻す
         for filename in moved_files:
@@ -133,19 +138,30 @@ class BatchGenerator:
         return "\n".join(lines)
     
     def generate_undo_batch(self, undo_operations: List[Dict[str, str]]) -> str:
-        """アンドゥ用バッチファイルを生成"""
+        """アンドゥ用バッチファイルを生成（フォルダごとに1回だけ cd する）
+        
+        current_name がサブフォルダのファイル（ドロップ・バッチ実行で移動したファイル）の場合は move で戻す。
+        """
         lines = []
         lines.append("@echo off")
-        lines.append("chcp 65001 > nul")
+        lines.append(chcp_line(self.encoding))
         
+        # フォルダ内の順序を保ったままフォルダ単位にまとめる
+        operations_by_directory: Dict[str, List[Dict[str, str]]] = {}
         for operation in undo_operations:
-            current_name = self._escape_filename(operation['current_name'])
-            original_name = self._escape_filename(operation['original_name'])
-            directory = operation.get('directory', '.')
-            
+            operations_by_directory.setdefault(operation.get('directory', '.'), []).append(operation)
+        
+        for directory, operations in operations_by_directory.items():
             # カレントディレクトリを変更
             lines.append(f'cd /d "{directory}"')
-            lines.append(f'ren "{current_name}" "{original_name}"')
+            for operation in operations:
+                current_name = self._escape_filename(operation['current_name'])
+                original_name = self._escape_filename(operation['original_name'])
+                if '/' in current_name or '\\' in current_name:
+                    current_name = current_name.replace('/', '\\')
+                    lines.append(f'move "{current_name}" "{original_name}"')
+                else:
+                    lines.append(f'ren "{current_name}" "{original_name}"')
         
         lines.append("")
         lines.append("echo アンドゥが完了しました。")
@@ -159,7 +175,11 @@ class BatchGenerator:
         output_directory: str,
         filename: str
     ) -> str:
-        """バッチファイルをディスクに保存"""
+        """バッチファイルをディスクに保存
+        
+        Shift_JIS で表せないファイル名を含む場合は CP932・UTF-8 に切り替え、
+        chcp の行もそのコードページに書き換える（結果は last_encoding_plan）。
+        """
         if not filename.endswith('.bat'):
             filename += '.bat'
         
@@ -168,8 +188,9 @@ class BatchGenerator:
         # ディレクトリが存在しない場合は作成
         os.makedirs(output_directory, exist_ok=True)
         
-        with open(output_path, 'w', encoding=self.encoding) as f:
-            f.write(batch_content)
+        self.last_encoding_plan = write_batch_file(
+            output_path, batch_content, self.encoding, allow_utf8=self.allow_utf8_fallback
+        )
         
         return output_path
     
@@ -6,12 +6,23 @@
 
 import os
 import json
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from src.models.batch_file import BatchFile
 from src.models.execution_result import ExecutionResult
 from src.models.preset import Preset
+from src.services.batch_regenerator import BatchRegenerator, RegenerationProgress, RegenerationResult
+from src.services.batch_scheduler import BatchJob, BatchScheduler, BatchScheduleResult
+from src.services.drop_pipeline import DropPipeline, DropIngestionResult
+from src.services.duplicate_detector import DuplicateDetector
+from src.services.execution_history import ExecutionHistoryStore
+from src.services.file_index import FileIndex
+from src.services.rename_engine import RenameEngine, RenameExecutionResult
+from src.services.sequence_store import SequenceStore
+from src.utils.atomic_write import AtomicWriteGroup
+from src.utils.batch_writer import read_batch_file, write_batch_file
+from src.utils.text_normalizer import normalize_text, search_key
 
 
 class BatchManager:
@@ -20,7 +31,73 @@ class BatchManager:
     def __init__(self, workspace_path: Optional[str] = None):
         self.workspace_path = workspace_path or ""
         self._batch_files = []
-        self._execution_history = []
+        self._history_store: Optional[ExecutionHistoryStore] = None
+        self._sequence_store: Optional[SequenceStore] = None
+        self._regenerator: Optional[BatchRegenerator] = None
+        self._file_index: Optional[FileIndex] = None
+        self._rename_engine: Optional[RenameEngine] = None
+        self._duplicate_detector: Optional[DuplicateDetector] = None
+    
+    @property
+    def history_store(self) -> ExecutionHistoryStore:
+        """実行履歴ストア（初回アクセス時にワークスペース内のDBを開く）"""
+        if self._history_store is None:
+            self._history_store = ExecutionHistoryStore.for_workspace(self.workspace_path)
+        return self._history_store
+    
+    @property
+    def sequence_store(self) -> SequenceStore:
+        """連番ストア（初回アクセス時にワークスペース内のDBを開く）"""
+        if self._sequence_store is None:
+            self._sequence_store = SequenceStore.for_workspace(self.workspace_path)
+        return self._sequence_store
+    
+    @property
+    def regenerator(self) -> BatchRegenerator:
+        """バッチファイルの一括再生成（初回アクセス時にワークスペース内のプリセットID索引を開く）"""
+        if self._regenerator is None:
+            self._regenerator = BatchRegenerator.for_workspace(self.workspace_path)
+        return self._regenerator
+    
+    @property
+    def file_index(self) -> FileIndex:
+        """ファイル名項目インデックス（初回アクセス時にワークスペース内のDBを開く）"""
+        if self._file_index is None:
+            self._file_index = FileIndex.for_workspace(self.workspace_path)
+        return self._file_index
+    
+    @property
+    def rename_engine(self) -> RenameEngine:
+        """リネームエンジン（ワークスペースのアンドゥ用ジャーナルに記録し、インデックスに反映する）"""
+        if self._rename_engine is None:
+            self._rename_engine = RenameEngine.for_workspace(self.workspace_path, index=self.file_index)
+        return self._rename_engine
+    
+    @property
+    def duplicate_detector(self) -> DuplicateDetector:
+        """重複ファイル検出（初回アクセス時にワークスペース内のダイジェストキャッシュを開く）"""
+        if self._duplicate_detector is None:
+            self._duplicate_detector = DuplicateDetector.for_workspace(self.workspace_path)
+        return self._duplicate_detector
+    
+    def close(self):
+        """実行履歴ストア・連番ストア・プリセットID索引・ファイル名項目インデックス・ダイジェストキャッシュを閉じる"""
+        if self._history_store is not None:
+            self._history_store.close()
+            self._history_store = None
+        if self._sequence_store is not None:
+            self._sequence_store.close()
+            self._sequence_store = None
+        if self._regenerator is not None:
+            self._regenerator.close()
+            self._regenerator = None
+        if self._file_index is not None:
+            self._file_index.close()
+            self._file_index = None
+            self._rename_engine = None
+        if self._duplicate_detector is not None:
+            self._duplicate_detector.close()
+            self._duplicate_detector = None
     
     def create_batch_file(self, preset: Preset, values: Dict[str, str]) -> BatchFile:
         """プリセットと値からバッチファイルを作成"""
@@ -29,12 +106,13 @@ class BatchManager:
             preset_name=preset.name,
             field_values=values,
             target_extensions=preset.target_extensions,
-            workspace_path=self.workspace_path
+            workspace_path=self.workspace_path,
+            sequence_store=self.sequence_store
         )
         return batch_file
     
-    def save_batch_file(self, batch_file: BatchFile) -> str:
-        """バッチファイルをワークスペースに保存"""
+    def save_batch_file(self, batch_file: BatchFile, group: Optional[AtomicWriteGroup] = None) -> str:
+        """バッチファイルをワークスペースに保存（group を指定した場合は group のコミット時に置き換える）"""
         # rename_batchesフォルダに保存
         rename_batches_dir = os.path.join(self.workspace_path, "rename_batches")
         os.makedirs(rename_batches_dir, exist_ok=True)
@@ -42,13 +120,43 @@ class BatchManager:
         filename = batch_file.get_batch_filename()
         file_path = os.path.join(rename_batches_dir, filename)
         
-        # バッチファイル内容を書き込み
+        # バッチファイル内容をアトミックに書き込み（Shift_JIS で表せない文字がある場合は CP932・UTF-8）
         content = batch_file.generate_batch_content()
-        with open(file_path, 'w', encoding='shift_jis') as f:
-            f.write(content)
+        write_batch_file(file_path, content, group=group)
         
         return file_path
     
+    def save_batch_files(self, batch_files: Iterable[BatchFile]) -> List[str]:
+        """複数のバッチファイルをまとめて保存（fsync と置き換えは最後にまとめて行う）"""
+        with AtomicWriteGroup() as group:
+            return [self.save_batch_file(batch_file, group) for batch_file in batch_files]
+    
+    def regenerate_batch_files(self, preset: Preset,
+                               progress: Optional[RegenerationProgress] = None) -> RegenerationResult:
+        """プリセットから作成した保存済みバッチファイルを、プリセットの現在の内容で作り直す
+        
+        内容が変わらないファイルは書き込まない。
+        """
+        return self.regenerator.regenerate(preset, progress)
+    
+    def list_batch_index(self) -> List[Dict[str, Any]]:
+        """保存済みバッチファイルの一覧（ファイル名・更新日時のみ、内容は読まない。新しい順）"""
+        rename_batches_dir = os.path.join(self.workspace_path, "rename_batches")
+        if not os.path.isdir(rename_batches_dir):
+            return []
+        
+        entries_by_mtime = []
+        with os.scandir(rename_batches_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.bat') and entry.is_file():
+                    entries_by_mtime.append((entry.stat().st_mtime, entry.name, entry.path))
+        entries_by_mtime.sort(reverse=True)
+        
+        return [
+            {"filename": name, "path": path, "created_at": datetime.fromtimestamp(mtime).isoformat()}
+            for mtime, name, path in entries_by_mtime
+        ]
+    
     def load_batch_files(self) -> List[BatchFile]:
         """ワークスペースからバッチファイル一覧を読み込み"""
         batch_files = []
@@ -59,48 +167,80 @@ class BatchManager:
         
         for filename in os.listdir(rename_batches_dir):
             if filename.endswith('.bat'):
-                try:
-                    file_path = os.path.join(rename_batches_dir, filename)
-                    with open(file_path, 'r', encoding='shift_jis') as f:
-                        content = f.read()
-                    
-                    # プリセットIDを抽出
-                    preset_id = None
-                    for line in content.split('\n'):
-                        if line.startswith('REM Preset ID:'):
-                            preset_id = line.split(':', 1)[1].strip()
-                            break
-                    
-                    if preset_id:
-                        # ファイル名から値を推定
-                        parts = filename.replace('.bat', '').split('_')
-                        if len(parts) >= 3:
-                            field_values = {
-                                "陣営": parts[1] if len(parts) > 1 else "",
-                                "キャラ名": parts[2] if len(parts) > 2 else ""
-                            }
-                            
-                            batch_file = BatchFile(
-                                preset_id=preset_id,
-                                preset_name="",
-                                field_values=field_values
-                            )
-                            batch_files.append(batch_file)
-                except:
-                    continue
+                batch_file = self.load_batch_file(os.path.join(rename_batches_dir, filename))
+                if batch_file is not None:
+                    batch_files.append(batch_file)
         
         self._batch_files = batch_files
         return batch_files
     
+    def load_batch_file(self, file_path: str) -> Optional[BatchFile]:
+        """保存済みバッチファイルを1件読み込み（読めない・形式が違う場合は None）"""
+        try:
+            content = read_batch_file(file_path)
+            
+            # プリセットID・対象拡張子を抽出
+            preset_id = None
+            target_extensions = []
+            for line in content.split('\n'):
+                if line.startswith('REM Preset ID:'):
+                    preset_id = line.split(':', 1)[1].strip()
+                elif line.startswith('REM Target extensions:'):
+                    extensions = line.split(':', 1)[1]
+                    target_extensions = [e.strip() for e in extensions.split(',') if e.strip()]
+                    break
+            
+            if preset_id:
+                # ファイル名から値を推定
+                field_values = BatchFile.field_values_from_filename(file_path)
+                if field_values is not None:
+                    return BatchFile(
+                        preset_id=preset_id,
+                        preset_name="",
+                        field_values=field_values,
+                        target_extensions=target_extensions,
+                        workspace_path=self.workspace_path,
+                        sequence_store=self.sequence_store
+                    )
+        except:
+            pass
+        return None
+    
+    def ingest_dropped_files(self, batch_file: BatchFile, paths: Iterable[str], progress=None,
+                             cancel_check=None, record_history: bool = True,
+                             skip_duplicates: bool = True) -> DropIngestionResult:
+        """ドロップされたファイル・フォルダをバッチファイルの規則で移動・リネーム
+        
+        連番はワークスペースの連番ストアで採番する。移動はアンドゥ用ジャーナルに記録し
+        （undo_rename で元に戻せる）、ファイル名項目インデックスに反映する。結果は実行履歴に記録する。
+        skip_duplicates の場合、移動先フォルダの既存ファイル・先に取り込んだファイルと
+        内容が同じファイルは移動しない（duplicate_count に数える）。
+        """
+        pipeline = DropPipeline(batch_file, self.sequence_store, rename_engine=self.rename_engine,
+                                duplicate_detector=self.duplicate_detector if skip_duplicates else None)
+        result = pipeline.run(paths, progress, cancel_check)
+        if record_history and (result.moved_count or result.error_count):
+            self.record_execution_result(result.to_execution_result())
+        return result
+    
+    def rename_files(self, file_items, label: str = "") -> RenameExecutionResult:
+        """FileItem（original_path → new_name）をリネーム（アンドゥ用ジャーナルに記録）"""
+        return self.rename_engine.execute_file_items(file_items, label)
+    
+    def undo_rename(self, execution_id: Optional[str] = None) -> RenameExecutionResult:
+        """リネーム・移動をアンドゥ（省略時はアンドゥしていない最新の実行）"""
+        return self.rename_engine.undo(execution_id)
+    
     def search_batch_files(self, criteria: Dict[str, str]) -> List[BatchFile]:
-        """バッチファイルを検索"""
+        """バッチファイルを検索（全角・半角、NFC/NFD、大文字・小文字の違いは区別しない）"""
         results = []
+        criteria = {key: search_key(value) for key, value in criteria.items()}
         
         for batch_file in self._batch_files:
             matches = True
             for key, value in criteria.items():
                 if key in batch_file.field_values:
-                    if value.lower() not in batch_file.field_values[key].lower():
+                    if value not in search_key(batch_file.field_values[key]):
                         matches = False
                         break
                 else:
@@ -112,6 +252,14 @@ class BatchManager:
         
         return results
     
+    def find_batch_file(self, filename: str) -> Optional[BatchFile]:
+        """読み込み済みのバッチファイルをファイル名で取得（ファイル名は正規化して比較）"""
+        filename = normalize_text(filename)
+        for batch_file in self._batch_files:
+            if batch_file.get_batch_filename() == filename:
+                return batch_file
+        return None
+    
     def delete_batch_file(self, filename: str) -> bool:
         """バッチファイルを削除"""
         try:
@@ -124,48 +272,63 @@ class BatchManager:
             return False
     
     def execute_batch_with_files(self, batch_file: BatchFile, file_list: List[str]) -> ExecutionResult:
-        """ファイルリストでバッチを実行"""
-        start_time = datetime.now()
+        """ファイルリストでバッチを実行
         
-        # フィルタリング
+        対象拡張子のファイルを、ドロップ取り込みと同じ規則で各ファイルのフォルダ内の
+        バッチ名フォルダへ連番付きで移動する（アンドゥ用ジャーナルに記録）。
+        見つからないファイルはエラーとして数える。
+        バッチファイル（move）と同じく、内容が同じファイルも除外せずに移動する。
+        """
         target_files = batch_file.filter_target_files(file_list)
+        existing_files = []
+        missing_files = []
+        for path in target_files:
+            if os.path.isfile(path):
+                existing_files.append(path)
+            else:
+                missing_files.append(path)
         
-        # 実行結果を作成（実際の処理はシミュレート）
-        result = ExecutionResult(
-            batch_filename=batch_file.get_batch_filename(),
-            executed_at=start_time.isoformat(),
-            processed_files_count=len(target_files),
-            success_count=len(target_files),
-            error_count=0,
-            processing_time_seconds=1.0
-        )
-        
+        result = self.ingest_dropped_files(batch_file, existing_files, record_history=False,
+                                           skip_duplicates=False).to_execution_result()
+        result.processed_files_count += len(missing_files)
+        result.error_count += len(missing_files)
+        result.error_messages.extend(f"ファイルが見つかりません: {path}" for path in missing_files)
         return result
     
+    def execute_batch_jobs(self, jobs: List[Tuple[BatchFile, List[str]]], max_workers: Optional[int] = None,
+                           progress_callback=None, scheduler: Optional[BatchScheduler] = None,
+                           record_history: bool = True) -> BatchScheduleResult:
+        """複数の（バッチファイル, ファイルリスト）をプロセスプールで並列実行
+        
+        同じフォルダを対象にするジョブは同時に実行しない。実行結果は実行履歴に記録する。
+        キャンセルする場合は scheduler を渡して scheduler.cancel() を呼び出す。
+        """
+        scheduler = scheduler or BatchScheduler(max_workers, progress_callback)
+        schedule = scheduler.run(BatchJob(batch_file, file_list) for batch_file, file_list in jobs)
+        if record_history:
+            for result in schedule.completed_results:
+                self.record_execution_result(result)
+        return schedule
+    
     def record_execution_result(self, result: ExecutionResult):
         """実行結果を記録"""
-        self._execution_history.append(result)
+        self.history_store.record(result)
     
-    def get_execution_history(self, batch_filename: str) -> List[ExecutionResult]:
+    def get_execution_history(self, batch_filename: str, limit: Optional[int] = None) -> List[ExecutionResult]:
         """指定したバッチファイルの実行履歴を取得"""
-        return [r for r in self._execution_history if r.batch_filename == batch_filename]
+        return self.history_store.get_history(batch_filename, limit)
     
     def generate_execution_report(self, days: int = 30) -> Dict[str, Any]:
         """実行レポートを生成"""
-        report = {
-            "total_executions": len(self._execution_history),
-            "success_rate": 0.95,  # 仮の値
-            "most_used_batches": [],
-            "error_summary": {}
-        }
-        return report
+        return self.history_store.generate_report(days)
     
     def get_usage_statistics(self) -> Dict[str, Any]:
         """使用統計を取得"""
+        totals = self.history_store.get_totals()
         stats = {
             "total_batch_files": len(self._batch_files),
-            "total_executions": len(self._execution_history),
-            "average_files_per_execution": 5.0,  # 仮の値
-            "most_popular_presets": []
+            "total_executions": totals["total_executions"],
+            "average_files_per_execution": totals["average_files_per_execution"],
+            "most_popular_presets": totals["most_popular_presets"]
         }
         return stats
\ No newline at end of file
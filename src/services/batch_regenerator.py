@@ -0,0 +1,311 @@
+"""
+バッチファイルの一括再生成
+
+プリセットの対象拡張子などを変更すると、そのプリセットから作成した rename_batches/ の
+バッチファイルは古い内容のままになる。プリセットIDごとに保存済みのバッチファイルを探し、
+BatchFile.generate_batch_content で内容を作り直す。
+
+  - プリセットIDの索引（BatchPresetIndex）をワークスペースの SQLite に保存し、
+    サイズ・更新日時が変わったファイルだけ読み直す（初回以外は stat のみ）
+  - 内容のハッシュ（生成日時・chcp の行を除く）が保存済みのものと同じファイルは書き込まない
+  - 内容の生成と一時ファイルへの書き込みはスレッドプールで並列に行い、書き込み先の置き換えと
+    fsync は AtomicWriteGroup でまとめて行う（途中で失敗しても元のファイルが残る）
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.models.batch_file import BatchFile
+from src.models.preset import Preset
+from src.utils.atomic_write import AtomicCommitError, AtomicWriteGroup
+from src.utils.batch_writer import read_batch_file, write_batch_file
+
+BATCH_INDEX_FILENAME = ".tadakan_batch_index.sqlite3"
+
+RENAME_BATCHES_DIRNAME = "rename_batches"
+
+# 内容のハッシュに含めない行（生成日時は再生成のたびに変わり、chcp は保存時のエンコーディングで決まるため）
+_UNHASHED_PREFIXES = ("REM Generated:", "chcp ")
+_PRESET_ID_PREFIX = "REM Preset ID:"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batch_files (
+    filename TEXT PRIMARY KEY,
+    preset_id TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_batch_files_preset ON batch_files(preset_id, filename);
+"""
+
+
+def content_digest(content: str) -> str:
+    """バッチファイルの内容のハッシュ（生成日時・chcp の行を除く）"""
+    digest = hashlib.blake2b(digest_size=20)
+    for line in content.split("\n"):
+        if not line.startswith(_UNHASHED_PREFIXES):
+            digest.update(line.encode("utf-8"))
+            digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _preset_id_of(content: str) -> str:
+    for line in content.split("\n"):
+        if line.startswith(_PRESET_ID_PREFIX):
+            return line.split(":", 1)[1].strip()
+    return ""
+
+
+class BatchIndexEntry:
+    """索引の1件（バッチファイル名・プリセットID・サイズ・更新日時・内容のハッシュ）"""
+
+    def __init__(self, filename: str, preset_id: str, size: int, mtime_ns: int, digest: str):
+        self.filename = filename
+        self.preset_id = preset_id
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+
+    def to_row(self) -> Tuple[str, str, int, int, str]:
+        return (self.filename, self.preset_id, self.size, self.mtime_ns, self.digest)
+
+
+class BatchPresetIndex:
+    """rename_batches/ のバッチファイルのプリセットID索引"""
+
+    def __init__(self, batches_directory: str, db_path: str = ":memory:", max_workers: int = 8):
+        self.batches_directory = batches_directory
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_workspace(cls, workspace_path: str, max_workers: int = 8) -> 'BatchPresetIndex':
+        """ワークスペース用の索引を作成（ワークスペースが無い場合はメモリ上）"""
+        batches_directory = os.path.join(workspace_path, RENAME_BATCHES_DIRNAME)
+        if workspace_path and os.path.isdir(workspace_path):
+            return cls(batches_directory, os.path.join(workspace_path, BATCH_INDEX_FILENAME), max_workers)
+        return cls(batches_directory, max_workers=max_workers)
+
+    def _connect(self) -> sqlite3.Connection:
+        """初回アクセス時にデータベースを開く"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self):
+        """データベースを閉じる"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _read_entry(self, filename: str, size: int, mtime_ns: int) -> Optional[BatchIndexEntry]:
+        try:
+            content = read_batch_file(os.path.join(self.batches_directory, filename))
+        except (OSError, UnicodeDecodeError):
+            return None
+        return BatchIndexEntry(filename, _preset_id_of(content), size, mtime_ns, content_digest(content))
+
+    def refresh(self) -> Tuple[int, int]:
+        """フォルダの変更を反映し、(読み直した件数, 削除した件数) を返す"""
+        current: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.batches_directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.bat') and entry.is_file():
+                        st = entry.stat()
+                        current[entry.name] = (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+
+        with self._lock:
+            connection = self._connect()
+            indexed = {filename: (size, mtime_ns) for filename, size, mtime_ns in
+                       connection.execute("SELECT filename, size, mtime_ns FROM batch_files")}
+        changed = [(filename, signature) for filename, signature in current.items()
+                   if indexed.get(filename) != signature]
+        removed = [filename for filename in indexed if filename not in current]
+
+        read = lambda item: self._read_entry(item[0], *item[1])
+        if len(changed) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(changed))) as executor:
+                entries = list(executor.map(read, changed))
+        else:
+            entries = [read(item) for item in changed]
+        # 読めなかったファイルは索引から外す（次回の refresh で読み直す）
+        removed.extend(filename for (filename, _), entry in zip(changed, entries) if entry is None)
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany("DELETE FROM batch_files WHERE filename = ?",
+                                       [(filename,) for filename in removed])
+                connection.executemany("INSERT OR REPLACE INTO batch_files VALUES (?, ?, ?, ?, ?)",
+                                       [entry.to_row() for entry in entries if entry is not None])
+        return len(changed), len(removed)
+
+    def files_for_preset(self, preset_id: str) -> List[BatchIndexEntry]:
+        """プリセットIDのバッチファイル（ファイル名順）"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT filename, preset_id, size, mtime_ns, digest FROM batch_files "
+                "WHERE preset_id = ? ORDER BY filename", (preset_id,)
+            ).fetchall()
+        return [BatchIndexEntry(*row) for row in rows]
+
+    def update_many(self, entries: Iterable[BatchIndexEntry]):
+        """書き込んだファイルの索引を更新"""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO batch_files VALUES (?, ?, ?, ?, ?)",
+                                       [entry.to_row() for entry in entries])
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM batch_files").fetchone()[0]
+
+
+class RegenerationResult:
+    """一括再生成の結果（件数・時間）"""
+
+    def __init__(self, preset_id: str):
+        self.preset_id = preset_id
+        self.matched_count = 0
+        self.regenerated: List[str] = []
+        self.unchanged_count = 0
+        self.errors: Dict[str, str] = {}
+        self.index_refreshed_count = 0
+        self.elapsed_seconds = 0.0
+
+    @property
+    def regenerated_count(self) -> int:
+        return len(self.regenerated)
+
+    @property
+    def error_count(self) -> int:
+        return len(self.errors)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "preset_id": self.preset_id,
+            "matched_count": self.matched_count,
+            "regenerated_count": self.regenerated_count,
+            "unchanged_count": self.unchanged_count,
+            "error_count": self.error_count,
+            "errors": dict(self.errors),
+            "index_refreshed_count": self.index_refreshed_count,
+            "elapsed_seconds": self.elapsed_seconds,
+        }
+
+
+# 進捗コールバック: (完了件数, 全件数)
+RegenerationProgress = Callable[[int, int], None]
+
+
+class BatchRegenerator:
+    """プリセットのバッチファイルを一括で再生成する"""
+
+    def __init__(self, index: BatchPresetIndex, max_workers: int = 8, fsync: bool = True):
+        self.index = index
+        self.max_workers = max_workers
+        self.fsync = fsync
+
+    @classmethod
+    def for_workspace(cls, workspace_path: str, max_workers: int = 8) -> 'BatchRegenerator':
+        return cls(BatchPresetIndex.for_workspace(workspace_path, max_workers), max_workers)
+
+    def close(self):
+        self.index.close()
+
+    def _regenerate_one(self, preset: Preset, entry: BatchIndexEntry, group: AtomicWriteGroup
+                        ) -> Tuple[Optional[BatchIndexEntry], Optional[str]]:
+        """1件を再生成して group に書き込み、(新しい索引, エラー) を返す（内容が同じ場合は (None, None)）
+
+        新しい索引のサイズ・更新日時はコミット後に設定する。
+        """
+        # 内容のうち項目値で決まるのは移動先フォルダ名（= ファイル名から .bat を除いたもの）だけなので、
+        # ファイル名に戻せる項目値が得られない場合は書き直さずにエラーにする
+        field_values = None
+        if entry.filename.startswith(f"{preset.id}_"):
+            field_values = BatchFile.field_values_from_filename(entry.filename)
+        if field_values is None:
+            return None, "ファイル名からプリセットの項目値を取得できません"
+        batch_file = BatchFile(preset.id, preset.name, field_values, list(preset.target_extensions))
+        if batch_file.get_batch_filename() != entry.filename:
+            return None, "ファイル名から移動先フォルダ名を特定できません"
+        content = batch_file.generate_batch_content()
+        digest = content_digest(content)
+        if digest == entry.digest:
+            return None, None
+
+        path = os.path.join(self.index.batches_directory, entry.filename)
+        try:
+            write_batch_file(path, content, group=group)
+        except (OSError, ValueError) as e:
+            return None, str(e)
+        return BatchIndexEntry(entry.filename, preset.id, 0, 0, digest), None
+
+    def regenerate(self, preset: Preset, progress: Optional[RegenerationProgress] = None) -> RegenerationResult:
+        """プリセットIDが同じ保存済みのバッチファイルを、プリセットの現在の内容で作り直す"""
+        start = time.perf_counter()
+        result = RegenerationResult(preset.id)
+        result.index_refreshed_count = self.index.refresh()[0]
+        entries = self.index.files_for_preset(preset.id)
+        result.matched_count = len(entries)
+
+        # 書き込み先の置き換えと fsync は最後にまとめて行う（グループコミット）
+        group = AtomicWriteGroup(fsync=self.fsync, max_workers=self.max_workers)
+        regenerate = lambda entry: self._regenerate_one(preset, entry, group)
+        written: List[BatchIndexEntry] = []
+        try:
+            if len(entries) > 1 and self.max_workers > 1:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(entries))) as executor:
+                    outcomes = executor.map(regenerate, entries)
+                    self._collect(entries, outcomes, result, written, progress)
+            else:
+                self._collect(entries, map(regenerate, entries), result, written, progress)
+        except BaseException:
+            group.discard()
+            raise
+
+        try:
+            group.commit()
+        except AtomicCommitError as e:
+            failed = {os.path.basename(path): error for path, error in e.failed.items()}
+            result.errors.update(failed)
+            result.regenerated = [filename for filename in result.regenerated if filename not in failed]
+            written = [entry for entry in written if entry.filename not in failed]
+        for entry in written:
+            st = os.stat(os.path.join(self.index.batches_directory, entry.filename))
+            entry.size, entry.mtime_ns = st.st_size, st.st_mtime_ns
+        if written:
+            self.index.update_many(written)
+        result.elapsed_seconds = time.perf_counter() - start
+        return result
+
+    @staticmethod
+    def _collect(entries: List[BatchIndexEntry], outcomes, result: RegenerationResult,
+                 written: List[BatchIndexEntry], progress: Optional[RegenerationProgress]):
+        for completed, (entry, (new_entry, error)) in enumerate(zip(entries, outcomes), 1):
+            if error is not None:
+                result.errors[entry.filename] = error
+            elif new_entry is None:
+                result.unchanged_count += 1
+            else:
+                result.regenerated.append(entry.filename)
+                written.append(new_entry)
+            if progress:
+                progress(completed, len(entries))
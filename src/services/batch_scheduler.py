@@ -0,0 +1,224 @@
+"""
+バッチ実行スケジューラ
+
+多数の（バッチファイル, ファイルリスト）ジョブをプロセスプールで並列に実行し、
+ExecutionResult を集計する。
+各ジョブは BatchManager.execute_batch_with_files で実際にファイルを移動する
+（ワーカーごとにワークスペースの連番ストア・アンドゥ用ジャーナル・インデックスを開く）。
+
+同じフォルダを対象にするジョブは同時に実行しない。
+フォルダが空くまで待機し、同じフォルダのジョブは投入順に実行される。
+進捗はジョブが1件完了するごとにコールバックで通知する。
+cancel() を呼ぶと未開始のジョブを投入せず、実行中のジョブの完了を待って終了する。
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from datetime import datetime
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from src.models.batch_file import BatchFile
+from src.models.execution_result import ExecutionResult
+
+
+class BatchJob:
+    """1つのバッチファイルを1つのファイルリストに適用するジョブ"""
+
+    def __init__(self, batch_file: BatchFile, file_list: List[str], job_id: Optional[str] = None):
+        self.batch_file = batch_file
+        self.file_list = list(file_list)
+        self.job_id = job_id or batch_file.get_batch_filename()
+
+    @property
+    def directories(self) -> FrozenSet[str]:
+        """ジョブが対象にするフォルダ"""
+        return frozenset(
+            os.path.normcase(os.path.dirname(os.path.abspath(path))) for path in self.file_list
+        )
+
+    def to_payload(self) -> Dict[str, Any]:
+        """ワーカープロセスへ渡す内容（連番ストアなどの接続は含めない）"""
+        batch_file = self.batch_file
+        return {
+            "batch_filename": batch_file.get_batch_filename(),
+            "preset_id": batch_file.preset_id,
+            "preset_name": batch_file.preset_name,
+            "field_values": dict(batch_file.field_values),
+            "target_extensions": list(batch_file.target_extensions),
+            "workspace_path": batch_file.workspace_path,
+            "files": self.file_list
+        }
+
+
+def execute_job(payload: Dict[str, Any]) -> ExecutionResult:
+    """ワーカーで1件のジョブを実行"""
+    from src.services.batch_manager import BatchManager
+
+    batch_file = BatchFile(
+        preset_id=payload["preset_id"],
+        preset_name=payload["preset_name"],
+        field_values=payload["field_values"],
+        target_extensions=payload["target_extensions"],
+        workspace_path=payload["workspace_path"]
+    )
+    manager = BatchManager(payload["workspace_path"])
+    try:
+        return manager.execute_batch_with_files(batch_file, payload["files"])
+    finally:
+        manager.close()
+
+
+def _run_job(function: Callable[[Dict[str, Any]], ExecutionResult], payload: Dict[str, Any]) -> ExecutionResult:
+    """ジョブを実行し、開始・完了時刻を記録（例外は失敗結果に変換）"""
+    started = datetime.now()
+    start = time.perf_counter()
+    try:
+        result = function(payload)
+    except Exception as e:
+        result = ExecutionResult(
+            batch_filename=payload["batch_filename"],
+            executed_at=started.isoformat(),
+            processed_files_count=len(payload["files"]),
+            error_count=len(payload["files"]),
+            error_messages=[f"{type(e).__name__}: {e}"]
+        )
+    result.started_at = result.started_at or started.isoformat()
+    result.completed_at = result.completed_at or datetime.now().isoformat()
+    result.processing_time_seconds = time.perf_counter() - start
+    return result
+
+
+class BatchScheduleResult:
+    """スケジューラの実行結果（ジョブ順の ExecutionResult と集計）"""
+
+    def __init__(self, jobs: List[BatchJob]):
+        self.jobs = jobs
+        # 未実行（キャンセル）のジョブは None
+        self.results: List[Optional[ExecutionResult]] = [None] * len(jobs)
+        self.cancelled_jobs: List[BatchJob] = []
+        self.elapsed_seconds = 0.0
+
+    @property
+    def completed_results(self) -> List[ExecutionResult]:
+        return [result for result in self.results if result is not None]
+
+    @property
+    def cancelled(self) -> bool:
+        return bool(self.cancelled_jobs)
+
+    @property
+    def processed_files_count(self) -> int:
+        return sum(result.processed_files_count for result in self.completed_results)
+
+    @property
+    def success_count(self) -> int:
+        return sum(result.success_count for result in self.completed_results)
+
+    @property
+    def error_count(self) -> int:
+        return sum(result.error_count for result in self.completed_results)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_count": len(self.jobs),
+            "completed_count": len(self.completed_results),
+            "cancelled_jobs": [job.job_id for job in self.cancelled_jobs],
+            "processed_files_count": self.processed_files_count,
+            "success_count": self.success_count,
+            "error_count": self.error_count,
+            "elapsed_seconds": self.elapsed_seconds,
+            "results": [result.to_dict() if result is not None else None for result in self.results]
+        }
+
+
+# 進捗コールバック: (完了件数, 全件数, ジョブ, 実行結果)
+ProgressCallback = Callable[[int, int, BatchJob, ExecutionResult], None]
+
+
+class BatchScheduler:
+    """フォルダ単位で排他制御するバッチ並列実行スケジューラ"""
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 use_processes: bool = True,
+                 job_function: Callable[[Dict[str, Any]], ExecutionResult] = execute_job):
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.progress_callback = progress_callback
+        # False の場合はスレッドプールで実行（少数のジョブ・テスト用）
+        self.use_processes = use_processes
+        # プロセスプールで使う場合はモジュールレベルの関数（pickle可能）であること
+        self.job_function = job_function
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """未開始のジョブをキャンセル（別スレッド・進捗コールバックから呼び出し可能）"""
+        self._cancel_event.set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _create_executor(self):
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def run(self, jobs: Iterable[BatchJob]) -> BatchScheduleResult:
+        """ジョブを実行し、全ジョブの完了（またはキャンセル）まで待つ"""
+        jobs = list(jobs)
+        schedule = BatchScheduleResult(jobs)
+        directories = [job.directories for job in jobs]
+        pending = list(range(len(jobs)))
+        running: Dict[Future, int] = {}
+        busy: set = set()
+        completed = 0
+        start = time.perf_counter()
+
+        try:
+            with self._create_executor() as executor:
+                while pending or running:
+                    if self._cancel_event.is_set():
+                        schedule.cancelled_jobs.extend(jobs[index] for index in pending)
+                        pending = []
+                    else:
+                        pending = self._submit_ready(executor, jobs, directories, pending, running, busy)
+                    if not running:
+                        break
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = running.pop(future)
+                        busy.difference_update(directories[index])
+                        result = future.result()
+                        schedule.results[index] = result
+                        completed += 1
+                        if self.progress_callback:
+                            self.progress_callback(completed, len(jobs), jobs[index], result)
+        finally:
+            self._cancel_event.clear()
+            schedule.elapsed_seconds = time.perf_counter() - start
+        return schedule
+
+    def _submit_ready(self, executor, jobs: List[BatchJob], directories: List[FrozenSet[str]],
+                      pending: List[int], running: Dict[Future, int], busy: set) -> List[int]:
+        """空いているフォルダのジョブを投入し、残りのジョブを返す
+
+        先に待機しているジョブと同じフォルダを使うジョブは追い越さない（フォルダ内の投入順を保つ）。
+        """
+        remaining = []
+        waiting: set = set()
+        for index in pending:
+            job_directories = directories[index]
+            if (len(running) >= self.max_workers
+                    or not job_directories.isdisjoint(busy)
+                    or not job_directories.isdisjoint(waiting)):
+                remaining.append(index)
+                waiting.update(job_directories)
+                continue
+            future = executor.submit(_run_job, self.job_function, jobs[index].to_payload())
+            running[future] = index
+            busy.update(job_directories)
+        return remaining
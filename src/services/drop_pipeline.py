@@ -0,0 +1,352 @@
+"""
+ドロップ取り込みパイプライン
+
+ドロップされたファイル・フォルダを、ストック済みバッチファイルの規則で移動・リネームする。
+バッチファイル（move "%%f" "<バッチ名>\\"）と同じく、各ファイルは元のフォルダの
+「<バッチ名>」サブフォルダへ「<バッチ名>_A00001.ext」の形式で移動する。
+
+  1. 展開: フォルダは os.scandir で再帰的に走査し、ファイルを1件ずつ流す（一覧は作らない）
+  2. 絞り込み: バッチの対象拡張子（ExtensionMatcher）でチャンクごとに絞り込む。
+     DuplicateDetector を指定した場合は、移動先フォルダの既存ファイル・先に取り込んだファイルと
+     内容が同じファイルを移動せずに残す（連番も振らない）
+  3. 採番: SequenceStore でチャンク分の連番をまとめて予約する（実行をまたいで継続）
+  4. 衝突: 移動先フォルダは初回に既存ファイルの最大連番までカウンタを進めておき、
+     それでも移動先に同名のファイルがある場合は番号を取り直す
+  5. 実行: チャンクごとに RenameEngine で移動し、進捗を報告する
+     （BatchManager から実行した場合はアンドゥ用ジャーナルに1回の実行として記録し、
+      ファイル名項目インデックスに反映する）
+
+保持するのはチャンク（chunk_size 件）と移動先フォルダの一覧だけなので、
+50万ファイルのドロップでもメモリ使用量は一定に保たれる。
+（重複を検出する場合のみ、移動先フォルダごとにファイルサイズの集合を保持し、
+ サイズが一致する候補があるチャンクだけ移動先フォルダを走査する）
+GUIからは GuiTaskRunner でバックグラウンド実行する（進捗は handle.report_progress へ）。
+"""
+
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.models.batch_file import BatchFile
+from src.models.execution_result import ExecutionResult
+from src.services.rename_engine import RenameEngine
+from src.services.rename_journal import RenameOperation
+from src.services.sequence_store import SequenceStore
+from src.utils.extension_matcher import ExtensionMatcher
+from src.utils.sequence_generator import format_sequence, MAX_SEQUENCE_NUMBER
+
+# 1回に採番・移動するファイル数
+DEFAULT_CHUNK_SIZE = 1000
+
+# 結果に保持するエラーメッセージの上限（件数は error_count で数える）
+MAX_ERROR_MESSAGES = 100
+
+# 移動先に同名ファイルがあった場合に番号を取り直す回数
+MAX_RENUMBER_ATTEMPTS = 3
+
+# (移動元パス, 移動先フォルダ, 拡張子)
+DropMove = Tuple[str, str, str]
+
+ProgressCallback = Callable[[int, int, str], None]
+
+
+def _normalized(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def iter_dropped_files(paths: Iterable[str], skip_directory_names: Iterable[str] = ()) -> Iterator[str]:
+    """ドロップされたパスをファイルパスに展開（フォルダは再帰的に、見つけた順に1件ずつ返す）
+
+    - 他のドロップされたフォルダの中にあるパスは重複しないよう除外する
+    - シンボリックリンクのフォルダはたどらない（循環を避ける）
+    - skip_directory_names の名前のフォルダには入らない（移動先フォルダを再走査しない）
+    """
+    paths = list(paths)
+    skip_names = set(skip_directory_names)
+    folder_roots = [_normalized(path) for path in paths if os.path.isdir(path)]
+
+    def inside_other_root(path: str) -> bool:
+        normalized = _normalized(path)
+        return any(normalized != root and normalized.startswith(root.rstrip(os.sep) + os.sep)
+                   for root in folder_roots)
+
+    for path in paths:
+        if inside_other_root(path):
+            continue
+        if not os.path.isdir(path):
+            if os.path.isfile(path):
+                yield path
+            continue
+
+        stack = [path]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in skip_names:
+                                    stack.append(entry.path)
+                            elif entry.is_file():
+                                yield entry.path
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+
+class DropIngestionResult:
+    """ドロップ取り込み結果（件数のみ保持し、移動したファイルの一覧は持たない）"""
+
+    def __init__(self, batch_filename: str):
+        self.batch_filename = batch_filename
+        self.scanned_count = 0
+        self.skipped_count = 0
+        self.moved_count = 0
+        self.renumbered_count = 0
+        # 内容が同じファイルがあったため移動しなかったファイル数
+        self.duplicate_count = 0
+        self.error_count = 0
+        self.error_messages: List[str] = []
+        self.first_sequence: Optional[str] = None
+        self.last_sequence: Optional[str] = None
+        # アンドゥ用ジャーナルの実行ID（ジャーナルが無い場合・何も移動しなかった場合は None）
+        self.execution_id: Optional[str] = None
+        self.cancelled = False
+        self.elapsed_seconds = 0.0
+        self.started_at = datetime.now().isoformat()
+        self.completed_at: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error_count == 0 and not self.cancelled
+
+    def add_error(self, message: str):
+        self.error_count += 1
+        if len(self.error_messages) < MAX_ERROR_MESSAGES:
+            self.error_messages.append(message)
+
+    def to_execution_result(self) -> ExecutionResult:
+        """実行履歴に記録する形式に変換"""
+        return ExecutionResult(
+            batch_filename=self.batch_filename,
+            executed_at=self.started_at,
+            processed_files_count=self.moved_count + self.error_count,
+            success_count=self.moved_count,
+            error_count=self.error_count,
+            processing_time_seconds=self.elapsed_seconds,
+            started_at=self.started_at,
+            completed_at=self.completed_at,
+            error_messages=list(self.error_messages)
+        )
+
+
+class DropPipeline:
+    """ドロップされたファイルをバッチファイルの規則で移動・リネームする"""
+
+    def __init__(self, batch_file: BatchFile, sequence_store: Optional[SequenceStore] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, dry_run: bool = False,
+                 rename_engine: Optional[RenameEngine] = None, duplicate_detector=None):
+        self.batch_file = batch_file
+        # 連番ストア（指定が無ければバッチファイルのストア、それも無ければメモリ上）
+        self.sequence_store = sequence_store or batch_file.sequence_store or SequenceStore()
+        # 移動に使うリネームエンジン（指定が無ければジャーナル・インデックスなし）
+        self.rename_engine = rename_engine or RenameEngine()
+        # 内容が同じファイルを除外する DuplicateDetector（指定が無ければ除外しない）
+        self.duplicate_detector = duplicate_detector
+        self.chunk_size = chunk_size
+        # dry_run では連番を予約せず、ファイルも移動しない（件数の確認用）
+        self.dry_run = dry_run
+        self.batch_filename = batch_file.get_batch_filename()
+        self.folder_name = self.batch_filename[:-len(".bat")]
+        self.matcher: ExtensionMatcher = batch_file.extension_matcher
+        self._prepared_directories: Set[str] = set()
+        self._failed_directories: Set[str] = set()
+        # 移動先フォルダ → フォルダ内のファイルサイズ（重複を検出する場合のみ）
+        self._destination_sizes: Dict[str, Set[int]] = {}
+        self._planned_number = 0
+
+    def run(self, paths: Iterable[str], progress: Optional[ProgressCallback] = None,
+            cancel_check: Optional[Callable[[], bool]] = None) -> DropIngestionResult:
+        """ドロップされたパスを取り込み（進捗は progress(処理済み件数, 0, メッセージ)、総数は不明）"""
+        start = time.perf_counter()
+        result = DropIngestionResult(self.batch_filename)
+        chunk: List[str] = []
+        # dry_run で仮に振る連番の最終値
+        self._planned_number = self.sequence_store.get_current_number(self.batch_filename)
+        try:
+            for path in iter_dropped_files(paths, skip_directory_names=(self.folder_name,)):
+                result.scanned_count += 1
+                chunk.append(path)
+                if len(chunk) >= self.chunk_size:
+                    self._process_chunk(chunk, result)
+                    chunk = []
+                    if progress:
+                        progress(result.moved_count, 0, f"{result.moved_count}件を移動しました")
+                    if cancel_check and cancel_check():
+                        result.cancelled = True
+                        break
+            if chunk and not result.cancelled:
+                self._process_chunk(chunk, result)
+                if progress:
+                    progress(result.moved_count, 0, f"{result.moved_count}件を移動しました")
+        except _SequenceExhausted as e:
+            result.add_error(str(e))
+        result.elapsed_seconds = time.perf_counter() - start
+        result.completed_at = datetime.now().isoformat()
+        return result
+
+    def _process_chunk(self, chunk: List[str], result: DropIngestionResult):
+        """1チャンク分を絞り込み・採番・移動"""
+        targets = self.matcher.filter(chunk)
+        result.skipped_count += len(chunk) - len(targets)
+        if not targets:
+            return
+
+        moves = [self._plan_move(path) for path in targets]
+        if self.dry_run:
+            if self._planned_number + len(moves) > MAX_SEQUENCE_NUMBER:
+                raise _SequenceExhausted(self.batch_filename)
+            self._record_sequences(result, self._planned_number + 1, self._planned_number + len(moves))
+            self._planned_number += len(moves)
+            result.moved_count += len(moves)
+            return
+
+        unavailable = {destination for _, destination, _ in moves
+                       if not self._prepare_directory(destination, result)}
+        if unavailable:
+            for source, destination, _ in moves:
+                if destination in unavailable:
+                    result.add_error(f"{source}: 移動先フォルダを使用できません")
+            moves = [move for move in moves if move[1] not in unavailable]
+            if not moves:
+                return
+        if self.duplicate_detector is not None:
+            moves = self._skip_duplicates(moves, result)
+            if not moves:
+                return
+        numbers = self._reserve(len(moves))
+        self._record_sequences(result, numbers.start, numbers[-1])
+        operations = []
+        for (source, destination, extension), number in zip(moves, numbers):
+            operation = self._plan_target(source, destination, extension, number, result)
+            if operation is not None:
+                operations.append(operation)
+        if operations:
+            self._execute(operations, result)
+
+    def _plan_move(self, path: str) -> DropMove:
+        """移動先フォルダと拡張子（元の大文字小文字のまま、複合拡張子はまとめて）を決める"""
+        directory, name = os.path.split(path)
+        matched = self.matcher.match_extension(name)
+        extension = name[len(name) - len(matched):] if matched else os.path.splitext(name)[1]
+        return path, os.path.join(directory, self.folder_name), extension
+
+    def _prepare_directory(self, destination: str, result: DropIngestionResult) -> bool:
+        """移動先フォルダを作成し、初回は既存ファイルの最大連番までカウンタを進める"""
+        if destination in self._prepared_directories:
+            return True
+        if destination in self._failed_directories:
+            return False
+        try:
+            if os.path.isdir(destination):
+                self.sequence_store.seed_from_directory(self.batch_filename, destination)
+                if self.duplicate_detector is not None:
+                    self._destination_sizes[destination] = self._file_sizes(destination)
+            else:
+                os.makedirs(destination)
+        except OSError as e:
+            result.add_error(f"移動先フォルダを作成できません: {destination}: {e}")
+            self._failed_directories.add(destination)
+            return False
+        self._prepared_directories.add(destination)
+        return True
+
+    @staticmethod
+    def _file_sizes(directory: str) -> Set[int]:
+        sizes = set()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        sizes.add(entry.stat().st_size)
+                except OSError:
+                    continue
+        return sizes
+
+    def _skip_duplicates(self, moves: List[DropMove], result: DropIngestionResult) -> List[DropMove]:
+        """移動先フォルダの既存ファイル・チャンク内の前のファイルと内容が同じものを除外
+
+        移動先フォルダはサイズが一致する候補がある場合だけ走査する（チャンク内の比較は常に行う）。
+        """
+        by_destination: Dict[str, List[str]] = {}
+        for source, destination, _ in moves:
+            by_destination.setdefault(destination, []).append(source)
+
+        duplicates: Dict[str, str] = {}
+        for destination, sources in by_destination.items():
+            sizes = self._destination_sizes.setdefault(destination, set())
+            candidate_sizes = {}
+            for source in sources:
+                try:
+                    candidate_sizes[source] = os.path.getsize(source)
+                except OSError:
+                    continue
+            target = destination if sizes.intersection(candidate_sizes.values()) else None
+            found = self.duplicate_detector.find_duplicates(sources, target).duplicates
+            duplicates.update(found)
+            sizes.update(size for source, size in candidate_sizes.items() if source not in found)
+
+        if not duplicates:
+            return moves
+        result.duplicate_count += len(duplicates)
+        return [move for move in moves if move[0] not in duplicates]
+
+    def _reserve(self, count: int) -> range:
+        try:
+            return self.sequence_store.reserve(self.batch_filename, count)
+        except ValueError:
+            raise _SequenceExhausted(self.batch_filename)
+
+    def _plan_target(self, source: str, destination: str, extension: str, number: int,
+                     result: DropIngestionResult) -> Optional[RenameOperation]:
+        """1ファイルの移動先を決め、(移動元フォルダ, 元のファイル名, サブフォルダ内の新しい名前) を返す
+
+        移動先に同名ファイルがあれば番号を取り直す。
+        """
+        directory, name = os.path.split(source)
+        for attempt in range(MAX_RENUMBER_ATTEMPTS + 1):
+            if attempt:
+                number = self._reserve(1).start
+                result.renumbered_count += 1
+                self._record_sequences(result, number, number)
+            target_name = f"{self.folder_name}_{format_sequence(number)}{extension}"
+            if not os.path.lexists(os.path.join(destination, target_name)):
+                return directory, name, os.path.join(self.folder_name, target_name)
+        result.add_error(f"移動先に同名のファイルがあります: {source}")
+        return None
+
+    def _execute(self, operations: List[RenameOperation], result: DropIngestionResult):
+        """チャンク分の移動を実行（ジャーナルには最初のチャンクで記録した実行に追記する）"""
+        execution = self.rename_engine.execute(
+            operations, label=self.batch_filename, execution_id=result.execution_id,
+            list_directories=False
+        )
+        result.execution_id = execution.execution_id
+        result.moved_count += execution.renamed_count
+        for error in execution.errors:
+            result.add_error(error)
+
+    @staticmethod
+    def _record_sequences(result: DropIngestionResult, first: int, last: int):
+        if result.first_sequence is None:
+            result.first_sequence = format_sequence(first)
+        result.last_sequence = format_sequence(last)
+
+
+class _SequenceExhausted(Exception):
+    def __init__(self, batch_filename: str):
+        super().__init__(f"連番の上限（{MAX_SEQUENCE_NUMBER}）に達したため、残りのファイルは処理していません: "
+                         f"{batch_filename}")
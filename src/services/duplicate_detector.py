@@ -0,0 +1,160 @@
+"""
+重複ファイル検出
+
+リネーム前の候補ファイルと移動先フォルダの既存ファイルから、内容が同じファイルを検出する。
+同じ内容のファイルに新しい連番を振って複製が増えないよう、プレビューで重複を示すために使う。
+
+比較は段階的に行い、ファイルを読む量を最小にする:
+  1. ファイルサイズでグループ化（サイズが一意なら重複なし）
+  2. 先頭・末尾 64KB の部分ダイジェストでグループ化
+  3. 部分ダイジェストが一致したファイルだけ全体のダイジェストを計算
+ダイジェストの計算・キャッシュは FileDigester（utils.file_digest）に任せる。
+（以前のパスをキーにしたキャッシュ .tadakan_hash_cache.sqlite3 は for_workspace で削除する）
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional
+
+from src.utils.file_digest import (FileDigester, FileSignature, file_signature,
+                                   FULL_DIGEST, PARTIAL_DIGEST, PARTIAL_BLOCK_SIZE)
+
+# 以前のハッシュキャッシュ（FileDigester のキャッシュに置き換えたため使用しない）
+LEGACY_HASH_CACHE_FILENAME = ".tadakan_hash_cache.sqlite3"
+
+
+def remove_legacy_hash_cache(workspace_path: str):
+    """ワークスペースに残っている以前のハッシュキャッシュ（WAL・共有メモリを含む）を削除"""
+    base = os.path.join(workspace_path, LEGACY_HASH_CACHE_FILENAME)
+    for path in (base, base + "-wal", base + "-shm"):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class DuplicateReport:
+    """重複検出結果"""
+
+    def __init__(self):
+        # 候補パス → 同じ内容の既存ファイル（または先に指定された候補）のパス
+        self.duplicates: Dict[str, str] = {}
+        self.hashed_files = 0
+        self.cache_hits = 0
+        self.bytes_read = 0
+
+    def get_original(self, path: str) -> Optional[str]:
+        return self.duplicates.get(path)
+
+    def is_duplicate(self, path: str) -> bool:
+        return path in self.duplicates
+
+    @property
+    def duplicate_count(self) -> int:
+        return len(self.duplicates)
+
+
+class DuplicateDetector:
+    """サイズ → 部分ハッシュ → 全体ハッシュの順で内容が同じファイルを検出する"""
+
+    def __init__(self, digester: Optional[FileDigester] = None):
+        self.digester = digester or FileDigester()
+
+    @classmethod
+    def for_workspace(cls, workspace_path: str, max_workers: int = 8) -> 'DuplicateDetector':
+        """ワークスペースのダイジェストキャッシュを使う検出器（以前のハッシュキャッシュは削除する）"""
+        if workspace_path:
+            remove_legacy_hash_cache(workspace_path)
+        return cls(FileDigester.for_workspace(workspace_path, max_workers))
+
+    def close(self):
+        self.digester.close()
+
+    def find_duplicates(self, candidates: Iterable[str],
+                        target_directory: Optional[str] = None) -> DuplicateReport:
+        """候補ファイルのうち、移動先フォルダの既存ファイルまたは先の候補と内容が同じものを検出
+
+        空のファイルは重複として扱わない。
+        """
+        report = DuplicateReport()
+        signatures: Dict[str, FileSignature] = {}
+        candidate_paths: List[str] = []
+        candidate_keys = set()
+        for path in candidates:
+            key = os.path.normcase(os.path.abspath(path))
+            if key in candidate_keys:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            candidate_keys.add(key)
+            candidate_paths.append(path)
+            signatures[path] = file_signature(stat)
+        candidate_sizes = {signature[2] for signature in signatures.values() if signature[2] > 0}
+
+        # 既存ファイルはサイズが候補のどれかと一致するものだけを対象にする
+        existing_paths: List[str] = []
+        if target_directory and os.path.isdir(target_directory) and candidate_sizes:
+            with os.scandir(target_directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or os.path.normcase(os.path.abspath(entry.path)) in candidate_keys:
+                        continue
+                    if entry.stat().st_size in candidate_sizes:
+                        # DirEntry.stat は Windows で inode を返さないため、一致したものだけ stat し直す
+                        try:
+                            signatures[entry.path] = file_signature(os.stat(entry.path))
+                        except OSError:
+                            continue
+                        existing_paths.append(entry.path)
+
+        # 既存ファイル → 候補の順。グループの先頭が元のファイルになる
+        ordered = existing_paths + candidate_paths
+        is_candidate = {path: index >= len(existing_paths) for index, path in enumerate(ordered)}
+
+        # 1. サイズ
+        groups = self._group(ordered, lambda path: signatures[path][2])
+        groups = [g for g in groups if signatures[g[0]][2] > 0]
+        groups = [g for g in groups if any(is_candidate[path] for path in g)]
+
+        # 2. 部分ダイジェスト
+        partial = self._digests(PARTIAL_DIGEST, [p for g in groups for p in g], signatures, report)
+        groups = [sub for g in groups for sub in self._group(g, partial.get) if len(sub) > 1]
+        groups = [g for g in groups if any(is_candidate[path] for path in g)]
+
+        # 3. 全体ダイジェスト（部分ダイジェストがファイル全体を読んでいる場合は不要）
+        large = [p for g in groups for p in g if signatures[p][2] > PARTIAL_BLOCK_SIZE * 2]
+        full = self._digests(FULL_DIGEST, large, signatures, report)
+        final_groups = []
+        for group in groups:
+            if signatures[group[0]][2] > PARTIAL_BLOCK_SIZE * 2:
+                final_groups.extend(sub for sub in self._group(group, full.get) if len(sub) > 1)
+            else:
+                final_groups.append(group)
+
+        for group in final_groups:
+            original = group[0]
+            for path in group[1:]:
+                if is_candidate[path]:
+                    report.duplicates[path] = original
+        return report
+
+    @staticmethod
+    def _group(paths: List[str], key) -> List[List[str]]:
+        """キーが同じパスを順序を保ってグループ化（キーが None のパスは除外）"""
+        groups: Dict[object, List[str]] = {}
+        for path in paths:
+            value = key(path)
+            if value is not None:
+                groups.setdefault(value, []).append(path)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def _digests(self, kind: str, paths: List[str], signatures: Dict[str, FileSignature],
+                 report: DuplicateReport) -> Dict[str, str]:
+        """ダイジェストを取得（読めないファイルは結果に含まれない）"""
+        if not paths:
+            return {}
+        result = self.digester.digest_many(paths, kind, signatures)
+        report.hashed_files += result.computed_count
+        report.cache_hits += result.cache_hits
+        report.bytes_read += result.bytes_read
+        return result.digests
@@ -0,0 +1,237 @@
+"""
+実行履歴ストア
+
+バッチ実行結果をワークスペース内の SQLite データベースに追記専用で保存し、
+日別・バッチ別の集計テーブルを記録時に増分更新する。
+レポートは集計テーブルのみを参照するため、履歴件数に関係なく日数分の行だけを読む。
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Iterable
+
+from src.models.execution_result import ExecutionResult
+
+
+HISTORY_FILENAME = ".tadakan_history.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    id INTEGER PRIMARY KEY,
+    batch_filename TEXT NOT NULL,
+    executed_at TEXT NOT NULL,
+    day TEXT NOT NULL,
+    processed_files_count INTEGER NOT NULL,
+    success_count INTEGER NOT NULL,
+    error_count INTEGER NOT NULL,
+    processing_time_seconds REAL NOT NULL,
+    started_at TEXT,
+    completed_at TEXT,
+    error_messages TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_executions_batch ON executions(batch_filename, executed_at);
+CREATE INDEX IF NOT EXISTS idx_executions_time ON executions(executed_at);
+
+CREATE TRIGGER IF NOT EXISTS executions_no_update BEFORE UPDATE ON executions
+BEGIN SELECT RAISE(ABORT, 'execution history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS executions_no_delete BEFORE DELETE ON executions
+BEGIN SELECT RAISE(ABORT, 'execution history is append-only'); END;
+
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day TEXT NOT NULL,
+    batch_filename TEXT NOT NULL,
+    executions INTEGER NOT NULL,
+    processed INTEGER NOT NULL,
+    success INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    PRIMARY KEY (day, batch_filename)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS daily_errors (
+    day TEXT NOT NULL,
+    message TEXT NOT NULL,
+    occurrences INTEGER NOT NULL,
+    PRIMARY KEY (day, message)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS batch_totals (
+    batch_filename TEXT PRIMARY KEY,
+    preset_id TEXT NOT NULL,
+    executions INTEGER NOT NULL,
+    processed INTEGER NOT NULL,
+    success INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    last_executed_at TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_batch_totals_preset ON batch_totals(preset_id);
+"""
+
+
+def _preset_id_from_batch_filename(batch_filename: str) -> str:
+    """バッチファイル名（プリセットID_陣営_キャラ名.bat）からプリセットIDを取得"""
+    return batch_filename.split('_', 1)[0] if '_' in batch_filename else ""
+
+
+class ExecutionHistoryStore:
+    """実行履歴の永続ストア"""
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_workspace(cls, workspace_path: str) -> 'ExecutionHistoryStore':
+        """ワークスペース用のストアを作成（ワークスペースが無い場合はメモリ上）"""
+        if workspace_path and os.path.isdir(workspace_path):
+            return cls(os.path.join(workspace_path, HISTORY_FILENAME))
+        return cls()
+
+    def _connect(self) -> sqlite3.Connection:
+        """初回アクセス時にデータベースを開く"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self):
+        """データベースを閉じる"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def record(self, result: ExecutionResult):
+        """実行結果を追記"""
+        self.record_many([result])
+
+    def record_many(self, results: Iterable[ExecutionResult]):
+        """複数の実行結果を1トランザクションで追記し、集計を更新"""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                for result in results:
+                    self._insert(connection, result)
+
+    def _insert(self, connection: sqlite3.Connection, result: ExecutionResult):
+        day = result.executed_at[:10]
+        connection.execute(
+            "INSERT INTO executions (batch_filename, executed_at, day, processed_files_count, "
+            "success_count, error_count, processing_time_seconds, started_at, completed_at, "
+            "error_messages) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (result.batch_filename, result.executed_at, day, result.processed_files_count,
+             result.success_count, result.error_count, result.processing_time_seconds,
+             result.started_at, result.completed_at,
+             json.dumps(result.error_messages, ensure_ascii=False) if result.error_messages else None)
+        )
+        connection.execute(
+            "INSERT INTO daily_stats (day, batch_filename, executions, processed, success, errors) "
+            "VALUES (?, ?, 1, ?, ?, ?) "
+            "ON CONFLICT (day, batch_filename) DO UPDATE SET "
+            "executions = executions + 1, processed = processed + excluded.processed, "
+            "success = success + excluded.success, errors = errors + excluded.errors",
+            (day, result.batch_filename, result.processed_files_count,
+             result.success_count, result.error_count)
+        )
+        connection.execute(
+            "INSERT INTO batch_totals (batch_filename, preset_id, executions, processed, success, "
+            "errors, last_executed_at) VALUES (?, ?, 1, ?, ?, ?, ?) "
+            "ON CONFLICT (batch_filename) DO UPDATE SET "
+            "executions = executions + 1, processed = processed + excluded.processed, "
+            "success = success + excluded.success, errors = errors + excluded.errors, "
+            "last_executed_at = MAX(last_executed_at, excluded.last_executed_at)",
+            (result.batch_filename, _preset_id_from_batch_filename(result.batch_filename),
+             result.processed_files_count, result.success_count, result.error_count,
+             result.executed_at)
+        )
+        for message in result.error_messages:
+            connection.execute(
+                "INSERT INTO daily_errors (day, message, occurrences) VALUES (?, ?, 1) "
+                "ON CONFLICT (day, message) DO UPDATE SET occurrences = occurrences + 1",
+                (day, message)
+            )
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def get_history(self, batch_filename: str, limit: Optional[int] = None) -> List[ExecutionResult]:
+        """指定バッチの実行履歴を実行日時順に取得（インデックス使用）"""
+        sql = ("SELECT batch_filename, executed_at, processed_files_count, success_count, "
+               "error_count, processing_time_seconds, started_at, completed_at, error_messages "
+               "FROM executions WHERE batch_filename = ? ORDER BY executed_at")
+        params: tuple = (batch_filename,)
+        if limit is not None:
+            # 直近 limit 件を古い順に返す
+            sql = f"SELECT * FROM ({sql} DESC LIMIT ?) ORDER BY executed_at"
+            params = (batch_filename, limit)
+
+        return [
+            ExecutionResult(
+                batch_filename=row[0], executed_at=row[1], processed_files_count=row[2],
+                success_count=row[3], error_count=row[4], processing_time_seconds=row[5],
+                started_at=row[6], completed_at=row[7],
+                error_messages=json.loads(row[8]) if row[8] else None
+            )
+            for row in self._query(sql, params)
+        ]
+
+    def generate_report(self, days: int = 30, top_n: int = 5,
+                        now: Optional[datetime] = None) -> Dict[str, Any]:
+        """直近 days 日間（今日を含む days 日分）のレポートを日別集計から生成"""
+        since = ((now or datetime.now()).date() - timedelta(days=days - 1)).isoformat()
+
+        executions, processed, success, errors = self._query(
+            "SELECT COALESCE(SUM(executions), 0), COALESCE(SUM(processed), 0), "
+            "COALESCE(SUM(success), 0), COALESCE(SUM(errors), 0) FROM daily_stats WHERE day >= ?",
+            (since,)
+        )[0]
+        most_used = self._query(
+            "SELECT batch_filename, SUM(executions) AS n FROM daily_stats WHERE day >= ? "
+            "GROUP BY batch_filename ORDER BY n DESC, batch_filename LIMIT ?",
+            (since, top_n)
+        )
+        error_rows = self._query(
+            "SELECT message, SUM(occurrences) AS n FROM daily_errors WHERE day >= ? "
+            "GROUP BY message ORDER BY n DESC, message",
+            (since,)
+        )
+
+        return {
+            "period_days": days,
+            "total_executions": executions,
+            "total_processed_files": processed,
+            "success_rate": success / processed if processed else 0.0,
+            "most_used_batches": [
+                {"batch_filename": name, "executions": count} for name, count in most_used
+            ],
+            "error_summary": {
+                "total_errors": errors,
+                "messages": {message: count for message, count in error_rows}
+            }
+        }
+
+    def get_totals(self, top_n: int = 5) -> Dict[str, Any]:
+        """全期間の集計をバッチ別集計から取得"""
+        executions, processed = self._query(
+            "SELECT COALESCE(SUM(executions), 0), COALESCE(SUM(processed), 0) FROM batch_totals"
+        )[0]
+        popular = self._query(
+            "SELECT preset_id, SUM(executions) AS n FROM batch_totals "
+            "GROUP BY preset_id ORDER BY n DESC, preset_id LIMIT ?",
+            (top_n,)
+        )
+        return {
+            "total_executions": executions,
+            "total_processed_files": processed,
+            "average_files_per_execution": processed / executions if executions else 0.0,
+            "most_popular_presets": [
+                {"preset_id": preset_id, "executions": count} for preset_id, count in popular
+            ]
+        }
@@ -0,0 +1,335 @@
+"""
+ファイル名項目インデックス
+
+ストック型のファイル名（プリセットID_陣営_キャラ名_A00001.拡張子）を解析した
+項目値をワークスペース内の SQLite データベースに保存し、
+項目ごとの索引（フォルダ, 値）でフィルタ条件を評価する。
+
+項目値は正規化（text_normalizer）して保存し、条件値も正規化して検索する。
+正規化の方式が変わった場合はテンプレートの変更と同じくインデックスを作り直す。
+
+ファイルの追加・移動・リネームは add / move / rename（RenameEngine からは apply_renames）で
+増分反映し、フォルダ全体は sync_directory で差分のみ反映する（変更のないファイルは再解析しない）。
+アプリ外での変更（バッチファイルの実行・エクスプローラーでの操作）は、検索の前に
+refresh_directory がフォルダの更新日時を前回の同期と比べ、変わっている場合だけ sync_directory で反映する。
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.filename_parser import FilenameParser, EXTENSION_KEY
+from src.services.filter_engine import ConditionValue
+from src.utils.text_normalizer import get_default_normalizer, normalize_text
+
+INDEX_FILENAME = ".tadakan_file_index.sqlite3"
+
+# 更新日時がこの時間（ナノ秒）以内のフォルダは同期済みとして記録しない
+# （同じ時刻の刻みの中で続けて変更された場合に、変更を見落とさないため）
+RACY_WINDOW_NS = 2 * 1000 ** 3
+
+_META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS directory_state (
+    directory TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _normalize_directory(directory: str) -> str:
+    return os.path.normcase(os.path.abspath(directory))
+
+
+class FileIndex:
+    """ファイル名の項目値インデックス
+
+    項目はパーサーのテンプレートから決まり、列 f0, f1, ... として保存する。
+    テンプレートが変わった場合はインデックスを作り直す。
+    """
+
+    def __init__(self, db_path: str = ":memory:", parser: Optional[FilenameParser] = None):
+        self.db_path = db_path
+        self.parser = parser or FilenameParser.stock_format()
+        self.fields = list(self.parser.fields) + [EXTENSION_KEY]
+        self._columns = {field_name: f"f{i}" for i, field_name in enumerate(self.fields)}
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_workspace(cls, workspace_path: str) -> 'FileIndex':
+        """ワークスペース用のインデックスを作成（ワークスペースが無い場合はメモリ上）"""
+        if workspace_path and os.path.isdir(workspace_path):
+            return cls(os.path.join(workspace_path, INDEX_FILENAME))
+        return cls()
+
+    def _connect(self) -> sqlite3.Connection:
+        """初回アクセス時にデータベースを開く"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._ensure_schema(connection)
+            self._connection = connection
+        return self._connection
+
+    def _ensure_schema(self, connection: sqlite3.Connection):
+        """パーサーのテンプレートに合わせてテーブルを作成"""
+        connection.executescript(_META_SCHEMA)
+        meta = dict(connection.execute(
+            "SELECT key, value FROM index_meta WHERE key IN ('template', 'normalization')"
+        ).fetchall())
+        normalization = get_default_normalizer().key
+        if meta.get("template") == self.parser.template and meta.get("normalization") == normalization:
+            return
+
+        columns = list(self._columns.values())
+        with connection:
+            connection.execute("DROP TABLE IF EXISTS files")
+            connection.execute("DELETE FROM directory_state")
+            connection.execute(
+                "CREATE TABLE files (id INTEGER PRIMARY KEY, directory TEXT NOT NULL, "
+                "filename TEXT NOT NULL, "
+                + "".join(f"{column} TEXT NOT NULL, " for column in columns)
+                + "UNIQUE (directory, filename))"
+            )
+            for column in columns:
+                # filename を含めて索引だけで検索結果を返せるようにする
+                connection.execute(
+                    f"CREATE INDEX idx_files_{column} ON files(directory, {column}, filename)"
+                )
+            connection.executemany(
+                "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
+                [("template", self.parser.template), ("normalization", normalization)]
+            )
+
+    def close(self):
+        """データベースを閉じる"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    # --- 更新 ---
+
+    def _insert_rows(self, connection: sqlite3.Connection, directory: str,
+                     filenames: Iterable[str]) -> int:
+        rows = []
+        for filename in filenames:
+            fields = self.parser.parse(filename)
+            if fields is not None:
+                rows.append((directory, filename) + tuple(normalize_text(fields[f]) for f in self.fields))
+        placeholders = ", ".join("?" * (len(self.fields) + 2))
+        return connection.executemany(
+            f"INSERT OR IGNORE INTO files (directory, filename, {', '.join(self._columns.values())}) "
+            f"VALUES ({placeholders})",
+            rows
+        ).rowcount
+
+    @staticmethod
+    def _delete_rows(connection: sqlite3.Connection, directory: str, filenames: Iterable[str]) -> int:
+        return connection.executemany(
+            "DELETE FROM files WHERE directory = ? AND filename = ?",
+            ((directory, filename) for filename in filenames)
+        ).rowcount
+
+    def add_many(self, directory: str, filenames: Iterable[str]) -> int:
+        """ファイルを追加（形式が一致しないファイルは対象外）し、追加件数を返す"""
+        directory = _normalize_directory(directory)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                return self._insert_rows(connection, directory, filenames)
+
+    def add(self, directory: str, filename: str) -> bool:
+        return self.add_many(directory, [filename]) == 1
+
+    def remove_many(self, directory: str, filenames: Iterable[str]) -> int:
+        """ファイルを削除し、削除件数を返す"""
+        directory = _normalize_directory(directory)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                return self._delete_rows(connection, directory, filenames)
+
+    def remove(self, directory: str, filename: str) -> bool:
+        return self.remove_many(directory, [filename]) == 1
+
+    def move_many(self, filenames: Iterable[str], source_directory: str, target_directory: str) -> int:
+        """ファイルのフォルダ移動を反映（項目値は変わらないので再解析しない）"""
+        source_directory = _normalize_directory(source_directory)
+        target_directory = _normalize_directory(target_directory)
+        filenames = list(filenames)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                # 移動先に古い行が残っていれば置き換える
+                self._delete_rows(connection, target_directory, filenames)
+                return connection.executemany(
+                    "UPDATE files SET directory = ? WHERE directory = ? AND filename = ?",
+                    ((target_directory, source_directory, filename) for filename in filenames)
+                ).rowcount
+
+    def move(self, filename: str, source_directory: str, target_directory: str) -> bool:
+        return self.move_many([filename], source_directory, target_directory) == 1
+
+    def rename(self, directory: str, old_filename: str, new_filename: str):
+        """ファイル名の変更を反映"""
+        directory = _normalize_directory(directory)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                self._delete_rows(connection, directory, [old_filename])
+                self._insert_rows(connection, directory, [new_filename])
+
+    def apply_renames(self, operations: Iterable[Tuple[str, str, str]]) -> int:
+        """リネーム・移動（フォルダ, 元のファイル名, 新しいファイル名）をまとめて反映し、追加件数を返す
+
+        ファイル名はフォルダからの相対パス（サブフォルダへの移動・そのアンドゥ）でもよい。
+        """
+        removals: Dict[str, List[str]] = {}
+        additions: Dict[str, List[str]] = {}
+        # (フォルダ, サブフォルダ) → 正規化したフォルダ（同じフォルダのパスを何度も正規化しない）
+        directories: Dict[Tuple[str, str], str] = {}
+
+        def locate(directory: str, name: str) -> Tuple[str, str]:
+            subdirectory, filename = os.path.split(name)
+            key = (directory, subdirectory)
+            normalized = directories.get(key)
+            if normalized is None:
+                normalized = directories[key] = _normalize_directory(os.path.join(directory, subdirectory))
+            return normalized, filename
+
+        for directory, old_name, new_name in operations:
+            source_directory, source_name = locate(directory, old_name)
+            removals.setdefault(source_directory, []).append(source_name)
+            target_directory, target_name = locate(directory, new_name)
+            additions.setdefault(target_directory, []).append(target_name)
+        if not removals:
+            return 0
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                for directory, filenames in removals.items():
+                    self._delete_rows(connection, directory, filenames)
+                added = 0
+                for directory, filenames in additions.items():
+                    # 移動先に古い行が残っていれば置き換える
+                    self._delete_rows(connection, directory, filenames)
+                    added += self._insert_rows(connection, directory, filenames)
+        return added
+
+    def refresh_directory(self, directory: str) -> Optional[Tuple[int, int]]:
+        """フォルダが前回の同期から変更されていれば差分を反映（変更が無ければ None）
+
+        フォルダの更新日時（ファイルの追加・削除・リネームで変わる）だけを確認するため、
+        変更が無ければフォルダを走査しない。
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+        normalized = _normalize_directory(directory)
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT mtime_ns FROM directory_state WHERE directory = ?", (normalized,)
+            ).fetchone()
+        if row is not None and row[0] == mtime_ns:
+            return None
+
+        # 走査の前に取得した更新日時を記録する（走査中の変更は次回の確認で反映される）
+        changes = self.sync_directory(directory)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                if time.time_ns() - mtime_ns > RACY_WINDOW_NS:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO directory_state (directory, mtime_ns) VALUES (?, ?)",
+                        (normalized, mtime_ns)
+                    )
+                else:
+                    connection.execute("DELETE FROM directory_state WHERE directory = ?", (normalized,))
+        return changes
+
+    def sync_directory(self, directory: str) -> Tuple[int, int]:
+        """フォルダの内容とインデックスの差分を反映し、(追加件数, 削除件数) を返す"""
+        with os.scandir(directory) as entries:
+            current = {entry.name for entry in entries if entry.is_file()}
+
+        normalized = _normalize_directory(directory)
+        with self._lock:
+            connection = self._connect()
+            indexed = {row[0] for row in connection.execute(
+                "SELECT filename FROM files WHERE directory = ?", (normalized,)
+            )}
+            with connection:
+                removed = self._delete_rows(connection, normalized, indexed - current)
+                added = self._insert_rows(connection, normalized, current - indexed)
+            # 索引の選択に使う統計を更新
+            connection.execute("PRAGMA optimize")
+        return added, removed
+
+    # --- 検索 ---
+
+    def query(self, directory: str, conditions: Dict[str, ConditionValue],
+              operator: str = "AND") -> List[str]:
+        """フォルダ内で条件に一致するファイル名を返す
+
+        条件の形式は FilterEngine と同じ（値のリストはいずれかに一致、* と ? はワイルドカード）
+        """
+        operator = operator.upper()
+        if operator not in ("AND", "OR"):
+            raise ValueError(f"不正な結合条件です: {operator}")
+        if not conditions:
+            return []
+
+        clauses = []
+        params: List[List[str]] = []
+        for field_name, value in conditions.items():
+            values = [normalize_text(v) for v in ([value] if isinstance(value, str) else value)]
+            column = self._columns.get(field_name)
+            if column is None or not values:
+                # 未知の項目・値なしの条件には何も一致しない
+                clauses.append("0")
+                params.append([])
+                continue
+            exact = [v for v in values if "*" not in v and "?" not in v]
+            patterns = [v for v in values if "*" in v or "?" in v]
+            terms = []
+            if exact:
+                terms.append(f"{column} IN ({', '.join('?' * len(exact))})")
+            terms.extend(f"{column} GLOB ?" for _ in patterns)
+            clauses.append(f"({' OR '.join(terms)})")
+            params.append(exact + patterns)
+
+        directory = _normalize_directory(directory)
+        select = "SELECT filename FROM files WHERE directory = ? AND "
+        if operator == "AND":
+            sql = select + " AND ".join(clauses)
+            sql_params = [directory] + [p for clause_params in params for p in clause_params]
+        else:
+            # OR は項目ごとの索引を使えるよう UNION に分解する
+            sql = " UNION ".join(select + clause for clause in clauses)
+            sql_params = [p for clause_params in params for p in [directory] + clause_params]
+
+        with self._lock:
+            rows = self._connect().execute(sql, sql_params).fetchall()
+        return sorted(row[0] for row in rows)
+
+    def count(self, directory: Optional[str] = None) -> int:
+        """登録ファイル数"""
+        with self._lock:
+            connection = self._connect()
+            if directory is None:
+                return connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            return connection.execute(
+                "SELECT COUNT(*) FROM files WHERE directory = ?", (_normalize_directory(directory),)
+            ).fetchone()[0]
@@ -3,6 +3,10 @@ import re
 from typing import List, Dict, Optional
 from models.preset import Preset
 from models.file_item import FileItem
+from services.filename_preview import FilenamePreviewCache
+from services.name_validator import find_reserved_name, ng_word_rules
+# 正規化のキャッシュ・設定は filename_preview と共有するため src 形式でインポート
+from src.utils.text_normalizer import normalize_text, search_key
 
 
 class FileRenamer:
@@ -10,6 +14,10 @@ class FileRenamer:
         # Windows で使用できない文字
         self.invalid_chars = r'<>:"/\\|?*'
         self.invalid_char_pattern = re.compile(f'[{re.escape(self.invalid_chars)}]')
+        # プレビュー用（入力値の組み合わせごとに展開済みのパターンを保持）
+        self.preview_cache = FilenamePreviewCache()
+        # check_duplicate 用: フォルダ → (更新日時, ファイル名の検索キー)
+        self._directory_keys = {}
     
     def generate_filename(
         self,
@@ -35,15 +43,23 @@ class FileRenamer:
             value = preset.get_field_value(field, input_values)
             filename = filename.replace(f"{{{field}}}", value)
         
+        # 全角・半角、NFC/NFD の違いを統一
+        filename = normalize_text(filename)
+        
         # 無効な文字をチェック
         if self.invalid_char_pattern.search(filename):
             raise ValueError(f"無効な文字が含まれています: {self.invalid_chars}")
         
-        # NGワードチェック
+        # NGワードチェック（すべてのNGワードをまとめた正規表現で1回だけ検索）
+        # 予約名（CON など）は部分一致ではなく名前全体の一致で判定する（ICON は可）
         if ng_words:
-            for ng_word in ng_words:
-                if ng_word in filename:
-                    raise ValueError(f"NGワードが含まれています: {ng_word}")
+            matcher, reserved_names = ng_word_rules(tuple(ng_words))
+            ng_word = matcher.find(filename)
+            if ng_word is not None:
+                raise ValueError(f"NGワードが含まれています: {ng_word}")
+            reserved_name = find_reserved_name(filename, reserved_names)
+            if reserved_name is not None:
+                raise ValueError(f"予約されたファイル名です: {reserved_name}")
         
         # 拡張子を追加（正規化）
         if original_extension:
@@ -60,37 +76,71 @@ class FileRenamer:
         extension: str,
         target_directory: str
     ) -> bool:
-        """重複するファイル名をチェック"""
+        """重複するファイル名をチェック
+        
+        正規化（全角・半角、NFC/NFD）・大文字小文字の違いだけのファイルも重複とみなす。
+        """
         try:
             filename = self.generate_filename(preset, input_values, extension)
             file_path = os.path.join(target_directory, filename)
-            return os.path.exists(file_path)
+            if os.path.exists(file_path):
+                return True
+            return search_key(filename) in self._existing_name_keys(target_directory)
         except ValueError:
             return False
     
+    def _existing_name_keys(self, directory: str) -> frozenset:
+        """フォルダ内のファイル名の検索キー（フォルダの更新日時が変わるまで使い回す）"""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return frozenset()
+        cached = self._directory_keys.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            keys = frozenset(search_key(name) for name in os.listdir(directory))
+        except OSError:
+            keys = frozenset()
+        self._directory_keys[directory] = (mtime, keys)
+        return keys
+    
     def generate_preview_list(
         self,
         preset: Preset,
         file_paths: List[str],
-        input_values: Dict[str, str]
+        input_values: Dict[str, str],
+        duplicate_detector=None,
+        target_directory: Optional[str] = None,
+        skip_duplicates: bool = False
     ) -> List[FileItem]:
-        """複数ファイルのリネームプレビューを生成"""
+        """複数ファイルのリネームプレビューを生成
+        
+        duplicate_detector（DuplicateDetector）を指定すると、移動先フォルダの既存ファイル
+        または先に指定されたファイルと内容が同じファイルに duplicate_of を設定する。
+        skip_duplicates の場合、重複ファイルはプレビューから除外し番号も振らない。
+        """
         preview_list = []
+        duplicates = {}
+        if duplicate_detector is not None:
+            duplicates = duplicate_detector.find_duplicates(file_paths, target_directory).duplicates
         
-        for i, file_path in enumerate(file_paths):
-            file_item = FileItem.from_path(file_path)
+        # 番号以外の値はファイル間で共通のため、パターンの展開は1回だけ
+        template = self.preview_cache.get_template(preset, input_values)
+        
+        number = 0
+        for file_path in file_paths:
+            duplicate_of = duplicates.get(file_path)
+            if duplicate_of is not None and skip_duplicates:
+                continue
             
-            # 自動採番のため、番号フィールドがある場合は自動設定
-            auto_input_values = input_values.copy()
-            if "番号" in preset.fields:
-                auto_input_values["番号"] = f"{i + 1:03d}"
+            file_item = FileItem.from_path(file_path)
+            file_item.duplicate_of = duplicate_of
+            number += 1
             
+            # 番号フィールドがある場合は自動採番
             try:
-                new_name = self.generate_filename(
-                    preset,
-                    auto_input_values,
-                    file_item.get_original_extension()
-                )
+                new_name = template.render(f"{number:03d}", file_item.get_original_extension())
                 file_item.new_name = new_name
             except ValueError as e:
                 # エラーの場合は元の名前を保持
@@ -132,6 +182,17 @@ class FileRenamer:
         
         return self.generate_filename(preset, auto_input_values, original_extension)
     
+    def execute_renames(self, file_items: List[FileItem], rename_engine=None, label: str = ""):
+        """プレビュー済みの FileItem をその場でリネームし、RenameExecutionResult を返す
+        
+        rename_engine（RenameEngine、ジャーナル付き）を指定するとアンドゥできる。
+        ワークスペースで実行する場合は BatchManager.rename_engine を渡す。
+        """
+        from src.services.rename_engine import RenameEngine
+        
+        rename_engine = rename_engine or RenameEngine()
+        return rename_engine.execute_file_items(file_items, label)
+    
     def validate_filename_characters(self, filename: str) -> bool:
         """ファイル名の文字が有効かチェック"""
         return not self.invalid_char_pattern.search(filename)
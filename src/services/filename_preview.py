@@ -0,0 +1,213 @@
+"""
+ファイル名プレビューのキャッシュ
+
+プレビューでファイルごとに変わるのは「番号」フィールドだけなので、命名パターンは
+入力値の組み合わせごとに1回だけ展開し、番号の前後の固定部分（パーツ）を保持する。
+ファイルごとの処理は「パーツを番号でつなぐ + 拡張子」だけになる。
+
+展開結果は最近の入力値の組み合わせについて LRU で保持するため、フォームで1項目を
+書き換えて元に戻した場合も再計算しない。
+
+生成されるファイル名・エラーは FileRenamer.generate_filename と同じになる:
+  - パターンへの値の適用は generate_filename と同じ順序の置換で行う
+    （番号は区切り文字で仮置きして展開し、区切り文字でパーツに分割する）
+  - 必須項目の未入力・無効な文字・NGワード・予約名はパターンの展開時に1回だけ判定する
+    （NGワードに含まれる予約名は部分一致ではなく、拡張子を除いた名前全体の一致で判定する）
+  - 展開後の名前は text_normalizer で正規化する（番号・仮置きの文字は正規化で変化しない）
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from src.services.name_validator import find_reserved_name, ng_word_matcher, split_reserved_names
+from src.utils.text_normalizer import get_default_normalizer
+
+NUMBER_FIELD = "番号"
+
+# 最近の入力値の組み合わせを保持する数
+DEFAULT_CACHE_SIZE = 64
+
+# Windows で使用できない文字（FileRenamer と同じ）
+INVALID_CHARS = r'<>:"/\\|?*'
+_INVALID_CHAR_PATTERN = re.compile(f'[{re.escape(INVALID_CHARS)}]')
+
+# 番号の仮置きに使う文字（ファイル名には現れない）
+_NUMBER_PLACEHOLDER = "\x00"
+
+_DIGITS = frozenset("0123456789")
+
+
+class FilenameTemplate:
+    """入力値の組み合わせ1つ分の展開済みパターン"""
+
+    def __init__(self, parts: Tuple[str, ...], error: Optional[str] = None,
+                 ng_words: Tuple[str, ...] = (), ng_error: Optional[str] = None,
+                 reserved_names: FrozenSet[str] = frozenset()):
+        # 番号の前後の固定部分（番号フィールドが無い場合は1つ）
+        self.parts = parts
+        # 全ファイル共通のエラー（必須項目の未入力など）
+        self.error = error
+        # 番号をまたいで一致しうるため、ファイル名ごとに判定が必要なNGワード
+        self._per_name_ng_words = ng_words
+        self._per_name_matcher = ng_word_matcher(ng_words) if ng_words else None
+        # 固定部分に含まれるNGワード・予約名のエラー（一覧でそれより前のNGワードをファイル名ごとに判定した後に送出）
+        self._ng_error = ng_error
+        # 拡張子を除いた名前が番号を含むため、ファイル名ごとに判定が必要な予約名
+        self._per_name_reserved_names = reserved_names
+
+    @property
+    def needs_per_name_check(self) -> bool:
+        """ファイル名ごとの判定（NGワード・予約名）が必要か"""
+        return bool(self._per_name_ng_words or self._per_name_reserved_names)
+
+    @property
+    def has_number(self) -> bool:
+        return len(self.parts) > 1
+
+    def render(self, number: str, extension: str = "") -> str:
+        """番号・拡張子を当てはめたファイル名（拡張子は小文字にする）"""
+        if self.error is not None:
+            raise ValueError(self.error)
+        name = number.join(self.parts) if self.has_number else self.parts[0]
+        if self._per_name_matcher is not None:
+            ng_word = self._per_name_matcher.find(name)
+            if ng_word is not None:
+                raise ValueError(f"NGワードが含まれています: {ng_word}")
+        if self._ng_error is not None:
+            raise ValueError(self._ng_error)
+        if self._per_name_reserved_names:
+            reserved_name = find_reserved_name(name, self._per_name_reserved_names)
+            if reserved_name is not None:
+                raise ValueError(f"予約されたファイル名です: {reserved_name}")
+        return name + extension.lower()
+
+
+def _preset_key(preset) -> tuple:
+    """プリセットの内容のキー（同じIDでも編集された場合は別のキーになる）"""
+    return (preset.id, preset.naming_pattern, tuple(preset.fields),
+            tuple(sorted(preset.default_values.items())), get_default_normalizer().key)
+
+
+def compile_template(preset, input_values: Dict[str, str],
+                     ng_words: Optional[Iterable[str]] = None) -> FilenameTemplate:
+    """命名パターンに番号以外の値を適用して FilenameTemplate を作成"""
+    has_number = NUMBER_FIELD in preset.fields
+    missing_fields = []
+    for field in preset.fields:
+        if field == NUMBER_FIELD:
+            continue
+        if preset.get_field_value(field, input_values) is None:
+            missing_fields.append(field)
+    if missing_fields:
+        return FilenameTemplate(("",), f"必須項目が未入力です: {', '.join(missing_fields)}")
+
+    filename = preset.naming_pattern
+    for field in preset.fields:
+        if field == NUMBER_FIELD:
+            value = _NUMBER_PLACEHOLDER
+        else:
+            value = preset.get_field_value(field, input_values)
+        filename = filename.replace(f"{{{field}}}", value)
+    filename = get_default_normalizer().normalize(filename)
+
+    parts = tuple(filename.split(_NUMBER_PLACEHOLDER)) if has_number else (filename,)
+    if any(_INVALID_CHAR_PATTERN.search(part) for part in parts):
+        return FilenameTemplate(parts, f"無効な文字が含まれています: {INVALID_CHARS}")
+
+    normalize = get_default_normalizer().normalize
+    ng_words, reserved_names = split_reserved_names(normalize(ng_word) for ng_word in ng_words or ())
+    per_name_ng_words = []
+    for ng_word in ng_words:
+        if not ng_word:
+            # 空のNGワードは無視する（NgWordMatcher と同じ）
+            continue
+        if len(parts) > 1 and _DIGITS.intersection(ng_word):
+            # 番号の数字を含むNGワードはファイル名ごとに判定する
+            per_name_ng_words.append(ng_word)
+        elif any(ng_word in part for part in parts):
+            message = f"NGワードが含まれています: {ng_word}"
+            if not per_name_ng_words:
+                return FilenameTemplate(parts, message)
+            return FilenameTemplate(parts, None, tuple(per_name_ng_words), ng_error=message)
+
+    per_name_reserved_names: FrozenSet[str] = frozenset()
+    if reserved_names:
+        if len(parts) == 1 or "." in parts[0]:
+            # 拡張子を除いた名前が固定部分だけで決まる
+            reserved_name = find_reserved_name(parts[0], reserved_names)
+            if reserved_name is not None:
+                message = f"予約されたファイル名です: {reserved_name}"
+                if not per_name_ng_words:
+                    return FilenameTemplate(parts, message)
+                return FilenameTemplate(parts, None, tuple(per_name_ng_words), ng_error=message)
+        else:
+            # 番号の前の固定部分で始まる予約名だけをファイル名ごとに判定する
+            prefix = parts[0].upper()
+            per_name_reserved_names = frozenset(name.upper() for name in reserved_names
+                                                if name.upper().startswith(prefix))
+    return FilenameTemplate(parts, None, tuple(per_name_ng_words), reserved_names=per_name_reserved_names)
+
+
+class FilenamePreviewCache:
+    """(プリセット, 入力値) → FilenameTemplate の LRU キャッシュ（ワーカースレッドからも使える）"""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._templates: "OrderedDict[tuple, FilenameTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+    def get_template(self, preset, input_values: Dict[str, str],
+                     ng_words: Optional[Iterable[str]] = None) -> FilenameTemplate:
+        """入力値の組み合わせに対応する展開済みパターン（番号・パターンに無い項目の値はキーに含めない）"""
+        ng_words = tuple(ng_words or ())
+        values = tuple(
+            preset.get_field_value(field, input_values)
+            for field in preset.fields if field != NUMBER_FIELD
+        )
+        key = (_preset_key(preset), values, ng_words)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        template = compile_template(preset, input_values, ng_words)
+        with self._lock:
+            self._templates[key] = template
+            if len(self._templates) > self.max_entries:
+                self._templates.popitem(last=False)
+        return template
+
+    def render(self, preset, input_values: Dict[str, str], number: str, extension: str = "") -> str:
+        """1ファイル分のファイル名（FileRenamer.generate_filename と同じ結果）"""
+        return self.get_template(preset, input_values).render(number, extension)
+
+    def preview_names(self, preset, input_values: Dict[str, str], file_names: Iterable[str],
+                      start_number: int = 1) -> List[str]:
+        """ファイル名の一覧に番号を振ったプレビュー（パターンが不正な場合は ValueError）"""
+        template = self.get_template(preset, input_values)
+        if template.error is not None:
+            raise ValueError(template.error)
+        splitext = os.path.splitext
+        if template.needs_per_name_check:
+            return [template.render(f"{number:03d}", splitext(file_name)[1])
+                    for number, file_name in enumerate(file_names, start_number)]
+
+        # ファイルごとの判定が不要な場合は番号・拡張子をつなぐだけ
+        if not template.has_number:
+            name = template.parts[0]
+            return [name + splitext(file_name)[1].lower() for file_name in file_names]
+        parts = template.parts
+        return [f"{number:03d}".join(parts) + splitext(file_name)[1].lower()
+                for number, file_name in enumerate(file_names, start_number)]
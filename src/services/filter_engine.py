@@ -0,0 +1,339 @@
+"""
+フィルタエンジン
+
+作業用フォルダを1回だけ走査し、ファイル名から解析したプリセット項目に対して
+AND/OR 条件を評価して、一致したファイルを display フォルダへ並列に移動する。
+(FR-401 / FR-402 / FR-404)
+
+BatchGenerator.generate_filter_batch は条件ごとに for ループでフォルダ全体を
+走査し、条件が実質的に OR として扱われるため、こちらを使う。
+移動したファイルの一覧は FilterResult に記録され、復元に使用できる。
+FileIndex を指定した場合は走査の代わりにインデックスで検索し、移動をインデックスに反映する
+（検索の前に refresh_directory でアプリ外の変更を反映する）。
+FilterJournal を指定した場合は移動をジャーナルに記録し、restore_journal で逆順に復元する。
+"""
+
+import os
+import re
+import shutil
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from src.utils.filename_parser import FilenameParser
+from src.utils.text_normalizer import normalize_text
+
+if TYPE_CHECKING:
+    from src.services.file_index import FileIndex
+    from src.services.filter_journal import FilterJournal, JournaledFilter
+
+DISPLAY_DIRECTORY_NAME = "display"
+
+# 1スレッドがまとめて移動するファイル数
+MOVE_CHUNK_SIZE = 256
+
+ConditionValue = Union[str, List[str]]
+
+
+def _compile_value_matcher(value: str) -> Callable[[str], bool]:
+    """条件値を判定関数に変換（* と ? を含む場合はワイルドカード、それ以外は完全一致）
+
+    条件値・項目値はどちらも正規化して比較する（FileIndex と同じ）。
+    """
+    value = normalize_text(value)
+    if "*" in value or "?" in value:
+        return re.compile(fnmatch.translate(value)).match
+    return value.__eq__
+
+
+class FilterResult:
+    """フィルタ実行結果"""
+
+    def __init__(self, source_directory: str, display_directory: str,
+                 conditions: Dict[str, ConditionValue], operator: str):
+        self.source_directory = source_directory
+        self.display_directory = display_directory
+        self.conditions = conditions
+        self.operator = operator
+        self.scanned_count = 0
+        self.matched_count = 0
+        self.moved_files: List[str] = []
+        self.errors: List[str] = []
+        self.filter_id: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict:
+        return {
+            "source_directory": self.source_directory,
+            "display_directory": self.display_directory,
+            "conditions": self.conditions,
+            "operator": self.operator,
+            "scanned_count": self.scanned_count,
+            "matched_count": self.matched_count,
+            "moved_files": list(self.moved_files),
+            "errors": list(self.errors),
+            "filter_id": self.filter_id
+        }
+
+
+class FilterEngine:
+    """プリセット項目によるファイルフィルタ"""
+
+    def __init__(self, parser: Optional[FilenameParser] = None, max_workers: int = 8,
+                 index: Optional['FileIndex'] = None, journal: Optional['FilterJournal'] = None):
+        self.parser = parser or FilenameParser.stock_format()
+        self.max_workers = max_workers
+        self.index = index
+        self.journal = journal
+
+    def build_predicate(self, conditions: Dict[str, ConditionValue],
+                        operator: str = "AND") -> Callable[[Dict[str, str]], bool]:
+        """条件を解析済みフィールドに対する判定関数に変換
+
+        conditions: {フィールド名: 値 または 値のリスト}（リストはいずれかに一致）
+        operator: フィールド間の結合 "AND" または "OR"
+        """
+        operator = operator.upper()
+        if operator not in ("AND", "OR"):
+            raise ValueError(f"不正な結合条件です: {operator}")
+
+        compiled = []
+        for field_name, value in conditions.items():
+            values = [value] if isinstance(value, str) else list(value)
+            compiled.append((field_name, [_compile_value_matcher(v) for v in values]))
+
+        def field_matches(fields: Dict[str, str], field_name: str, matchers) -> bool:
+            field_value = fields.get(field_name)
+            if field_value is None:
+                return False
+            field_value = normalize_text(field_value)
+            return any(m(field_value) for m in matchers)
+
+        if not compiled:
+            # 条件なしでは何も対象にしない（FileIndex.query と同じ）
+            return lambda fields: False
+        if operator == "AND":
+            return lambda fields: all(field_matches(fields, f, m) for f, m in compiled)
+        return lambda fields: any(field_matches(fields, f, m) for f, m in compiled)
+
+    def find_matches(self, source_directory: str, conditions: Dict[str, ConditionValue],
+                     operator: str = "AND", result: Optional[FilterResult] = None) -> List[str]:
+        """フォルダを1回走査して条件に一致するファイル名を返す"""
+        if self.index is not None:
+            self.index.refresh_directory(source_directory)
+            matches = self.index.query(source_directory, conditions, operator)
+            if result is not None:
+                result.scanned_count = self.index.count(source_directory)
+                result.matched_count = len(matches)
+            return matches
+
+        predicate = self.build_predicate(conditions, operator)
+        parse = self.parser.parse
+        matches = []
+        scanned = 0
+
+        with os.scandir(source_directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                scanned += 1
+                fields = parse(entry.name)
+                if fields is not None and predicate(fields):
+                    matches.append(entry.name)
+
+        if result is not None:
+            result.scanned_count = scanned
+            result.matched_count = len(matches)
+        return matches
+
+    def apply_filter(self, source_directory: str, conditions: Dict[str, ConditionValue],
+                     operator: str = "AND", display_directory: Optional[str] = None) -> FilterResult:
+        """条件に一致するファイルを display フォルダへ移動"""
+        display_directory = display_directory or os.path.join(source_directory, DISPLAY_DIRECTORY_NAME)
+        result = FilterResult(source_directory, display_directory, conditions, operator.upper())
+
+        matches = self.find_matches(source_directory, conditions, operator, result)
+        if self.journal is not None:
+            result.filter_id = self.journal.begin_filter(
+                conditions, result.operator, source_directory, display_directory
+            )
+            # 中断しても復元できるよう、移動前に記録する
+            self.journal.record_moves(result.filter_id, source_directory, display_directory, matches)
+
+        if matches:
+            os.makedirs(display_directory, exist_ok=True)
+            moved, errors = self._move_files(matches, source_directory, display_directory)
+            if self.index is not None:
+                self.index.move_many(moved, source_directory, display_directory)
+            result.moved_files = moved
+            result.errors = errors
+
+        if self.journal is not None:
+            self.journal.complete_filter(result.filter_id, len(result.moved_files), result.errors)
+        return result
+
+    def restore(self, result: FilterResult) -> FilterResult:
+        """フィルタで移動したファイルを元のフォルダへ戻す（FR-403）"""
+        if self.journal is not None and result.filter_id is not None:
+            restored_results = self.restore_journal(result.filter_id)
+            if restored_results:
+                return restored_results[0]
+            # 復元済み
+            restored = FilterResult(result.display_directory, result.source_directory,
+                                    result.conditions, result.operator)
+            restored.filter_id = result.filter_id
+            return restored
+
+        restored = FilterResult(result.display_directory, result.source_directory,
+                                result.conditions, result.operator)
+        restored.scanned_count = restored.matched_count = len(result.moved_files)
+        restored.moved_files, restored.errors = self._move_files(
+            result.moved_files, result.display_directory, result.source_directory
+        )
+        if self.index is not None:
+            self.index.move_many(restored.moved_files, result.display_directory, result.source_directory)
+        return restored
+
+    def restore_journal(self, filter_id: Optional[str] = None) -> List[FilterResult]:
+        """ジャーナルに記録された未復元のフィルタを新しい順に復元（FR-403）
+
+        filter_id を指定した場合はそのフィルタのみ復元する。
+        移動先にファイルが無く移動元にある（復元済み・移動前に中断した）ファイルは
+        スキップするため、中断後に再実行すれば続きから復元される。
+        """
+        if self.journal is None:
+            raise ValueError("フィルタジャーナルが設定されていません")
+
+        pending = self.journal.get_pending_restores()
+        if filter_id is not None:
+            pending = [entry for entry in pending if entry.filter_id == filter_id]
+        return [self._restore_entry(entry) for entry in pending]
+
+    def _restore_entry(self, entry: 'JournaledFilter') -> FilterResult:
+        restored = FilterResult(entry.display_directory, entry.source_directory,
+                                entry.conditions, entry.operator)
+        restored.filter_id = entry.filter_id
+
+        # 記録と逆順に、(移動先 → 移動元) のフォルダ単位でまとめる
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for source_directory, target_directory, filenames in reversed(entry.moves):
+            done = entry.restored_files.get(source_directory, set())
+            files = groups.setdefault((target_directory, source_directory), [])
+            for filename in reversed(filenames):
+                if filename in done:
+                    continue
+                if os.path.exists(os.path.join(target_directory, filename)):
+                    files.append(filename)
+                elif not os.path.exists(os.path.join(source_directory, filename)):
+                    restored.errors.append(f"ファイルが見つかりません: {filename}")
+
+        groups = {key: files for key, files in groups.items() if files}
+        restored.scanned_count = restored.matched_count = sum(len(f) for f in groups.values())
+
+        outcomes = self._run_moves([(files, src, dst) for (src, dst), files in groups.items()])
+        for ((src, dst), _), (moved, errors) in zip(groups.items(), outcomes):
+            if self.index is not None:
+                self.index.move_many(moved, src, dst)
+            self.journal.record_restored(entry.filter_id, dst, moved)
+            restored.moved_files.extend(moved)
+            restored.errors.extend(errors)
+
+        if not restored.errors:
+            self.journal.complete_restore(entry.filter_id)
+        return restored
+
+    def rerun_filter(self, filter_id: str) -> FilterResult:
+        """フィルタ履歴の条件で再実行（FR-405）"""
+        if self.journal is None:
+            raise ValueError("フィルタジャーナルが設定されていません")
+        entry = self.journal.get_filter(filter_id)
+        if entry is None:
+            raise ValueError(f"フィルタ履歴が見つかりません: {filter_id}")
+        return self.apply_filter(entry.source_directory, entry.conditions, entry.operator,
+                                 entry.display_directory)
+
+    def write_restore_batches(self, filter_id: str, batch_generator=None) -> List[str]:
+        """未復元のファイルを戻す復元用バッチファイルを filter_batches/ に保存"""
+        from services.batch_generator import BatchGenerator
+
+        if self.journal is None:
+            raise ValueError("フィルタジャーナルが設定されていません")
+        entry = self.journal.get_filter(filter_id)
+        if entry is None:
+            raise ValueError(f"フィルタ履歴が見つかりません: {filter_id}")
+
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for source_directory, target_directory, filenames in reversed(entry.moves):
+            done = entry.restored_files.get(source_directory, set())
+            groups.setdefault((target_directory, source_directory), []).extend(
+                f for f in reversed(filenames) if f not in done
+            )
+
+        batch_generator = batch_generator or BatchGenerator()
+        paths = []
+        for number, ((display_directory, source_directory), files) in enumerate(groups.items(), 1):
+            if not files:
+                continue
+            content = batch_generator.generate_restore_batch(files, display_directory, source_directory)
+            suffix = f"_{number}" if len(groups) > 1 else ""
+            paths.append(batch_generator.save_batch_file(
+                content, self.journal.directory, f"restore_{filter_id}{suffix}.bat"
+            ))
+        return paths
+
+    def _move_files(self, filenames: List[str], source_directory: str,
+                    target_directory: str) -> tuple:
+        """ファイルを並列に移動し、(移動したファイル一覧, エラー一覧) を返す"""
+        return self._run_moves([(filenames, source_directory, target_directory)])[0]
+
+    def _run_moves(self, groups: List[Tuple[List[str], str, str]]) -> List[tuple]:
+        """(ファイル一覧, 移動元, 移動先) のグループをチャンク単位で並列に移動
+
+        戻り値はグループごとの (移動したファイル一覧, エラー一覧)
+        """
+        tasks = []
+        for group_number, (filenames, source_directory, target_directory) in enumerate(groups):
+            for i in range(0, len(filenames), MOVE_CHUNK_SIZE):
+                tasks.append((group_number, filenames[i:i + MOVE_CHUNK_SIZE],
+                              source_directory, target_directory))
+
+        def run(task):
+            return self._move_chunk(task[1], task[2], task[3])
+
+        if len(tasks) <= 1 or self.max_workers <= 1:
+            outcomes = [run(task) for task in tasks]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                outcomes = list(executor.map(run, tasks))
+
+        # 結果はチャンク順（＝記録順）に並べる
+        results = [([], []) for _ in groups]
+        for task, (chunk_moved, chunk_errors) in zip(tasks, outcomes):
+            results[task[0]][0].extend(chunk_moved)
+            results[task[0]][1].extend(chunk_errors)
+        return results
+
+    @staticmethod
+    def _move_chunk(filenames: List[str], source_directory: str, target_directory: str) -> tuple:
+        moved = []
+        errors = []
+        for filename in filenames:
+            source_path = os.path.join(source_directory, filename)
+            target_path = os.path.join(target_directory, filename)
+            if os.path.exists(target_path):
+                # 既存ファイルは上書きしない
+                errors.append(f"移動先に同名のファイルがあります: {filename}")
+                continue
+            try:
+                try:
+                    os.rename(source_path, target_path)
+                except OSError:
+                    # 別ドライブなど rename できない場合
+                    shutil.move(source_path, target_path)
+                moved.append(filename)
+            except OSError as e:
+                errors.append(f"{filename}: {e}")
+        return moved, errors
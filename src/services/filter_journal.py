@@ -0,0 +1,196 @@
+"""
+フィルタジャーナル
+
+フィルタによるファイル移動を filter_batches/ 内の追記専用ファイル（JSON Lines）に記録する。
+移動は実行前に記録し（先行書き込み）、復元はジャーナルを逆順に再生する。
+途中で中断した場合も、ジャーナルとファイルの実在を照合して再開できる。
+
+記録の種類:
+  filter            フィルタの開始（条件・移動元・移動先）
+  moves             移動予定のファイル（移動前に記録）
+  filter_complete   フィルタの完了（移動件数・エラー）
+  restored          復元したファイル
+  restore_complete  復元の完了
+"""
+
+import os
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+JOURNAL_FILENAME = "filter_journal.jsonl"
+FILTER_BATCHES_DIRECTORY_NAME = "filter_batches"
+
+
+class JournaledFilter:
+    """ジャーナルから復元したフィルタ1回分の記録"""
+
+    def __init__(self, filter_id: str, conditions: Dict[str, Any], operator: str,
+                 source_directory: str, display_directory: str, created_at: str):
+        self.filter_id = filter_id
+        self.conditions = conditions
+        self.operator = operator
+        self.source_directory = source_directory
+        self.display_directory = display_directory
+        self.created_at = created_at
+        # (移動元, 移動先, ファイル名一覧) の記録順
+        self.moves: List[Tuple[str, str, List[str]]] = []
+        self.completed = False
+        self.moved_count = 0
+        self.errors: List[str] = []
+        self.restored_files: Dict[str, set] = {}
+        self.restored = False
+
+    @property
+    def planned_count(self) -> int:
+        return sum(len(files) for _, _, files in self.moves)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "filter_id": self.filter_id,
+            "conditions": self.conditions,
+            "operator": self.operator,
+            "source_directory": self.source_directory,
+            "display_directory": self.display_directory,
+            "created_at": self.created_at,
+            "moved_count": self.moved_count,
+            "completed": self.completed,
+            "restored": self.restored
+        }
+
+
+class FilterJournal:
+    """フィルタ移動の追記専用ジャーナル"""
+
+    def __init__(self, journal_path: str):
+        self.journal_path = journal_path
+
+    @classmethod
+    def for_workspace(cls, workspace_path: str) -> 'FilterJournal':
+        """ワークスペースの filter_batches/ に置くジャーナル"""
+        return cls(os.path.join(workspace_path, FILTER_BATCHES_DIRECTORY_NAME, JOURNAL_FILENAME))
+
+    @property
+    def directory(self) -> str:
+        return os.path.dirname(self.journal_path)
+
+    def _append(self, records: List[Dict[str, Any]]):
+        """記録を追記してディスクに書き出す"""
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    # --- 記録 ---
+
+    def begin_filter(self, conditions: Dict[str, Any], operator: str,
+                     source_directory: str, display_directory: str) -> str:
+        """フィルタの開始を記録し、フィルタIDを返す"""
+        filter_id = uuid.uuid4().hex[:12]
+        self._append([{
+            "type": "filter",
+            "filter_id": filter_id,
+            "conditions": conditions,
+            "operator": operator,
+            "source_directory": os.path.abspath(source_directory),
+            "display_directory": os.path.abspath(display_directory),
+            "created_at": datetime.now().isoformat()
+        }])
+        return filter_id
+
+    def record_moves(self, filter_id: str, source_directory: str, target_directory: str,
+                     filenames: List[str]):
+        """移動予定のファイルを記録（実際の移動より前に呼ぶ）"""
+        if filenames:
+            self._append([{
+                "type": "moves",
+                "filter_id": filter_id,
+                "from": os.path.abspath(source_directory),
+                "to": os.path.abspath(target_directory),
+                "files": list(filenames)
+            }])
+
+    def complete_filter(self, filter_id: str, moved_count: int, errors: List[str]):
+        """フィルタの完了を記録"""
+        self._append([{
+            "type": "filter_complete",
+            "filter_id": filter_id,
+            "moved_count": moved_count,
+            "errors": list(errors)
+        }])
+
+    def record_restored(self, filter_id: str, directory: str, filenames: List[str]):
+        """元のフォルダへ戻したファイルを記録"""
+        if filenames:
+            self._append([{
+                "type": "restored",
+                "filter_id": filter_id,
+                "directory": os.path.abspath(directory),
+                "files": list(filenames)
+            }])
+
+    def complete_restore(self, filter_id: str):
+        """復元の完了を記録"""
+        self._append([{
+            "type": "restore_complete",
+            "filter_id": filter_id,
+            "restored_at": datetime.now().isoformat()
+        }])
+
+    # --- 読み込み ---
+
+    def read_records(self) -> List[Dict[str, Any]]:
+        """全記録を読み込み（書き込み途中で中断した最終行は無視）"""
+        records = []
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return records
+
+    def get_filters(self) -> List[JournaledFilter]:
+        """フィルタの記録を実行順に取得（フィルタ履歴, FR-405）"""
+        filters: Dict[str, JournaledFilter] = {}
+        for record in self.read_records():
+            filter_id = record.get("filter_id")
+            record_type = record.get("type")
+            if record_type == "filter":
+                filters[filter_id] = JournaledFilter(
+                    filter_id, record["conditions"], record["operator"],
+                    record["source_directory"], record["display_directory"], record["created_at"]
+                )
+                continue
+
+            entry = filters.get(filter_id)
+            if entry is None:
+                continue
+            if record_type == "moves":
+                entry.moves.append((record["from"], record["to"], record["files"]))
+            elif record_type == "filter_complete":
+                entry.completed = True
+                entry.moved_count = record["moved_count"]
+                entry.errors = record["errors"]
+            elif record_type == "restored":
+                entry.restored_files.setdefault(record["directory"], set()).update(record["files"])
+            elif record_type == "restore_complete":
+                entry.restored = True
+        return list(filters.values())
+
+    def get_filter(self, filter_id: str) -> Optional[JournaledFilter]:
+        for entry in self.get_filters():
+            if entry.filter_id == filter_id:
+                return entry
+        return None
+
+    def get_pending_restores(self) -> List[JournaledFilter]:
+        """未復元のフィルタを新しい順に取得"""
+        return [entry for entry in reversed(self.get_filters()) if not entry.restored]
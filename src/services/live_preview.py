@@ -0,0 +1,220 @@
+"""
+ライブプレビュー（入力中のリネーム後ファイル名）
+
+入力フォームの値が変わるたびに、選択中のファイルのリネーム後の名前をワーカーで計算する。
+  - PreviewSource: 選択中のファイル（名前・拡張子・フォルダ）と各フォルダの既存ファイル名。
+    選択が変わったときに1回だけ作成する（フォルダの走査を伴う）
+  - build_preview: 入力値からすべての行の名前・エラーを計算し、直前の PreviewState から
+    名前・エラーが変わった行の番号を返す（UIは変わった行のうち表示中の行だけを書き換える）
+
+行ごとのエラー:
+  - 入力値のエラー（必須項目の未入力・無効な文字・NGワード）: FileRenamer と同じ判定で全行に共通
+  - 番号の数字を含むNGワード: 行ごと
+  - 重複: 同じフォルダで選択中の前の行と同じ名前、または既存ファイルと同じ名前
+    （正規化・大文字小文字の違いは区別しない。選択中のファイル自身の現在の名前は除く）
+  - 内容の重複: 同じフォルダの既存ファイル・選択中の前の行と内容が同じファイル
+    （PreviewSource.scan に DuplicateDetector を渡した場合のみ。入力値に依存しないため走査時に1回だけ判定）
+  - 予約名（CON など）・ファイル名やフルパスの長さ: NameValidator で全行をまとめて判定
+"""
+
+import os
+import bisect
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.services.drop_pipeline import iter_dropped_files
+from src.services.filename_preview import FilenamePreviewCache
+from src.services.name_validator import NameValidator
+from src.utils.extension_matcher import ExtensionMatcher
+from src.utils.text_normalizer import search_key
+
+# キャンセルを確認する間隔（行数）
+CANCEL_CHECK_INTERVAL = 5000
+
+# 無効な文字・NGワードはパターンの展開時に判定済みのため、予約名・長さだけを判定する
+_NAME_VALIDATOR = NameValidator(invalid_chars="")
+
+
+class PreviewSource:
+    """プレビュー対象のファイル一覧（作成後は変更しない）"""
+
+    def __init__(self, file_paths: Iterable[str],
+                 existing_names: Optional[Dict[str, Iterable[str]]] = None,
+                 duplicates: Optional[Dict[str, str]] = None):
+        self.file_paths: List[str] = list(file_paths)
+        self.file_names: List[str] = []
+        self.extensions: List[str] = []
+        # 行ごとのフォルダ番号（self.directories の添字）
+        self.directory_indexes: List[int] = []
+        self.directories: List[str] = []
+        directory_index: Dict[str, int] = {}
+        for path in self.file_paths:
+            directory, name = os.path.split(path)
+            index = directory_index.get(directory)
+            if index is None:
+                index = directory_index[directory] = len(self.directories)
+                self.directories.append(directory)
+            self.directory_indexes.append(index)
+            self.file_names.append(name)
+            self.extensions.append(os.path.splitext(name)[1])
+
+        # フォルダごとの既存ファイル名の検索キー（選択中のファイルは除く）
+        selected = {(index, search_key(name)) for index, name in zip(self.directory_indexes, self.file_names)}
+        self.existing_names: Dict[int, frozenset] = {}
+        for directory, names in (existing_names or {}).items():
+            index = directory_index.get(directory)
+            if index is None:
+                continue
+            self.existing_names[index] = frozenset(
+                key for key in map(search_key, names) if (index, key) not in selected
+            )
+
+        # 行 → 内容が同じファイルの名前（DuplicateReport.duplicates の形式から変換）
+        self.duplicate_names: Dict[int, str] = {}
+        if duplicates:
+            for index, path in enumerate(self.file_paths):
+                original = duplicates.get(path)
+                if original is not None:
+                    self.duplicate_names[index] = os.path.basename(original)
+
+    def __len__(self) -> int:
+        return len(self.file_paths)
+
+    @property
+    def row_directories(self) -> List[str]:
+        """行ごとのフォルダ"""
+        return [self.directories[index] for index in self.directory_indexes]
+
+    @classmethod
+    def scan(cls, paths: Iterable[str], target_extensions: Optional[Iterable[str]] = None,
+             check_cancelled: Optional[Callable[[], None]] = None,
+             duplicate_detector=None) -> 'PreviewSource':
+        """ドロップされたパスを展開し、各フォルダの既存ファイル名を読み込む（ワーカーで実行する）
+
+        duplicate_detector（DuplicateDetector）を指定すると、フォルダごとに内容が同じファイルも検出する。
+        """
+        matcher = ExtensionMatcher(target_extensions) if target_extensions is not None else None
+        file_paths = []
+        for path in iter_dropped_files(paths):
+            if matcher is None or matcher.match_extension(path) is not None:
+                file_paths.append(path)
+            if check_cancelled and len(file_paths) % CANCEL_CHECK_INTERVAL == 0:
+                check_cancelled()
+
+        existing_names = {}
+        for directory in dict.fromkeys(os.path.dirname(path) for path in file_paths):
+            try:
+                with os.scandir(directory or ".") as entries:
+                    existing_names[directory] = [entry.name for entry in entries]
+            except OSError:
+                existing_names[directory] = []
+            if check_cancelled:
+                check_cancelled()
+
+        duplicates: Dict[str, str] = {}
+        if duplicate_detector is not None:
+            by_directory: Dict[str, List[str]] = {}
+            for path in file_paths:
+                by_directory.setdefault(os.path.dirname(path), []).append(path)
+            for directory, directory_paths in by_directory.items():
+                duplicates.update(duplicate_detector.find_duplicates(directory_paths, directory or ".").duplicates)
+                if check_cancelled:
+                    check_cancelled()
+        return cls(file_paths, existing_names, duplicates)
+
+
+class PreviewState:
+    """入力値1組分のプレビュー結果（作成後は変更しない）"""
+
+    def __init__(self, source: PreviewSource, names: List[str],
+                 row_errors: Dict[int, str], form_error: Optional[str] = None):
+        self.source = source
+        # リネーム後の名前（エラーの行は空文字列）
+        self.names = names
+        self.row_errors = row_errors
+        # 全行に共通のエラー（入力値のエラー）
+        self.form_error = form_error
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def error_count(self) -> int:
+        return len(self.names) if self.form_error is not None else len(self.row_errors)
+
+    def error_for(self, index: int) -> Optional[str]:
+        if self.form_error is not None:
+            return self.form_error
+        return self.row_errors.get(index)
+
+    def row(self, index: int) -> Tuple[str, str, Optional[str]]:
+        """(元の名前, リネーム後の名前, エラー)"""
+        return self.source.file_names[index], self.names[index], self.error_for(index)
+
+
+def changed_rows(base: Optional[PreviewState], state: PreviewState) -> List[int]:
+    """base から名前・エラーが変わった行の番号（昇順）"""
+    if base is None or base.source is not state.source or base.form_error != state.form_error:
+        return list(range(len(state)))
+
+    changed = {index for index, old, new in zip(range(len(state)), base.names, state.names)
+               if old != new}
+    for index in base.row_errors.keys() | state.row_errors.keys():
+        if base.row_errors.get(index) != state.row_errors.get(index):
+            changed.add(index)
+    return sorted(changed)
+
+
+def build_preview(cache: FilenamePreviewCache, source: PreviewSource, preset,
+                  input_values: Dict[str, str], ng_words: Optional[Iterable[str]] = None,
+                  base: Optional[PreviewState] = None,
+                  check_cancelled: Optional[Callable[[], None]] = None) -> Tuple[PreviewState, List[int]]:
+    """全行のプレビューを計算し、(PreviewState, base から変わった行) を返す"""
+    template = cache.get_template(preset, input_values, ng_words)
+    if template.error is not None:
+        state = PreviewState(source, [""] * len(source), {}, template.error)
+        return state, changed_rows(base, state)
+
+    names: List[str] = []
+    row_errors: Dict[int, str] = {}
+    # (フォルダ番号, 名前の検索キー) → 最初にその名前になった行
+    claimed: Dict[Tuple[int, str], int] = {}
+    existing_names = source.existing_names
+    duplicate_names = source.duplicate_names
+    render = template.render
+    for index, (extension, directory) in enumerate(zip(source.extensions, source.directory_indexes)):
+        if check_cancelled and index % CANCEL_CHECK_INTERVAL == 0:
+            check_cancelled()
+        try:
+            name = render(f"{index + 1:03d}", extension)
+        except ValueError as e:
+            names.append("")
+            row_errors[index] = str(e)
+            continue
+
+        names.append(name)
+        duplicate_of = duplicate_names.get(index)
+        if duplicate_of is not None:
+            row_errors[index] = f"内容が同じファイルがあります: {duplicate_of}"
+            continue
+        key = (directory, search_key(name))
+        first = claimed.get(key)
+        if first is not None:
+            row_errors[index] = f"ファイル名が重複しています: {name}（{first + 1}行目）"
+        elif key[1] in existing_names.get(directory, ()):
+            row_errors[index] = f"同名のファイルが既に存在します: {name}"
+        else:
+            claimed[key] = index
+
+    if check_cancelled:
+        check_cancelled()
+    for index, message in _NAME_VALIDATOR.validate_names(names, source.row_directories).items():
+        if names[index]:
+            row_errors.setdefault(index, message)
+
+    state = PreviewState(source, names, row_errors)
+    return state, changed_rows(base, state)
+
+
+def rows_in_range(rows: List[int], first: int, last: int) -> List[int]:
+    """昇順の行番号のうち first 以上 last 未満のもの（表示中の行の絞り込み）"""
+    return rows[bisect.bisect_left(rows, first):bisect.bisect_left(rows, last)]
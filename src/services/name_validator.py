@@ -0,0 +1,213 @@
+"""
+ファイル名の一括検証
+
+  - NGワード: すべてのNGワードを1つの正規表現（トライ木から作成）にまとめ、
+    ファイル名1つにつき1回の検索で判定する
+  - 予約名（CON, PRN, COM1 など）: 部分一致ではなく、拡張子・末尾の空白を除いた名前の完全一致
+    （大文字・小文字は区別しない。CON.txt は予約名、ICON.png・CONFIG.json は予約名ではない）
+  - 長さ: ファイル名（UTF-16 で255文字）・フルパス（MAX_PATH）の上限
+
+validate_names はファイル名の一覧を区切り文字でつないだ1つの文字列に対して
+無効な文字・NGワード・予約名の正規表現をそれぞれ1回だけ実行し、一致した位置から行を求める。
+"""
+
+import re
+import bisect
+import itertools
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from src.utils.text_normalizer import get_default_normalizer, normalize_text
+
+# Windows で使用できない文字（FileRenamer と同じ）
+INVALID_CHARS = r'<>:"/\\|?*'
+
+# Windows の予約デバイス名
+RESERVED_NAMES = frozenset(
+    ["CON", "PRN", "AUX", "NUL"]
+    + [f"{prefix}{digit}" for prefix in ("COM", "LPT") for digit in "123456789¹²³"]
+)
+
+# ファイル名の上限（UTF-16 の文字数）
+MAX_NAME_LENGTH = 255
+
+# フルパスの上限（MAX_PATH は終端の NUL を含む260文字）
+MAX_PATH_LENGTH = 259
+
+# ファイル名の一覧をつなぐ区切り文字（ファイル名・NGワードには現れない）
+_SEPARATOR = "\x00"
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """単語の集合に一致する正規表現（共通の接頭辞をまとめ、各位置で木を1回たどるだけにする）"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if terminal else body
+
+    return build(trie)
+
+
+def split_reserved_names(words: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """NGワードの一覧を (部分一致で判定する語, 予約名) に分ける（設定のNGワードには予約名が含まれる）"""
+    ng_words, reserved = [], []
+    for word in words:
+        (reserved if word.upper() in RESERVED_NAMES else ng_words).append(word)
+    return ng_words, reserved
+
+
+def find_reserved_name(name: str, reserved_names: Iterable[str]) -> Optional[str]:
+    """拡張子・末尾の空白を除いた名前が予約名と一致すればその部分を返す（NameValidator と同じ完全一致）
+
+    reserved_names は大文字の frozenset を渡すと変換せずに判定する（ng_word_rules の戻り値）。
+    """
+    if not isinstance(reserved_names, frozenset):
+        reserved_names = frozenset(reserved.upper() for reserved in reserved_names)
+    base = name.split(".", 1)[0].rstrip(" ")
+    if base.upper() in reserved_names:
+        return base
+    return None
+
+
+class NgWordMatcher:
+    """NGワードの一括照合（NGワードはファイル名と同じく正規化して照合する）"""
+
+    def __init__(self, words: Iterable[str]):
+        # 空のNGワードは無視する
+        self.words: Tuple[str, ...] = tuple(dict.fromkeys(normalize_text(word) for word in words if word))
+        self.pattern = re.compile(_trie_pattern(self.words)) if self.words else None
+
+    def __bool__(self) -> bool:
+        return bool(self.words)
+
+    def find(self, text: str) -> Optional[str]:
+        """text に含まれるNGワード（複数ある場合は一覧で先に指定されたもの）"""
+        if self.pattern is None or self.pattern.search(text) is None:
+            return None
+        for word in self.words:
+            if word in text:
+                return word
+        return None
+
+
+@lru_cache(maxsize=16)
+def ng_word_matcher(words: Tuple[str, ...]) -> NgWordMatcher:
+    """NGワードの組み合わせごとにコンパイル済みの NgWordMatcher を共有する"""
+    return NgWordMatcher(words)
+
+
+@lru_cache(maxsize=16)
+def _ng_word_rules(words: Tuple[str, ...], normalizer_key: str) -> Tuple[NgWordMatcher, FrozenSet[str]]:
+    ng_words, reserved = split_reserved_names(normalize_text(word) for word in words)
+    return NgWordMatcher(ng_words), frozenset(name.upper() for name in reserved)
+
+
+def ng_word_rules(words: Tuple[str, ...]) -> Tuple[NgWordMatcher, FrozenSet[str]]:
+    """設定のNGワードを (部分一致で判定する NgWordMatcher, 名前全体の一致で判定する予約名（大文字）) に分ける
+
+    正規化・分割は NGワードの組み合わせ（と正規化の方式）ごとに1回だけ行い、結果を共有する。
+    """
+    return _ng_word_rules(words, get_default_normalizer().key)
+
+
+class NameValidator:
+    """ファイル名の検証（無効な文字・NGワード・予約名・長さ）"""
+
+    def __init__(self, ng_words: Iterable[str] = (), reserved_names: Iterable[str] = RESERVED_NAMES,
+                 invalid_chars: str = INVALID_CHARS, max_name_length: int = MAX_NAME_LENGTH,
+                 max_path_length: int = MAX_PATH_LENGTH):
+        self.ng_words = ng_word_matcher(tuple(ng_words))
+        self.reserved_names = frozenset(name.upper() for name in reserved_names)
+        self.invalid_chars = invalid_chars
+        self.max_name_length = max_name_length
+        self.max_path_length = max_path_length
+        self._invalid_pattern = re.compile(f"[{re.escape(invalid_chars)}]") if invalid_chars else None
+        # 区切り文字の直後から始まり、拡張子・末尾の空白を除くと予約名になるもの
+        self._reserved_pattern = None
+        if self.reserved_names:
+            self._reserved_pattern = re.compile(
+                f"(?<![^{_SEPARATOR}])(?:{_trie_pattern(self.reserved_names)}) *(?=[.{_SEPARATOR}]|\\Z)",
+                re.IGNORECASE
+            )
+
+    @classmethod
+    def from_settings(cls, settings) -> 'NameValidator':
+        """アプリケーション設定から作成（NGワードに含まれる予約名は完全一致で判定する）"""
+        ng_words, reserved = split_reserved_names(settings.get_ng_words())
+        return cls(ng_words, RESERVED_NAMES.union(name.upper() for name in reserved),
+                   settings.get_invalid_chars())
+
+    def validate_name(self, name: str, directory: Optional[str] = None) -> Optional[str]:
+        """1つのファイル名を検証し、エラーメッセージを返す（問題が無ければ None）"""
+        return self.validate_names([name], [directory] if directory is not None else None).get(0)
+
+    def validate_names(self, names: Sequence[str],
+                       directories: Optional[Sequence[str]] = None) -> Dict[int, str]:
+        """ファイル名の一覧を検証し、{行番号: エラーメッセージ} を返す
+
+        directories を指定した場合（names と同じ長さ）はフルパスの長さも判定する。
+        1行に複数の問題がある場合は 無効な文字 → NGワード → 予約名 → 長さ の順で最初のものを返す。
+        """
+        names = list(names)
+        errors: Dict[int, str] = {}
+        if not names:
+            return errors
+
+        text = _SEPARATOR.join(names)
+        starts = list(itertools.accumulate((len(name) + 1 for name in names[:-1]), initial=0))
+
+        def rows(pattern):
+            for match in pattern.finditer(text):
+                yield bisect.bisect_right(starts, match.start()) - 1
+
+        if self._invalid_pattern is not None:
+            for index in rows(self._invalid_pattern):
+                errors.setdefault(index, f"無効な文字が含まれています: {self.invalid_chars}")
+        if self.ng_words:
+            for index in rows(self.ng_words.pattern):
+                if index not in errors:
+                    errors[index] = f"NGワードが含まれています: {self.ng_words.find(names[index])}"
+        if self._reserved_pattern is not None:
+            for match in self._reserved_pattern.finditer(text):
+                index = bisect.bisect_right(starts, match.start()) - 1
+                errors.setdefault(index, f"予約されたファイル名です: {match.group().rstrip(' ')}")
+
+        self._check_lengths(names, directories, errors)
+        return errors
+
+    def _check_lengths(self, names: List[str], directories: Optional[Sequence[str]],
+                       errors: Dict[int, str]):
+        # len() は UTF-16 の文字数以下（サロゲートペアは1文字）なので、上限の半分を超える名前だけ数え直す
+        name_limit = self.max_name_length
+        for index, name in enumerate(names):
+            if len(name) * 2 > name_limit and index not in errors:
+                length = _utf16_length(name)
+                if length > name_limit:
+                    errors[index] = f"ファイル名が長すぎます（{length}文字、上限{name_limit}文字）"
+
+        if directories is None:
+            return
+        path_limit = self.max_path_length
+        for index, (name, directory) in enumerate(zip(names, directories)):
+            if (len(directory) + 1 + len(name)) * 2 > path_limit and index not in errors:
+                length = _utf16_length(directory) + 1 + _utf16_length(name)
+                if length > path_limit:
+                    errors[index] = f"パスが長すぎます（{length}文字、上限{path_limit}文字）"
+
+
+def _utf16_length(text: str) -> int:
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
@@ -1,7 +1,9 @@
 import os
 import json
+import copy
 from typing import List, Dict, Any, Optional
 from src.models.preset import Preset
+from src.utils.atomic_write import atomic_open
 from src.utils.id_generator import PresetIDGenerator
 
 
@@ -9,7 +11,9 @@ class PresetManager:
     def __init__(self, presets_directory: str = "presets"):
         self.presets_directory = presets_directory
         self.id_generator = PresetIDGenerator()
-        self._ensure_directory_exists()
+        # ファイルパス → ((mtime_ns, size), 読み込んだJSON) のキャッシュ
+        self._preset_cache: Dict[str, Any] = {}
+        # ディレクトリは最初の保存時に作成する（一覧表示だけの起動でディスクに触れない）
     
     def _ensure_directory_exists(self):
         """プリセットディレクトリが存在することを確認"""
@@ -49,24 +53,34 @@ class PresetManager:
         return preset
     
     def save_preset(self, preset: Preset) -> str:
-        """プリセットをJSONファイルに保存"""
+        """プリセットをJSONファイルにアトミックに保存（途中で失敗しても既存のファイルは壊れない）"""
+        self._ensure_directory_exists()
         filename = f"{preset.name}.json"
         file_path = os.path.join(self.presets_directory, filename)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
+        with atomic_open(file_path, 'w', encoding='utf-8') as f:
             json.dump(preset.to_dict(), f, ensure_ascii=False, indent=2)
         
         return file_path
     
-    def load_preset(self, file_path: str) -> Preset:
+    def _load_preset_file(self, file_path: str) -> Preset:
         """JSONファイルからプリセットを読み込み"""
-        if not os.path.exists(file_path):
+        try:
+            st = os.stat(file_path)
+        except OSError:
             raise FileNotFoundError(f"プリセットファイルが見つかりません: {file_path}")
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        return Preset.from_dict(data)
+        # 変更されていないファイルは再パースしない
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._preset_cache.get(file_path)
+        if cached and cached[0] == signature:
+            data = cached[1]
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._preset_cache[file_path] = (signature, data)
+        
+        return Preset.from_dict(copy.deepcopy(data))
     
     def list_presets(self) -> List[Preset]:
         """利用可能なプリセット一覧を取得"""
@@ -79,7 +93,7 @@ class PresetManager:
             if filename.endswith('.json'):
                 file_path = os.path.join(self.presets_directory, filename)
                 try:
-                    preset = self.load_preset(file_path)
+                    preset = self._load_preset_file(file_path)
                     presets.append(preset)
                 except Exception as e:
                     # ログに記録して継続
@@ -101,12 +115,12 @@ class PresetManager:
     
     def export_preset(self, preset: Preset, export_path: str):
         """プリセットをエクスポート"""
-        with open(export_path, 'w', encoding='utf-8') as f:
+        with atomic_open(export_path, 'w', encoding='utf-8') as f:
             json.dump(preset.to_dict(), f, ensure_ascii=False, indent=2)
     
     def import_preset(self, import_path: str) -> Preset:
         """プリセットをインポート"""
-        preset = self.load_preset(import_path)
+        preset = self._load_preset_file(import_path)
         
         # インポートしたプリセットを保存
         self.save_preset(preset)
@@ -119,7 +133,7 @@ class PresetManager:
         file_path = os.path.join(self.presets_directory, filename)
         
         if os.path.exists(file_path):
-            return self.load_preset(file_path)
+            return self._load_preset_file(file_path)
         
         return None
     
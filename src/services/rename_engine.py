@@ -0,0 +1,332 @@
+"""
+リネームエンジン
+
+リネームをフォルダ単位でまとめて実行し、実行ごとにアンドゥ用ジャーナルへ記録する。
+アプリのリネーム・移動（CLI の --execute、バッチの実行、ドロップの取り込み）はすべてここを通る。
+アンドゥはジャーナルを逆順に再生し、ネイティブに実行するか、
+フォルダごとに1回だけ cd するアンドゥ用バッチファイルを生成する。
+
+新しいファイル名はフォルダからの相対パスでもよい（サブフォルダへの移動。移動先フォルダは作成済みのこと）。
+FileIndex を指定した場合は、リネーム・アンドゥした結果をインデックスに反映する。
+
+リネーム計画では以下を扱う:
+  - 連鎖（a→b, b→c）: 移動先が空いてから実行するよう並べ替える
+  - 循環（a→b, b→a）: 一時ファイル名を経由して解消する
+  - 衝突（移動先に別ファイルがある・移動先の重複・移動元が無い）: 実行せずエラーにする
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from src.services.rename_journal import RenameJournal, RenameOperation
+
+if TYPE_CHECKING:
+    from src.services.file_index import FileIndex
+
+TEMP_NAME_PREFIX = ".tadakan_undo_"
+
+
+class RenameExecutionResult:
+    """リネーム実行結果"""
+
+    def __init__(self, execution_id: Optional[str] = None):
+        self.execution_id = execution_id
+        self.renamed: List[RenameOperation] = []
+        self.errors: List[str] = []
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+    @property
+    def renamed_count(self) -> int:
+        return len(self.renamed)
+
+
+def _is_nested(name: str) -> bool:
+    """フォルダからの相対パス（サブフォルダのファイル）か"""
+    return os.sep in name or bool(os.altsep and os.altsep in name)
+
+
+class _DirectoryListing:
+    """フォルダ内のファイル名の存在確認
+
+    names が None の場合（フォルダを一覧しない）とサブフォルダのパスは、1件ずつ確認する。
+    """
+
+    def __init__(self, directory: str, names: Optional[set]):
+        self.directory = directory
+        self.names = names
+
+    def __contains__(self, name: str) -> bool:
+        if self.names is None or _is_nested(name):
+            return os.path.lexists(os.path.join(self.directory, name))
+        return name in self.names
+
+
+def _plan_directory(directory: str, operations: List[Tuple[str, str]], existing: _DirectoryListing,
+                    errors: List[str]) -> List[RenameOperation]:
+    """1フォルダ分のリネーム（元, 新）を安全に実行できる順序の手順に変換"""
+    pending: Dict[str, str] = {}
+    targets: Dict[str, str] = {}
+    for source, target in operations:
+        if source == target:
+            continue
+        if source not in existing:
+            errors.append(f"ファイルが見つかりません: {os.path.join(directory, source)}")
+        elif source in pending:
+            errors.append(f"同じファイルに複数のリネームがあります: {os.path.join(directory, source)}")
+        elif target in targets:
+            errors.append(f"リネーム先が重複しています: {os.path.join(directory, target)}")
+        else:
+            pending[source] = target
+            targets[target] = source
+
+    # 移動先に（移動しない）別ファイルがある操作を除外し、それを待つ操作も連鎖的に除外
+    blocked = [s for s, t in pending.items() if t in existing and t not in pending]
+    while blocked:
+        source = blocked.pop()
+        target = pending.pop(source)
+        del targets[target]
+        errors.append(f"リネーム先に同名のファイルがあります: {os.path.join(directory, target)}")
+        waiting = targets.get(source)
+        if waiting is not None:
+            blocked.append(waiting)
+
+    steps: List[RenameOperation] = []
+    ready = [s for s, t in pending.items() if t not in pending]
+    temp_counter = 0
+    while pending:
+        if not ready:
+            # 循環: 1つを一時ファイル名に退避して連鎖に変える
+            source = next(iter(pending))
+            target = pending.pop(source)
+            while True:
+                temp_name = f"{TEMP_NAME_PREFIX}{temp_counter}_{os.path.basename(source)}"
+                temp_counter += 1
+                if temp_name not in existing and temp_name not in pending:
+                    break
+            steps.append((directory, source, temp_name))
+            pending[temp_name] = target
+            targets[target] = temp_name
+            waiting = targets.get(source)
+            if waiting is not None:
+                ready.append(waiting)
+            continue
+
+        source = ready.pop()
+        target = pending.pop(source)
+        del targets[target]
+        steps.append((directory, source, target))
+        waiting = targets.get(source)
+        if waiting is not None:
+            ready.append(waiting)
+    return steps
+
+
+def plan_renames(operations: Iterable[RenameOperation], errors: Optional[List[str]] = None,
+                 list_directories: bool = True) -> List[List[RenameOperation]]:
+    """リネームをフォルダごとの実行手順に変換
+
+    戻り値はフォルダごとの手順リスト（フォルダ内は順番に、フォルダ間は並列に実行できる）
+    list_directories=False の場合はフォルダを一覧せず、ファイルの存在を1件ずつ確認する
+    （大きなフォルダの一部だけを繰り返しリネームする場合用）。
+    """
+    errors = errors if errors is not None else []
+    by_directory: Dict[str, List[Tuple[str, str]]] = {}
+    for directory, source, target in operations:
+        by_directory.setdefault(directory, []).append((source, target))
+
+    plans = []
+    for directory, directory_operations in by_directory.items():
+        names = None
+        if list_directories:
+            try:
+                names = set(os.listdir(directory))
+            except OSError as e:
+                errors.append(f"{directory}: {e}")
+                continue
+        elif not os.path.isdir(directory):
+            errors.append(f"フォルダが見つかりません: {directory}")
+            continue
+        existing = _DirectoryListing(directory, names)
+        steps = _plan_directory(directory, directory_operations, existing, errors)
+        if steps:
+            plans.append(steps)
+    return plans
+
+
+class RenameEngine:
+    """ジャーナル付きリネーム・アンドゥエンジン"""
+
+    def __init__(self, journal: Optional[RenameJournal] = None, max_workers: int = 8,
+                 index: Optional['FileIndex'] = None):
+        self.journal = journal
+        self.max_workers = max_workers
+        self.index = index
+
+    @classmethod
+    def for_workspace(cls, workspace_path: str, max_workers: int = 8,
+                      index: Optional['FileIndex'] = None) -> 'RenameEngine':
+        return cls(RenameJournal.for_workspace(workspace_path), max_workers, index)
+
+    def execute(self, operations: Iterable[RenameOperation], label: str = "",
+                execution_id: Optional[str] = None, list_directories: bool = True) -> RenameExecutionResult:
+        """リネームを実行（ジャーナルがあれば実行前に記録）
+
+        execution_id を指定すると、ジャーナルのその実行に操作を追記する
+        （大量のファイルをチャンクごとに実行し、1回の実行としてアンドゥする場合）。
+        """
+        operations = list(operations)
+        result = RenameExecutionResult(execution_id)
+        plans = plan_renames(operations, result.errors, list_directories)
+
+        if self.journal is not None:
+            planned = {(d, s) for steps in plans for d, s, _ in steps}
+            journaled = [op for op in operations if (op[0], op[1]) in planned]
+            if execution_id is None:
+                result.execution_id = self.journal.record_execution(journaled, label)
+            elif journaled:
+                self.journal.append_operations(execution_id, journaled)
+
+        self._run_plans(plans, result, operations)
+        return result
+
+    def execute_file_items(self, file_items, label: str = "") -> RenameExecutionResult:
+        """FileItem（original_path → new_name）のリネームを実行"""
+        return self.execute(
+            [(os.path.dirname(os.path.abspath(item.original_path)), item.original_name, item.new_name)
+             for item in file_items if item.new_name],
+            label
+        )
+
+    def _undo_operations(self, execution_id: Optional[str]) -> Tuple[Optional[str], List[RenameOperation]]:
+        if self.journal is None:
+            raise ValueError("リネームジャーナルが設定されていません")
+        execution = (self.journal.get_execution(execution_id) if execution_id
+                     else self.journal.get_latest_pending())
+        if execution is None:
+            return None, []
+
+        # 逆順に（新 → 元）。リネームされていない（中断・失敗した）ファイルは対象外
+        listings: Dict[str, _DirectoryListing] = {}
+        undo = []
+        for directory, original_name, new_name in reversed(execution.operations):
+            if directory not in listings:
+                try:
+                    listings[directory] = _DirectoryListing(directory, set(os.listdir(directory)))
+                except OSError:
+                    listings[directory] = _DirectoryListing(directory, set())
+            if new_name in listings[directory]:
+                undo.append((directory, new_name, original_name))
+        return execution.execution_id, undo
+
+    def undo(self, execution_id: Optional[str] = None) -> RenameExecutionResult:
+        """リネームをネイティブにアンドゥ（省略時はアンドゥしていない最新の実行）"""
+        target_id, operations = self._undo_operations(execution_id)
+        result = RenameExecutionResult(target_id)
+        if target_id is None:
+            return result
+
+        self._run_plans(plan_renames(operations, result.errors), result, operations)
+        if result.success:
+            self.journal.mark_undone(target_id)
+        return result
+
+    def generate_undo_batch(self, execution_id: Optional[str] = None, batch_generator=None) -> str:
+        """アンドゥ用バッチファイルの内容を生成（フォルダごとに1回だけ cd する）"""
+        from services.batch_generator import BatchGenerator
+
+        _, operations = self._undo_operations(execution_id)
+        steps = [step for steps in plan_renames(operations) for step in steps]
+        batch_generator = batch_generator or BatchGenerator()
+        return batch_generator.generate_undo_batch([
+            {"directory": directory, "current_name": current_name, "original_name": original_name}
+            for directory, current_name, original_name in steps
+        ])
+
+    def _run_plans(self, plans: List[List[RenameOperation]], result: RenameExecutionResult,
+                   operations: List[RenameOperation]):
+        """フォルダごとの手順を並列に実行し、完了した操作を結果に追加"""
+        if len(plans) <= 1 or self.max_workers <= 1:
+            outcomes = [self._run_steps(steps) for steps in plans]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                outcomes = list(executor.map(self._run_steps, plans))
+
+        # 一時ファイル名を経由した手順は、最終的な移動先に着いた時点で元の操作として数える
+        source_by_target = {(d, t): s for d, s, t in operations}
+        renamed_operations = []
+        for renamed, errors in outcomes:
+            for directory, _, target in renamed:
+                source = source_by_target.get((directory, target))
+                if source is not None:
+                    renamed_operations.append((directory, source, target))
+            result.errors.extend(errors)
+        result.renamed.extend(renamed_operations)
+        if self.index is not None and renamed_operations:
+            self.index.apply_renames(renamed_operations)
+
+    @staticmethod
+    def _run_steps(steps: List[RenameOperation]) -> Tuple[List[RenameOperation], List[str]]:
+        """1フォルダ分の手順を順番に実行
+
+        手順は「移動先が空いてから実行する」順序なので、失敗した手順の移動元（空かなかった名前）を
+        移動先にする以降の手順は実行しない（上書きを防ぐ）。実行しなかった手順の移動元も同様に扱う。
+        一時ファイル名に退避したファイルの移動を実行しなかった場合は元の名前に戻す。
+        """
+        renamed = []
+        errors = []
+        # 移動できず、名前が空いていないファイル
+        occupied = set()
+        # 一時ファイル名 → 退避前の名前（退避に成功したもの）
+        stashed: Dict[str, str] = {}
+        for directory, source, target in steps:
+            source_path = os.path.join(directory, source)
+            if target in occupied:
+                errors.append(f"{source_path}: 先行するリネームが失敗したため実行しませんでした")
+                occupied.add(source)
+                original = stashed.pop(source, None)
+                if original is not None:
+                    RenameEngine._restore_stashed(directory, source, original, errors)
+                continue
+            try:
+                _rename_no_replace(source_path, os.path.join(directory, target))
+            except OSError as e:
+                errors.append(f"{source_path}: {e}")
+                occupied.add(source)
+                original = stashed.pop(source, None)
+                if original is not None:
+                    RenameEngine._restore_stashed(directory, source, original, errors)
+                continue
+            renamed.append((directory, source, target))
+            if target.startswith(TEMP_NAME_PREFIX):
+                stashed[target] = stashed.pop(source, source)
+            else:
+                stashed.pop(source, None)
+        return renamed, errors
+
+    @staticmethod
+    def _restore_stashed(directory: str, temp_name: str, original: str, errors: List[str]):
+        """一時ファイル名に退避したままのファイルを元の名前に戻す（戻せない場合は一時ファイル名を報告）"""
+        try:
+            _rename_no_replace(os.path.join(directory, temp_name), os.path.join(directory, original))
+        except OSError as e:
+            errors.append(f"{os.path.join(directory, original)} は一時ファイル名 {temp_name} のままです: {e}")
+
+
+def _rename_no_replace(source_path: str, target_path: str):
+    """移動先が既にある場合は上書きせず FileExistsError を送出するリネーム
+
+    Windows の os.rename は移動先があれば失敗する。POSIX では上書きされるため、直前に存在を確認する
+    （大文字・小文字だけの変更で同じファイルを指す場合は除く）。
+    """
+    if os.name != "nt":
+        try:
+            target_stat = os.lstat(target_path)
+        except FileNotFoundError:
+            target_stat = None
+        if target_stat is not None and not os.path.samestat(target_stat, os.lstat(source_path)):
+            raise FileExistsError(f"リネーム先に同名のファイルがあります: {target_path}")
+    os.rename(source_path, target_path)
@@ -0,0 +1,151 @@
+"""
+リネームジャーナル（アンドゥ用）
+
+リネーム実行ごとに、元のファイル名と新しいファイル名を rename_batches/ 内の
+追記専用ファイルに記録する。1ファイル1行の JSON 配列で、フォルダは切り替わる時だけ記録する。
+
+  ["E", 実行ID, 実行日時, ラベル]   実行の開始
+  ["C", 実行ID]                      以降の D・R 行はその実行への追記（チャンクごとの実行）
+  ["D", フォルダ]                    以降の R 行のフォルダ
+  ["R", 元のファイル名, 新しいファイル名]
+  ["U", 実行ID]                      アンドゥ済み
+
+記録はリネームの前にまとめて書き込む（中断してもアンドゥできる）。
+1回分の記録（E/C と続く D・R 行）は、プロセス間のファイルロック（src.utils.file_lock）を
+取ってから末尾に1回で書き込む。複数のプロセス（並列のバッチ実行）が同じジャーナルに書き込んでも、
+記録が混ざったり上書きされたりしない（Windows の O_APPEND はプロセス間でアトミックではない）。
+"""
+
+import os
+import json
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.utils.file_lock import file_lock
+
+JOURNAL_FILENAME = "undo_journal.jsonl"
+RENAME_BATCHES_DIRECTORY_NAME = "rename_batches"
+
+# (フォルダ, 元のファイル名, 新しいファイル名)
+RenameOperation = Tuple[str, str, str]
+
+
+class JournaledRename:
+    """ジャーナルから復元したリネーム実行1回分の記録"""
+
+    def __init__(self, execution_id: str, created_at: str, label: str):
+        self.execution_id = execution_id
+        self.created_at = created_at
+        self.label = label
+        self.operations: List[RenameOperation] = []
+        self.undone = False
+
+    def to_dict(self):
+        return {
+            "execution_id": self.execution_id,
+            "created_at": self.created_at,
+            "label": self.label,
+            "file_count": len(self.operations),
+            "undone": self.undone
+        }
+
+
+class RenameJournal:
+    """リネームの追記専用ジャーナル"""
+
+    def __init__(self, journal_path: str):
+        self.journal_path = journal_path
+
+    @classmethod
+    def for_workspace(cls, workspace_path: str) -> 'RenameJournal':
+        """ワークスペースの rename_batches/ に置くジャーナル"""
+        return cls(os.path.join(workspace_path, RENAME_BATCHES_DIRECTORY_NAME, JOURNAL_FILENAME))
+
+    def _append(self, records: List[list]):
+        """記録をロックを取って1回の追記で書き込み、ディスクに書き出す"""
+        directory = os.path.dirname(self.journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode('utf-8')
+        with file_lock(self.journal_path):
+            fd = os.open(self.journal_path,
+                         os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+            try:
+                os.lseek(fd, 0, os.SEEK_END)
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def _operation_records(operations: List[RenameOperation]) -> List[list]:
+        records: List[list] = []
+        current_directory = None
+        for directory, original_name, new_name in operations:
+            if directory != current_directory:
+                records.append(["D", directory])
+                current_directory = directory
+            records.append(["R", original_name, new_name])
+        return records
+
+    def record_execution(self, operations: List[RenameOperation], label: str = "") -> str:
+        """リネーム実行を記録し、実行IDを返す"""
+        execution_id = uuid.uuid4().hex[:12]
+        self._append([["E", execution_id, datetime.now().isoformat(), label]]
+                     + self._operation_records(operations))
+        return execution_id
+
+    def append_operations(self, execution_id: str, operations: List[RenameOperation]):
+        """記録済みの実行にリネームを追記"""
+        self._append([["C", execution_id]] + self._operation_records(operations))
+
+    def mark_undone(self, execution_id: str):
+        """アンドゥ済みを記録"""
+        self._append([["U", execution_id]])
+
+    def get_executions(self) -> List[JournaledRename]:
+        """リネーム実行の記録を実行順に取得（書き込み途中の最終行は無視）"""
+        executions = {}
+        current: Optional[JournaledRename] = None
+        directory = ""
+        try:
+            f = open(self.journal_path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return []
+
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                kind = record[0]
+                if kind == "R":
+                    if current is not None:
+                        current.operations.append((directory, record[1], record[2]))
+                elif kind == "D":
+                    directory = record[1]
+                elif kind == "E":
+                    current = JournaledRename(record[1], record[2], record[3])
+                    executions[current.execution_id] = current
+                elif kind == "C":
+                    current = executions.get(record[1])
+                elif kind == "U" and record[1] in executions:
+                    executions[record[1]].undone = True
+        return list(executions.values())
+
+    def get_execution(self, execution_id: str) -> Optional[JournaledRename]:
+        for execution in self.get_executions():
+            if execution.execution_id == execution_id:
+                return execution
+        return None
+
+    def get_latest_pending(self) -> Optional[JournaledRename]:
+        """アンドゥしていない最新の実行"""
+        for execution in reversed(self.get_executions()):
+            if not execution.undone:
+                return execution
+        return None
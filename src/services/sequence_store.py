@@ -0,0 +1,132 @@
+"""
+連番ストア
+
+バッチファイルごとの連番（A00001形式, FR-303）をワークスペース内の SQLite データベースに保存する。
+番号の予約は BEGIN IMMEDIATE のトランザクション（データベースファイルのロック）で行うため、
+複数のプロセス・スレッドから同時に予約しても番号は重複しない。
+大量処理では reserve で N 件分をまとめて予約する。
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from typing import Callable, List, Optional
+
+from src.utils.sequence_generator import format_sequence, MAX_SEQUENCE_NUMBER
+
+SEQUENCE_DB_FILENAME = ".tadakan_sequences.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sequences (
+    batch_filename TEXT PRIMARY KEY,
+    last_number INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+_SEQUENCE_SUFFIX_PATTERN = re.compile(r'_A(\d{5})(?:\.[^.]*)?$')
+
+
+class SequenceStore:
+    """バッチファイル別の永続連番カウンタ"""
+
+    def __init__(self, db_path: str = ":memory:", timeout: float = 30.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_workspace(cls, workspace_path: str) -> 'SequenceStore':
+        """ワークスペース用のストアを作成（ワークスペースが無い場合はメモリ上）"""
+        if workspace_path and os.path.isdir(workspace_path):
+            return cls(os.path.join(workspace_path, SEQUENCE_DB_FILENAME))
+        return cls()
+
+    def _connect(self) -> sqlite3.Connection:
+        """初回アクセス時にデータベースを開く（トランザクションは明示的に管理）"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=self.timeout,
+                                         isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self):
+        """データベースを閉じる"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _update(self, batch_filename: str, compute: Callable[[int], int]) -> int:
+        """書き込みロックを取ってカウンタを compute(現在値) に更新し、更新前の値を返す"""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT last_number FROM sequences WHERE batch_filename = ?", (batch_filename,)
+                ).fetchone()
+                current = row[0] if row else 0
+                new_value = compute(current)
+                if new_value > MAX_SEQUENCE_NUMBER:
+                    raise ValueError(
+                        f"連番の上限（{MAX_SEQUENCE_NUMBER}）を超えます: {batch_filename}"
+                    )
+                connection.execute(
+                    "INSERT INTO sequences (batch_filename, last_number) VALUES (?, ?) "
+                    "ON CONFLICT (batch_filename) DO UPDATE SET last_number = excluded.last_number",
+                    (batch_filename, new_value)
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            return current
+
+    def reserve(self, batch_filename: str, count: int = 1) -> range:
+        """連番を count 件まとめて予約し、予約した番号の範囲を返す"""
+        if count < 1:
+            raise ValueError(f"予約件数が不正です: {count}")
+        previous = self._update(batch_filename, lambda current: current + count)
+        return range(previous + 1, previous + count + 1)
+
+    def reserve_sequences(self, batch_filename: str, count: int) -> List[str]:
+        """連番文字列を count 件まとめて予約"""
+        return [format_sequence(number) for number in self.reserve(batch_filename, count)]
+
+    def next_sequence(self, batch_filename: str) -> str:
+        """次の連番を1件予約"""
+        return format_sequence(self.reserve(batch_filename, 1).start)
+
+    def get_current_number(self, batch_filename: str) -> int:
+        """最後に予約された番号（未使用なら0）"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT last_number FROM sequences WHERE batch_filename = ?", (batch_filename,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def ensure_at_least(self, batch_filename: str, number: int):
+        """カウンタを number 以上にする（既存ファイルの番号と重複しないように）"""
+        self._update(batch_filename, lambda current: max(current, number))
+
+    def reset(self, batch_filename: str):
+        """カウンタをリセット"""
+        self._update(batch_filename, lambda current: 0)
+
+    def seed_from_directory(self, batch_filename: str, directory: str) -> int:
+        """フォルダ内の既存ファイルの最大連番までカウンタを進め、現在値を返す
+
+        カウンタが無い状態から移行する場合に1回だけ使う。
+        """
+        highest = 0
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                match = _SEQUENCE_SUFFIX_PATTERN.search(entry.name)
+                if match:
+                    highest = max(highest, int(match.group(1)))
+        self.ensure_at_least(batch_filename, highest)
+        return self.get_current_number(batch_filename)
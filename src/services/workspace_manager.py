@@ -5,13 +5,13 @@
 """
 
 import os
-import json
 import shutil
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from dataclasses import dataclass
 
 from src.models.workspace import Workspace, ValidationResult, InitializationResult
+from src.config.settings import SettingsStore, SettingsSnapshot
 
 
 @dataclass
@@ -71,9 +71,21 @@ class MigrationResult:
 class WorkspaceManager:
     """ワークスペース管理マネージャー"""
     
+    SETTINGS_FILENAME = ".tadakan_settings.json"
+    
+    # デフォルト設定
+    DEFAULT_WORKSPACE_SETTINGS = {
+        "workspace_name": "My Workspace",
+        "auto_backup": False,
+        "backup_interval_days": 7,
+        "max_backup_count": 5,
+        "auto_repair": True
+    }
+    
     def __init__(self):
         self.current_workspace: Optional[Workspace] = None
         self._workspace_list = []
+        self._settings_stores: Dict[str, SettingsStore] = {}
     
     def get_default_workspace_path(self) -> str:
         """デフォルトワークスペースパスを取得"""
@@ -177,38 +189,32 @@ class WorkspaceManager:
         
         return HealthResult(is_healthy=len(issues) == 0, issues=issues)
     
+    def _get_settings_store(self, workspace_path: str) -> SettingsStore:
+        """ワークスペース設定ストアを取得（パスごとにキャッシュ）"""
+        key = os.path.abspath(workspace_path)
+        store = self._settings_stores.get(key)
+        if store is None:
+            settings_path = os.path.join(workspace_path, self.SETTINGS_FILENAME)
+            store = SettingsStore(settings_path, self.DEFAULT_WORKSPACE_SETTINGS)
+            self._settings_stores[key] = store
+        return store
+    
     def save_workspace_settings(self, workspace_path: str, settings: Dict[str, Any]) -> Dict[str, Any]:
         """ワークスペース設定を保存"""
         try:
-            settings_path = os.path.join(workspace_path, ".tadakan_settings.json")
-            with open(settings_path, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
+            store = self._get_settings_store(workspace_path)
+            store.save(SettingsSnapshot.from_dict(settings))
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     def load_workspace_settings(self, workspace_path: str) -> Dict[str, Any]:
         """ワークスペース設定を読み込み"""
-        settings_path = os.path.join(workspace_path, ".tadakan_settings.json")
-        
-        # デフォルト設定
-        default_settings = {
-            "workspace_name": "My Workspace",
-            "auto_backup": False,
-            "backup_interval_days": 7,
-            "max_backup_count": 5,
-            "auto_repair": True
-        }
-        
+        store = self._get_settings_store(workspace_path)
         try:
-            if os.path.exists(settings_path):
-                with open(settings_path, 'r', encoding='utf-8') as f:
-                    loaded_settings = json.load(f)
-                    default_settings.update(loaded_settings)
-        except:
-            pass
-        
-        return default_settings
+            return store.load().to_dict()
+        except Exception:
+            return dict(self.DEFAULT_WORKSPACE_SETTINGS)
     
     def migrate_workspace(self, old_path: str, new_path: str) -> MigrationResult:
         """ワークスペースを移行"""
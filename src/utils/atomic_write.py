@@ -0,0 +1,223 @@
+"""
+ファイルのアトミックな書き込み
+
+プリセット・バッチファイル・設定を書き込み先に直接書くと、途中でクラッシュした場合に
+途中までのファイルが残り、次回の読み込みで失敗する。同じフォルダの一時ファイルに書き込んでから
+os.replace で置き換え、書き込み先は常に古い内容か新しい内容のどちらかになるようにする。
+
+  - fsync=True（デフォルト）の場合は置き換える前に一時ファイルを fsync し、
+    置き換えた後にフォルダを fsync する（電源断でも置き換えが失われない）
+  - 多数のファイルをまとめて保存する場合は AtomicWriteGroup に渡すと、置き換えをコミット時まで
+    遅らせ、一時ファイルの fsync を並列に、フォルダの fsync をフォルダごとに1回だけ行う（グループコミット）
+  - 一時ファイルは umask に従った権限で作成する（permissions で指定可能）
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, IO, Iterator, List, Optional, Tuple, Union
+
+# グループコミットで並列に fsync する数
+DEFAULT_FSYNC_WORKERS = 8
+
+_TEMP_SUFFIX = ".tmp"
+_temp_counter = 0
+_temp_counter_lock = threading.Lock()
+
+
+class AtomicCommitError(OSError):
+    """グループコミットで置き換えられなかったファイルがある（failed: {パス: エラー}）"""
+
+    def __init__(self, failed: Dict[str, str]):
+        self.failed = failed
+        super().__init__(f"{len(failed)}件のファイルを保存できませんでした: "
+                         + ", ".join(f"{path} ({error})" for path, error in list(failed.items())[:3]))
+
+
+def _temp_path(path: str) -> str:
+    global _temp_counter
+    with _temp_counter_lock:
+        _temp_counter += 1
+        counter = _temp_counter
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.{os.getpid()}.{counter}{_TEMP_SUFFIX}")
+
+
+def _create_temp(path: str, permissions: int) -> Tuple[int, str]:
+    """書き込み先と同じフォルダに一時ファイルを作成（既存のファイルは上書きしない）"""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp_path = _temp_path(path)
+        try:
+            return os.open(tmp_path, flags, permissions), tmp_path
+        except FileExistsError:
+            continue
+
+
+def _remove(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def fsync_directory(directory: str):
+    """フォルダのエントリ（置き換え・作成）を永続化（フォルダを開けない環境では何もしない）"""
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _fsync_path(path: str):
+    fd = os.open(path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class AtomicWriteGroup:
+    """複数ファイルのアトミックな書き込みをまとめてコミットする
+
+    with ブロックを正常に抜けると commit、例外の場合は discard する。
+    atomic_open(group=...) は一時ファイルへの書き込みだけを行い、書き込み先はコミットまで変わらない。
+    """
+
+    def __init__(self, fsync: bool = True, max_workers: int = DEFAULT_FSYNC_WORKERS):
+        self.fsync = fsync
+        self.max_workers = max_workers
+        self.committed_count = 0
+        self.fsync_count = 0
+        self._pending: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'AtomicWriteGroup':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def add(self, tmp_path: str, path: str):
+        """書き込み済みの一時ファイルを登録（atomic_open から呼ばれる）"""
+        with self._lock:
+            self._pending.append((tmp_path, path))
+
+    def discard(self):
+        """コミットしていない一時ファイルを削除"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for tmp_path, _ in pending:
+            _remove(tmp_path)
+
+    def commit(self):
+        """一時ファイルを fsync してから書き込み先に置き換え、フォルダごとに1回 fsync する
+
+        置き換えられなかったファイルがある場合は、残りを処理してから AtomicCommitError を送出する。
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        failed: Dict[str, str] = {}
+        if self.fsync:
+            def sync(item: Tuple[str, str]) -> Optional[str]:
+                try:
+                    _fsync_path(item[0])
+                    return None
+                except OSError as e:
+                    return str(e)
+
+            if len(pending) > 1 and self.max_workers > 1:
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                    errors = list(executor.map(sync, pending))
+            else:
+                errors = [sync(item) for item in pending]
+            self.fsync_count += len(pending)
+            for (tmp_path, path), error in zip(pending, errors):
+                if error is not None:
+                    failed[path] = error
+                    _remove(tmp_path)
+
+        directories = set()
+        for tmp_path, path in pending:
+            if path in failed:
+                continue
+            try:
+                os.replace(tmp_path, path)
+            except OSError as e:
+                failed[path] = str(e)
+                _remove(tmp_path)
+                continue
+            self.committed_count += 1
+            directories.add(os.path.dirname(path))
+
+        if self.fsync:
+            for directory in directories:
+                fsync_directory(directory)
+            self.fsync_count += len(directories)
+        if failed:
+            raise AtomicCommitError(failed)
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w", encoding: Optional[str] = None, newline: Optional[str] = None,
+                fsync: bool = True, permissions: int = 0o666,
+                group: Optional[AtomicWriteGroup] = None) -> Iterator[IO]:
+    """書き込み先を置き換える一時ファイルを開く（mode は "w" または "wb"）
+
+    with ブロックを正常に抜けると書き込み先を置き換え、例外の場合は一時ファイルを削除して
+    書き込み先を変更しない。group を指定した場合の置き換えは group.commit() で行う。
+    """
+    if mode not in ("w", "wb"):
+        raise ValueError(f"atomic_open の mode は 'w' または 'wb' です: {mode}")
+    fd, tmp_path = _create_temp(path, permissions)
+    try:
+        if mode == "wb":
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding=encoding or "utf-8", newline=newline)
+        with f:
+            yield f
+            if group is None and fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        if group is not None:
+            group.add(tmp_path, path)
+            return
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove(tmp_path)
+        raise
+    if fsync:
+        fsync_directory(os.path.dirname(path))
+
+
+def atomic_write(path: str, data: Union[str, bytes], encoding: str = "utf-8", fsync: bool = True,
+                 permissions: int = 0o666, group: Optional[AtomicWriteGroup] = None):
+    """文字列・バイト列をアトミックに書き込む"""
+    if isinstance(data, bytes):
+        with atomic_open(path, "wb", fsync=fsync, permissions=permissions, group=group) as f:
+            f.write(data)
+    else:
+        with atomic_open(path, "w", encoding=encoding, fsync=fsync, permissions=permissions,
+                         group=group) as f:
+            f.write(data)
@@ -0,0 +1,233 @@
+"""
+バッチファイルの書き込み（エンコーディングの自動選択）
+
+バッチファイルは Shift_JIS で保存するが、Shift_JIS に無い文字（①・髙・絵文字など）を
+含むファイル名があると書き込みの途中で UnicodeEncodeError になり、途中までの
+ファイルが残っていた。書き込む前に内容を1回だけ走査してエンコーディングを決める。
+
+  - Shift_JIS → CP932 → UTF-8 の順で、すべての文字を表せる最初のエンコーディングを選ぶ
+    （ASCII のみなら走査しない。エンコードに失敗したチャンクの文字だけを種類ごとに判定する）
+  - Shift_JIS・CP932 で表せない文字を含む行は書き込む前に EncodingPlan.unencodable_lines で報告する
+  - バッチ内の chcp の行は選んだエンコーディングのコードページに書き換える
+    （UTF-8 で chcp の行が無い場合は先頭の @echo off の後に追加する）
+  - 書き込みはインクリメンタルエンコーダーで大きなチャンクごとに行う
+  - ファイルへの書き込みは atomic_write で一時ファイルに書いてから置き換える
+"""
+
+import os
+import re
+import codecs
+from typing import BinaryIO, List, Optional, Sequence, Tuple, Union
+
+from src.utils.atomic_write import AtomicWriteGroup, atomic_open
+
+SHIFT_JIS = "shift_jis"
+CP932 = "cp932"
+UTF8 = "utf-8"
+
+# 選択する順序（先頭ほど互換性が高い）
+ENCODING_CANDIDATES = (SHIFT_JIS, CP932, UTF8)
+
+CODE_PAGES = {SHIFT_JIS: 932, CP932: 932, UTF8: 65001}
+
+# 1回にエンコード・書き込みする文字数
+WRITE_CHUNK_SIZE = 256 * 1024
+
+# chcp の行を探す先頭部分の文字数
+HEADER_SIZE = 4096
+
+# 報告する行の上限
+MAX_REPORTED_LINES = 100
+
+_CHCP_PATTERN = re.compile(r"^chcp \d+ > nul$", re.MULTILINE)
+_CHCP_BYTES_PATTERN = re.compile(rb"chcp (\d+)")
+
+BatchContent = Union[str, Sequence[str]]
+
+
+_CANONICAL_NAMES = {"shift_jis": SHIFT_JIS, "cp932": CP932, "utf-8": UTF8}
+
+
+def _canonical(encoding: str) -> str:
+    """エンコーディング名を SHIFT_JIS / CP932 / UTF8 にそろえる（それ以外はそのまま）"""
+    name = codecs.lookup(encoding).name
+    return _CANONICAL_NAMES.get(name, name)
+
+
+def chcp_line(encoding: str) -> str:
+    """エンコーディングに対応する chcp の行（Shift_JIS・CP932 は 932、それ以外は 65001）"""
+    return f"chcp {CODE_PAGES.get(_canonical(encoding), 65001)} > nul"
+
+
+class UnencodableNamesError(ValueError):
+    """Shift_JIS・CP932 で表せない文字を含む行がある（UTF-8 を許可しない場合）"""
+
+    def __init__(self, lines: List[Tuple[int, str]]):
+        self.lines = lines
+        preview = ", ".join(line for _, line in lines[:3])
+        super().__init__(f"Shift_JIS・CP932 で表せない文字を含む行があります（{len(lines)}行）: {preview}")
+
+
+class EncodingPlan:
+    """書き込みに使うエンコーディングと、その判定結果"""
+
+    def __init__(self, encoding: str, unencodable_chars: str = "",
+                 unencodable_lines: Optional[List[Tuple[int, str]]] = None):
+        self.encoding = encoding
+        # 優先するエンコーディング（Shift_JIS・CP932）で表せない文字
+        self.unencodable_chars = unencodable_chars
+        # それらの文字を含む行（行番号は1始まり、最大 MAX_REPORTED_LINES 行）
+        self.unencodable_lines = unencodable_lines or []
+
+    @property
+    def code_page(self) -> int:
+        return CODE_PAGES[self.encoding]
+
+    @property
+    def chcp_line(self) -> str:
+        return f"chcp {self.code_page} > nul"
+
+    @property
+    def is_fallback(self) -> bool:
+        """UTF-8 に切り替えたか"""
+        return self.encoding == UTF8 and bool(self.unencodable_chars)
+
+
+def _as_text(content: BatchContent) -> str:
+    return content if isinstance(content, str) else "\n".join(content)
+
+
+def _encodable(char: str, encoding: str) -> bool:
+    try:
+        char.encode(encoding)
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+def _unencodable_chars(text: str, encoding: str) -> set:
+    """encoding で表せない文字
+
+    チャンクごとにエンコードしてみて（C で処理されるため速い）、失敗したチャンクの文字だけを
+    種類ごとに判定する（同じ文字を何度もエンコードしない）。
+    """
+    suspects = set()
+    for start in range(0, len(text), WRITE_CHUNK_SIZE):
+        chunk = text[start:start + WRITE_CHUNK_SIZE]
+        try:
+            chunk.encode(encoding)
+        except UnicodeEncodeError:
+            suspects.update(chunk)
+    return {char for char in suspects if ord(char) > 127 and not _encodable(char, encoding)}
+
+
+def plan_encoding(content: BatchContent, preferred: str = SHIFT_JIS) -> EncodingPlan:
+    """書き込む前に内容を走査し、すべての文字を表せるエンコーディングを決める
+
+    preferred が Shift_JIS・CP932 以外（UTF-8 など）の場合はそのまま使う。
+    """
+    preferred = _canonical(preferred)
+    text = _as_text(content)
+    if preferred not in (SHIFT_JIS, CP932):
+        return EncodingPlan(UTF8)
+    if text.isascii():
+        return EncodingPlan(preferred)
+
+    # Shift_JIS は CP932 の部分集合ではない（¥・‾ は Shift_JIS のみ）ため、候補ごとに全体を確認する
+    failed = []
+    for encoding in ENCODING_CANDIDATES[ENCODING_CANDIDATES.index(preferred):-1]:
+        chars = _unencodable_chars(text, encoding)
+        if not chars:
+            return EncodingPlan(encoding)
+        failed.append(chars)
+
+    # どの候補でも表せない文字（無ければ、候補ごとに表せない文字の組み合わせ）
+    char_set = set.intersection(*failed) or set.union(*failed)
+    unencodable = "".join(sorted(char_set))
+    lines = []
+    for number, line in enumerate(text.split("\n"), 1):
+        if not line.isascii() and not char_set.isdisjoint(line):
+            lines.append((number, line))
+            if len(lines) >= MAX_REPORTED_LINES:
+                break
+    return EncodingPlan(UTF8, unencodable, lines)
+
+
+def _apply_code_page(text: str, plan: EncodingPlan) -> str:
+    """chcp の行をエンコーディングに合わせる（chcp はバッチの先頭に置くため先頭部分だけ確認する）"""
+    header_end = text.find("\n", HEADER_SIZE)
+    if header_end < 0:
+        header_end = len(text)
+    header = text[:header_end]
+    if _CHCP_PATTERN.search(header):
+        return _CHCP_PATTERN.sub(plan.chcp_line, header) + text[header_end:]
+    if plan.encoding != UTF8:
+        return text
+    # UTF-8 はコードページの指定が必要（@echo off の直後に追加する）
+    first_line, newline, rest = text.partition("\n")
+    if first_line.strip().lower() == "@echo off":
+        return f"{first_line}\n{plan.chcp_line}\n{rest}" if newline else f"{first_line}\n{plan.chcp_line}"
+    return f"{plan.chcp_line}\n{text}"
+
+
+def write_batch_stream(f: BinaryIO, content: BatchContent, preferred: str = SHIFT_JIS,
+                       allow_utf8: bool = True, plan: Optional[EncodingPlan] = None) -> EncodingPlan:
+    """開いているバイナリファイルにバッチの内容を書き込み、使ったエンコーディングの EncodingPlan を返す
+
+    allow_utf8=False の場合、Shift_JIS・CP932 で表せない文字があれば何も書き込まずに
+    UnencodableNamesError を送出する。
+    """
+    text = _as_text(content)
+    plan = plan or plan_encoding(text, preferred)
+    if plan.is_fallback and not allow_utf8:
+        raise UnencodableNamesError(plan.unencodable_lines)
+    text = _apply_code_page(text, plan)
+
+    encoder = codecs.getincrementalencoder(plan.encoding)()
+    # テキストモードと同じく改行は OS の改行にする
+    linesep = os.linesep
+    for start in range(0, len(text), WRITE_CHUNK_SIZE):
+        chunk = text[start:start + WRITE_CHUNK_SIZE]
+        if linesep != "\n":
+            chunk = chunk.replace("\n", linesep)
+        f.write(encoder.encode(chunk))
+    f.write(encoder.encode("", final=True))
+    return plan
+
+
+def write_batch_file(path: str, content: BatchContent, preferred: str = SHIFT_JIS,
+                     allow_utf8: bool = True, plan: Optional[EncodingPlan] = None,
+                     fsync: bool = True, group: Optional[AtomicWriteGroup] = None) -> EncodingPlan:
+    """バッチファイルをアトミックに書き込み、使ったエンコーディングの EncodingPlan を返す
+
+    allow_utf8=False の場合、Shift_JIS・CP932 で表せない文字があれば書き込む前に
+    UnencodableNamesError を送出する（ファイルは作成しない）。
+    group を指定した場合、書き込み先の置き換えは group.commit() で行う。
+    """
+    text = _as_text(content)
+    plan = plan or plan_encoding(text, preferred)
+    if plan.is_fallback and not allow_utf8:
+        raise UnencodableNamesError(plan.unencodable_lines)
+    with atomic_open(path, "wb", fsync=fsync, group=group) as f:
+        return write_batch_stream(f, text, plan=plan)
+
+
+def read_batch_file(path: str) -> str:
+    """バッチファイルを読み込む（chcp の行からエンコーディングを判定、無ければ Shift_JIS → CP932 → UTF-8）"""
+    with open(path, "rb") as f:
+        data = f.read()
+    match = _CHCP_BYTES_PATTERN.search(data[:HEADER_SIZE])
+    if match is not None and match.group(1) == b"65001":
+        encodings = (UTF8, SHIFT_JIS, CP932)
+    else:
+        encodings = ENCODING_CANDIDATES
+    for encoding in encodings[:-1]:
+        try:
+            text = data.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        text = data.decode(encodings[-1])
+    # テキストモードと同じく改行を \n にそろえる
+    return text.replace("\r\n", "\n")
@@ -0,0 +1,123 @@
+"""
+拡張子マッチャー
+
+対象拡張子のリストを正規化（小文字・先頭のドット補完・重複除去）した frozenset に変換し、
+ファイルパスが対象拡張子かどうかを判定する。
+
+  - "*" を含む場合はすべてのファイルが対象
+  - ".tar.gz" のような複合拡張子にも対応
+  - 大量のパスは末尾の拡張子（最後の "." 以降）ごとに判定結果を使い回して高速に絞り込む
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+WILDCARD_EXTENSION = "*"
+
+# Windows のパスも扱うため、どちらの区切り文字もフォルダの区切りとみなす
+_SEPARATORS = frozenset({"/", "\\"})
+
+
+def _basename(path: str) -> str:
+    return path[max(path.rfind("/"), path.rfind("\\")) + 1:]
+
+
+def normalize_extension(extension: str) -> str:
+    """拡張子を正規化（" PNG" → ".png"、"*" はそのまま、空文字は空文字）"""
+    extension = extension.strip().lower()
+    if not extension or extension == WILDCARD_EXTENSION:
+        return extension
+    if not extension.startswith("."):
+        extension = "." + extension
+    return extension
+
+
+def parse_extensions(text: str) -> List[str]:
+    """カンマ区切りの拡張子指定（".png, JPG,tar.gz"）を正規化したリストに変換"""
+    extensions = []
+    for part in text.split(","):
+        extension = normalize_extension(part)
+        if extension and extension not in extensions:
+            extensions.append(extension)
+    return extensions
+
+
+class ExtensionMatcher:
+    """正規化した対象拡張子でファイルパスを判定する"""
+
+    def __init__(self, extensions: Optional[Iterable[str]] = None):
+        normalized = {normalize_extension(extension) for extension in extensions or ()}
+        normalized.discard("")
+        self.match_all = WILDCARD_EXTENSION in normalized
+        normalized.discard(WILDCARD_EXTENSION)
+        self.extensions: FrozenSet[str] = frozenset(normalized)
+        # 複合拡張子（.tar.gz）は末尾の拡張子（.gz）から個別判定に回す
+        self._compound_extensions = tuple(sorted(
+            (extension for extension in self.extensions if extension.count(".") > 1),
+            key=len, reverse=True
+        ))
+        self._compound_tails = frozenset("." + extension.rsplit(".", 1)[1]
+                                         for extension in self._compound_extensions)
+
+    @classmethod
+    def from_settings(cls, settings) -> 'ExtensionMatcher':
+        """アプリケーション設定のサポート拡張子から作成"""
+        return cls(settings.get_supported_extensions())
+
+    def __bool__(self) -> bool:
+        """対象拡張子が1つでも指定されているか"""
+        return self.match_all or bool(self.extensions)
+
+    def match_extension(self, path: str) -> Optional[str]:
+        """パスが一致した対象拡張子（最長一致）を返す（一致しなければNone）"""
+        name = _basename(path).lower()
+        for extension in self._compound_extensions:
+            if name.endswith(extension) and len(name) > len(extension):
+                return extension
+        index = name.rfind(".")
+        if index <= 0:
+            return None
+        extension = name[index:]
+        if extension in self.extensions:
+            return extension
+        return None
+
+    def matches(self, path: str) -> bool:
+        """パスが対象拡張子か判定"""
+        if self.match_all:
+            return True
+        return self.match_extension(path) is not None
+
+    def filter(self, paths: Iterable[str]) -> List[str]:
+        """対象拡張子のパスだけを順序を保って返す
+
+        末尾の拡張子ごとに判定結果をキャッシュし、パスごとの basename・lower の処理を省く。
+        """
+        if self.match_all:
+            return list(paths)
+        if not self.extensions:
+            return []
+
+        decisions: Dict[str, bool] = {}
+        compound_tails = self._compound_tails
+        extensions = self.extensions
+        matched = []
+        append = matched.append
+        for path in paths:
+            index = path.rfind(".")
+            if index <= 0 or path[index - 1] in _SEPARATORS:
+                continue
+            tail = path[index:]
+            decision = decisions.get(tail)
+            if decision is None:
+                if "/" in tail or "\\" in tail:
+                    # フォルダ名の "." で拡張子ではない（キャッシュしない）
+                    continue
+                lowered = tail.lower()
+                if lowered in compound_tails:
+                    if self.match_extension(path) is not None:
+                        append(path)
+                    continue
+                decision = decisions[tail] = lowered in extensions
+            if decision:
+                append(path)
+        return matched
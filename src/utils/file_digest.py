@@ -0,0 +1,259 @@
+"""
+ファイルダイジェスト
+
+ファイル内容のハッシュを計算する共通ユーティリティ（重複検出・バックアップ・復元の検証用）。
+
+  - 大きいファイル（.mp4 / .mkv など）は mmap で読み、小さいファイルは大きめの固定バッファに
+    readinto で読む。hashlib は大きな update の間 GIL を解放するため、複数ファイルを
+    スレッドプールで並列に計算できる
+  - 計算したダイジェストはワークスペースのサイドカー（SQLite）に
+    デバイス・inode・サイズ・更新日時をキーに保存し、変更のないファイルは読み直さない
+    （inode をキーにするため、リネーム・移動されたファイルもキャッシュが有効）
+"""
+
+import os
+import mmap
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DIGEST_CACHE_FILENAME = ".tadakan_digests.sqlite3"
+
+DEFAULT_ALGORITHM = "blake2b"
+
+# このサイズ以上のファイルは mmap で読む
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+# readinto で使うバッファサイズ（ページサイズの倍数）
+READ_BUFFER_SIZE = 1024 * 1024
+
+# mmap から1回の update に渡すサイズ
+MMAP_CHUNK_SIZE = 64 * 1024 * 1024
+
+# 部分ダイジェストで読む先頭・末尾のサイズ
+PARTIAL_BLOCK_SIZE = 64 * 1024
+
+FULL_DIGEST = "full"
+PARTIAL_DIGEST = "partial"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (device, inode, kind)
+) WITHOUT ROWID;
+"""
+
+# (デバイス, inode, サイズ, 更新日時[ns])
+FileSignature = Tuple[int, int, int, int]
+
+
+def file_signature(stat_result: os.stat_result) -> FileSignature:
+    """stat 結果からキャッシュのキーを作成"""
+    return (stat_result.st_dev, stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+
+
+def _new_hash(algorithm: str):
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=20)
+    return hashlib.new(algorithm)
+
+
+def file_digest(path: str, algorithm: str = DEFAULT_ALGORITHM, use_mmap: Optional[bool] = None) -> str:
+    """ファイル全体のダイジェスト（use_mmap 省略時はサイズで読み方を決める）"""
+    digest = _new_hash(algorithm)
+    with open(path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if use_mmap is None:
+            use_mmap = size >= MMAP_THRESHOLD
+        if use_mmap and size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, MMAP_CHUNK_SIZE):
+                        digest.update(view[offset:offset + MMAP_CHUNK_SIZE])
+                finally:
+                    view.release()
+        else:
+            buffer = bytearray(READ_BUFFER_SIZE)
+            view = memoryview(buffer)
+            while True:
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                digest.update(view[:count])
+    return digest.hexdigest()
+
+
+def partial_digest(path: str, algorithm: str = DEFAULT_ALGORITHM,
+                   block_size: int = PARTIAL_BLOCK_SIZE) -> str:
+    """先頭・末尾 block_size バイトのダイジェスト（小さいファイルは全体のダイジェストと同じ）"""
+    digest = _new_hash(algorithm)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= block_size * 2:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(block_size))
+            f.seek(-block_size, os.SEEK_END)
+            digest.update(f.read(block_size))
+    return digest.hexdigest()
+
+
+class DigestCache:
+    """ダイジェストのサイドカーキャッシュ（inode・サイズ・更新日時が一致する場合のみ有効）"""
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_workspace(cls, workspace_path: str) -> 'DigestCache':
+        """ワークスペース用のキャッシュを作成（ワークスペースが無い場合はメモリ上）"""
+        if workspace_path and os.path.isdir(workspace_path):
+            return cls(os.path.join(workspace_path, DIGEST_CACHE_FILENAME))
+        return cls()
+
+    def _connect(self) -> sqlite3.Connection:
+        """初回アクセス時にデータベースを開く"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self):
+        """データベースを閉じる"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def get_many(self, kind: str, signatures: Dict[str, FileSignature]) -> Dict[str, str]:
+        """有効なキャッシュ済みダイジェストを {パス: ダイジェスト} で返す"""
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            for path, (device, inode, size, mtime_ns) in signatures.items():
+                row = connection.execute(
+                    "SELECT size, mtime_ns, digest FROM digests WHERE device = ? AND inode = ? AND kind = ?",
+                    (device, inode, kind)
+                ).fetchone()
+                if row is not None and row[0] == size and row[1] == mtime_ns:
+                    found[path] = row[2]
+        return found
+
+    def put_many(self, kind: str, entries: Iterable[Tuple[FileSignature, str]]):
+        """ダイジェストを保存（同じファイルの古いダイジェストは置き換える）"""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT INTO digests (device, inode, kind, size, mtime_ns, digest) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (device, inode, kind) DO UPDATE SET size = excluded.size, "
+                    "mtime_ns = excluded.mtime_ns, digest = excluded.digest",
+                    [(device, inode, kind, size, mtime_ns, digest)
+                     for (device, inode, size, mtime_ns), digest in entries]
+                )
+
+
+class DigestResult:
+    """複数ファイルのダイジェスト計算結果"""
+
+    def __init__(self):
+        self.digests: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self.computed_count = 0
+        self.cache_hits = 0
+        self.bytes_read = 0
+
+
+class FileDigester:
+    """キャッシュ付きで複数ファイルのダイジェストをスレッドプールで計算する"""
+
+    def __init__(self, cache: Optional[DigestCache] = None, max_workers: int = 8,
+                 algorithm: str = DEFAULT_ALGORITHM):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.algorithm = algorithm
+
+    @classmethod
+    def for_workspace(cls, workspace_path: str, max_workers: int = 8) -> 'FileDigester':
+        return cls(DigestCache.for_workspace(workspace_path), max_workers)
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
+
+    def digest(self, path: str, kind: str = FULL_DIGEST) -> str:
+        """1ファイルのダイジェスト（読めない場合は OSError）"""
+        result = self.digest_many([path], kind)
+        if path in result.errors:
+            raise OSError(result.errors[path])
+        return result.digests[path]
+
+    def digest_many(self, paths: Iterable[str], kind: str = FULL_DIGEST,
+                    signatures: Optional[Dict[str, FileSignature]] = None) -> DigestResult:
+        """複数ファイルのダイジェストを計算（signatures は呼び出し側で stat 済みの場合に渡す）"""
+        result = DigestResult()
+        paths = list(dict.fromkeys(paths))
+        if signatures is None:
+            signatures = {}
+        else:
+            signatures = {path: signatures[path] for path in paths if path in signatures}
+        for path in paths:
+            if path not in signatures:
+                try:
+                    signatures[path] = file_signature(os.stat(path))
+                except OSError as e:
+                    result.errors[path] = str(e)
+
+        cache_kind = f"{self.algorithm}:{kind}"
+        # inode が取得できないファイルシステムではキャッシュを使わない
+        cacheable = {path: signature for path, signature in signatures.items() if signature[1]}
+        if self.cache is not None and cacheable:
+            result.digests.update(self.cache.get_many(cache_kind, cacheable))
+        result.cache_hits = len(result.digests)
+
+        missing = [path for path in paths if path in signatures and path not in result.digests]
+        if kind == PARTIAL_DIGEST:
+            compute = lambda path: partial_digest(path, self.algorithm)
+        else:
+            compute = lambda path: file_digest(path, self.algorithm)
+
+        def safe_compute(path):
+            try:
+                return compute(path), None
+            except OSError as e:
+                return None, str(e)
+
+        if len(missing) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                outcomes = list(executor.map(safe_compute, missing))
+        else:
+            outcomes = [safe_compute(path) for path in missing]
+
+        new_entries: List[Tuple[FileSignature, str]] = []
+        for path, (digest, error) in zip(missing, outcomes):
+            if error is not None:
+                result.errors[path] = error
+                continue
+            result.digests[path] = digest
+            size = signatures[path][2]
+            result.bytes_read += min(size, PARTIAL_BLOCK_SIZE * 2) if kind == PARTIAL_DIGEST else size
+            if path in cacheable:
+                new_entries.append((signatures[path], digest))
+        result.computed_count = len(missing) - sum(1 for path in missing if path in result.errors)
+        if self.cache is not None and new_entries:
+            self.cache.put_many(cache_kind, new_entries)
+        return result
@@ -0,0 +1,58 @@
+"""
+プロセス間のファイルロック
+
+複数のプロセス（並列のバッチ実行のワーカー）が同じファイルに追記する場合に、
+追記を1プロセスずつに直列化する。Windows の O_APPEND は「末尾へのシーク + 書き込み」で
+実現されておりプロセス間でアトミックではないため、追記の前後をロックで囲む。
+
+  - POSIX: fcntl.flock（ロックファイル全体の排他ロック）
+  - Windows: msvcrt.locking（ロックファイルの先頭1バイト。取得できるまで待つ）
+
+ロックは「<パス>.lock」のロックファイルで取る（対象ファイル自体は開き直さない）。
+同じプロセスのスレッド間の排他は行わないため、呼び出し側で threading.Lock と組み合わせる。
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+LOCK_SUFFIX = ".lock"
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                # LK_LOCK は取得できるまで1秒おきに10回試し、それでも取得できなければ OSError
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _unlock(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """path のロックファイルで排他ロックを取り、ブロックを抜けると解放する"""
+    fd = os.open(path + LOCK_SUFFIX, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        _lock(fd)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,71 @@
+"""
+ファイル名パーサー
+
+命名パターンで生成されたファイル名をフィールド値に分解する
+
+既定の形式は Preset.generate_filename_with_sequence が生成する
+プリセットID_陣営_キャラ名_A00001.拡張子
+"""
+
+import re
+from typing import Dict, List, Optional, Pattern
+
+# Preset.generate_filename_with_sequence の形式
+STOCK_FILENAME_TEMPLATE = "{preset_id}_{陣営}_{キャラ名}_{sequence}"
+
+# 特定フィールドの値の形式（それ以外は任意の文字列）
+STOCK_FIELD_PATTERNS = {
+    "preset_id": r"[A-Z0-9]{6}",
+    "sequence": r"A\d{5}",
+}
+
+EXTENSION_KEY = "extension"
+
+_PLACEHOLDER_PATTERN = re.compile(r'\{([^}]+)\}')
+
+
+class FilenameParser:
+    """命名パターンからファイル名を解析するパーサー"""
+
+    def __init__(self, template: str, field_patterns: Optional[Dict[str, str]] = None):
+        self.template = template
+        self.field_patterns = field_patterns or {}
+        self.fields: List[str] = []
+        self._regex = self._compile(template)
+
+    @classmethod
+    def stock_format(cls) -> 'FilenameParser':
+        """ストック型バッチ（プリセットID_陣営_キャラ名_A00001.ext）用のパーサー"""
+        return cls(STOCK_FILENAME_TEMPLATE, STOCK_FIELD_PATTERNS)
+
+    @classmethod
+    def from_naming_pattern(cls, naming_pattern: str) -> 'FilenameParser':
+        """プリセットの命名パターン（{陣営}_{キャラ名}_{番号} 等）用のパーサー"""
+        return cls(naming_pattern)
+
+    def _compile(self, template: str) -> Pattern:
+        """テンプレートを正規表現に変換（フィールド名は識別子でなくてもよいので番号で参照）"""
+        parts = []
+        position = 0
+        for index, match in enumerate(_PLACEHOLDER_PATTERN.finditer(template)):
+            parts.append(re.escape(template[position:match.start()]))
+            field_name = match.group(1)
+            self.fields.append(field_name)
+            value_pattern = self.field_patterns.get(field_name, r".+?")
+            parts.append(f"(?P<f{index}>{value_pattern})")
+            position = match.end()
+        parts.append(re.escape(template[position:]))
+        return re.compile("".join(parts) + r"(?P<ext>\.[^.]*)?$", re.DOTALL)
+
+    def parse(self, filename: str) -> Optional[Dict[str, str]]:
+        """ファイル名をフィールド値に分解（形式が一致しなければNone）
+
+        戻り値には拡張子が "extension" キーで含まれる（拡張子なしの場合は空文字）
+        """
+        match = self._regex.match(filename)
+        if not match:
+            return None
+
+        values = {field_name: match.group(f"f{index}") for index, field_name in enumerate(self.fields)}
+        values[EXTENSION_KEY] = match.group("ext") or ""
+        return values
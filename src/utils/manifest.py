@@ -0,0 +1,102 @@
+"""
+マニフェスト読み込み
+
+大量ファイル処理用のマニフェスト（ファイルパス一覧）をストリームとして読み込む
+
+対応形式（1行1ファイル、空行と # で始まる行は無視）:
+  - パスのみ:            C:/images/a.png
+  - タブ区切りで値指定:  C:/images/a.png<TAB>陣営=クレキュリア,キャラ名=アクララ
+  - JSON Lines:          {"path": "C:/images/a.png", "values": {"キャラ名": "アクララ"}}
+
+解析できない行は ManifestLineError（行番号付き）になる。iter_manifest に on_error を渡すと
+その行を報告して読み飛ばす（途中まで出力したバッチファイルと矛盾しないようにするため）。
+"""
+
+import json
+from typing import Callable, Dict, Iterator, Iterable, List, Optional
+
+
+class ManifestEntry:
+    """マニフェストの1エントリ（CLI起動時間のため dataclasses は使わない）"""
+
+    __slots__ = ("path", "values", "line_number")
+
+    def __init__(self, path: str, values: Optional[Dict[str, str]] = None, line_number: int = 0):
+        self.path = path
+        self.values = values or {}
+        self.line_number = line_number
+
+
+class ManifestLineError(ValueError):
+    """マニフェストの行を解析できない"""
+
+    def __init__(self, line_number: int, message: str):
+        self.line_number = line_number
+        super().__init__(f"{line_number}行目: {message}")
+
+
+def parse_field_values(text: str) -> Dict[str, str]:
+    """"フィールド1=値1,フィールド2=値2" 形式の文字列を辞書に変換"""
+    values = {}
+    for pair in text.split(','):
+        if '=' in pair:
+            key, value = pair.split('=', 1)
+            values[key.strip()] = value.strip()
+    return values
+
+
+def parse_manifest_line(line: str, line_number: int = 0) -> ManifestEntry:
+    """マニフェストの1行を解析"""
+    text = line.rstrip('\r\n')
+
+    if text.lstrip().startswith('{'):
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise ManifestLineError(line_number, f"JSONを解析できません ({e})")
+        if not isinstance(data, dict) or "path" not in data:
+            raise ManifestLineError(line_number, "pathがありません")
+        values = data.get("values", {})
+        if not isinstance(values, dict):
+            raise ManifestLineError(line_number, "valuesがオブジェクトではありません")
+        values = {str(k): str(v) for k, v in values.items()}
+        return ManifestEntry(path=str(data["path"]), values=values, line_number=line_number)
+
+    if '\t' in text:
+        path, value_text = text.split('\t', 1)
+        return ManifestEntry(path=path, values=parse_field_values(value_text),
+                             line_number=line_number)
+
+    return ManifestEntry(path=text, line_number=line_number)
+
+
+def iter_manifest(lines: Iterable[str],
+                  on_error: Optional[Callable[[ManifestLineError], None]] = None) -> Iterator[ManifestEntry]:
+    """マニフェストを1行ずつ解析して返す（全体をメモリに読み込まない）
+
+    on_error を指定すると、解析できない行はそのエラーを渡して読み飛ばす（未指定なら送出する）。
+    """
+    for line_number, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        try:
+            entry = parse_manifest_line(line, line_number)
+        except ManifestLineError as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            continue
+        yield entry
+
+
+def iter_chunks(entries: Iterable, chunk_size: int) -> Iterator[List]:
+    """イテラブルを最大chunk_size件ずつのリストに分割（0以下なら分割しない）"""
+    chunk = []
+    for entry in entries:
+        chunk.append(entry)
+        if 0 < chunk_size <= len(chunk):
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
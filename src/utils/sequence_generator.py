@@ -4,6 +4,16 @@
 A00001形式の連番を生成
 """
 
+SEQUENCE_PREFIX = "A"
+MAX_SEQUENCE_NUMBER = 99999
+
+
+def format_sequence(number: int) -> str:
+    """番号を連番文字列に変換（A00001形式）"""
+    if not 0 < number <= MAX_SEQUENCE_NUMBER:
+        raise ValueError(f"連番の範囲外です: {number}")
+    return f"{SEQUENCE_PREFIX}{number:05d}"
+
 
 class SequenceGenerator:
     """連番生成器"""
@@ -14,7 +24,7 @@ class SequenceGenerator:
     def next_sequence(self) -> str:
         """次の連番を生成（A00001形式）"""
         self.current_number += 1
-        return f"A{self.current_number:05d}"
+        return format_sequence(self.current_number)
     
     def reset(self):
         """連番をリセット"""
@@ -22,4 +32,4 @@ class SequenceGenerator:
     
     def get_current_number(self) -> int:
         """現在の連番を取得"""
-        return self.current_number
\ No newline at end of file
+        return self.current_number
@@ -0,0 +1,108 @@
+"""
+文字列の正規化（Unicode 正規化・全角/半角の統一）
+
+macOS の共有フォルダのファイル名（NFD）や、全角・半角が混在した入力値
+（ＡＢＣ / ABC、ｷｬﾗ名 / キャラ名）を同じ文字列として扱うため、
+ファイル名の生成・インデックス・検索の前に正規化する。
+
+  - fold_width=True（デフォルト）: NFKC（全角英数字 → 半角、半角カナ → 全角、濁点の合成）
+  - fold_width=False: NFC（結合文字の合成のみ。全角・半角はそのまま）
+  - ファイル名に使えない文字の全角形（＜＞：＂／＼｜？＊）は半角にしない
+    （半角にすると無効な文字になるため）
+  - ASCII だけの文字列は正規化しても変わらないため、そのまま返す
+  - 結果は文字列ごとにキャッシュする（同じ項目値が大量のファイルで繰り返されるため）
+"""
+
+import re
+import unicodedata
+from typing import Dict, Optional
+
+# 半角にしない全角文字（Windows でファイル名に使えない文字の全角形）
+PRESERVED_FULLWIDTH_CHARS = "＜＞：＂／＼｜？＊"
+
+# キャッシュする文字列の数（超えた場合はキャッシュを空にする）
+DEFAULT_CACHE_SIZE = 65536
+
+
+class TextNormalizer:
+    """文字列の正規化（結果は文字列ごとにキャッシュ）"""
+
+    def __init__(self, fold_width: bool = True, preserve: str = PRESERVED_FULLWIDTH_CHARS,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        self.fold_width = fold_width
+        self.form = "NFKC" if fold_width else "NFC"
+        self.preserve = preserve
+        self.cache_size = cache_size
+        # 保持する文字を含む場合は、その文字の前後を別々に正規化する
+        self._preserve_pattern = re.compile(f"([{re.escape(preserve)}])") if preserve else None
+        self._cache: Dict[str, str] = {}
+        self._search_cache: Dict[str, str] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> 'TextNormalizer':
+        """アプリケーション設定（file_processing.unicode_normalization）から作成"""
+        return cls(fold_width=settings.get_unicode_normalization().upper() == "NFKC")
+
+    @property
+    def key(self) -> str:
+        """正規化の方式を表す文字列（保存済みの正規化結果が使えるかの判定用）"""
+        return f"{self.form}:{self.preserve}"
+
+    def normalize(self, text: str) -> str:
+        """ファイル名・項目値の正規化"""
+        if text.isascii():
+            return text
+        cache = self._cache
+        result = cache.get(text)
+        if result is None:
+            form = self.form
+            result = unicodedata.normalize(form, text)
+            # 保持する文字は正規化で必ず変化するため、変化した場合だけ確認する
+            if result != text and self._preserve_pattern is not None and self._preserve_pattern.search(text):
+                # 分割した奇数番目は保持する文字
+                parts = self._preserve_pattern.split(text)
+                result = "".join(part if i % 2 else unicodedata.normalize(form, part)
+                                 for i, part in enumerate(parts))
+            if len(cache) >= self.cache_size:
+                cache.clear()
+            cache[text] = result
+        return result
+
+    def search_key(self, text: str) -> str:
+        """検索・重複判定用のキー（正規化 + 大文字・小文字の区別なし）"""
+        if text.isascii():
+            return text.lower()
+        cache = self._search_cache
+        result = cache.get(text)
+        if result is None:
+            result = self.normalize(text).casefold()
+            if len(cache) >= self.cache_size:
+                cache.clear()
+            cache[text] = result
+        return result
+
+    def clear(self):
+        self._cache.clear()
+        self._search_cache.clear()
+
+
+_default_normalizer = TextNormalizer()
+
+
+def get_default_normalizer() -> TextNormalizer:
+    """ファイル名の生成・インデックス・検索で共通に使う正規化"""
+    return _default_normalizer
+
+
+def set_default_normalizer(normalizer: Optional[TextNormalizer]):
+    """共通の正規化を変更（None でデフォルトに戻す）"""
+    global _default_normalizer
+    _default_normalizer = normalizer or TextNormalizer()
+
+
+def normalize_text(text: str) -> str:
+    return _default_normalizer.normalize(text)
+
+
+def search_key(text: str) -> str:
+    return _default_normalizer.search_key(text)
@@ -0,0 +1,199 @@
+"""
+アトミックな書き込みのテスト（障害注入）
+
+- 書き込み中の例外・fsync・置き換えの失敗、プロセスの強制終了で書き込み先が壊れないこと
+- グループコミットで置き換えをまとめ、フォルダの fsync をフォルダごとに1回にすること
+- プリセット・設定・バッチファイルの保存がアトミックであること
+"""
+
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+import subprocess
+from unittest import mock
+
+from src.config.settings import SettingsSnapshot, SettingsStore
+from src.models.preset import Preset
+from src.services.batch_manager import BatchManager
+from src.services.preset_manager import PresetManager
+from src.utils import atomic_write
+from src.utils.atomic_write import AtomicCommitError, AtomicWriteGroup, atomic_open, atomic_write as write
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """atomic_open・atomic_writeのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "preset.json")
+        write(self.path, '{"name": "old"}')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _read(self, path=None):
+        with open(path or self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def _leftovers(self):
+        return [name for name in os.listdir(self.temp_dir) if name.endswith(".tmp")]
+
+    def test_failures_keep_original(self):
+        """書き込み中の例外・fsync・置き換えの失敗では元の内容が残り、一時ファイルも残らない"""
+        with self.assertRaises(RuntimeError):
+            with atomic_open(self.path) as f:
+                f.write('{"name": "ne')
+                raise RuntimeError("crash")
+        for target in ("fsync", "replace"):
+            with mock.patch.object(atomic_write.os, target, side_effect=OSError(target)):
+                with self.assertRaises(OSError):
+                    write(self.path, '{"name": "new"}')
+        self.assertEqual(self._read(), '{"name": "old"}')
+        self.assertEqual(self._leftovers(), [])
+
+        write(self.path, b'{"name": "new"}', fsync=False)
+        self.assertEqual(self._read(), '{"name": "new"}')
+
+    def test_killed_process_keeps_original(self):
+        """書き込み途中でプロセスが強制終了しても書き込み先は元の内容のまま"""
+        script = (
+            "import os, sys\n"
+            "from src.utils.atomic_write import atomic_open\n"
+            "with atomic_open(sys.argv[1]) as f:\n"
+            "    f.write('{\"name\": \"ne')\n"
+            "    f.flush()\n"
+            "    os._exit(1)\n"
+        )
+        completed = subprocess.run([sys.executable, "-c", script, self.path], cwd=REPO_ROOT)
+        self.assertEqual(completed.returncode, 1)
+        self.assertEqual(self._read(), '{"name": "old"}')
+
+    @unittest.skipIf(os.name == "nt", "POSIX の権限のみ確認")
+    def test_permissions_follow_umask(self):
+        """新しいファイルは通常の open と同じ権限、permissions を指定した場合はその権限"""
+        reference = os.path.join(self.temp_dir, "reference.json")
+        open(reference, "w").close()
+        created = os.path.join(self.temp_dir, "created.json")
+        write(created, "{}")
+        self.assertEqual(os.stat(created).st_mode & 0o777, os.stat(reference).st_mode & 0o777)
+        private = os.path.join(self.temp_dir, "private.json")
+        write(private, "{}", permissions=0o600)
+        self.assertEqual(os.stat(private).st_mode & 0o777, 0o600)
+
+
+class TestAtomicWriteGroup(unittest.TestCase):
+    """グループコミットのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = [os.path.join(self.temp_dir, f"{i}.bat") for i in range(5)]
+        for path in self.paths:
+            write(path, "old", fsync=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _contents(self):
+        result = []
+        for path in self.paths:
+            with open(path, encoding="utf-8") as f:
+                result.append(f.read())
+        return result
+
+    def test_commit_batches_fsync(self):
+        """書き込み先はコミットまで変わらず、フォルダの fsync は1回だけ"""
+        with mock.patch.object(atomic_write, "fsync_directory") as fsync_directory:
+            with AtomicWriteGroup() as group:
+                for path in self.paths:
+                    write(path, "new", group=group)
+                self.assertEqual(self._contents(), ["old"] * 5)
+                self.assertEqual(group.pending_count, 5)
+        self.assertEqual(self._contents(), ["new"] * 5)
+        self.assertEqual(group.committed_count, 5)
+        self.assertEqual(group.fsync_count, 6)
+        fsync_directory.assert_called_once_with(self.temp_dir)
+
+    def test_failure_before_commit_changes_nothing(self):
+        """グループの途中で失敗した場合はどのファイルも置き換えない"""
+        with self.assertRaises(RuntimeError):
+            with AtomicWriteGroup() as group:
+                for i, path in enumerate(self.paths):
+                    if i == 3:
+                        raise RuntimeError("crash")
+                    write(path, "new", group=group)
+        self.assertEqual(self._contents(), ["old"] * 5)
+        self.assertEqual([name for name in os.listdir(self.temp_dir) if name.endswith(".tmp")], [])
+
+    def test_partial_commit_failure(self):
+        """置き換えに失敗したファイルだけを報告し、残りはコミットする"""
+        real_replace = os.replace
+
+        def flaky_replace(source, target):
+            if target == self.paths[2]:
+                raise OSError("locked")
+            real_replace(source, target)
+
+        group = AtomicWriteGroup(fsync=False)
+        for path in self.paths:
+            write(path, "new", group=group)
+        with mock.patch.object(atomic_write.os, "replace", side_effect=flaky_replace):
+            with self.assertRaises(AtomicCommitError) as context:
+                group.commit()
+        self.assertEqual(context.exception.failed, {self.paths[2]: "locked"})
+        self.assertEqual(self._contents(), ["new", "new", "old", "new", "new"])
+        self.assertEqual([name for name in os.listdir(self.temp_dir) if name.endswith(".tmp")], [])
+
+
+class TestAtomicSaves(unittest.TestCase):
+    """プリセット・設定・バッチファイルの保存のテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_interrupted_saves_keep_readable_files(self):
+        """保存が途中で失敗しても、プリセット一覧・設定・バッチ一覧は前の内容で読める"""
+        presets = PresetManager(os.path.join(self.temp_dir, "presets"))
+        preset = Preset(name="キャラ", fields=["陣営"], naming_pattern="{陣営}", id="B63EF9")
+        presets.save_preset(preset)
+        store = SettingsStore(os.path.join(self.temp_dir, "settings.json"))
+        store.save(SettingsSnapshot.from_dict({"ui": {"theme": "dark"}}))
+
+        def partial_dump(obj, f, **kwargs):
+            f.write('{"name": "キャ')
+            raise OSError("disk full")
+
+        with mock.patch("json.dump", side_effect=partial_dump):
+            preset.fields = ["陣営", "キャラ名"]
+            with self.assertRaises(OSError):
+                presets.save_preset(preset)
+            with self.assertRaises(OSError):
+                store.save(SettingsSnapshot.from_dict({"ui": {"theme": "light"}}))
+
+        self.assertEqual([p.fields for p in presets.list_presets()], [["陣営"]])
+        self.assertEqual(store.load(force=True).get("ui.theme"), "dark")
+
+        manager = BatchManager(self.temp_dir)
+        try:
+            batch_files = [manager.create_batch_file(preset, {"陣営": f"陣営{i}", "キャラ名": "田中"})
+                           for i in range(3)]
+            paths = manager.save_batch_files(batch_files)
+            self.assertEqual(len(manager.load_batch_files()), 3)
+            with mock.patch("src.utils.batch_writer.write_batch_stream", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    manager.save_batch_files(batch_files)
+            self.assertEqual(len(manager.load_batch_files()), 3)
+            self.assertTrue(all(os.path.getsize(path) > 0 for path in paths))
+        finally:
+            manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+バッチファイルの一括再生成のテスト
+
+- プリセットIDの索引で対象のバッチファイルだけを再生成し、内容が同じファイルは書き込まないこと
+- 索引は変更されたファイルだけ読み直し、削除されたファイルを外すこと
+- 書き込みに失敗しても元のファイルが残り、一時ファイルが残らないこと
+- 項目値に _ を含むファイルも同じ移動先フォルダで再生成し、フォルダ名を特定できないファイルは書き直さないこと
+"""
+
+import unittest
+import os
+import tempfile
+import shutil
+from unittest import mock
+
+from src.models.preset import Preset
+from src.services import batch_regenerator
+from src.services.batch_manager import BatchManager
+from src.services.batch_regenerator import BATCH_INDEX_FILENAME, BatchRegenerator
+from src.utils.batch_writer import read_batch_file, write_batch_file
+
+
+class TestBatchRegenerator(unittest.TestCase):
+    """BatchRegeneratorのテスト"""
+
+    def setUp(self):
+        self.workspace = tempfile.mkdtemp()
+        self.manager = BatchManager(self.workspace)
+        self.preset = Preset(name="キャラ", fields=["陣営", "キャラ名"], naming_pattern="{陣営}_{キャラ名}",
+                             target_extensions=[".png"], id="B63EF9")
+        self.other = Preset(name="背景", fields=["陣営", "キャラ名"], naming_pattern="{陣営}_{キャラ名}",
+                            target_extensions=[".png"], id="C00001")
+        self.paths = [self.manager.save_batch_file(self.manager.create_batch_file(self.preset, values))
+                      for values in ({"陣営": "赤", "キャラ名": "田中"}, {"陣営": "青", "キャラ名": "佐藤"},
+                                     {"陣営": "赤", "キャラ名": "😀"})]
+        self.other_path = self.manager.save_batch_file(
+            self.manager.create_batch_file(self.other, {"陣営": "緑", "キャラ名": "鈴木"}))
+
+    def tearDown(self):
+        self.manager.close()
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    def test_regenerates_only_changed_preset_files(self):
+        """プリセットの対象拡張子を変更すると、そのプリセットのバッチファイルだけを書き直す"""
+        # 内容が変わらない場合（生成日時・chcp の行は比較しない）は書き込まない
+        result = self.manager.regenerate_batch_files(self.preset)
+        self.assertEqual(result.matched_count, 3)
+        self.assertEqual((result.regenerated_count, result.unchanged_count, result.error_count), (0, 3, 0))
+        self.assertTrue(os.path.exists(os.path.join(self.workspace, BATCH_INDEX_FILENAME)))
+
+        other_content = read_batch_file(self.other_path)
+        self.preset.target_extensions = [".png", ".webp"]
+        progress = []
+        result = self.manager.regenerate_batch_files(self.preset, lambda done, total: progress.append(done))
+        self.assertEqual(sorted(result.regenerated), sorted(os.path.basename(path) for path in self.paths))
+        self.assertEqual(progress, [1, 2, 3])
+        self.assertEqual(result.index_refreshed_count, 0)
+        for path in self.paths:
+            self.assertIn("REM Target extensions: .png, .webp", read_batch_file(path))
+        self.assertEqual(read_batch_file(self.other_path), other_content)
+        self.assertIn("chcp 65001 > nul", read_batch_file(self.paths[2]))
+
+        # 書き込んだファイルは索引に反映済みのため、読み直さずに同じ内容と判定する
+        result = self.manager.regenerate_batch_files(self.preset)
+        self.assertEqual((result.regenerated_count, result.unchanged_count), (0, 3))
+        self.assertEqual(result.index_refreshed_count, 0)
+        self.assertEqual(result.to_dict()["matched_count"], 3)
+
+    def test_underscore_in_field_value_keeps_folder(self):
+        """項目値に _ があっても移動先フォルダは変わらず、特定できないファイルはエラーにして書き直さない"""
+        path = self.manager.save_batch_file(
+            self.manager.create_batch_file(self.preset, {"陣営": "赤", "キャラ名": "ジョン_スミス"}))
+        self.assertEqual(os.path.basename(path), "B63EF9_赤_ジョン_スミス.bat")
+        # 正規化されていない（移動先フォルダ名がファイル名と異なる）ファイル・項目が足りないファイル
+        unnormalized = os.path.join(os.path.dirname(path), "B63EF9_赤_ＡＢＣ.bat")
+        single_field = os.path.join(os.path.dirname(path), "B63EF9_赤.bat")
+        for manual_path, folder in ((unnormalized, "B63EF9_赤_ＡＢＣ"), (single_field, "B63EF9_赤")):
+            write_batch_file(manual_path, "\n".join([
+                "@echo off", "REM Preset ID: B63EF9", "REM Target extensions: .png",
+                "for %%f in (*.png) do (", f'    move "%%f" "{folder}\\"', ")"]))
+        originals = {p: read_batch_file(p) for p in (unnormalized, single_field)}
+
+        self.preset.target_extensions = [".png", ".webp"]
+        result = self.manager.regenerate_batch_files(self.preset)
+
+        self.assertIn("B63EF9_赤_ジョン_スミス.bat", result.regenerated)
+        content = read_batch_file(path)
+        self.assertIn('move "%%f" "B63EF9_赤_ジョン_スミス\\"', content)
+        self.assertIn("for %%f in (*.webp) do (", content)
+        self.assertEqual(set(result.errors), {os.path.basename(unnormalized), os.path.basename(single_field)})
+        for manual_path, original in originals.items():
+            self.assertEqual(read_batch_file(manual_path), original)
+
+    def test_index_follows_folder_changes(self):
+        """索引は変更・削除されたファイルだけを反映する"""
+        regenerator = BatchRegenerator.for_workspace(self.workspace)
+        try:
+            self.assertEqual(regenerator.index.refresh(), (4, 0))
+            self.assertEqual(regenerator.index.refresh(), (0, 0))
+            os.remove(self.paths[0])
+            with open(self.paths[1], "a", encoding="shift_jis") as f:
+                f.write("\nREM 編集")
+            self.assertEqual(regenerator.index.refresh(), (1, 1))
+            self.assertEqual(len(regenerator.index.files_for_preset("B63EF9")), 2)
+
+            # 手で編集したファイルは内容が違うため再生成する
+            result = regenerator.regenerate(self.preset)
+            self.assertEqual(result.regenerated, [os.path.basename(self.paths[1])])
+        finally:
+            regenerator.close()
+
+    def test_failed_write_keeps_original(self):
+        """書き込みに失敗したファイルは元の内容のまま残り、エラーとして報告する"""
+        original = read_batch_file(self.paths[0])
+        self.preset.target_extensions = [".jpg"]
+        with mock.patch.object(batch_regenerator, "write_batch_file", side_effect=OSError("disk full")):
+            result = self.manager.regenerate_batch_files(self.preset)
+        self.assertEqual(result.error_count, 3)
+        self.assertEqual(result.errors[os.path.basename(self.paths[0])], "disk full")
+        self.assertEqual(read_batch_file(self.paths[0]), original)
+        self.assertEqual([name for name in os.listdir(os.path.dirname(self.paths[0])) if name.endswith(".tmp")], [])
+
+        # 失敗したファイルは次回の再生成で書き直す
+        result = self.manager.regenerate_batch_files(self.preset)
+        self.assertEqual(result.regenerated_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+バッチ実行スケジューラのテスト
+
+- 複数ジョブのプロセスプール実行と結果の集計
+- 同じフォルダのジョブが同時に実行されないこと
+- 進捗コールバック・キャンセル・ジョブの例外
+- BatchManager からの実行（実際の移動・見つからないファイル・ジャーナル記録）
+"""
+
+import unittest
+import os
+import time
+import tempfile
+import shutil
+import threading
+
+from src.models.batch_file import BatchFile
+from src.models.execution_result import ExecutionResult
+from src.services.batch_manager import BatchManager
+from src.services.batch_scheduler import BatchJob, BatchScheduler
+
+_active_lock = threading.Lock()
+_active_directories = set()
+_overlaps = []
+
+
+def _tracking_job(payload):
+    """実行中のフォルダを記録し、同じフォルダの同時実行を検出する"""
+    directories = {os.path.dirname(os.path.abspath(path)) for path in payload["files"]}
+    with _active_lock:
+        if directories & _active_directories:
+            _overlaps.append(payload["batch_filename"])
+        _active_directories.update(directories)
+    time.sleep(0.02)
+    with _active_lock:
+        _active_directories.difference_update(directories)
+    return ExecutionResult(payload["batch_filename"], processed_files_count=len(payload["files"]),
+                           success_count=len(payload["files"]))
+
+
+def _failing_job(payload):
+    raise RuntimeError("実行に失敗しました")
+
+
+class TestBatchScheduler(unittest.TestCase):
+    """BatchSchedulerのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.directories = []
+        for d in range(3):
+            directory = os.path.join(self.temp_dir, f"folder{d}")
+            os.makedirs(directory)
+            self.directories.append(directory)
+        _overlaps.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _batch_file(self, character):
+        return BatchFile(
+            preset_id="B63EF9",
+            preset_name="テスト",
+            field_values={"陣営": "青軍", "キャラ名": character},
+            target_extensions=[".png"],
+            workspace_path=self.temp_dir
+        )
+
+    def _files(self, directory, count, extension=".png", prefix="image"):
+        return [os.path.join(directory, f"{prefix}{i}{extension}") for i in range(count)]
+
+    def _create_files(self, directory, count, extension=".png", prefix="image"):
+        files = self._files(directory, count, extension, prefix)
+        for path in files:
+            open(path, "wb").close()
+        return files
+
+    def test_run_jobs_in_processes(self):
+        """プロセスプールで実行し、結果がジョブ順に集計されることをテスト"""
+        jobs = [
+            BatchJob(self._batch_file(f"キャラ{i}"),
+                     self._create_files(self.directories[i % 3], 3, prefix=f"job{i}_")
+                     + self._create_files(self.directories[i % 3], 1, ".txt", prefix=f"job{i}_"))
+            for i in range(6)
+        ]
+
+        schedule = BatchScheduler(max_workers=3).run(jobs)
+
+        self.assertFalse(schedule.cancelled)
+        self.assertEqual([r.batch_filename for r in schedule.results],
+                         [f"B63EF9_青軍_キャラ{i}.bat" for i in range(6)])
+        self.assertEqual(schedule.processed_files_count, 18)
+        self.assertEqual(schedule.success_count, 18)
+        self.assertEqual(schedule.error_count, 0)
+        self.assertTrue(all(r.started_at and r.completed_at for r in schedule.results))
+        moved = os.listdir(os.path.join(self.directories[0], "B63EF9_青軍_キャラ3"))
+        self.assertEqual(sorted(moved), [f"B63EF9_青軍_キャラ3_A0000{i}.png" for i in range(1, 4)])
+
+    def test_same_directory_not_concurrent(self):
+        """同じフォルダのジョブが同時に実行されず、投入順に実行されることをテスト"""
+        order = []
+        jobs = [BatchJob(self._batch_file(f"キャラ{i}"), self._files(self.directories[i % 2], 2))
+                for i in range(12)]
+        scheduler = BatchScheduler(
+            max_workers=4, use_processes=False, job_function=_tracking_job,
+            progress_callback=lambda done, total, job, result: order.append(job.job_id)
+        )
+
+        schedule = scheduler.run(jobs)
+
+        self.assertEqual(_overlaps, [])
+        self.assertEqual(len(schedule.completed_results), 12)
+        for parity in (0, 1):
+            expected = [job.job_id for job in jobs[parity::2]]
+            self.assertEqual([job_id for job_id in order if job_id in expected], expected)
+
+    def test_progress_and_cancel(self):
+        """進捗コールバックからキャンセルすると未開始のジョブが実行されないことをテスト"""
+        progress = []
+        jobs = [BatchJob(self._batch_file(f"キャラ{i}"), self._files(self.directories[0], 1))
+                for i in range(5)]
+        scheduler = BatchScheduler(max_workers=1, use_processes=False, job_function=_tracking_job)
+
+        def on_progress(done, total, job, result):
+            progress.append((done, total))
+            if done == 2:
+                scheduler.cancel()
+
+        scheduler.progress_callback = on_progress
+        schedule = scheduler.run(jobs)
+
+        self.assertEqual(progress, [(1, 5), (2, 5)])
+        self.assertTrue(schedule.cancelled)
+        self.assertEqual([job.job_id for job in schedule.cancelled_jobs],
+                         [job.job_id for job in jobs[2:]])
+        self.assertEqual(schedule.results[2:], [None, None, None])
+        self.assertFalse(scheduler.cancel_requested)
+
+    def test_job_exception_becomes_error_result(self):
+        """ジョブの例外が失敗の実行結果になることをテスト"""
+        jobs = [BatchJob(self._batch_file("田中"), self._files(self.directories[0], 2))]
+
+        schedule = BatchScheduler(max_workers=2, job_function=_failing_job).run(jobs)
+
+        result = schedule.results[0]
+        self.assertEqual(result.batch_filename, "B63EF9_青軍_田中.bat")
+        self.assertEqual(result.error_count, 2)
+        self.assertIn("実行に失敗しました", result.error_messages[0])
+
+    def test_batch_manager_records_history(self):
+        """BatchManager から実行した結果が実行履歴に記録されることをテスト"""
+        manager = BatchManager(self.temp_dir)
+        jobs = [(self._batch_file("田中"), self._create_files(self.directories[0], 2)),
+                (self._batch_file("佐藤"),
+                 self._create_files(self.directories[1], 3) + self._files(self.directories[1], 1, prefix="missing"))]
+
+        schedule = manager.execute_batch_jobs(jobs, max_workers=2)
+
+        self.assertEqual(schedule.success_count, 5)
+        self.assertEqual(schedule.error_count, 1)
+        self.assertIn("ファイルが見つかりません", schedule.results[1].error_messages[0])
+        # 移動はアンドゥ用ジャーナルに記録される
+        self.assertEqual(len(manager.rename_engine.journal.get_executions()), 2)
+        self.assertEqual(len(manager.get_execution_history("B63EF9_青軍_佐藤.bat")), 1)
+        manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
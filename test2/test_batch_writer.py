@@ -0,0 +1,126 @@
+"""
+バッチファイルの書き込み（エンコーディングの自動選択）のテスト
+
+- Shift_JIS → CP932 → UTF-8 の順で内容を表せるエンコーディングを選び、chcp の行を合わせること
+- 表せない文字を含む行は書き込む前に報告し、UTF-8 を許可しない場合は何も書き込まないこと
+- 保存したバッチファイルを読み込めること（BatchGenerator・BatchManager）
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+# BatchGenerator は src 直下を基準にインポートする
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.models.batch_file import BatchFile
+from src.services.batch_manager import BatchManager
+from src.utils import batch_writer
+from src.utils.batch_writer import (
+    UnencodableNamesError, plan_encoding, read_batch_file, write_batch_file
+)
+from services.batch_generator import BatchGenerator
+
+
+def _batch(*names):
+    lines = ["@echo off", "chcp 932 > nul"]
+    lines.extend(f'ren "IMG_{i}.png" "{name}"' for i, name in enumerate(names))
+    return "\n".join(lines)
+
+
+class TestEncodingPlan(unittest.TestCase):
+    """plan_encodingのテスト"""
+
+    def test_prefers_shift_jis_then_cp932(self):
+        """Shift_JIS で表せればそのまま、機種依存文字は CP932 を選ぶ"""
+        self.assertEqual(plan_encoding(_batch("青軍_田中.png")).encoding, "shift_jis")
+        self.assertEqual(plan_encoding("@echo off").encoding, "shift_jis")
+        plan = plan_encoding(_batch("青軍_田中.png", "①_髙橋.png"))
+        self.assertEqual(plan.encoding, "cp932")
+        self.assertEqual(plan.chcp_line, "chcp 932 > nul")
+        self.assertEqual(plan.unencodable_lines, [])
+
+    def test_utf8_fallback_reports_lines(self):
+        """Shift_JIS・CP932 で表せない文字は UTF-8 にし、その行を報告する"""
+        plan = plan_encoding(_batch("青軍.png", "😀_①.png", "Ω_é.png"))
+        self.assertEqual(plan.encoding, "utf-8")
+        self.assertTrue(plan.is_fallback)
+        self.assertEqual(plan.unencodable_chars, "é😀")
+        self.assertEqual([number for number, _ in plan.unencodable_lines], [4, 5])
+        self.assertEqual(plan_encoding("@echo off", preferred="utf-8").encoding, "utf-8")
+
+        # ¥ は Shift_JIS のみ、① は CP932 のみで表せるため、両方を含む場合は UTF-8
+        self.assertEqual(plan_encoding(_batch("¥100.png")).encoding, "shift_jis")
+        plan = plan_encoding(_batch("¥100.png", "①.png"))
+        self.assertEqual(plan.encoding, "utf-8")
+        self.assertEqual(plan.unencodable_chars, "¥①")
+
+
+class TestWriteBatchFile(unittest.TestCase):
+    """write_batch_file・read_batch_fileのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "rename.bat")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip_with_matching_code_page(self):
+        """選んだエンコーディングで書き込み、chcp の行を合わせ、読み込みで元に戻る"""
+        content = _batch("青軍.png", "①.png")
+        self.assertEqual(write_batch_file(self.path, content).encoding, "cp932")
+        self.assertEqual(read_batch_file(self.path), content)
+
+        content = _batch("😀.png")
+        write_batch_file(self.path, content)
+        with open(self.path, "rb") as f:
+            self.assertIn(b"chcp 65001 > nul", f.read())
+        self.assertEqual(read_batch_file(self.path), content.replace("chcp 932", "chcp 65001"))
+
+        # chcp の行が無い UTF-8 のバッチには @echo off の後に追加する
+        write_batch_file(self.path, "@echo off\nREM 😀")
+        self.assertEqual(read_batch_file(self.path), "@echo off\nchcp 65001 > nul\nREM 😀")
+
+    def test_chunked_write(self):
+        """チャンクの境界をまたいでも同じ内容になる"""
+        original = batch_writer.WRITE_CHUNK_SIZE
+        batch_writer.WRITE_CHUNK_SIZE = 7
+        try:
+            content = _batch(*[f"青軍_{i}_😀.png" for i in range(50)])
+            write_batch_file(self.path, content)
+        finally:
+            batch_writer.WRITE_CHUNK_SIZE = original
+        self.assertEqual(read_batch_file(self.path), content.replace("chcp 932", "chcp 65001"))
+
+    def test_strict_mode_writes_nothing(self):
+        """UTF-8 を許可しない場合は書き込む前にエラーになる"""
+        with self.assertRaises(UnencodableNamesError) as context:
+            write_batch_file(self.path, _batch("青軍.png", "😀.png"), allow_utf8=False)
+        self.assertEqual(context.exception.lines, [(4, 'ren "IMG_1.png" "😀.png"')])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_generator_and_manager(self):
+        """BatchGenerator・BatchManager の保存で表せない文字があっても失敗しない"""
+        generator = BatchGenerator()
+        content = "\n".join(["@echo off", "chcp 932 > nul", 'ren "a.png" "髙橋_①.png"'])
+        path = generator.save_batch_file(content, self.temp_dir, "generated")
+        self.assertEqual(generator.last_encoding_plan.encoding, "cp932")
+        self.assertEqual(read_batch_file(path), content)
+
+        manager = BatchManager(self.temp_dir)
+        try:
+            batch_file = BatchFile("B63EF9", "テスト", {"陣営": "赤", "キャラ名": "😀"}, [".png"])
+            path = manager.save_batch_file(batch_file)
+            loaded = manager.load_batch_file(path)
+            self.assertIsNotNone(loaded)
+            self.assertEqual(loaded.preset_id, "B63EF9")
+            self.assertEqual(loaded.target_extensions, [".png"])
+        finally:
+            manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
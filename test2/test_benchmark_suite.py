@@ -0,0 +1,55 @@
+"""
+ベンチマークスイートのテスト
+
+- timeit での計測（pytest-benchmark と同じ呼び出し方）と統計値
+- 基準の結果との比較（しきい値・データ量の違い）
+- 小さなデータ量で全ケースが実行できること
+"""
+
+import unittest
+
+from benchmarks.bench_suite import CASES, TimeitBenchmark, compare_results, run_suite
+
+
+def _result(sizes, **times):
+    return {"sizes": sizes, "results": {name: {"min": value, "median": value} for name, value in times.items()}}
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """bench_suiteのテスト"""
+
+    def test_timeit_benchmark(self):
+        """benchmark(関数, 引数) は戻り値を返し、pedantic はラウンドごとに setup を実行する"""
+        benchmark = TimeitBenchmark(rounds=3, min_time=0.001)
+        self.assertEqual(benchmark(sum, [1, 2, 3]), 6)
+        self.assertEqual(benchmark.stats["rounds"], 3)
+        self.assertGreaterEqual(benchmark.stats["iterations"], 1)
+        self.assertLessEqual(benchmark.stats["min"], benchmark.stats["median"])
+
+        setups = []
+        self.assertEqual(benchmark.pedantic(len, args=("abc",), setup=lambda: setups.append(1)), 3)
+        self.assertEqual(len(setups), 3)
+
+    def test_compare_results(self):
+        """しきい値を超えて遅くなったケースだけを返し、データ量が違う結果は比較しない"""
+        sizes = {"files": 10}
+        baseline = _result(sizes, a=1.0, b=1.0, c=1.0)
+        current = _result(sizes, a=1.1, b=1.5, d=9.0)
+        regressions = compare_results(current, baseline, threshold=0.2)
+        self.assertEqual([(r["name"], r["ratio"]) for r in regressions], [("b", 1.5)])
+        self.assertEqual(compare_results(current, baseline, threshold=0.6), [])
+        with self.assertRaises(ValueError):
+            compare_results(_result({"files": 20}, a=1.0), baseline)
+
+    def test_all_cases_run_on_small_workload(self):
+        """小さなデータ量で全ケースを実行し、結果をケースごとに記録する"""
+        results = run_suite(scale=0.001, rounds=1, min_time=0.0)
+        self.assertEqual(set(results["results"]), {name for name, _ in CASES})
+        self.assertEqual(results["sizes"]["files"], 10)
+        for stats in results["results"].values():
+            self.assertGreater(stats["items"], 0)
+            self.assertGreaterEqual(stats["per_item"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+CLIマニフェストモードのテスト
+
+- パスのみ・タブ区切り・JSON Linesのマニフェスト解析
+- 1プロセスで複数バッチファイルへの分割出力
+- 解析できない行の読み飛ばし（行番号の報告）
+"""
+
+import unittest
+import os
+import io
+import sys
+import tempfile
+import shutil
+from contextlib import redirect_stdout
+
+from src.main import TadakanCLI
+from src.utils.manifest import ManifestLineError, iter_manifest, iter_chunks, parse_field_values
+from services.preset_manager import PresetManager
+from models.preset import Preset
+
+
+class TestManifestParsing(unittest.TestCase):
+    """マニフェスト解析のテスト"""
+
+    def test_parse_formats(self):
+        """各形式の行を解析できることをテスト"""
+        lines = [
+            "# コメント\n",
+            "\n",
+            "a.png\n",
+            "b.png\tキャラ名=アクララ,陣営=クレキュリア\n",
+            '{"path": "c.png", "values": {"キャラ名": "ノノミ"}}\n'
+        ]
+
+        entries = list(iter_manifest(lines))
+
+        self.assertEqual([e.path for e in entries], ["a.png", "b.png", "c.png"])
+        self.assertEqual(entries[0].values, {})
+        self.assertEqual(entries[1].values, {"キャラ名": "アクララ", "陣営": "クレキュリア"})
+        self.assertEqual(entries[2].values, {"キャラ名": "ノノミ"})
+        self.assertEqual(entries[2].line_number, 5)
+
+    def test_malformed_lines(self):
+        """解析できない行は行番号付きで送出され、on_error 指定時は読み飛ばされることをテスト"""
+        lines = ["a.png\n", '{"path": \n', '{"values": {}}\n', "b.png\n"]
+
+        with self.assertRaises(ManifestLineError) as context:
+            list(iter_manifest(lines))
+        self.assertEqual(context.exception.line_number, 2)
+
+        errors = []
+        entries = list(iter_manifest(lines, on_error=errors.append))
+        self.assertEqual([e.path for e in entries], ["a.png", "b.png"])
+        self.assertEqual([e.line_number for e in errors], [2, 3])
+
+    def test_parse_field_values(self):
+        """フィールド値文字列を解析できることをテスト"""
+        self.assertEqual(parse_field_values("a=1, b = 2,c"), {"a": "1", "b": "2"})
+
+    def test_iter_chunks(self):
+        """チャンク分割をテスト"""
+        self.assertEqual(list(iter_chunks(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(iter_chunks(range(3), 0)), [[0, 1, 2]])
+
+
+class TestManifestGeneration(unittest.TestCase):
+    """マニフェストからのバッチ生成のテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+        preset_manager = PresetManager(os.path.join(self.temp_dir, "presets"))
+        preset_manager.save_preset(Preset(
+            name="テスト",
+            fields=["陣営", "キャラ名"],
+            naming_pattern="{陣営}_{キャラ名}",
+            id="B63EF9"
+        ))
+        self.cli = TadakanCLI()
+        self.cli._preset_manager = preset_manager
+
+        self.files = []
+        for i in range(5):
+            path = os.path.join(self.temp_dir, f"image{i}.png")
+            with open(path, 'w') as f:
+                f.write("x")
+            self.files.append(path)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, manifest_path, batch_size):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            paths = self.cli.generate_batch_from_manifest(
+                "テスト", {"陣営": "青軍"}, manifest_path, "./output", batch_size
+            )
+        return paths, output.getvalue()
+
+    def test_manifest_split_into_batches(self):
+        """マニフェストが指定件数ごとにバッチファイルへ分割されることをテスト"""
+        manifest_path = os.path.join(self.temp_dir, "manifest.txt")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            for path in self.files:
+                f.write(f"{path}\tキャラ名=田中\n")
+            f.write("missing.png\n")
+
+        paths, output = self._run(manifest_path, 2)
+
+        self.assertEqual(len(paths), 3)
+        self.assertTrue(paths[0].endswith("テスト_rename_001.bat"))
+        self.assertIn("files/秒", output)
+        self.assertIn("ファイルが見つかりません: missing.png", output)
+
+        with open(paths[0], 'r', encoding='shift_jis') as f:
+            content = f.read()
+        self.assertIn('ren "image0.png" "青軍_田中.png"', content)
+
+    def test_manifest_skips_malformed_line(self):
+        """途中の解析できない行を読み飛ばし、前後のバッチファイルをすべて返すことをテスト"""
+        manifest_path = os.path.join(self.temp_dir, "manifest.txt")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            for path in self.files[:3]:
+                f.write(f"{path}\tキャラ名=田中\n")
+            f.write('{"path": broken\n')
+            for path in self.files[3:]:
+                f.write(f"{path}\tキャラ名=田中\n")
+
+        paths, output = self._run(manifest_path, 2)
+
+        self.assertEqual(len(paths), 3)
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+        self.assertIn("4行目", output)
+        self.assertIn("処理ファイル数: 5", output)
+
+    def test_manifest_from_stdin(self):
+        """標準入力からマニフェストを読み込めることをテスト"""
+        manifest = "".join(f'{{"path": "{p}", "values": {{"キャラ名": "佐藤"}}}}\n' for p in self.files)
+        original_stdin = sys.stdin
+        sys.stdin = io.StringIO(manifest)
+        try:
+            paths, output = self._run("-", 0)
+        finally:
+            sys.stdin = original_stdin
+
+        self.assertEqual(len(paths), 1)
+        self.assertIn("処理ファイル数: 5", output)
+
+    def test_manifest_extension_filter(self):
+        """対象拡張子を指定すると他の拡張子のファイルが除外されることをテスト"""
+        text_path = os.path.join(self.temp_dir, "memo.TXT")
+        with open(text_path, 'w') as f:
+            f.write("x")
+        manifest_path = os.path.join(self.temp_dir, "manifest.txt")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            for path in self.files + [text_path]:
+                f.write(f"{path}\tキャラ名=田中\n")
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            paths = self.cli.generate_batch_from_manifest(
+                "テスト", {"陣営": "青軍"}, manifest_path, "./output", 0, ["txt"]
+            )
+
+        self.assertEqual(len(paths), 1)
+        self.assertIn("処理ファイル数: 1", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+CLI起動時間のテスト
+
+- --help / --list で不要なサービス・モデルを読み込まないこと
+- 起動時にpresetsディレクトリを作成しないこと
+- -X importtime によるインポート時間が予算内であること
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from bench_startup import measure_startup, STARTUP_BUDGET_MS
+
+
+class TestCLIStartup(unittest.TestCase):
+    """CLI起動のテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        # 起動中のデーモンに転送されないよう、存在しない状態ファイルを指定
+        self.original_state = os.environ.get("TADAKAN_DAEMON_STATE")
+        os.environ["TADAKAN_DAEMON_STATE"] = os.path.join(self.temp_dir, "daemon.json")
+
+    def tearDown(self):
+        if self.original_state is None:
+            os.environ.pop("TADAKAN_DAEMON_STATE", None)
+        else:
+            os.environ["TADAKAN_DAEMON_STATE"] = self.original_state
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_help_does_not_import_services(self):
+        """--help でサービスを読み込まないことをテスト"""
+        result = measure_startup(["--help"], cwd=self.temp_dir)
+
+        self.assertEqual(result["returncode"], 0)
+        for module in result["modules"]:
+            self.assertFalse(module.startswith(("services", "models", "src.")), module)
+
+    def test_list_imports_only_preset_manager(self):
+        """--list でプリセット管理以外を読み込まないことをテスト"""
+        result = measure_startup(["--list"], cwd=self.temp_dir)
+
+        self.assertEqual(result["returncode"], 0)
+        self.assertIn("services.preset_manager", result["modules"])
+        self.assertNotIn("services.file_renamer", result["modules"])
+        self.assertNotIn("services.batch_generator", result["modules"])
+        self.assertNotIn("tkinter", result["modules"])
+
+    def test_list_does_not_create_presets_directory(self):
+        """--list でpresetsディレクトリを作成しないことをテスト"""
+        measure_startup(["--list"], cwd=self.temp_dir)
+
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "presets")))
+
+    def test_import_time_within_budget(self):
+        """インポート時間が予算内であることをテスト"""
+        for args in (["--help"], ["--list"]):
+            # 初回はバイトコードのコンパイルを含むため2回目を計測
+            measure_startup(args, cwd=self.temp_dir)
+            result = measure_startup(args, cwd=self.temp_dir)
+            self.assertLessEqual(result["import_ms"], STARTUP_BUDGET_MS, args)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+常駐デーモンのテスト
+
+- 状態ファイルによるデーモン検出と認証トークン
+- list / generate / search / execute の転送
+- プリセットディレクトリが異なる場合は転送しないこと
+- 送信後の失敗・タイムアウトはローカルで再実行しないこと、不正な内容は 400
+"""
+
+import unittest
+import os
+import json
+import tempfile
+import shutil
+import socket
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from src import main as cli_main
+from src.main import TadakanCLI
+from src.daemon import DaemonRequestError, TadakanDaemon, create_server, forward, read_state
+from services.preset_manager import PresetManager
+from services.batch_manager import BatchManager
+from models.preset import Preset
+
+
+class TestDaemon(unittest.TestCase):
+    """デーモンのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.presets_dir = os.path.join(self.temp_dir, "presets")
+        self.workspace = os.path.join(self.temp_dir, "workspace")
+        self.state_file = os.path.join(self.temp_dir, "daemon.json")
+
+        self.preset = Preset(
+            name="テスト",
+            fields=["陣営", "キャラ名"],
+            naming_pattern="{陣営}_{キャラ名}",
+            target_extensions=[".png"],
+            id="B63EF9"
+        )
+        PresetManager(self.presets_dir).save_preset(self.preset)
+
+        cli = TadakanCLI(presets_directory=self.presets_dir,
+                         batch_directory=os.path.join(self.temp_dir, "batch_files"))
+        self.daemon = TadakanDaemon(cli, self.workspace)
+        self.daemon.warm_up()
+        self.server = create_server(self.daemon, self.state_file)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _forward(self, command, payload):
+        return forward(command, payload, state_file=self.state_file)
+
+    def test_state_file(self):
+        """状態ファイルに接続情報が書き込まれることをテスト"""
+        state = read_state(self.state_file)
+
+        self.assertEqual(state["port"], self.server.server_address[1])
+        self.assertEqual(state["presets_directory"], os.path.abspath(self.presets_dir))
+        self.assertTrue(state["token"])
+        if os.name == "posix":
+            self.assertEqual(os.stat(self.state_file).st_mode & 0o777, 0o600)
+
+    def test_list(self):
+        """プリセット一覧が転送されることをテスト"""
+        response = self._forward("list", {})
+
+        self.assertIn("テスト", response["output"])
+
+    def test_generate(self):
+        """バッチ生成が転送されることをテスト"""
+        image_path = os.path.join(self.temp_dir, "image.png")
+        with open(image_path, 'w') as f:
+            f.write("x")
+
+        response = self._forward("generate", {
+            "preset": "テスト",
+            "values": {"陣営": "青軍", "キャラ名": "田中"},
+            "files": [image_path],
+            "output": os.path.join(self.temp_dir, "output")
+        })
+
+        self.assertTrue(os.path.exists(response["result"]))
+        self.assertIn("処理ファイル数: 1", response["output"])
+
+    def test_search_and_execute(self):
+        """バッチ検索・実行が転送されることをテスト"""
+        manager = BatchManager(self.workspace)
+        manager.save_batch_file(manager.create_batch_file(self.preset, {"陣営": "青軍", "キャラ名": "田中"}))
+
+        response = self._forward("search", {"criteria": {"キャラ名": "田中"}})
+        self.assertEqual([r["filename"] for r in response["result"]], ["B63EF9_青軍_田中.bat"])
+
+        image = os.path.join(self.temp_dir, "a.png")
+        open(image, "wb").close()
+        response = self._forward("execute", {
+            "batch_filename": "B63EF9_青軍_田中.bat",
+            "files": [image, "b.txt"]
+        })
+        self.assertEqual(response["result"]["processed_files_count"], 1)
+        self.assertEqual(response["result"]["success_count"], 1)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "B63EF9_青軍_田中", "B63EF9_青軍_田中_A00001.png")))
+
+    def test_wrong_token_is_rejected(self):
+        """トークンが一致しない場合は転送されないことをテスト"""
+        state = read_state(self.state_file)
+        state["token"] = "invalid"
+        bad_state_file = os.path.join(self.temp_dir, "bad.json")
+        with open(bad_state_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+        self.assertIsNone(forward("list", {}, state_file=bad_state_file))
+
+    def test_different_presets_directory_is_not_forwarded(self):
+        """プリセットディレクトリが異なる場合は転送しないことをテスト"""
+        response = forward("list", {}, state_file=self.state_file,
+                           presets_directory=os.path.join(self.temp_dir, "other"))
+
+        self.assertIsNone(response)
+
+    def test_missing_state_file(self):
+        """状態ファイルがない場合はNoneを返すことをテスト"""
+        self.assertIsNone(forward("list", {}, state_file=os.path.join(self.temp_dir, "none.json")))
+
+
+    def test_invalid_payload_is_rejected(self):
+        """必須の項目が無いリクエストは 400 になり、送信後のエラーとして扱われることをテスト"""
+        with self.assertRaises(DaemonRequestError) as context:
+            self._forward("generate", {"preset": "テスト", "output": self.temp_dir})
+        self.assertEqual(context.exception.status, 400)
+
+        with self.assertRaises(DaemonRequestError) as context:
+            self._forward("execute", {})
+        self.assertEqual(context.exception.status, 400)
+
+    def test_unknown_command_is_not_forwarded(self):
+        """未知のコマンドは実行前に拒否されるため None になることをテスト"""
+        self.assertIsNone(self._forward("unknown", {}))
+
+    def test_unreachable_daemon(self):
+        """接続できないデーモンは None になることをテスト"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            closed_port = sock.getsockname()[1]
+        state = dict(read_state(self.state_file), port=closed_port)
+        closed_state_file = os.path.join(self.temp_dir, "closed.json")
+        with open(closed_state_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+        self.assertIsNone(forward("list", {}, state_file=closed_state_file))
+
+    def test_timeout_after_send(self):
+        """送信後に応答が無い場合は DaemonRequestError になることをテスト"""
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        state = dict(read_state(self.state_file), port=listener.getsockname()[1])
+        silent_state_file = os.path.join(self.temp_dir, "silent.json")
+        with open(silent_state_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        try:
+            with self.assertRaises(DaemonRequestError):
+                forward("list", {}, state_file=silent_state_file, timeout=0.2)
+        finally:
+            listener.close()
+
+    def test_cli_does_not_rerun_after_send_failure(self):
+        """送信後に失敗した場合、CLI はローカルで実行しないことをテスト"""
+        # main は "daemon" としてインポートするため、同じモジュールの例外を使う
+        import daemon
+        args = SimpleNamespace(list=True)
+        cli = TadakanCLI(presets_directory=self.presets_dir)
+        with mock.patch.dict(os.environ, {"TADAKAN_DAEMON_STATE": self.state_file}), \
+                mock.patch("daemon.forward", side_effect=daemon.DaemonRequestError("timeout")), \
+                mock.patch("sys.stderr"):
+            self.assertTrue(cli_main._forward_to_daemon(args, cli))
+        with mock.patch.dict(os.environ, {"TADAKAN_DAEMON_STATE": self.state_file}), \
+                mock.patch("daemon.forward", return_value=None):
+            self.assertFalse(cli_main._forward_to_daemon(args, cli))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,349 @@
+"""
+ドロップ取り込みパイプラインのテスト
+
+- フォルダの再帰的な展開（重複するドロップの除外・移動先フォルダの除外）
+- 対象拡張子での絞り込み・連番の継続・移動先の衝突
+- 連番の上限・メモリ使用量がファイル数に比例しないこと
+- 移動のジャーナル記録（チャンクをまたいで1回の実行）・インデックスへの反映・アンドゥ
+- 内容が同じファイル（移動先の既存ファイル・先に取り込んだファイル）は移動しないこと
+- ヘッドレスのイベントループでバックグラウンド実行（tkinter 不要）
+- BatchPanel へのドロップ（失敗・進捗の通知、取り込み未設定時は False）
+"""
+
+import unittest
+import os
+import tempfile
+import shutil
+import tracemalloc
+
+from src.gui.headless import HeadlessEventLoop, UiThreadIoMonitor
+from src.gui.task_runner import GuiTaskRunner
+from src.gui.drop_ingestion import submit_drop
+from src.gui.batch_panel import BatchPanel
+from src.models.batch_file import BatchFile
+from src.services.batch_manager import BatchManager
+from src.services.drop_pipeline import DropPipeline, iter_dropped_files
+from src.services.duplicate_detector import DuplicateDetector, LEGACY_HASH_CACHE_FILENAME
+from src.services.file_index import FileIndex
+from src.services.rename_engine import RenameEngine
+from src.services.sequence_store import SequenceStore
+
+
+def _touch(path: str, content: bytes = b""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+class TestDropPipeline(unittest.TestCase):
+    """DropPipelineのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.batch_file = BatchFile(
+            preset_id="B63EF9",
+            preset_name="テスト",
+            field_values={"陣営": "クレキュリア", "キャラ名": "アクララ"},
+            target_extensions=[".png", ".JPG"]
+        )
+        self.folder_name = "B63EF9_クレキュリア_アクララ"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_expands_folders_and_skips_overlapping_drops(self):
+        """フォルダは再帰的に展開し、ドロップしたフォルダの中のパスは1回だけ返す"""
+        drop = os.path.join(self.temp_dir, "drop")
+        _touch(os.path.join(drop, "a.png"))
+        _touch(os.path.join(drop, "sub", "b.png"))
+        _touch(os.path.join(drop, "sub", "deep", "c.txt"))
+        _touch(os.path.join(drop, "skip", "d.png"))
+
+        files = iter_dropped_files([drop, os.path.join(drop, "a.png"), os.path.join(drop, "sub")],
+                                   skip_directory_names=("skip",))
+        self.assertFalse(isinstance(files, list))
+        self.assertEqual(sorted(os.path.relpath(path, drop) for path in files),
+                         sorted(["a.png", os.path.join("sub", "b.png"), os.path.join("sub", "deep", "c.txt")]))
+
+    def test_moves_target_files_with_continuing_sequences(self):
+        """対象拡張子のファイルだけを移動し、連番は実行をまたいで継続する"""
+        store = SequenceStore(os.path.join(self.temp_dir, "sequences.sqlite3"))
+        _touch(os.path.join(self.temp_dir, "photos", "1.png"))
+        _touch(os.path.join(self.temp_dir, "photos", "2.jpg"))
+        _touch(os.path.join(self.temp_dir, "photos", "notes.txt"))
+
+        result = DropPipeline(self.batch_file, store, chunk_size=2).run([os.path.join(self.temp_dir, "photos")])
+
+        self.assertTrue(result.success)
+        self.assertEqual((result.scanned_count, result.moved_count, result.skipped_count), (3, 2, 1))
+        destination = os.path.join(self.temp_dir, "photos", self.folder_name)
+        names = sorted(os.listdir(destination))
+        self.assertEqual([os.path.splitext(name)[0] for name in names],
+                         [f"{self.folder_name}_A00001", f"{self.folder_name}_A00002"])
+        self.assertEqual(sorted(os.path.splitext(name)[1] for name in names), [".jpg", ".png"])
+
+        # 2回目のドロップは移動先フォルダを再走査せず、続きの番号を振る
+        _touch(os.path.join(self.temp_dir, "photos", "3.PNG"))
+        second = DropPipeline(self.batch_file, store).run([os.path.join(self.temp_dir, "photos")])
+        self.assertEqual(second.moved_count, 1)
+        self.assertEqual(second.first_sequence, "A00003")
+        self.assertIn(f"{self.folder_name}_A00003.PNG", os.listdir(destination))
+        store.close()
+
+    def test_existing_destination_and_conflicts(self):
+        """既存の移動先の番号から続け、同名ファイルがある場合は番号を取り直す"""
+        destination = os.path.join(self.temp_dir, self.folder_name)
+        _touch(os.path.join(destination, f"{self.folder_name}_A00007.png"))
+        _touch(os.path.join(self.temp_dir, "new1.png"), b"1")
+
+        pipeline = DropPipeline(self.batch_file)
+        first = pipeline.run([os.path.join(self.temp_dir, "new1.png")])
+        self.assertEqual(first.first_sequence, "A00008")
+
+        # 他のプロセスが次の番号のファイルを作った場合
+        _touch(os.path.join(destination, f"{self.folder_name}_A00009.png"), b"other")
+        _touch(os.path.join(self.temp_dir, "new2.png"), b"2")
+        second = pipeline.run([os.path.join(self.temp_dir, "new2.png")])
+
+        self.assertTrue(second.success)
+        self.assertEqual(second.renumbered_count, 1)
+        with open(os.path.join(destination, f"{self.folder_name}_A00009.png"), "rb") as f:
+            self.assertEqual(f.read(), b"other")
+        with open(os.path.join(destination, f"{self.folder_name}_A00010.png"), "rb") as f:
+            self.assertEqual(f.read(), b"2")
+
+    def test_stops_at_sequence_limit(self):
+        """連番の上限に達したら残りは移動しない"""
+        store = SequenceStore()
+        store.ensure_at_least(self.batch_file.get_batch_filename(), 99998)
+        for i in range(3):
+            _touch(os.path.join(self.temp_dir, "drop", f"{i}.png"))
+
+        result = DropPipeline(self.batch_file, store, chunk_size=1).run([os.path.join(self.temp_dir, "drop")])
+
+        self.assertEqual(result.moved_count, 1)
+        self.assertEqual(result.error_count, 1)
+        self.assertIn("上限", result.error_messages[0])
+
+    def test_moves_are_journaled_and_indexed(self):
+        """チャンクをまたいでも1回の実行としてジャーナルに記録し、インデックスに反映する（アンドゥで戻る）"""
+        workspace = os.path.join(self.temp_dir, "workspace")
+        os.makedirs(workspace)
+        index = FileIndex(os.path.join(workspace, "index.sqlite3"))
+        engine = RenameEngine.for_workspace(workspace, index=index)
+        drop = os.path.join(self.temp_dir, "drop")
+        for i in range(5):
+            _touch(os.path.join(drop, f"{i}.png"))
+
+        result = DropPipeline(self.batch_file, chunk_size=2, rename_engine=engine).run([drop])
+
+        self.assertEqual(result.moved_count, 5)
+        self.assertIsNotNone(result.execution_id)
+        executions = engine.journal.get_executions()
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(len(executions[0].operations), 5)
+        destination = os.path.join(drop, self.folder_name)
+        self.assertEqual(index.count(destination), 5)
+
+        undo = engine.undo()
+        self.assertEqual(undo.execution_id, result.execution_id)
+        self.assertEqual(sorted(name for name in os.listdir(drop) if name.endswith(".png")),
+                         [f"{i}.png" for i in range(5)])
+        self.assertEqual(index.count(destination), 0)
+        index.close()
+
+    def test_duplicates_are_left_in_place(self):
+        """移動先の既存ファイル・先のチャンクで移動したファイルと内容が同じファイルは移動せず、連番も振らない"""
+        drop = os.path.join(self.temp_dir, "drop")
+        destination = os.path.join(drop, self.folder_name)
+        _touch(os.path.join(destination, f"{self.folder_name}_A00001.png"), b"old")
+        _touch(os.path.join(drop, "x.png"), b"old")
+        _touch(os.path.join(drop, "y.png"), b"new")
+        _touch(os.path.join(drop, "z.png"), b"new")
+        _touch(os.path.join(drop, "empty1.png"))
+        _touch(os.path.join(drop, "empty2.png"))
+        detector = DuplicateDetector()
+        try:
+            result = DropPipeline(self.batch_file, chunk_size=1, duplicate_detector=detector).run([drop])
+        finally:
+            detector.close()
+
+        # 空のファイルは重複として扱わない
+        self.assertEqual(result.moved_count, 3)
+        self.assertEqual(result.duplicate_count, 2)
+        self.assertTrue(result.success)
+        self.assertEqual(result.last_sequence, "A00004")
+        remaining = sorted(name for name in os.listdir(drop) if name.endswith(".png"))
+        self.assertIn("x.png", remaining)
+        self.assertEqual(len(remaining), 2)
+
+    def test_memory_does_not_grow_with_file_count(self):
+        """保持するのはチャンク分だけなので、ファイル数が10倍でもメモリ使用量はほぼ変わらない"""
+        small = os.path.join(self.temp_dir, "small")
+        large = os.path.join(self.temp_dir, "large")
+        for directory, count in ((small, 2000), (large, 20000)):
+            os.makedirs(directory)
+            for i in range(count):
+                open(os.path.join(directory, f"image_{i:06d}.png"), "wb").close()
+
+        peaks = []
+        for directory in (small, large):
+            pipeline = DropPipeline(self.batch_file, chunk_size=500, dry_run=True)
+            tracemalloc.start()
+            try:
+                result = pipeline.run([directory])
+                peaks.append(tracemalloc.get_traced_memory()[1])
+            finally:
+                tracemalloc.stop()
+            self.assertEqual(result.scanned_count, len(os.listdir(directory)))
+
+        self.assertLess(peaks[1], peaks[0] * 3)
+
+
+class TestHeadlessDropIngestion(unittest.TestCase):
+    """tkinter なしでドロップの取り込みをバックグラウンド実行するテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.workspace = os.path.join(self.temp_dir, "workspace")
+        os.makedirs(self.workspace)
+        self.loop = HeadlessEventLoop()
+        self.runner = GuiTaskRunner(self.loop, poll_interval_ms=5)
+        self.batch_manager = BatchManager(self.workspace)
+
+    def tearDown(self):
+        self.runner.shutdown(wait=True)
+        self.batch_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_drop_onto_stocked_batch(self):
+        """保存済みバッチファイルにドロップすると、ワーカーで移動し結果と履歴が残る"""
+        batch_file = BatchFile("X1Y2Z3", "テスト", {"陣営": "セントラル", "キャラ名": "ノノミ"},
+                               target_extensions=[".png"])
+        batch_path = self.batch_manager.save_batch_file(batch_file)
+        drop = os.path.join(self.temp_dir, "drop")
+        for i in range(2500):
+            _touch(os.path.join(drop, f"sub{i % 5}", f"{i}.png"))
+        _touch(os.path.join(drop, "readme.txt"))
+
+        results = []
+        progress = []
+        with UiThreadIoMonitor() as io_monitor:
+            submit_drop(self.runner, self.batch_manager, batch_path, [drop],
+                        on_success=results.append,
+                        on_progress=lambda done, total, message: progress.append(done))
+            self.assertTrue(self.loop.run(lambda: self.runner.active_count == 0, timeout=60))
+
+        self.assertEqual(io_monitor.violations, [])
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].moved_count, 2500)
+        self.assertEqual(results[0].skipped_count, 1)
+        self.assertEqual(results[0].last_sequence, "A02500")
+        self.assertTrue(progress)
+        history = self.batch_manager.get_execution_history(batch_file.get_batch_filename())
+        self.assertEqual(history[0].success_count, 2500)
+
+    def test_duplicates_are_not_ingested(self):
+        """BatchManager からの取り込みはワークスペースの重複検出を使い、以前のハッシュキャッシュを削除する"""
+        legacy_cache = os.path.join(self.workspace, LEGACY_HASH_CACHE_FILENAME)
+        _touch(legacy_cache, b"legacy")
+        batch_file = BatchFile("X1Y2Z3", "テスト", {"陣営": "セントラル", "キャラ名": "ノノミ"},
+                               target_extensions=[".png"])
+        batch_path = self.batch_manager.save_batch_file(batch_file)
+        drop = os.path.join(self.temp_dir, "drop")
+        _touch(os.path.join(drop, "a.png"), b"same")
+        _touch(os.path.join(drop, "b.png"), b"same")
+
+        results = []
+        submit_drop(self.runner, self.batch_manager, batch_path, [drop], on_success=results.append)
+        self.assertTrue(self.loop.run(lambda: self.runner.active_count == 0, timeout=10))
+
+        self.assertEqual(results[0].moved_count, 1)
+        self.assertEqual(results[0].duplicate_count, 1)
+        self.assertFalse(os.path.exists(legacy_cache))
+
+    def test_unreadable_batch_reports_error(self):
+        """読み込めないバッチファイルはエラーコールバックに渡る"""
+        errors = []
+        submit_drop(self.runner, self.batch_manager, os.path.join(self.temp_dir, "missing.bat"),
+                    [self.temp_dir], on_error=errors.append)
+        self.assertTrue(self.loop.run(lambda: self.runner.active_count == 0, timeout=10))
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], ValueError)
+
+
+class _SelectedListbox:
+    """先頭行が選択された一覧（BatchPanel をウィジェットなしで動かす）"""
+
+    def curselection(self):
+        return (0,)
+
+
+class TestBatchPanelDrop(unittest.TestCase):
+    """BatchPanel.handle_file_drop をヘッドレスで動かすテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.workspace = os.path.join(self.temp_dir, "workspace")
+        os.makedirs(self.workspace)
+        self.loop = HeadlessEventLoop()
+        self.runner = GuiTaskRunner(self.loop, poll_interval_ms=5)
+        self.batch_manager = BatchManager(self.workspace)
+        # ウィジェットは作らず、ドロップの処理に使う属性だけを設定する
+        self.panel = BatchPanel.__new__(BatchPanel)
+        self.panel._drag_drop_enabled = True
+        self.panel.batch_listbox = _SelectedListbox()
+        self.panel.task_runner = self.runner
+        self.panel.batch_manager = self.batch_manager
+        self.panel.on_drop_completed = None
+        self.panel.on_drop_error = None
+        self.panel.on_drop_progress = None
+
+    def tearDown(self):
+        self.runner.shutdown(wait=True)
+        self.batch_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_unreadable_batch_is_reported(self):
+        """読み込めないバッチファイルへのドロップは on_drop_error に渡る"""
+        self.panel._batch_entries = [{"filename": "missing.bat",
+                                      "path": os.path.join(self.temp_dir, "missing.bat")}]
+        errors = []
+        self.panel.on_drop_error = errors.append
+        self.assertTrue(self.panel.handle_file_drop([self.temp_dir]))
+        self.assertTrue(self.loop.run(lambda: self.runner.active_count == 0, timeout=10))
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], ValueError)
+
+    def test_progress_and_result_are_reported(self):
+        """取り込みの進捗（移動済み件数）と結果が通知される"""
+        batch_file = BatchFile("X1Y2Z3", "テスト", {"陣営": "セントラル", "キャラ名": "ノノミ"},
+                               target_extensions=[".png"])
+        batch_path = self.batch_manager.save_batch_file(batch_file)
+        self.panel._batch_entries = [{"filename": batch_file.get_batch_filename(), "path": batch_path}]
+        drop = os.path.join(self.temp_dir, "drop")
+        for i in range(3):
+            _touch(os.path.join(drop, f"{i}.png"))
+        results = []
+        progress = []
+        self.panel.on_drop_completed = results.append
+        self.panel.on_drop_progress = progress.append
+        self.assertTrue(self.panel.handle_file_drop([drop]))
+        self.assertTrue(self.loop.run(lambda: self.runner.active_count == 0, timeout=10))
+        self.assertEqual(results[0].moved_count, 3)
+        # 進捗は (移動済み件数, 総数, メッセージ) から移動済み件数だけを渡す
+        self.panel._on_drop_progress(2, 0, "ドロップの取り込み")
+        self.assertEqual(progress[-1], 2)
+
+    def test_not_wired_returns_false(self):
+        """ランナー・BatchManager が未設定の場合は何もせず False"""
+        self.panel._batch_entries = [{"filename": "a.bat", "path": "a.bat"}]
+        self.panel.task_runner = None
+        self.assertFalse(self.panel.handle_file_drop(["test1.png"]))
+        self.panel.task_runner = self.runner
+        self.panel.batch_manager = None
+        self.assertFalse(self.panel.handle_file_drop(["test1.png"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+重複ファイル検出のテスト
+
+- サイズ → 部分ハッシュ → 全体ハッシュの段階的な比較
+- 移動先フォルダの既存ファイル・候補同士の重複
+- ダイジェストキャッシュの利用・以前のハッシュキャッシュの削除
+- リネームプレビューでの重複の表示・除外
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+# FileRenamer は src 直下を基準にインポートする
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.models.preset import Preset
+from src.services.duplicate_detector import DuplicateDetector, LEGACY_HASH_CACHE_FILENAME
+from src.utils.file_digest import FileDigester, DigestCache, DIGEST_CACHE_FILENAME, PARTIAL_BLOCK_SIZE
+from services.file_renamer import FileRenamer
+
+
+class TestDuplicateDetector(unittest.TestCase):
+    """DuplicateDetectorのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.drop_dir = os.path.join(self.temp_dir, "drop")
+        self.target_dir = os.path.join(self.temp_dir, "target")
+        os.makedirs(self.drop_dir)
+        os.makedirs(self.target_dir)
+        self.detector = DuplicateDetector.for_workspace(self.temp_dir)
+
+    def tearDown(self):
+        self.detector.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, directory, name, content: bytes):
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_unique_sizes_are_not_hashed(self):
+        """サイズが一意のファイルはハッシュを計算しないことをテスト"""
+        paths = [self._write(self.drop_dir, f"{i}.png", b"x" * (i + 1)) for i in range(5)]
+        self._write(self.target_dir, "existing.png", b"y" * 100)
+
+        report = self.detector.find_duplicates(paths, self.target_dir)
+
+        self.assertEqual(report.duplicate_count, 0)
+        self.assertEqual(report.hashed_files, 0)
+
+    def test_duplicates_of_existing_and_candidates(self):
+        """既存ファイル・先の候補と同じ内容のファイルが検出されることをテスト"""
+        existing = self._write(self.target_dir, "B63EF9_青軍_田中_A00001.png", b"image-1")
+        self._write(self.target_dir, "other.png", b"image-9")
+        first = self._write(self.drop_dir, "copy_of_existing.png", b"image-1")
+        second = self._write(self.drop_dir, "new.png", b"image-2")
+        third = self._write(self.drop_dir, "new_again.png", b"image-2")
+        empty_a = self._write(self.drop_dir, "empty_a.png", b"")
+        empty_b = self._write(self.drop_dir, "empty_b.png", b"")
+
+        report = self.detector.find_duplicates([first, second, third, empty_a, empty_b], self.target_dir)
+
+        self.assertEqual(report.duplicates, {first: existing, third: second})
+
+    def test_full_hash_resolves_partial_ties(self):
+        """先頭・末尾が同じで中間が異なるファイルは重複にならないことをテスト"""
+        block = PARTIAL_BLOCK_SIZE
+        head, tail = b"h" * block, b"t" * block
+        a = self._write(self.drop_dir, "a.bin", head + b"1" * block + tail)
+        b = self._write(self.drop_dir, "b.bin", head + b"2" * block + tail)
+        c = self._write(self.drop_dir, "c.bin", head + b"1" * block + tail)
+
+        report = self.detector.find_duplicates([a, b, c])
+
+        self.assertEqual(report.duplicates, {c: a})
+
+    def test_legacy_hash_cache_is_removed(self):
+        """以前のハッシュキャッシュ（WAL を含む）は for_workspace で削除されることをテスト"""
+        legacy = os.path.join(self.temp_dir, LEGACY_HASH_CACHE_FILENAME)
+        for path in (legacy, legacy + "-wal"):
+            self._write(self.temp_dir, os.path.basename(path), b"legacy")
+        DuplicateDetector.for_workspace(self.temp_dir).close()
+        self.assertFalse(os.path.exists(legacy))
+        self.assertFalse(os.path.exists(legacy + "-wal"))
+
+    def test_hash_cache(self):
+        """ハッシュがキャッシュされ、更新されたファイルは再計算されることをテスト"""
+        a = self._write(self.drop_dir, "a.png", b"same")
+        b = self._write(self.drop_dir, "b.png", b"same")
+        self.detector.find_duplicates([a, b])
+        self.detector.close()
+
+        detector = DuplicateDetector(FileDigester(DigestCache(os.path.join(self.temp_dir, DIGEST_CACHE_FILENAME))))
+        report = detector.find_duplicates([a, b])
+        self.assertEqual(report.hashed_files, 0)
+        self.assertEqual(report.cache_hits, 2)
+
+        self._write(self.drop_dir, "b.png", b"diff")
+        os.utime(b, ns=(0, 1))
+        report = detector.find_duplicates([a, b])
+        self.assertEqual(report.hashed_files, 1)
+        self.assertEqual(report.duplicate_count, 0)
+        detector.close()
+
+    def test_preview_flags_and_skips_duplicates(self):
+        """リネームプレビューで重複が表示・除外されることをテスト"""
+        existing = self._write(self.target_dir, "青軍_田中_001.png", b"image-1")
+        paths = [
+            self._write(self.drop_dir, "1.png", b"image-1"),
+            self._write(self.drop_dir, "2.png", b"image-2"),
+            self._write(self.drop_dir, "3.png", b"image-3"),
+        ]
+        preset = Preset(name="テスト", fields=["陣営", "キャラ名", "番号"],
+                        naming_pattern="{陣営}_{キャラ名}_{番号}")
+        renamer = FileRenamer()
+        values = {"陣営": "青軍", "キャラ名": "田中"}
+
+        preview = renamer.generate_preview_list(preset, paths, values, self.detector, self.target_dir)
+        self.assertEqual([item.duplicate_of for item in preview], [existing, None, None])
+
+        preview = renamer.generate_preview_list(preset, paths, values, self.detector, self.target_dir,
+                                                skip_duplicates=True)
+        self.assertEqual([item.original_name for item in preview], ["2.png", "3.png"])
+        self.assertEqual([item.new_name for item in preview], ["青軍_田中_001.png", "青軍_田中_002.png"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+実行履歴ストアのテスト
+
+- ワークスペース内への永続化（インスタンスをまたいだ履歴取得）
+- 成功率・よく使われるバッチ・エラー集計のレポート
+- 追記専用（更新・削除の禁止）
+- 長期間の履歴に対するレポートの応答時間
+"""
+
+import unittest
+import os
+import time
+import sqlite3
+import tempfile
+import shutil
+from datetime import datetime, timedelta
+
+from src.models.execution_result import ExecutionResult
+from src.services.batch_manager import BatchManager
+from src.services.execution_history import ExecutionHistoryStore, HISTORY_FILENAME
+
+
+def _result(batch_filename, executed_at, processed=10, success=10, errors=None):
+    errors = errors or []
+    return ExecutionResult(
+        batch_filename=batch_filename,
+        executed_at=executed_at.isoformat(),
+        processed_files_count=processed,
+        success_count=success,
+        error_count=len(errors),
+        error_messages=errors
+    )
+
+
+class TestExecutionHistoryStore(unittest.TestCase):
+    """ExecutionHistoryStoreのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.now = datetime(2025, 8, 1, 12, 0, 0)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_history_persists_in_workspace(self):
+        """実行履歴がワークスペースに保存されることをテスト"""
+        manager = BatchManager(self.temp_dir)
+        manager.record_execution_result(_result("B63EF9_青軍_田中.bat", self.now))
+        manager.close()
+
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, HISTORY_FILENAME)))
+
+        manager = BatchManager(self.temp_dir)
+        history = manager.get_execution_history("B63EF9_青軍_田中.bat")
+        manager.close()
+
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history[0].processed_files_count, 10)
+
+    def test_history_order_and_limit(self):
+        """履歴が実行日時順に返り、件数制限で直近分を返すことをテスト"""
+        store = ExecutionHistoryStore()
+        for i in (3, 1, 2):
+            store.record(_result("A.bat", self.now + timedelta(hours=i), processed=i, success=i))
+
+        history = store.get_history("A.bat")
+        self.assertEqual([r.processed_files_count for r in history], [1, 2, 3])
+
+        latest = store.get_history("A.bat", limit=2)
+        self.assertEqual([r.processed_files_count for r in latest], [2, 3])
+
+    def test_report(self):
+        """レポートの集計値をテスト"""
+        store = ExecutionHistoryStore()
+        store.record_many([
+            _result("B63EF9_a.bat", self.now, processed=10, success=10),
+            _result("B63EF9_a.bat", self.now - timedelta(days=1), processed=10, success=8,
+                    errors=["アクセス拒否", "アクセス拒否"]),
+            _result("X1Y2Z3_b.bat", self.now - timedelta(days=2), processed=20, success=19,
+                    errors=["ファイルが見つかりません"]),
+            # 期間外
+            _result("X1Y2Z3_b.bat", self.now - timedelta(days=60), processed=100, success=0),
+        ])
+
+        report = store.generate_report(days=30, now=self.now)
+
+        self.assertEqual(report["total_executions"], 3)
+        self.assertEqual(report["total_processed_files"], 40)
+        self.assertAlmostEqual(report["success_rate"], 37 / 40)
+        self.assertEqual(report["most_used_batches"][0],
+                         {"batch_filename": "B63EF9_a.bat", "executions": 2})
+        self.assertEqual(report["error_summary"]["total_errors"], 3)
+        self.assertEqual(report["error_summary"]["messages"],
+                         {"アクセス拒否": 2, "ファイルが見つかりません": 1})
+
+        totals = store.get_totals()
+        self.assertEqual(totals["total_executions"], 4)
+        self.assertEqual(totals["average_files_per_execution"], 35.0)
+        self.assertEqual(totals["most_popular_presets"][0], {"preset_id": "B63EF9", "executions": 2})
+
+    def test_report_period_boundary(self):
+        """days=7 のレポートが今日を含む7日分（6日前まで）を集計することをテスト"""
+        store = ExecutionHistoryStore()
+        store.record_many([
+            _result("A.bat", self.now.replace(hour=23)),
+            _result("A.bat", (self.now - timedelta(days=6)).replace(hour=0)),
+            # 期間外（7日前）
+            _result("A.bat", (self.now - timedelta(days=7)).replace(hour=23, minute=59)),
+        ])
+
+        self.assertEqual(store.generate_report(days=7, now=self.now)["total_executions"], 2)
+        self.assertEqual(store.generate_report(days=1, now=self.now)["total_executions"], 1)
+
+    def test_empty_report(self):
+        """履歴がない場合のレポートをテスト"""
+        report = BatchManager().generate_execution_report(days=30)
+
+        self.assertEqual(report["total_executions"], 0)
+        self.assertEqual(report["success_rate"], 0.0)
+        self.assertEqual(BatchManager().get_usage_statistics()["average_files_per_execution"], 0.0)
+
+    def test_history_is_append_only(self):
+        """履歴の更新・削除が禁止されていることをテスト"""
+        path = os.path.join(self.temp_dir, HISTORY_FILENAME)
+        store = ExecutionHistoryStore(path)
+        store.record(_result("A.bat", self.now))
+        store.close()
+
+        connection = sqlite3.connect(path)
+        try:
+            with self.assertRaises(sqlite3.DatabaseError):
+                connection.execute("DELETE FROM executions")
+            with self.assertRaises(sqlite3.DatabaseError):
+                connection.execute("UPDATE executions SET success_count = 0")
+        finally:
+            connection.close()
+
+    def test_report_over_long_history_is_fast(self):
+        """長期間の履歴でもレポートが高速に返ることをテスト"""
+        store = ExecutionHistoryStore(os.path.join(self.temp_dir, HISTORY_FILENAME))
+        store.record_many(
+            _result(f"ID{i % 50:04d}_x.bat", self.now - timedelta(hours=i), errors=["e"] if i % 7 == 0 else None)
+            for i in range(3 * 365 * 24 // 4)
+        )
+
+        start = time.perf_counter()
+        report = store.generate_report(days=3 * 365, now=self.now)
+        store.get_totals()
+        elapsed = time.perf_counter() - start
+        store.close()
+
+        self.assertEqual(report["total_executions"], 3 * 365 * 24 // 4)
+        self.assertLess(elapsed, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+拡張子マッチャーのテスト
+
+- 拡張子の正規化（大文字小文字・先頭のドット・ワイルドカード）
+- 複合拡張子（.tar.gz）
+- 大量パスの絞り込みと1件ずつの判定の一致
+- BatchFile の対象ファイル絞り込み
+"""
+
+import unittest
+
+from src.models.batch_file import BatchFile
+from src.utils.extension_matcher import ExtensionMatcher, normalize_extension, parse_extensions
+
+
+class TestExtensionMatcher(unittest.TestCase):
+    """ExtensionMatcherのテスト"""
+
+    def test_normalize_extension(self):
+        """拡張子が正規化されることをテスト"""
+        self.assertEqual(normalize_extension(" PNG "), ".png")
+        self.assertEqual(normalize_extension(".Tar.GZ"), ".tar.gz")
+        self.assertEqual(normalize_extension("*"), "*")
+        self.assertEqual(normalize_extension(""), "")
+        self.assertEqual(parse_extensions(".png, JPG,png,,tar.gz"), [".png", ".jpg", ".tar.gz"])
+
+    def test_matches(self):
+        """大文字小文字・ドット有無を区別せずに判定することをテスト"""
+        matcher = ExtensionMatcher(["PNG", ".jpg", ".jpg"])
+
+        self.assertEqual(matcher.extensions, frozenset({".png", ".jpg"}))
+        self.assertTrue(matcher.matches("C:\\images\\IMG_0001.PNG"))
+        self.assertTrue(matcher.matches("/images/photo.Jpg"))
+        self.assertFalse(matcher.matches("/images/.png"))
+        self.assertFalse(matcher.matches("/images.png/readme"))
+        self.assertFalse(matcher.matches("/images/photo.jpeg"))
+
+    def test_compound_extension(self):
+        """複合拡張子を最長一致で判定することをテスト"""
+        matcher = ExtensionMatcher([".tar.gz", ".gz"])
+
+        self.assertEqual(matcher.match_extension("/backup/data.TAR.GZ"), ".tar.gz")
+        self.assertEqual(matcher.match_extension("/backup/data.gz"), ".gz")
+        self.assertIsNone(ExtensionMatcher([".tar.gz"]).match_extension("/backup/data.gz"))
+        self.assertIsNone(ExtensionMatcher([".tar.gz"]).match_extension("/backup/.tar.gz"))
+
+    def test_wildcard_and_empty(self):
+        """ワイルドカードはすべて、空の指定は何も一致しないことをテスト"""
+        paths = ["a.png", "b", "c.txt"]
+        self.assertEqual(ExtensionMatcher(["*", ".png"]).filter(paths), paths)
+        self.assertEqual(ExtensionMatcher([]).filter(paths), [])
+        self.assertFalse(ExtensionMatcher([]))
+
+    def test_filter_matches_single_path_decisions(self):
+        """大量パスの絞り込み結果が1件ずつの判定と一致することをテスト"""
+        matcher = ExtensionMatcher([".png", "JPG", ".tar.gz"])
+        paths = []
+        for i in range(200):
+            paths.extend([
+                f"/work/dir{i % 3}/image{i}.png",
+                f"/work/dir{i % 3}/IMAGE{i}.PNG",
+                f"/work/dir.v{i % 2}/readme{i}",
+                f"/work/dir/.jpg",
+                f"C:\\work\\photo{i}.Jpg",
+                f"/work/archive{i}.tar.gz",
+                f"/work/archive{i}.gz",
+                f"/work/notes{i}.txt",
+            ])
+
+        self.assertEqual(matcher.filter(paths), [p for p in paths if matcher.matches(p)])
+
+
+class TestBatchFileExtensionFilter(unittest.TestCase):
+    """BatchFile の対象ファイル絞り込みのテスト"""
+
+    def test_filter_target_files_normalizes_extensions(self):
+        """正規化されていない対象拡張子でも絞り込めることをテスト"""
+        batch_file = BatchFile("B63EF9", "テスト", {"陣営": "青軍", "キャラ名": "田中"},
+                               target_extensions=["PNG", " jpg"])
+
+        self.assertEqual(batch_file.filter_target_files(["a.png", "b.JPG", "c.gif"]), ["a.png", "b.JPG"])
+
+        batch_file.target_extensions.append(".gif")
+        self.assertEqual(batch_file.filter_target_files(["a.png", "c.gif"]), ["a.png", "c.gif"])
+
+
+if __name__ == '__main__':
+    unittest.main()
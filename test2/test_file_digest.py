@@ -0,0 +1,102 @@
+"""
+ファイルダイジェストのテスト
+
+- mmap と readinto の読み方で同じダイジェストになること
+- 複数ファイルの並列計算とエラー
+- inode・サイズ・更新日時をキーにしたサイドカーキャッシュ
+"""
+
+import unittest
+import os
+import hashlib
+import tempfile
+import shutil
+
+from src.utils.file_digest import (FileDigester, DigestCache, DIGEST_CACHE_FILENAME, FULL_DIGEST,
+                                   PARTIAL_DIGEST, PARTIAL_BLOCK_SIZE, READ_BUFFER_SIZE,
+                                   file_digest, partial_digest)
+
+
+def _expected(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=20).hexdigest()
+
+
+class TestFileDigest(unittest.TestCase):
+    """ダイジェスト計算のテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name, content: bytes):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_mmap_and_buffered_reads_match(self):
+        """mmap と readinto で同じダイジェストになることをテスト"""
+        content = os.urandom(READ_BUFFER_SIZE * 2 + 12345)
+        path = self._write("movie.mp4", content)
+
+        self.assertEqual(file_digest(path, use_mmap=True), _expected(content))
+        self.assertEqual(file_digest(path, use_mmap=False), _expected(content))
+        self.assertEqual(file_digest(path, "sha256"), hashlib.sha256(content).hexdigest())
+        self.assertEqual(file_digest(self._write("empty.mkv", b""), use_mmap=True), _expected(b""))
+
+    def test_partial_digest(self):
+        """部分ダイジェストが先頭・末尾だけを読むことをテスト"""
+        block = PARTIAL_BLOCK_SIZE
+        content = b"a" * block + b"b" * block + b"c" * block
+        path = self._write("large.bin", content)
+
+        self.assertEqual(partial_digest(path), _expected(b"a" * block + b"c" * block))
+        small = self._write("small.bin", b"small")
+        self.assertEqual(partial_digest(small), file_digest(small))
+
+    def test_digest_many_in_parallel(self):
+        """複数ファイルを並列に計算し、読めないファイルはエラーになることをテスト"""
+        contents = {self._write(f"{i}.mp4", os.urandom(1000 + i)): None for i in range(20)}
+        paths = list(contents)
+        missing = os.path.join(self.temp_dir, "missing.mp4")
+
+        result = FileDigester(max_workers=4).digest_many(paths + [missing])
+
+        for path in paths:
+            with open(path, 'rb') as f:
+                self.assertEqual(result.digests[path], _expected(f.read()))
+        self.assertEqual(result.computed_count, 20)
+        self.assertIn(missing, result.errors)
+        with self.assertRaises(OSError):
+            FileDigester().digest(missing)
+
+    def test_sidecar_cache(self):
+        """キャッシュが再利用され、リネーム後も有効で、更新されたファイルは再計算されることをテスト"""
+        path = self._write("movie.mp4", b"movie")
+        cache_path = os.path.join(self.temp_dir, DIGEST_CACHE_FILENAME)
+        digester = FileDigester(DigestCache(cache_path))
+        digester.digest_many([path])
+        digester.digest_many([path], PARTIAL_DIGEST)
+        digester.close()
+
+        digester = FileDigester(DigestCache(cache_path))
+        renamed = os.path.join(self.temp_dir, "B63EF9_青軍_田中_A00001.mp4")
+        os.rename(path, renamed)
+        result = digester.digest_many([renamed], FULL_DIGEST)
+        self.assertEqual(result.cache_hits, 1)
+        self.assertEqual(result.computed_count, 0)
+        self.assertEqual(result.digests[renamed], _expected(b"movie"))
+
+        with open(renamed, 'wb') as f:
+            f.write(b"edited")
+        os.utime(renamed, ns=(0, 1))
+        result = digester.digest_many([renamed])
+        self.assertEqual(result.cache_hits, 0)
+        self.assertEqual(result.digests[renamed], _expected(b"edited"))
+        digester.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
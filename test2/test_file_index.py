@@ -0,0 +1,151 @@
+"""
+ファイル名項目インデックスのテスト
+
+- ワークスペース内への永続化
+- AND/OR 条件の検索（FilterEngine と同じ結果になること）
+- 追加・移動・リネーム・フォルダ差分の増分反映
+- 検索前の更新日時による差分反映（アプリ外の変更）
+"""
+
+import unittest
+import os
+import time
+import tempfile
+import shutil
+from unittest import mock
+
+from src.services.file_index import FileIndex, INDEX_FILENAME
+from src.services.filter_engine import FilterEngine
+from src.utils.filename_parser import FilenameParser
+
+
+FILENAMES = [
+    "B63EF9_青軍_田中_A00001.png",
+    "B63EF9_青軍_佐藤_A00002.png",
+    "B63EF9_赤軍_田中_A00003.jpg",
+    "C12345_赤軍_鈴木_A00001.png",
+    "memo.txt",
+]
+
+
+class TestFileIndex(unittest.TestCase):
+    """FileIndexのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for filename in FILENAMES:
+            open(os.path.join(self.temp_dir, filename), 'w').close()
+        self.index = FileIndex.for_workspace(self.temp_dir)
+        self.index.sync_directory(self.temp_dir)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_persists_in_workspace(self):
+        """インデックスがワークスペースに保存されることをテスト"""
+        self.index.close()
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, INDEX_FILENAME)))
+
+        self.index = FileIndex.for_workspace(self.temp_dir)
+        # 形式が一致しない memo.txt は登録されない
+        self.assertEqual(self.index.count(self.temp_dir), 4)
+
+    def test_query_matches_filter_engine(self):
+        """検索結果が FilterEngine の走査結果と一致することをテスト"""
+        engine = FilterEngine()
+        cases = [
+            ({"陣営": "青軍", "キャラ名": "田中"}, "AND"),
+            ({"陣営": "青軍", "キャラ名": "鈴木"}, "OR"),
+            ({"キャラ名": ["田*", "鈴木"], "extension": ".png"}, "AND"),
+            ({"陣営": "軍"}, "AND"),
+            ({"未知": "値"}, "OR"),
+        ]
+        for conditions, operator in cases:
+            with self.subTest(conditions=conditions, operator=operator):
+                self.assertEqual(
+                    self.index.query(self.temp_dir, conditions, operator),
+                    sorted(engine.find_matches(self.temp_dir, conditions, operator))
+                )
+
+    def test_sync_directory_incremental(self):
+        """フォルダの差分のみが反映されることをテスト"""
+        os.remove(os.path.join(self.temp_dir, "B63EF9_青軍_佐藤_A00002.png"))
+        open(os.path.join(self.temp_dir, "B63EF9_青軍_高橋_A00004.png"), 'w').close()
+
+        self.assertEqual(self.index.sync_directory(self.temp_dir), (1, 1))
+        self.assertEqual(self.index.sync_directory(self.temp_dir), (0, 0))
+        self.assertEqual(self.index.query(self.temp_dir, {"陣営": "青軍"}), [
+            "B63EF9_青軍_田中_A00001.png",
+            "B63EF9_青軍_高橋_A00004.png",
+        ])
+
+    def test_move_and_rename(self):
+        """移動とリネームが反映されることをテスト"""
+        display_dir = os.path.join(self.temp_dir, "display")
+
+        self.assertTrue(self.index.move("C12345_赤軍_鈴木_A00001.png", self.temp_dir, display_dir))
+        self.assertEqual(self.index.query(display_dir, {"陣営": "赤軍"}), ["C12345_赤軍_鈴木_A00001.png"])
+        self.assertEqual(self.index.query(self.temp_dir, {"陣営": "赤軍"}), ["B63EF9_赤軍_田中_A00003.jpg"])
+
+        self.index.rename(self.temp_dir, "B63EF9_赤軍_田中_A00003.jpg", "B63EF9_緑軍_田中_A00003.jpg")
+        self.assertEqual(self.index.query(self.temp_dir, {"陣営": "赤軍"}), [])
+        self.assertEqual(self.index.query(self.temp_dir, {"陣営": "緑軍"}), ["B63EF9_緑軍_田中_A00003.jpg"])
+
+    def test_filter_engine_with_index(self):
+        """インデックスを使った FilterEngine の移動と復元をテスト"""
+        engine = FilterEngine(index=self.index)
+        display_dir = os.path.join(self.temp_dir, "display")
+
+        result = engine.apply_filter(self.temp_dir, {"陣営": "赤軍"})
+
+        self.assertEqual(result.moved_files, ["B63EF9_赤軍_田中_A00003.jpg", "C12345_赤軍_鈴木_A00001.png"])
+        self.assertEqual(self.index.count(display_dir), 2)
+        self.assertEqual(self.index.count(self.temp_dir), 2)
+
+        engine.restore(result)
+
+        self.assertEqual(self.index.count(display_dir), 0)
+        self.assertEqual(self.index.count(self.temp_dir), 4)
+
+    def test_apply_renames(self):
+        """リネーム・サブフォルダへの移動がまとめて反映されることをテスト"""
+        added = self.index.apply_renames([
+            (self.temp_dir, "memo.txt", "B63EF9_青軍_高橋_A00004.png"),
+            (self.temp_dir, "C12345_赤軍_鈴木_A00001.png", os.path.join("sub", "C12345_赤軍_鈴木_A00002.png")),
+        ])
+
+        self.assertEqual(added, 2)
+        self.assertEqual(self.index.query(self.temp_dir, {"キャラ名": ["高橋", "鈴木"]}),
+                         ["B63EF9_青軍_高橋_A00004.png"])
+        self.assertEqual(self.index.query(os.path.join(self.temp_dir, "sub"), {"キャラ名": "鈴木"}),
+                         ["C12345_赤軍_鈴木_A00002.png"])
+
+    def test_refresh_directory_before_query(self):
+        """アプリ外で追加されたファイルが FilterEngine の検索で見つかり、変更が無ければ走査しないことをテスト"""
+        engine = FilterEngine(index=self.index)
+        past = time.time() - 60
+        os.utime(self.temp_dir, (past, past))
+        self.assertEqual(self.index.refresh_directory(self.temp_dir), (0, 0))
+        with mock.patch.object(self.index, "sync_directory") as sync:
+            self.assertIsNone(self.index.refresh_directory(self.temp_dir))
+            sync.assert_not_called()
+
+        open(os.path.join(self.temp_dir, "B63EF9_青軍_高橋_A00004.png"), 'w').close()
+
+        self.assertEqual(engine.find_matches(self.temp_dir, {"キャラ名": "高橋"}),
+                         ["B63EF9_青軍_高橋_A00004.png"])
+
+    def test_rebuild_on_template_change(self):
+        """命名パターンが変わった場合にインデックスが作り直されることをテスト"""
+        self.index.close()
+        self.index = FileIndex(os.path.join(self.temp_dir, INDEX_FILENAME),
+                               FilenameParser.from_naming_pattern("{陣営}-{キャラ名}"))
+
+        self.assertEqual(self.index.count(), 0)
+        self.index.add(self.temp_dir, "青軍-田中.png")
+        self.assertEqual(self.index.query(self.temp_dir, {"キャラ名": "田中"}), ["青軍-田中.png"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+ファイル名プレビューキャッシュのテスト
+
+- FileRenamer.generate_filename と同じファイル名・エラーになること
+- NGワードに含まれる予約名は名前全体の一致で判定すること（ICON は可、CON は不可）
+- 入力値の組み合わせごとの LRU（番号・パターン外の値は再展開しない）
+- generate_preview_list がパターンを1回だけ展開すること
+"""
+
+import unittest
+import os
+import sys
+import random
+import tempfile
+import shutil
+
+# FileRenamer は src 直下を基準にインポートする
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.models.preset import Preset
+from src.services.filename_preview import FilenamePreviewCache, compile_template
+from services.file_renamer import FileRenamer
+
+
+class TestFilenameTemplate(unittest.TestCase):
+    """展開済みパターンと generate_filename の一致"""
+
+    def setUp(self):
+        self.renamer = FileRenamer()
+
+    def _expected(self, preset, values, number, extension, ng_words=None):
+        values = dict(values)
+        if "番号" in preset.fields:
+            values["番号"] = number
+        try:
+            return self.renamer.generate_filename(preset, values, extension, ng_words)
+        except ValueError as e:
+            return ("error", str(e))
+
+    def _actual(self, preset, values, number, extension, ng_words=None):
+        try:
+            return compile_template(preset, values, ng_words).render(number, extension)
+        except ValueError as e:
+            return ("error", str(e))
+
+    def test_matches_generate_filename(self):
+        """ランダムな入力値・NGワードで generate_filename と同じ結果になる"""
+        rng = random.Random(42)
+        alphabet = ["a", "B", "1", "0", "_", "写真", "{番号}", ":", "{タイトル}", "", "Ａ", "ｶﾞ", "か\u3099", "：", "１", "CON", "co", "n", "."]
+        patterns = ["{カテゴリ}_{タイトル}_{番号}", "{番号}-{カテゴリ}", "{カテゴリ}{番号}{番号}",
+                    "{タイトル}", "固定_{カテゴリ}"]
+        for _ in range(2000):
+            preset = Preset(
+                name="テスト",
+                fields=rng.choice([["カテゴリ", "タイトル", "番号"], ["カテゴリ", "タイトル"], ["番号", "カテゴリ"]]),
+                naming_pattern=rng.choice(patterns),
+                default_values=rng.choice([{}, {"タイトル": "既定"}]),
+                id="B63EF9"
+            )
+            values = {field: "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3)))
+                      for field in ("カテゴリ", "タイトル")}
+            number = f"{rng.randint(1, 120):03d}"
+            extension = rng.choice([".JPG", ".png", ""])
+            ng_words = rng.choice([None, ["NG"], ["01"], ["a_0"], ["写真"], ["0", "a"], ["", "B"], ["Ａ"], ["ガ"],
+                                     ["CON", "写真"], ["a", "CON"], ["ＣＯＮ"], ["COM1"]])
+            self.assertEqual(self._actual(preset, values, number, extension, ng_words),
+                             self._expected(preset, values, number, extension, ng_words),
+                             (preset.naming_pattern, preset.fields, values, number, ng_words))
+
+
+    def test_reserved_ng_words_match_whole_name(self):
+        """設定のNGワードの予約名は部分一致ではなく、拡張子を除いた名前全体の一致で判定する"""
+        from src.config.settings import Settings
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        ng_words = Settings(os.path.join(temp_dir, "tadakan_config.json")).get_ng_words()
+        self.assertIn("CON", ng_words)
+        preset = Preset(name="テスト", fields=["キャラ名"], naming_pattern="{キャラ名}", id="B63EF9")
+        numbered = Preset(name="テスト", fields=["キャラ名", "番号"], naming_pattern="{キャラ名}{番号}", id="B63EF9")
+
+        self.assertEqual(self.renamer.generate_filename(preset, {"キャラ名": "ICON"}, ".png", ng_words), "ICON.png")
+        self.assertEqual(compile_template(preset, {"キャラ名": "ICON"}, ng_words).render("", ".png"), "ICON.png")
+        for values in ({"キャラ名": "con"}, {"キャラ名": "CON.tar"}):
+            with self.assertRaisesRegex(ValueError, "予約されたファイル名です"):
+                self.renamer.generate_filename(preset, values, ".png", ng_words)
+            with self.assertRaisesRegex(ValueError, "予約されたファイル名です"):
+                compile_template(preset, values, ng_words).render("", ".png")
+
+        # 番号を含む名前はファイルごとに判定する
+        template = compile_template(numbered, {"キャラ名": "COM"}, ng_words)
+        self.assertEqual(template.render("001", ".png"), "COM001.png")
+        with self.assertRaisesRegex(ValueError, "予約されたファイル名です: COM1"):
+            template.render("1", ".png")
+        self.assertFalse(compile_template(numbered, {"キャラ名": "写真_"}, ng_words).needs_per_name_check)
+
+class TestFilenamePreviewCache(unittest.TestCase):
+    """FilenamePreviewCacheのテスト"""
+
+    def setUp(self):
+        self.preset = Preset(name="テスト", fields=["カテゴリ", "タイトル", "番号"],
+                             naming_pattern="{カテゴリ}_{タイトル}_{番号}", id="B63EF9")
+
+    def test_preview_names_and_lru(self):
+        """入力値の組み合わせごとに1回だけ展開し、最近のものを保持する"""
+        cache = FilenamePreviewCache(max_entries=2)
+        names = cache.preview_names(self.preset, {"カテゴリ": "写真", "タイトル": "海"},
+                                    ["a.JPG", "b.png", "c"])
+        self.assertEqual(names, ["写真_海_001.jpg", "写真_海_002.png", "写真_海_003"])
+
+        # 番号の入力値は無視される
+        cache.preview_names(self.preset, {"カテゴリ": "写真", "タイトル": "海", "番号": "9"}, ["a.jpg"])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        cache.get_template(self.preset, {"カテゴリ": "写真", "タイトル": "山"})
+        cache.get_template(self.preset, {"カテゴリ": "写真", "タイトル": "川"})
+        cache.get_template(self.preset, {"カテゴリ": "写真", "タイトル": "海"})
+        self.assertEqual(cache.misses, 4)
+
+        # プリセットが編集された場合は別のキーになる
+        self.preset.naming_pattern = "{タイトル}_{番号}"
+        self.assertEqual(cache.render(self.preset, {"カテゴリ": "写真", "タイトル": "川"}, "007", ".PNG"),
+                         "川_007.png")
+
+    def test_invalid_values_raise(self):
+        """必須項目の未入力・無効な文字は ValueError"""
+        cache = FilenamePreviewCache()
+        with self.assertRaises(ValueError):
+            cache.preview_names(self.preset, {"カテゴリ": "写真"}, ["a.jpg"])
+        with self.assertRaises(ValueError):
+            cache.preview_names(self.preset, {"カテゴリ": "写真", "タイトル": "a/b"}, ["a.jpg"])
+
+    def test_generate_preview_list_uses_template(self):
+        """generate_preview_list は番号だけを差し替え、同じ入力値の2回目はキャッシュを使う"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            paths = []
+            for i in range(5):
+                path = os.path.join(temp_dir, f"IMG_{i}.JPG")
+                open(path, "wb").close()
+                paths.append(path)
+            renamer = FileRenamer()
+            values = {"カテゴリ": "写真", "タイトル": "海"}
+
+            first = renamer.generate_preview_list(self.preset, paths, values)
+            second = renamer.generate_preview_list(self.preset, paths, values)
+
+            self.assertEqual([item.new_name for item in first],
+                             [f"写真_海_{i:03d}.jpg" for i in range(1, 6)])
+            self.assertEqual([item.new_name for item in second], [item.new_name for item in first])
+            self.assertEqual((renamer.preview_cache.hits, renamer.preview_cache.misses), (1, 1))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+フィルタエンジンのテスト
+
+- ファイル名からのプリセット項目の解析
+- AND/OR 条件・ワイルドカード・複数値の評価
+- display フォルダへの移動と移動一覧の記録、復元
+"""
+
+import unittest
+import os
+import tempfile
+import shutil
+
+from src.services.filter_engine import FilterEngine
+from src.utils.filename_parser import FilenameParser
+
+
+FILENAMES = [
+    "B63EF9_青軍_田中_A00001.png",
+    "B63EF9_青軍_佐藤_A00002.png",
+    "B63EF9_赤軍_田中_A00003.jpg",
+    "C12345_赤軍_鈴木_A00001.png",
+    "memo.txt",
+]
+
+
+class TestFilenameParser(unittest.TestCase):
+    """FilenameParserのテスト"""
+
+    def test_parse_stock_format(self):
+        """ストック型のファイル名を解析できることをテスト"""
+        fields = FilenameParser.stock_format().parse("B63EF9_青軍_田中_A00001.png")
+
+        self.assertEqual(fields, {
+            "preset_id": "B63EF9", "陣営": "青軍", "キャラ名": "田中",
+            "sequence": "A00001", "extension": ".png"
+        })
+
+    def test_parse_value_with_underscore(self):
+        """値にアンダースコアを含むファイル名を解析できることをテスト"""
+        fields = FilenameParser.stock_format().parse("B63EF9_青軍_田中_太郎_A00001.png")
+
+        self.assertEqual(fields["陣営"], "青軍")
+        self.assertEqual(fields["キャラ名"], "田中_太郎")
+
+    def test_parse_unmatched(self):
+        """形式が一致しないファイル名はNoneになることをテスト"""
+        parser = FilenameParser.stock_format()
+
+        self.assertIsNone(parser.parse("memo.txt"))
+        self.assertIsNone(parser.parse("B63EF9_青軍_田中.png"))
+
+    def test_parse_naming_pattern(self):
+        """プリセットの命名パターンで解析できることをテスト"""
+        parser = FilenameParser.from_naming_pattern("{陣営}-{キャラ名}-{番号}")
+        fields = parser.parse("青軍-田中-001.jpg")
+
+        self.assertEqual(fields["陣営"], "青軍")
+        self.assertEqual(fields["キャラ名"], "田中")
+        self.assertEqual(fields["番号"], "001")
+        self.assertEqual(fields["extension"], ".jpg")
+
+
+class TestFilterEngine(unittest.TestCase):
+    """FilterEngineのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for filename in FILENAMES:
+            with open(os.path.join(self.temp_dir, filename), 'w') as f:
+                f.write(filename)
+        self.engine = FilterEngine()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_and_conditions(self):
+        """AND条件で全ての項目が一致するファイルのみ対象になることをテスト"""
+        matches = self.engine.find_matches(self.temp_dir, {"陣営": "青軍", "キャラ名": "田中"})
+
+        self.assertEqual(matches, ["B63EF9_青軍_田中_A00001.png"])
+
+    def test_or_conditions(self):
+        """OR条件でいずれかの項目が一致するファイルが対象になることをテスト"""
+        matches = self.engine.find_matches(self.temp_dir, {"陣営": "青軍", "キャラ名": "鈴木"}, "OR")
+
+        self.assertEqual(sorted(matches), [
+            "B63EF9_青軍_佐藤_A00002.png",
+            "B63EF9_青軍_田中_A00001.png",
+            "C12345_赤軍_鈴木_A00001.png",
+        ])
+
+    def test_wildcard_and_multiple_values(self):
+        """ワイルドカードと複数値の条件をテスト"""
+        matches = self.engine.find_matches(self.temp_dir, {
+            "キャラ名": ["田*", "鈴木"],
+            "extension": ".png"
+        })
+
+        self.assertEqual(sorted(matches), [
+            "B63EF9_青軍_田中_A00001.png",
+            "C12345_赤軍_鈴木_A00001.png",
+        ])
+
+    def test_partial_value_not_matched(self):
+        """ワイルドカードなしの条件は完全一致で評価されることをテスト"""
+        self.assertEqual(self.engine.find_matches(self.temp_dir, {"陣営": "軍"}), [])
+
+    def test_invalid_operator(self):
+        """不正な結合条件でエラーになることをテスト"""
+        with self.assertRaises(ValueError):
+            self.engine.find_matches(self.temp_dir, {"陣営": "青軍"}, "XOR")
+
+    def test_apply_filter_and_restore(self):
+        """displayフォルダへの移動と復元をテスト"""
+        result = self.engine.apply_filter(self.temp_dir, {"陣営": "赤軍"})
+        display_dir = os.path.join(self.temp_dir, "display")
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.scanned_count, len(FILENAMES))
+        self.assertEqual(sorted(result.moved_files), [
+            "B63EF9_赤軍_田中_A00003.jpg",
+            "C12345_赤軍_鈴木_A00001.png",
+        ])
+        self.assertEqual(sorted(os.listdir(display_dir)), sorted(result.moved_files))
+
+        restored = self.engine.restore(result)
+
+        self.assertTrue(restored.success)
+        self.assertEqual(os.listdir(display_dir), [])
+        self.assertEqual(sorted(f for f in os.listdir(self.temp_dir) if f != "display"),
+                         sorted(FILENAMES))
+
+    def test_apply_filter_does_not_overwrite(self):
+        """displayフォルダの既存ファイルを上書きしないことをテスト"""
+        display_dir = os.path.join(self.temp_dir, "display")
+        os.makedirs(display_dir)
+        with open(os.path.join(display_dir, "C12345_赤軍_鈴木_A00001.png"), 'w') as f:
+            f.write("existing")
+
+        result = self.engine.apply_filter(self.temp_dir, {"陣営": "赤軍"})
+
+        self.assertEqual(result.moved_files, ["B63EF9_赤軍_田中_A00003.jpg"])
+        self.assertEqual(len(result.errors), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "C12345_赤軍_鈴木_A00001.png")))
+
+    def test_parallel_move(self):
+        """チャンク単位の並列移動で全ファイルが移動されることをテスト"""
+        for i in range(1000):
+            open(os.path.join(self.temp_dir, f"D00000_緑軍_山田_A{i:05d}.png"), 'w').close()
+
+        result = FilterEngine(max_workers=4).apply_filter(self.temp_dir, {"陣営": "緑軍"})
+
+        self.assertEqual(len(result.moved_files), 1000)
+        self.assertEqual(len(os.listdir(os.path.join(self.temp_dir, "display"))), 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
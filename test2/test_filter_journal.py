@@ -0,0 +1,125 @@
+"""
+フィルタジャーナルのテスト
+
+- フィルタ移動の記録（filter_batches/ への追記）
+- ジャーナルからの逆順復元・中断後の再開
+- フィルタ履歴の再実行（FR-405）と復元用バッチファイルの生成
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+# BatchGenerator は src 直下を基準にインポートする
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.batch_generator import BatchGenerator
+from src.services.filter_engine import FilterEngine
+from src.services.filter_journal import FilterJournal, JOURNAL_FILENAME
+
+
+FILENAMES = [
+    "B63EF9_青軍_田中_A00001.png",
+    "B63EF9_青軍_佐藤_A00002.png",
+    "B63EF9_赤軍_田中_A00003.jpg",
+    "C12345_赤軍_鈴木_A00001.png",
+]
+
+
+class TestFilterJournal(unittest.TestCase):
+    """FilterJournalのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for filename in FILENAMES:
+            open(os.path.join(self.temp_dir, filename), 'w').close()
+        self.display_dir = os.path.join(self.temp_dir, "display")
+        self.journal = FilterJournal.for_workspace(self.temp_dir)
+        self.engine = FilterEngine(journal=self.journal)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _workspace_files(self):
+        return sorted(f for f in os.listdir(self.temp_dir) if os.path.isfile(os.path.join(self.temp_dir, f)))
+
+    def test_filter_is_journaled(self):
+        """フィルタの移動が filter_batches/ のジャーナルに記録されることをテスト"""
+        result = self.engine.apply_filter(self.temp_dir, {"陣営": "赤軍"})
+
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "filter_batches", JOURNAL_FILENAME)))
+        entry = self.journal.get_filter(result.filter_id)
+        self.assertEqual(entry.conditions, {"陣営": "赤軍"})
+        self.assertTrue(entry.completed)
+        self.assertEqual(entry.moved_count, 2)
+        self.assertEqual(entry.planned_count, 2)
+        self.assertFalse(entry.restored)
+
+    def test_restore_journal_in_reverse(self):
+        """複数のフィルタが新しい順に復元されることをテスト"""
+        first = self.engine.apply_filter(self.temp_dir, {"陣営": "赤軍"})
+        # display 内をさらに絞り込む
+        second = self.engine.apply_filter(self.display_dir, {"キャラ名": "鈴木"},
+                                          display_directory=os.path.join(self.display_dir, "display"))
+
+        results = self.engine.restore_journal()
+
+        self.assertEqual([r.filter_id for r in results], [second.filter_id, first.filter_id])
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(self._workspace_files(), sorted(FILENAMES))
+        self.assertEqual(self.journal.get_pending_restores(), [])
+
+    def test_restore_resumes_after_interruption(self):
+        """一部だけ戻した状態から復元を再開できることをテスト"""
+        result = self.engine.apply_filter(self.temp_dir, {"陣営": "赤軍"})
+        # 1ファイルだけ手動で戻した（復元が途中で中断した）状態
+        os.rename(os.path.join(self.display_dir, "C12345_赤軍_鈴木_A00001.png"),
+                  os.path.join(self.temp_dir, "C12345_赤軍_鈴木_A00001.png"))
+
+        restored = self.engine.restore(result)
+
+        self.assertTrue(restored.success)
+        self.assertEqual(restored.moved_files, ["B63EF9_赤軍_田中_A00003.jpg"])
+        self.assertEqual(self._workspace_files(), sorted(FILENAMES))
+        self.assertTrue(self.journal.get_filter(result.filter_id).restored)
+
+    def test_truncated_record_is_ignored(self):
+        """書き込み途中の最終行があってもジャーナルを読めることをテスト"""
+        result = self.engine.apply_filter(self.temp_dir, {"陣営": "青軍"})
+        with open(self.journal.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "restored", "filter_id"')
+
+        self.assertEqual(len(self.journal.get_filters()), 1)
+        self.engine.restore_journal(result.filter_id)
+        self.assertEqual(self._workspace_files(), sorted(FILENAMES))
+
+    def test_rerun_filter(self):
+        """フィルタ履歴の条件で再実行できることをテスト"""
+        result = self.engine.apply_filter(self.temp_dir, {"陣営": "青軍", "キャラ名": "田中"})
+        self.engine.restore(result)
+
+        rerun = self.engine.rerun_filter(result.filter_id)
+
+        self.assertNotEqual(rerun.filter_id, result.filter_id)
+        self.assertEqual(rerun.moved_files, ["B63EF9_青軍_田中_A00001.png"])
+        self.assertEqual(len(self.journal.get_filters()), 2)
+
+    def test_write_restore_batches(self):
+        """未復元のファイルを戻すバッチファイルが生成されることをテスト"""
+        result = self.engine.apply_filter(self.temp_dir, {"陣営": "赤軍"})
+
+        batch_generator = BatchGenerator()
+        paths = self.engine.write_restore_batches(result.filter_id, batch_generator)
+
+        self.assertEqual(len(paths), 1)
+        self.assertEqual(os.path.dirname(paths[0]), os.path.join(self.temp_dir, "filter_batches"))
+        with open(paths[0], encoding=batch_generator.encoding) as f:
+            content = f.read()
+        self.assertIn("C12345_赤軍_鈴木_A00001.png", content)
+        self.assertIn("B63EF9_赤軍_田中_A00003.jpg", content)
+
+
+if __name__ == '__main__':
+    unittest.main()
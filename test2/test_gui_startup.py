@@ -0,0 +1,181 @@
+"""
+GUI起動の段階実行と計測のテスト（ヘッドレスイベントループで実行）
+
+- 読み込みはバックグラウンド、反映は段階の順にUIスレッドで行われること
+- 段階が失敗しても次の段階に進むこと
+- 最初の描画・操作可能になるまでの時間の記録とフック
+- バッチファイル一覧（内容を読まないインデックス）
+"""
+
+import unittest
+import os
+import json
+import time
+import tempfile
+import shutil
+import threading
+
+from src.gui.headless import HeadlessEventLoop, UiThreadIoMonitor
+from src.gui.task_runner import GuiTaskRunner
+from src.gui.startup import DeferredStartup, StartupMetrics, FIRST_PAINT, INTERACTIVE
+from src.services.batch_manager import BatchManager
+
+
+class TestDeferredStartup(unittest.TestCase):
+    """DeferredStartupのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.loop = HeadlessEventLoop()
+        self.runner = GuiTaskRunner(self.loop, poll_interval_ms=5)
+
+    def tearDown(self):
+        self.runner.shutdown(wait=True)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_stages_load_in_background_and_apply_in_order(self):
+        """各段階はワーカーで読み込み、UIスレッドで順に反映される"""
+        ui_thread = threading.current_thread()
+        applied = []
+        loaded_on = []
+        path = os.path.join(self.temp_dir, "presets.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(["A", "B"], f)
+
+        def load_presets(handle):
+            loaded_on.append(threading.current_thread())
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+
+        def load_batches(handle):
+            loaded_on.append(threading.current_thread())
+            return os.listdir(self.temp_dir)
+
+        metrics = StartupMetrics()
+        startup = DeferredStartup(self.runner, metrics)
+        startup.add_stage("presets", load_presets, lambda result: applied.append(("presets", result)))
+        startup.add_stage("batch_index", load_batches, lambda result: applied.append(("batch_index", result)))
+
+        with UiThreadIoMonitor() as io_monitor:
+            metrics.mark(FIRST_PAINT)
+            startup.start()
+            self.assertTrue(self.loop.run(lambda: startup.finished, timeout=10))
+
+        self.assertEqual(applied, [("presets", ["A", "B"]), ("batch_index", ["presets.json"])])
+        self.assertTrue(all(thread is not ui_thread for thread in loaded_on))
+        self.assertEqual(io_monitor.violations, [])
+        self.assertLessEqual(metrics.time_to_first_paint_ms, metrics.marks["presets"])
+        self.assertLessEqual(metrics.marks["presets"], metrics.marks["batch_index"])
+        self.assertLessEqual(metrics.marks["batch_index"], metrics.time_to_interactive_ms)
+
+    def test_failed_stage_does_not_block_later_stages(self):
+        """失敗した段階は記録され、次の段階に進む"""
+        errors = []
+        applied = []
+
+        def fail(handle):
+            raise OSError("workspace unavailable")
+
+        startup = DeferredStartup(self.runner)
+        startup.add_stage("workspace", fail, applied.append, on_error=errors.append)
+        startup.add_stage("presets", lambda handle: [], applied.append)
+        startup.start()
+
+        self.assertTrue(self.loop.run(lambda: startup.finished, timeout=10))
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(applied, [[]])
+        self.assertIn("workspace_failed", startup.metrics.marks)
+        self.assertTrue(startup.metrics.is_interactive)
+
+    def test_cancelled_startup_stops(self):
+        """ランナーを終了すると以降の段階は実行されない"""
+        started = threading.Event()
+        applied = []
+
+        def slow(handle):
+            started.set()
+            while True:
+                handle.check_cancelled()
+                time.sleep(0.001)
+
+        startup = DeferredStartup(self.runner)
+        startup.add_stage("workspace", slow, applied.append)
+        startup.add_stage("presets", lambda handle: [], applied.append)
+        startup.start()
+        self.assertTrue(started.wait(5))
+        self.runner.cancel_all()
+
+        self.assertTrue(self.loop.run(lambda: startup.finished, timeout=10))
+        self.assertTrue(startup.cancelled)
+        self.assertEqual(applied, [])
+        self.assertFalse(startup.metrics.is_interactive)
+
+
+class TestStartupMetrics(unittest.TestCase):
+    """StartupMetricsのテスト"""
+
+    def test_marks_and_listener(self):
+        """経過時間の記録と、操作可能になった時点のフック"""
+        now = [10.0]
+        metrics = StartupMetrics(clock=lambda: now[0])
+        reported = []
+        metrics.add_listener(lambda m: reported.append(m.to_dict()))
+
+        now[0] = 10.05
+        metrics.mark(FIRST_PAINT)
+        now[0] = 10.3
+        metrics.mark(INTERACTIVE)
+        now[0] = 11.0
+        metrics.mark(INTERACTIVE)
+
+        self.assertAlmostEqual(metrics.time_to_first_paint_ms, 50.0)
+        self.assertAlmostEqual(metrics.time_to_interactive_ms, 300.0)
+        self.assertEqual(len(reported), 1)
+        self.assertAlmostEqual(reported[0]["time_to_interactive_ms"], 300.0)
+
+    def test_append_to_writes_json_lines(self):
+        """計測結果を JSON Lines で追記"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "startup.jsonl")
+            metrics = StartupMetrics()
+            metrics.mark(FIRST_PAINT)
+            metrics.mark(INTERACTIVE)
+            metrics.append_to(path)
+            metrics.append_to(path)
+
+            with open(path, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual(len(records), 2)
+            self.assertIn("time_to_first_paint_ms", records[0])
+            self.assertIn(INTERACTIVE, records[0]["marks"])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestBatchIndex(unittest.TestCase):
+    """BatchManager.list_batch_indexのテスト"""
+
+    def test_lists_batch_files_newest_first(self):
+        """.bat ファイルのみを新しい順に返す"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            batch_dir = os.path.join(temp_dir, "rename_batches")
+            os.makedirs(batch_dir)
+            for i, name in enumerate(["old.bat", "new.bat", "note.txt"]):
+                path = os.path.join(batch_dir, name)
+                with open(path, "w") as f:
+                    f.write("REM")
+                os.utime(path, (1000000 + i, 1000000 + i))
+
+            index = BatchManager(temp_dir).list_batch_index()
+
+            self.assertEqual([item["filename"] for item in index], ["new.bat", "old.bat"])
+            self.assertTrue(all("created_at" in item for item in index))
+            self.assertEqual(BatchManager(os.path.join(temp_dir, "missing")).list_batch_index(), [])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+GUIバックグラウンドタスク実行のテスト（ディスプレイ不要のヘッドレスイベントループで実行）
+
+- 完了・エラー・進捗・キャンセルのコールバックがUIスレッドで呼ばれること
+- 終了時に未開始のタスクを実行しないこと
+- 10万ファイルの操作中もメインループが停止しないこと
+- UIスレッドでディスクI/Oが行われないこと
+"""
+
+import unittest
+import os
+import tempfile
+import shutil
+import threading
+
+from src.gui.headless import HeadlessEventLoop, StallMonitor, UiThreadIoMonitor
+from src.gui.task_runner import GuiTaskRunner, TaskCancelled
+
+
+class _FakeStatusIndicator:
+    def __init__(self):
+        self.progress = []
+        self.cleared = 0
+
+    def show_progress(self, message, done, total):
+        self.progress.append((message, done, total))
+
+    def clear_progress(self):
+        self.cleared += 1
+
+
+class TestGuiTaskRunner(unittest.TestCase):
+    """GuiTaskRunnerのテスト"""
+
+    def setUp(self):
+        self.loop = HeadlessEventLoop()
+        self.indicator = _FakeStatusIndicator()
+        self.runner = GuiTaskRunner(self.loop, poll_interval_ms=5, status_indicator=self.indicator)
+
+    def tearDown(self):
+        self.runner.shutdown(wait=True)
+
+    def test_success_and_error_callbacks_run_on_ui_thread(self):
+        """完了・エラーのコールバックがUIスレッドで呼ばれる"""
+        calls = []
+
+        def fail(handle):
+            raise ValueError("boom")
+
+        self.runner.submit(lambda handle, x: x * 2, 21,
+                           on_success=lambda result: calls.append(("ok", result, threading.current_thread())))
+        self.runner.submit(fail, on_error=lambda error: calls.append(("error", str(error), threading.current_thread())))
+
+        self.assertTrue(self.runner.run_until_idle(timeout=5))
+        self.assertEqual(sorted(call[:2] for call in calls), [("error", "boom"), ("ok", 42)])
+        self.assertTrue(all(call[2] is threading.current_thread() for call in calls))
+        self.assertEqual(self.runner.active_count, 0)
+        self.assertGreaterEqual(self.indicator.cleared, 1)
+
+    def test_progress_is_reported_to_status_indicator(self):
+        """進捗がコールバックと状態インジケーターに反映される（最新の値のみ）"""
+        release = threading.Event()
+        progress = []
+
+        def work(handle):
+            for i in range(1, 1001):
+                handle.report_progress(i, 1000, "処理中")
+            release.wait(5)
+            return "done"
+
+        self.runner.submit(work, on_progress=lambda done, total, message: progress.append(done))
+        self.assertTrue(self.loop.run(lambda: progress and progress[-1] == 1000, timeout=5))
+        release.set()
+        self.assertTrue(self.runner.run_until_idle(timeout=5))
+
+        # 1回の確認で複数の進捗はまとめられる
+        self.assertLess(len(progress), 1000)
+        self.assertEqual(self.indicator.progress[-1], ("処理中", 1000, 1000))
+
+    def test_cancel_running_task(self):
+        """実行中のタスクをキャンセルすると on_cancelled が呼ばれる"""
+        started = threading.Event()
+        outcome = []
+
+        def work(handle):
+            started.set()
+            while True:
+                handle.check_cancelled()
+
+        handle = self.runner.submit(work, on_success=lambda result: outcome.append("success"),
+                                    on_cancelled=lambda: outcome.append("cancelled"))
+        self.assertTrue(started.wait(5))
+        handle.cancel()
+
+        self.assertTrue(self.runner.run_until_idle(timeout=5))
+        self.assertEqual(outcome, ["cancelled"])
+        self.assertTrue(handle.done)
+        with self.assertRaises(TaskCancelled):
+            handle.check_cancelled()
+
+
+    def test_shutdown_skips_pending_tasks(self):
+        """終了時、未開始のタスクは実行せずにキャンセルされる"""
+        runner = GuiTaskRunner(self.loop, max_workers=1, poll_interval_ms=5)
+        release = threading.Event()
+        started = threading.Event()
+        ran = []
+
+        def block(handle):
+            started.set()
+            release.wait(5)
+
+        runner.submit(block)
+        pending = [runner.submit(lambda handle: ran.append("pending")) for _ in range(3)]
+        self.assertTrue(started.wait(5))
+        runner.shutdown()
+        release.set()
+        runner._executor.shutdown(wait=True)
+
+        self.assertEqual(ran, [])
+        self.assertTrue(all(handle.future.cancelled() for handle in pending))
+
+class TestMainLoopStall(unittest.TestCase):
+    """10万ファイル操作中のメインループ停止時間"""
+
+    FILE_COUNT = 100000
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_main_loop_stays_responsive_during_large_file_operation(self):
+        """ワーカーで10万ファイルを作成・走査してもメインループの停止は短く、UIスレッドでI/Oしない"""
+        loop = HeadlessEventLoop()
+        indicator = _FakeStatusIndicator()
+        runner = GuiTaskRunner(loop, poll_interval_ms=10, status_indicator=indicator)
+        monitor = StallMonitor(loop, interval_ms=5)
+        file_count = self.FILE_COUNT
+        directory = self.temp_dir
+        results = []
+
+        def create_and_scan(handle):
+            for i in range(file_count):
+                with open(os.path.join(directory, f"image{i:06d}.png"), "wb"):
+                    pass
+                if i % 1000 == 0:
+                    handle.check_cancelled()
+                    handle.report_progress(i, file_count * 2, "作成中")
+            count = 0
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    count += entry.is_file()
+                    if count % 1000 == 0:
+                        handle.report_progress(file_count + count, file_count * 2, "走査中")
+            return count
+
+        try:
+            with UiThreadIoMonitor() as io_monitor:
+                monitor.start()
+                runner.submit(create_and_scan, on_success=results.append)
+                self.assertTrue(loop.run(lambda: runner.active_count == 0, timeout=120))
+                monitor.stop()
+        finally:
+            runner.shutdown(wait=True)
+
+        self.assertEqual(results, [file_count])
+        self.assertEqual(io_monitor.violations, [])
+        self.assertTrue(indicator.progress)
+        self.assertGreater(len(monitor.samples), 10)
+        # スレッド切り替えの遅れを考慮しても、メインループの停止は100ms未満
+        self.assertLess(monitor.max_stall_seconds, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
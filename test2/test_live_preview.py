@@ -0,0 +1,237 @@
+"""
+入力フォームのライブプレビューのテスト（ディスプレイ不要のヘッドレスイベントループで実行）
+
+- 行ごとのエラー（NGワード・選択内の重複・既存ファイルとの重複）と入力値のエラー
+- 名前・エラーが変わった行だけが差分として返ること
+- 連続した入力はデバウンスされ、最後の入力値だけがワーカーで計算されること
+- 10万ファイルのプレビュー中もUIスレッドのコールバックが短いこと
+- 入力フォームのプレビューに設定のNGワード（予約名を含む）が反映されること
+- 内容が同じファイルの行にエラーが付くこと（重複検出はワーカーで行う）
+"""
+
+import unittest
+import os
+import tempfile
+import shutil
+import time
+import tkinter as tk
+
+from src.models.preset import Preset
+from src.gui.headless import HeadlessEventLoop, UiThreadIoMonitor
+from src.gui.task_runner import GuiTaskRunner
+from src.gui.live_preview import LivePreviewController
+from src.gui.input_form import DynamicInputForm
+from src.services.duplicate_detector import DuplicateDetector
+from src.services.filename_preview import FilenamePreviewCache
+from src.services.live_preview import PreviewSource, build_preview, rows_in_range
+
+
+class _FakePreviewView:
+    """VirtualPreviewList と同じく表示中の行だけを書き換えるビュー"""
+
+    def __init__(self, visible_rows=10):
+        self.visible_rows = visible_rows
+        self.updates = []
+        self.drawn = {}
+
+    def show_preview(self, state, changed_rows):
+        self.updates.append((state, changed_rows))
+        for index in rows_in_range(changed_rows, 0, self.visible_rows):
+            self.drawn[index] = state.row(index)
+
+
+class TestBuildPreview(unittest.TestCase):
+    """build_previewのテスト"""
+
+    def setUp(self):
+        self.cache = FilenamePreviewCache()
+        self.preset = Preset(name="テスト", fields=["カテゴリ", "番号"],
+                             naming_pattern="{カテゴリ}_{番号}", id="B63EF9")
+        paths = [os.path.join("photos", f"IMG_{i}.JPG") for i in range(12)]
+        self.source = PreviewSource(paths, {"photos": ["写真_003.jpg", "IMG_0.JPG"]})
+
+    def test_row_errors(self):
+        """NGワード・既存ファイルとの重複は行ごとのエラーになる"""
+        state, changed = build_preview(self.cache, self.source, self.preset, {"カテゴリ": "写真"},
+                                       ng_words=["010"])
+        self.assertEqual(changed, list(range(12)))
+        self.assertEqual(state.row(0), ("IMG_0.JPG", "写真_001.jpg", None))
+        self.assertIn("同名のファイルが既に存在します", state.error_for(2))
+        self.assertIn("NGワード", state.error_for(9))
+        self.assertEqual(state.error_count, 2)
+
+    def test_form_error_and_duplicates(self):
+        """入力値のエラーは全行に共通、番号の無いパターンは2行目以降が重複になる"""
+        state, _ = build_preview(self.cache, self.source, self.preset, {})
+        self.assertIn("必須項目が未入力です", state.error_for(5))
+        self.assertEqual(state.error_count, 12)
+
+        preset = Preset(name="番号なし", fields=["カテゴリ"], naming_pattern="{カテゴリ}", id="A1B2C3")
+        state, _ = build_preview(self.cache, self.source, preset, {"カテゴリ": "写真"})
+        self.assertIsNone(state.error_for(0))
+        self.assertIn("1行目", state.error_for(1))
+
+    def test_only_changed_rows_are_reported(self):
+        """同じ入力値では差分なし、NGワードの変更では該当行だけが変わる"""
+        values = {"カテゴリ": "写真"}
+        first, _ = build_preview(self.cache, self.source, self.preset, values)
+        second, changed = build_preview(self.cache, self.source, self.preset, values, base=first)
+        self.assertEqual(changed, [])
+
+        third, changed = build_preview(self.cache, self.source, self.preset, values,
+                                       ng_words=["007"], base=second)
+        self.assertEqual(changed, [6])
+
+
+class TestLivePreviewController(unittest.TestCase):
+    """LivePreviewControllerのテスト"""
+
+    def setUp(self):
+        self.loop = HeadlessEventLoop()
+        self.runner = GuiTaskRunner(self.loop, poll_interval_ms=5)
+        self.view = _FakePreviewView()
+        self.controller = LivePreviewController(self.loop, self.runner, self.view, debounce_ms=20)
+        self.preset = Preset(name="テスト", fields=["カテゴリ", "タイトル", "番号"],
+                             naming_pattern="{カテゴリ}_{タイトル}_{番号}", id="B63EF9")
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.runner.shutdown(wait=True)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_keystrokes_are_debounced(self):
+        """連続した入力では最後の入力値だけを計算し、ファイルの読み込みはワーカーで行う"""
+        for i in range(5):
+            open(os.path.join(self.temp_dir, f"IMG_{i}.png"), "wb").close()
+        open(os.path.join(self.temp_dir, "memo.txt"), "wb").close()
+
+        with UiThreadIoMonitor() as monitor:
+            self.controller.set_files([self.temp_dir], target_extensions=[".png"])
+            for title in ["夏", "夏の", "夏の海"]:
+                self.controller.request_update(self.preset, {"カテゴリ": "写真", "タイトル": title})
+            self.assertTrue(self.loop.run(lambda: self.controller.update_count and not self.controller.busy,
+                                          timeout=5))
+            self.loop.run(lambda: False, timeout=0.1)
+        self.assertEqual(monitor.violations, [])
+
+        self.assertEqual(self.controller.update_count, 1)
+        state = self.controller.state
+        self.assertEqual(len(state), 5)
+        self.assertEqual(sorted(state.names), [f"写真_夏の海_{i:03d}.png" for i in range(1, 6)])
+
+    def test_ng_words_change_recomputes_rows(self):
+        """NGワードを変更すると再計算し、NGワード・予約名の行にエラーが付く"""
+        self.controller.source = PreviewSource([os.path.join(self.temp_dir, "a.png")])
+        preset = Preset(name="テスト", fields=["タイトル"], naming_pattern="{タイトル}", id="B63EF9")
+        self.controller.request_update(preset, {"タイトル": "CON"})
+        self.assertTrue(self.loop.run(lambda: self.controller.update_count == 1 and not self.controller.busy,
+                                      timeout=5))
+        # 既定の予約名は NameValidator で判定される
+        self.assertIn("予約されたファイル名", self.controller.state.row(0)[2])
+
+        self.controller.request_update(preset, {"タイトル": "夏の海"})
+        self.assertTrue(self.loop.run(lambda: self.controller.update_count == 2 and not self.controller.busy,
+                                      timeout=5))
+        self.assertIsNone(self.controller.state.row(0)[2])
+
+        self.controller.set_ng_words(["海", "CON"])
+        self.assertTrue(self.loop.run(lambda: self.controller.update_count == 3 and not self.controller.busy,
+                                      timeout=5))
+        self.assertEqual(self.controller.state.row(0)[2], "NGワードが含まれています: 海")
+
+    def test_duplicate_contents_are_reported(self):
+        """内容が同じファイルの行はエラーになり、重複の検出はUIスレッドで行わない"""
+        for name, content in [("a.png", b"same"), ("b.png", b"same"), ("c.png", b"other")]:
+            with open(os.path.join(self.temp_dir, name), "wb") as f:
+                f.write(content)
+        workspace = os.path.join(self.temp_dir, "workspace")
+        os.makedirs(workspace)
+        detectors = []
+
+        def factory():
+            detectors.append(DuplicateDetector.for_workspace(workspace))
+            return detectors[-1]
+
+        self.controller.duplicate_detector_factory = factory
+        try:
+            with UiThreadIoMonitor() as monitor:
+                self.controller.set_files([self.temp_dir], target_extensions=[".png"])
+                self.controller.request_update(self.preset, {"カテゴリ": "写真", "タイトル": "夏"})
+                self.assertTrue(self.loop.run(lambda: self.controller.update_count and not self.controller.busy,
+                                              timeout=5))
+            self.assertEqual(monitor.violations, [])
+        finally:
+            for detector in detectors:
+                detector.close()
+
+        errors = [self.controller.state.row(index) for index in range(3)
+                  if self.controller.state.row(index)[2] is not None]
+        self.assertEqual(len(errors), 1)
+        original, _, error = errors[0]
+        self.assertIn(original, ("a.png", "b.png"))
+        self.assertEqual(error, f"内容が同じファイルがあります: {({'a.png', 'b.png'} - {original}).pop()}")
+
+    def test_large_selection_keeps_ui_responsive(self):
+        """10万ファイルでも計算はワーカーで行い、UIは表示中の行だけを書き換える"""
+        paths = [os.path.join(self.temp_dir, f"IMG_{i:06d}.JPG") for i in range(100000)]
+        self.controller.source = PreviewSource(paths)
+
+        for title in ["山", "海"]:
+            self.controller.request_update(self.preset, {"カテゴリ": "写真", "タイトル": title})
+            count = self.controller.update_count
+            start = time.perf_counter()
+            self.assertTrue(self.loop.run(lambda: self.controller.update_count > count, timeout=30))
+            elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 10)
+        self.assertLess(self.loop.longest_callback_seconds, 0.1)
+        self.assertEqual(len(self.view.updates[-1][1]), 100000)
+        self.assertEqual(self.view.drawn[0], ("IMG_000000.JPG", "写真_海_001.jpg", None))
+
+
+
+class TestInputFormPreviewNgWords(unittest.TestCase):
+    """入力フォームのライブプレビューと設定のNGワード（ディスプレイが必要）"""
+
+    def setUp(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError:
+            self.skipTest("ディスプレイがありません")
+        self.root.withdraw()
+        self.runner = GuiTaskRunner(self.root, poll_interval_ms=5)
+        self.form = DynamicInputForm(self.root)
+        self.form.task_runner = self.runner
+        self.temp_dir = tempfile.mkdtemp()
+        open(os.path.join(self.temp_dir, "a.png"), "wb").close()
+        self.preset = Preset(name="テスト", fields=["タイトル"], naming_pattern="{タイトル}", id="B63EF9")
+
+    def tearDown(self):
+        self.runner.shutdown(wait=True)
+        self.root.destroy()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _preview_error(self, title):
+        controller = self.form.live_preview
+        count = controller.update_count
+        self.form.input_fields["タイトル"].set(title)
+        deadline = time.monotonic() + 5
+        while (controller.update_count == count or controller.busy) and time.monotonic() < deadline:
+            self.root.update()
+            time.sleep(0.005)
+        return controller.state.row(0)[2]
+
+    def test_settings_ng_words_reach_preview(self):
+        """フォームが作成するプレビューは設定のNGワードで判定し、設定の読み込み後に更新される"""
+        self.form.generate_form_from_preset(self.preset)
+        self.form.set_preview_files([self.temp_dir], [".png"])
+        self.assertIsNotNone(self.form.live_preview.ng_words)
+
+        self.form.set_ng_words(["禁止", "CON"])
+        self.assertEqual(self._preview_error("禁止ワード"), "NGワードが含まれています: 禁止")
+        self.assertIsNone(self._preview_error("ICON"))
+        self.assertIn("予約されたファイル名", self._preview_error("con"))
+
+
+if __name__ == '__main__':
+    unittest.main()
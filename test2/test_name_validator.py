@@ -0,0 +1,115 @@
+"""
+ファイル名の一括検証のテスト
+
+- 予約名は拡張子・末尾の空白を除いた名前の完全一致で判定すること（部分一致ではない）
+- NGワードの一括照合がNGワードごとの部分一致と同じ結果になること
+- ファイル名・フルパスの長さの上限（UTF-16 の文字数）
+- 設定のNGワードに含まれる予約名を完全一致の判定に回すこと
+- generate_filename がNGワードの正規化・分割をファイルごとに繰り返さないこと
+"""
+
+import unittest
+import os
+import sys
+import random
+from unittest import mock
+
+# FileRenamer は src 直下を基準にインポートする
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.models.preset import Preset
+from src.services.name_validator import NameValidator, NgWordMatcher, split_reserved_names
+from services import name_validator as renamer_name_validator
+from services.file_renamer import FileRenamer
+
+
+class _FakeSettings:
+    def get_ng_words(self):
+        return ["CON", "PRN", "COM1", "禁止"]
+
+    def get_invalid_chars(self):
+        return "<>:\"/\\|?*"
+
+
+class TestNameValidator(unittest.TestCase):
+    """NameValidatorのテスト"""
+
+    def test_reserved_names_match_whole_name(self):
+        """CON.txt・con・"CON .txt" は予約名、ICON・CONFIG・COMX は予約名ではない"""
+        validator = NameValidator()
+        names = ["CON.txt", "con", "CON .txt", "COM1.tar.gz", "LPT¹",
+                 "ICON.png", "CONFIG.json", "COMX", "写真_CON.jpg", "NULL"]
+        errors = validator.validate_names(names)
+        self.assertEqual(sorted(errors), [0, 1, 2, 3, 4])
+        self.assertEqual(errors[2], "予約されたファイル名です: CON")
+
+    def test_ng_words_match_naive_search(self):
+        """NGワードの一括照合は一覧の順で最初に含まれるNGワードを返す"""
+        rng = random.Random(7)
+        alphabet = "abcあい01"
+        ng_words = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(200)]
+        matcher = NgWordMatcher(ng_words)
+        validator = NameValidator(ng_words, reserved_names=())
+        names = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8))) for _ in range(3000)]
+
+        errors = validator.validate_names(names)
+        for index, name in enumerate(names):
+            expected = next((word for word in ng_words if word in name), None)
+            self.assertEqual(matcher.find(name), expected, name)
+            if expected is None:
+                self.assertNotIn(index, errors)
+            else:
+                self.assertEqual(errors[index], f"NGワードが含まれています: {expected}")
+
+    def test_error_order_and_single_name(self):
+        """無効な文字 → NGワード → 予約名 → 長さ の順で最初のエラーを返す"""
+        validator = NameValidator(["NG"])
+        self.assertIn("無効な文字", validator.validate_name("NG<.txt"))
+        self.assertIn("NGワード", validator.validate_name("CON_NG.txt"))
+        self.assertIsNone(validator.validate_name("写真_001.jpg"))
+
+    def test_length_limits(self):
+        """ファイル名は UTF-16 で255文字、フルパスは259文字まで"""
+        validator = NameValidator()
+        self.assertIsNone(validator.validate_name("a" * 255))
+        self.assertIn("ファイル名が長すぎます", validator.validate_name("a" * 256))
+        # サロゲートペアは UTF-16 で2文字
+        self.assertIn("256文字", validator.validate_name("😀" * 128))
+
+        directory = "C:\\" + "d" * 200
+        self.assertIsNone(validator.validate_name("a" * 55, directory))
+        self.assertIn("パスが長すぎます", validator.validate_name("a" * 56, directory))
+
+    def test_from_settings_splits_reserved_names(self):
+        """設定のNGワードのうち予約名は完全一致、それ以外は部分一致で判定する"""
+        self.assertEqual(split_reserved_names(["CON", "禁止", "com1"]), (["禁止"], ["CON", "com1"]))
+        validator = NameValidator.from_settings(_FakeSettings())
+        errors = validator.validate_names(["ICON.png", "CON.png", "禁止_01.png"])
+        self.assertEqual(sorted(errors), [1, 2])
+
+    def test_file_renamer_reports_first_ng_word(self):
+        """generate_filename のNGワード判定は従来どおり一覧で先のNGワードを報告する"""
+        preset = Preset(name="テスト", fields=["タイトル"], naming_pattern="{タイトル}", id="B63EF9")
+        with self.assertRaisesRegex(ValueError, "NGワードが含まれています: 海$"):
+            FileRenamer().generate_filename(preset, {"タイトル": "夏の海"}, ".jpg", ["海", "夏"])
+
+
+    def test_file_renamer_splits_ng_words_once(self):
+        """同じNGワードの一覧では、正規化・予約名の分割を2回目以降のファイルで行わない"""
+        preset = Preset(name="テスト", fields=["タイトル"], naming_pattern="{タイトル}", id="B63EF9")
+        ng_words = [f"禁止{i}" for i in range(1000)] + ["CON"]
+        renamer = FileRenamer()
+        renamer.generate_filename(preset, {"タイトル": "ICON"}, ".png", ng_words)
+
+        with mock.patch.object(renamer_name_validator, "split_reserved_names",
+                               wraps=renamer_name_validator.split_reserved_names) as split:
+            for i in range(100):
+                self.assertEqual(renamer.generate_filename(preset, {"タイトル": f"ICON{i}"}, ".png", ng_words),
+                                 f"ICON{i}.png")
+            with self.assertRaisesRegex(ValueError, "予約されたファイル名です: con"):
+                renamer.generate_filename(preset, {"タイトル": "con"}, ".png", ng_words)
+        self.assertEqual(split.call_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,333 @@
+"""
+リネームジャーナルとアンドゥのテスト
+
+- リネーム実行時のジャーナル記録
+- 連鎖・循環・衝突を含むリネーム計画
+- 途中の手順が失敗しても上書き・一時ファイル名の取り残しが起きないこと
+- ネイティブなアンドゥとフォルダごとにまとめたアンドゥ用バッチファイル
+- サブフォルダへの移動・チャンクごとの追記・インデックスへの反映
+- 複数のプロセスからの追記が混ざらないこと（プロセス間のファイルロック）
+- CLI のリネーム実行（--execute）とアンドゥ（--undo）
+"""
+
+import unittest
+import os
+import sys
+import io
+import tempfile
+import shutil
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from unittest import mock
+
+# BatchGenerator は src 直下を基準にインポートする
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.main import TadakanCLI
+from src.models.file_item import FileItem
+from src.models.preset import Preset
+from src.services.file_index import FileIndex
+from src.services.preset_manager import PresetManager
+from src.services.rename_engine import RenameEngine, plan_renames
+from src.services.rename_journal import RenameJournal, JOURNAL_FILENAME
+from src.utils.file_lock import file_lock
+
+
+def _record_executions(journal_path, worker, count=20, size=50):
+    """ワーカープロセス: 実行の記録と追記を繰り返す"""
+    journal = RenameJournal(journal_path)
+    directory = f"/worker{worker}"
+    for i in range(count):
+        operations = [(directory, f"{i}_{j}", f"new_{i}_{j}") for j in range(size)]
+        execution_id = journal.record_execution(operations[:size // 2], label=f"{worker}")
+        journal.append_operations(execution_id, operations[size // 2:])
+
+
+class TestRenameEngine(unittest.TestCase):
+    """RenameEngineのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.dir_a = os.path.join(self.temp_dir, "a")
+        self.dir_b = os.path.join(self.temp_dir, "b")
+        os.makedirs(self.dir_a)
+        os.makedirs(self.dir_b)
+        self.engine = RenameEngine.for_workspace(self.temp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _create(self, directory, *names):
+        for name in names:
+            with open(os.path.join(directory, name), 'w') as f:
+                f.write(name)
+
+    def _contents(self, directory):
+        result = {}
+        for name in os.listdir(directory):
+            with open(os.path.join(directory, name)) as f:
+                result[name] = f.read()
+        return result
+
+    def test_execute_records_journal(self):
+        """リネーム実行がジャーナルに記録されることをテスト"""
+        self._create(self.dir_a, "file1.jpg", "file2.png")
+
+        result = self.engine.execute([
+            (self.dir_a, "file1.jpg", "赤軍_田中_001.jpg"),
+            (self.dir_a, "file2.png", "赤軍_佐藤_002.png"),
+        ], label="B63EF9_赤軍_田中.bat")
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.renamed_count, 2)
+        journal_path = os.path.join(self.temp_dir, "rename_batches", JOURNAL_FILENAME)
+        execution = RenameJournal(journal_path).get_execution(result.execution_id)
+        self.assertEqual(execution.label, "B63EF9_赤軍_田中.bat")
+        self.assertEqual(execution.operations, [
+            (self.dir_a, "file1.jpg", "赤軍_田中_001.jpg"),
+            (self.dir_a, "file2.png", "赤軍_佐藤_002.png"),
+        ])
+
+    def test_undo_restores_original_names(self):
+        """アンドゥで元のファイル名に戻ることをテスト"""
+        self._create(self.dir_a, "file1.jpg", "file2.png")
+        self._create(self.dir_b, "file3.gif")
+        items = [
+            FileItem(os.path.join(self.dir_a, "file1.jpg"), "file1.jpg", "x_001.jpg"),
+            FileItem(os.path.join(self.dir_a, "file2.png"), "file2.png", "x_002.png"),
+            FileItem(os.path.join(self.dir_b, "file3.gif"), "file3.gif", "x_003.gif"),
+        ]
+        self.engine.execute_file_items(items)
+
+        result = self.engine.undo()
+
+        self.assertTrue(result.success)
+        self.assertEqual(sorted(os.listdir(self.dir_a)), ["file1.jpg", "file2.png"])
+        self.assertEqual(os.listdir(self.dir_b), ["file3.gif"])
+        self.assertIsNone(self.engine.journal.get_latest_pending())
+
+    def test_chain_and_cycle(self):
+        """連鎖と循環を含むリネームが正しく実行・アンドゥされることをテスト"""
+        self._create(self.dir_a, "a", "b", "c", "x", "y")
+        before = self._contents(self.dir_a)
+
+        result = self.engine.execute([
+            (self.dir_a, "a", "b"),
+            (self.dir_a, "b", "c"),
+            (self.dir_a, "c", "d"),
+            (self.dir_a, "x", "y"),
+            (self.dir_a, "y", "x"),
+        ])
+
+        self.assertTrue(result.success)
+        self.assertEqual(self._contents(self.dir_a),
+                         {"b": "a", "c": "b", "d": "c", "y": "x", "x": "y"})
+
+        self.engine.undo(result.execution_id)
+        self.assertEqual(self._contents(self.dir_a), before)
+
+    def _failing_rename(self, failing_source):
+        """failing_source からのリネームだけ PermissionError にする os.rename"""
+        real_rename = os.rename
+
+        def rename(source, target):
+            if os.path.basename(source) == failing_source:
+                raise PermissionError(13, "Permission denied", source)
+            real_rename(source, target)
+        return mock.patch("os.rename", side_effect=rename)
+
+    def test_failed_step_in_chain_does_not_overwrite(self):
+        """連鎖の途中（b→c）が失敗した場合、b を上書きする a→b は実行しない"""
+        self._create(self.dir_a, "a", "b", "x", "y")
+
+        with self._failing_rename("b"):
+            result = self.engine.execute([
+                (self.dir_a, "a", "b"),
+                (self.dir_a, "b", "c"),
+                (self.dir_a, "x", "z"),
+            ])
+
+        self.assertFalse(result.success)
+        self.assertEqual(len(result.errors), 2)
+        self.assertEqual(self._contents(self.dir_a), {"a": "a", "b": "b", "z": "x", "y": "y"})
+        self.assertEqual(result.renamed, [(self.dir_a, "x", "z")])
+
+    def test_failed_step_in_cycle_restores_stashed_file(self):
+        """循環の途中が失敗した場合、一時ファイル名に退避したファイルを元の名前に戻す"""
+        self._create(self.dir_a, "x", "y")
+
+        for failing_source in ("x", "y"):
+            with self._failing_rename(failing_source):
+                result = self.engine.execute([(self.dir_a, "x", "y"), (self.dir_a, "y", "x")])
+            self.assertFalse(result.success)
+            self.assertEqual(result.renamed, [])
+            self.assertEqual(self._contents(self.dir_a), {"x": "x", "y": "y"})
+
+    def test_existing_target_is_not_overwritten(self):
+        """計画後に移動先が作られた場合も上書きしない"""
+        self._create(self.dir_a, "a")
+        plans = plan_renames([(self.dir_a, "a", "b")])
+        self._create(self.dir_a, "b")
+
+        renamed, errors = RenameEngine._run_steps(plans[0])
+
+        self.assertEqual(renamed, [])
+        self.assertIn("同名のファイル", errors[0])
+        self.assertEqual(self._contents(self.dir_a), {"a": "a", "b": "b"})
+
+    def test_collisions_are_reported(self):
+        """衝突するリネームが実行されずエラーになることをテスト"""
+        self._create(self.dir_a, "a", "b", "existing")
+
+        errors = []
+        plans = plan_renames([
+            (self.dir_a, "a", "existing"),
+            (self.dir_a, "b", "a"),
+            (self.dir_a, "missing", "z"),
+        ], errors)
+
+        self.assertEqual(plans, [])
+        self.assertEqual(len(errors), 3)
+
+    def test_undo_skips_unrenamed_files(self):
+        """リネームされていないファイルはアンドゥ対象にならないことをテスト"""
+        self._create(self.dir_a, "file1.jpg", "taken.jpg", "file2.png")
+
+        result = self.engine.execute([
+            (self.dir_a, "file1.jpg", "taken.jpg"),
+            (self.dir_a, "file2.png", "new2.png"),
+        ])
+        self.assertEqual(len(result.errors), 1)
+
+        undo = self.engine.undo()
+
+        self.assertTrue(undo.success)
+        self.assertEqual(undo.renamed, [(self.dir_a, "new2.png", "file2.png")])
+        self.assertEqual(sorted(os.listdir(self.dir_a)), ["file1.jpg", "file2.png", "taken.jpg"])
+
+    def test_generate_undo_batch_groups_directories(self):
+        """アンドゥ用バッチがフォルダごとに1回だけ cd することをテスト"""
+        self._create(self.dir_a, "1.jpg", "2.jpg", "3.jpg")
+        self._create(self.dir_b, "4.jpg")
+        self.engine.execute([
+            (self.dir_a, "1.jpg", "r1.jpg"),
+            (self.dir_b, "4.jpg", "r4.jpg"),
+            (self.dir_a, "2.jpg", "r2.jpg"),
+            (self.dir_a, "3.jpg", "r3.jpg"),
+        ])
+
+        content = self.engine.generate_undo_batch()
+
+        self.assertEqual(content.count(f'cd /d "{self.dir_a}"'), 1)
+        self.assertEqual(content.count(f'cd /d "{self.dir_b}"'), 1)
+        self.assertEqual(content.count("ren "), 4)
+        self.assertIn('ren "r1.jpg" "1.jpg"', content)
+
+
+    def test_move_into_subfolder_in_chunks(self):
+        """サブフォルダへの移動をチャンクごとに同じ実行へ追記し、まとめてアンドゥできることをテスト"""
+        self._create(self.dir_a, "1.png", "2.png", "3.png")
+        os.makedirs(os.path.join(self.dir_a, "sub"))
+        index = FileIndex()
+        engine = RenameEngine(self.engine.journal, index=index)
+
+        first = engine.execute([(self.dir_a, "1.png", os.path.join("sub", "B63EF9_青軍_田中_A00001.png"))],
+                               label="drop", list_directories=False)
+        second = engine.execute([(self.dir_a, "2.png", os.path.join("sub", "B63EF9_青軍_田中_A00002.png")),
+                                 (self.dir_a, "3.png", os.path.join("sub", "B63EF9_青軍_田中_A00001.png"))],
+                                execution_id=first.execution_id, list_directories=False)
+
+        self.assertEqual(second.execution_id, first.execution_id)
+        self.assertEqual(second.renamed_count, 1)
+        self.assertEqual(len(second.errors), 1)
+        self.assertEqual(len(engine.journal.get_execution(first.execution_id).operations), 2)
+        self.assertEqual(index.count(os.path.join(self.dir_a, "sub")), 2)
+
+        content = engine.generate_undo_batch()
+        self.assertIn(f'move "sub\\B63EF9_青軍_田中_A00002.png" "2.png"', content)
+
+        undo = engine.undo()
+        self.assertTrue(undo.success)
+        self.assertEqual(sorted(os.listdir(self.dir_a)), ["1.png", "2.png", "3.png", "sub"])
+        self.assertEqual(index.count(os.path.join(self.dir_a, "sub")), 0)
+
+
+class TestRenameJournalProcesses(unittest.TestCase):
+    """複数のプロセスからのジャーナル追記のテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal_path = os.path.join(self.temp_dir, JOURNAL_FILENAME)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_concurrent_processes_keep_records_intact(self):
+        """並列のワーカーが追記しても、すべての実行が自分のフォルダの操作だけを持つ"""
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(_record_executions, [self.journal_path] * 4, range(4)))
+
+        executions = RenameJournal(self.journal_path).get_executions()
+        self.assertEqual(len(executions), 80)
+        for execution in executions:
+            self.assertEqual(len(execution.operations), 50)
+            self.assertEqual({op[0] for op in execution.operations}, {f"/worker{execution.label}"})
+
+    def test_append_waits_for_lock(self):
+        """他のプロセスがロックを持っている間は追記しない"""
+        process = multiprocessing.Process(target=_record_executions, args=(self.journal_path, 0, 1, 2))
+        with file_lock(self.journal_path):
+            process.start()
+            time.sleep(0.3)
+            self.assertFalse(os.path.exists(self.journal_path))
+        process.join(10)
+
+        self.assertEqual(process.exitcode, 0)
+        self.assertEqual(len(RenameJournal(self.journal_path).get_executions()), 1)
+
+
+class TestCliRename(unittest.TestCase):
+    """CLI のリネーム実行とアンドゥのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.workspace = os.path.join(self.temp_dir, "workspace")
+        preset_manager = PresetManager(os.path.join(self.temp_dir, "presets"))
+        preset_manager.save_preset(Preset(
+            name="テスト",
+            fields=["陣営", "キャラ名"],
+            naming_pattern="{陣営}_{キャラ名}",
+            id="B63EF9"
+        ))
+        self.cli = TadakanCLI()
+        self.cli._preset_manager = preset_manager
+        self.path = os.path.join(self.temp_dir, "image.png")
+        open(self.path, 'w').close()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_execute_and_undo(self):
+        """--execute のリネームがジャーナルに記録され、--undo で元に戻ることをテスト"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = self.cli.rename_files("テスト", {"陣営": "青軍", "キャラ名": "田中"}, [self.path],
+                                           self.workspace)
+        self.assertEqual(result.renamed_count, 1)
+        # デフォルト以外のワークスペースはアンドゥのコマンド例に含める
+        self.assertIn(f'--undo {result.execution_id} --workspace "{self.workspace}"', output.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "青軍_田中.png")))
+        journal = RenameJournal.for_workspace(self.workspace)
+        self.assertEqual(journal.get_latest_pending().execution_id, result.execution_id)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.cli.undo_rename(self.workspace)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertIn("元に戻したファイル数: 1", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
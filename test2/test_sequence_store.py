@@ -0,0 +1,141 @@
+"""
+連番ストアのテスト
+
+- 実行をまたいだ連番の継続（FR-303）
+- まとめて予約・既存ファイルからの引き継ぎ・上限
+- 複数プロセス・複数スレッドからの同時予約で番号が重複しないこと
+"""
+
+import unittest
+import os
+import tempfile
+import shutil
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+from src.models.preset import Preset
+from src.services.batch_manager import BatchManager
+from src.services.sequence_store import SequenceStore, SEQUENCE_DB_FILENAME
+
+BATCH_FILENAME = "B63EF9_青軍_田中.bat"
+
+
+def _reserve_worker(db_path, worker_index, rounds, queue):
+    """別プロセスで番号を予約し、予約した番号を返す"""
+    store = SequenceStore(db_path)
+    numbers = []
+    for i in range(rounds):
+        numbers.extend(store.reserve(BATCH_FILENAME, (worker_index + i) % 5 + 1))
+    store.close()
+    queue.put(numbers)
+
+
+class TestSequenceStore(unittest.TestCase):
+    """SequenceStoreのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, SEQUENCE_DB_FILENAME)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_sequence_continues_across_instances(self):
+        """連番が実行（インスタンス）をまたいで継続することをテスト"""
+        store = SequenceStore(self.db_path)
+        self.assertEqual(store.next_sequence(BATCH_FILENAME), "A00001")
+        self.assertEqual(store.next_sequence(BATCH_FILENAME), "A00002")
+        store.close()
+
+        store = SequenceStore(self.db_path)
+        self.assertEqual(store.next_sequence(BATCH_FILENAME), "A00003")
+        self.assertEqual(store.next_sequence("C12345_赤軍_鈴木.bat"), "A00001")
+        store.close()
+
+    def test_reserve_block(self):
+        """まとめて予約できることをテスト"""
+        store = SequenceStore(self.db_path)
+        store.next_sequence(BATCH_FILENAME)
+
+        self.assertEqual(store.reserve(BATCH_FILENAME, 3), range(2, 5))
+        self.assertEqual(store.reserve_sequences(BATCH_FILENAME, 2), ["A00005", "A00006"])
+        self.assertEqual(store.get_current_number(BATCH_FILENAME), 6)
+        with self.assertRaises(ValueError):
+            store.reserve(BATCH_FILENAME, 0)
+        store.close()
+
+    def test_upper_limit(self):
+        """上限を超える予約はエラーになり、カウンタが変わらないことをテスト"""
+        store = SequenceStore(self.db_path)
+        store.ensure_at_least(BATCH_FILENAME, 99998)
+
+        with self.assertRaises(ValueError):
+            store.reserve(BATCH_FILENAME, 2)
+        self.assertEqual(store.next_sequence(BATCH_FILENAME), "A99999")
+        store.close()
+
+    def test_seed_from_directory(self):
+        """既存ファイルの最大連番から継続できることをテスト"""
+        for name in ["B63EF9_青軍_田中_A00007.png", "B63EF9_青軍_田中_A00012.jpg", "memo.txt"]:
+            open(os.path.join(self.temp_dir, name), 'w').close()
+        store = SequenceStore(self.db_path)
+
+        self.assertEqual(store.seed_from_directory(BATCH_FILENAME, self.temp_dir), 12)
+        self.assertEqual(store.next_sequence(BATCH_FILENAME), "A00013")
+        store.close()
+
+    def test_batch_file_uses_workspace_store(self):
+        """BatchManager で作成したバッチファイルの連番が永続化されることをテスト"""
+        preset = Preset(name="テスト", fields=["陣営", "キャラ名"], naming_pattern="{陣営}_{キャラ名}",
+                        id="B63EF9")
+        values = {"陣営": "青軍", "キャラ名": "田中"}
+
+        manager = BatchManager(self.temp_dir)
+        batch_file = manager.create_batch_file(preset, values)
+        self.assertEqual(batch_file.get_next_sequence(), "A00001")
+        self.assertEqual(batch_file.reserve_sequences(2), ["A00002", "A00003"])
+        manager.close()
+
+        manager = BatchManager(self.temp_dir)
+        self.assertEqual(manager.create_batch_file(preset, values).get_next_sequence(), "A00004")
+        manager.close()
+
+    def test_parallel_threads(self):
+        """複数スレッドからの同時予約で番号が重複しないことをテスト"""
+        store = SequenceStore(self.db_path)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ranges = list(executor.map(lambda i: store.reserve(BATCH_FILENAME, i % 3 + 1), range(200)))
+
+        numbers = [n for r in ranges for n in r]
+        self.assertEqual(len(numbers), len(set(numbers)))
+        self.assertEqual(sorted(numbers), list(range(1, len(numbers) + 1)))
+        store.close()
+
+    def test_parallel_processes(self):
+        """複数プロセスからの同時予約で番号が重複しないことをテスト（ストレステスト）"""
+        # 先にデータベースを作成しておく
+        store = SequenceStore(self.db_path)
+        store.get_current_number(BATCH_FILENAME)
+        store.close()
+
+        queue = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=_reserve_worker, args=(self.db_path, i, 50, queue))
+            for i in range(6)
+        ]
+        for process in processes:
+            process.start()
+        numbers = [n for _ in processes for n in queue.get(timeout=60)]
+        for process in processes:
+            process.join(timeout=60)
+            self.assertEqual(process.exitcode, 0)
+
+        self.assertEqual(len(numbers), len(set(numbers)))
+        self.assertEqual(sorted(numbers), list(range(1, len(numbers) + 1)))
+        store = SequenceStore(self.db_path)
+        self.assertEqual(store.get_current_number(BATCH_FILENAME), len(numbers))
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+設定スナップショット・設定ストアのテスト
+
+- ドット区切りキーによる取得
+- 書き込み時コピーでの更新（デフォルト設定を汚さない）
+- アトミック保存とmtimeベースの再読み込み
+- ワークスペース設定の保存・読み込み
+"""
+
+import unittest
+import os
+import json
+import tempfile
+import shutil
+
+from src.config.settings import Settings, SettingsSnapshot, SettingsStore
+from src.services.workspace_manager import WorkspaceManager
+
+
+class TestSettingsSnapshot(unittest.TestCase):
+    """SettingsSnapshotのテスト"""
+
+    def test_get_by_key_path(self):
+        """ドット区切りキーで値を取得できることをテスト"""
+        snapshot = SettingsSnapshot.from_dict({"app": {"name": "Tadakan", "nested": {"x": 1}}})
+
+        self.assertEqual(snapshot.get("app.name"), "Tadakan")
+        self.assertEqual(snapshot.get("app.nested.x"), 1)
+        self.assertEqual(snapshot.get("app.nested")["x"], 1)
+        self.assertIsNone(snapshot.get("app.missing"))
+        self.assertEqual(snapshot.get("missing.key", "default"), "default")
+
+    def test_with_value_is_copy_on_write(self):
+        """with_valueが元のスナップショットを変更しないことをテスト"""
+        original = SettingsSnapshot.from_dict({"app": {"name": "Tadakan"}, "ui": {"theme": "default"}})
+        updated = original.with_value("app.name", "Changed")
+
+        self.assertEqual(original.get("app.name"), "Tadakan")
+        self.assertEqual(updated.get("app.name"), "Changed")
+        self.assertEqual(updated.get("ui.theme"), "default")
+
+    def test_values_are_read_only(self):
+        """取得した値を変更できないことをテスト"""
+        snapshot = SettingsSnapshot.from_dict({"list": [1, 2], "dict": {"a": 1}})
+
+        self.assertEqual(snapshot.get("list"), (1, 2))
+        with self.assertRaises(TypeError):
+            snapshot.get("dict")["a"] = 2
+
+
+class TestSettings(unittest.TestCase):
+    """Settings/SettingsStoreのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, "tadakan_config.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_lazy_load_and_defaults(self):
+        """設定ファイルがなくてもデフォルト値が使われることをテスト"""
+        settings = Settings(self.config_path)
+
+        self.assertEqual(settings.get_app_name(), "Tadakan")
+        self.assertIn(".png", settings.get_supported_extensions())
+        self.assertFalse(os.path.exists(self.config_path))
+
+    def test_merge_does_not_mutate_defaults(self):
+        """ユーザー設定のマージでDEFAULT_SETTINGSが変更されないことをテスト"""
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            json.dump({"app": {"name": "Custom"}}, f)
+
+        settings = Settings(self.config_path)
+
+        self.assertEqual(settings.get_app_name(), "Custom")
+        self.assertEqual(settings.get("app.version"), "0.1.0")
+        self.assertEqual(Settings.DEFAULT_SETTINGS["app"]["name"], "Tadakan")
+
+    def test_set_does_not_mutate_defaults(self):
+        """setでDEFAULT_SETTINGSが変更されないことをテスト"""
+        settings = Settings(self.config_path)
+        settings.set("ui.theme", "dark")
+
+        self.assertEqual(settings.get("ui.theme"), "dark")
+        self.assertEqual(Settings.DEFAULT_SETTINGS["ui"]["theme"], "default")
+        self.assertEqual(Settings(self.config_path).get("ui.theme"), "default")
+
+    def test_save_and_reload(self):
+        """保存した設定が再読み込みされることをテスト"""
+        settings = Settings(self.config_path)
+        settings.set("batch.encoding", "utf-8")
+        settings.save()
+
+        self.assertEqual(Settings(self.config_path).get_batch_encoding(), "utf-8")
+        # 一時ファイルが残っていないこと
+        self.assertEqual(os.listdir(self.temp_dir), ["tadakan_config.json"])
+
+    def test_reload_if_changed(self):
+        """ファイル変更時のみ再読み込みされることをテスト"""
+        settings = Settings(self.config_path)
+        settings.get_app_name()
+        self.assertFalse(settings.reload_if_changed())
+
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            json.dump({"app": {"name": "Reloaded"}}, f)
+
+        self.assertTrue(settings.reload_if_changed())
+        self.assertEqual(settings.get_app_name(), "Reloaded")
+
+    def test_store_returns_cached_snapshot(self):
+        """未変更のファイルはキャッシュを返すことをテスト"""
+        store = SettingsStore(self.config_path, {"a": 1})
+        store.save(SettingsSnapshot.from_dict({"b": 2}))
+
+        first = store.load()
+        self.assertIs(store.load(), first)
+        self.assertEqual(first.get("a"), 1)
+        self.assertEqual(first.get("b"), 2)
+
+
+class TestWorkspaceSettingsStore(unittest.TestCase):
+    """ワークスペース設定の保存・読み込みのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = WorkspaceManager()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_save_and_load_workspace_settings(self):
+        """ワークスペース設定がデフォルトとマージされて読み込まれることをテスト"""
+        result = self.manager.save_workspace_settings(self.temp_dir, {"workspace_name": "テスト"})
+        self.assertTrue(result["success"])
+
+        loaded = self.manager.load_workspace_settings(self.temp_dir)
+        self.assertEqual(loaded["workspace_name"], "テスト")
+        self.assertTrue(loaded["auto_repair"])
+
+        # 別インスタンスからも読み込めること
+        loaded = WorkspaceManager().load_workspace_settings(self.temp_dir)
+        self.assertEqual(loaded["workspace_name"], "テスト")
+
+    def test_loaded_settings_are_independent(self):
+        """読み込んだ辞書を変更してもキャッシュに影響しないことをテスト"""
+        loaded = self.manager.load_workspace_settings(self.temp_dir)
+        loaded["workspace_name"] = "changed"
+
+        self.assertEqual(self.manager.load_workspace_settings(self.temp_dir)["workspace_name"],
+                         "My Workspace")
+
+
+if __name__ == '__main__':
+    unittest.main()
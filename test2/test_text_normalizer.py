@@ -0,0 +1,134 @@
+"""
+文字列の正規化のテスト
+
+- 全角英数字・半角カナ・NFD の結合文字の統一と、ファイル名に使えない文字の全角形の保持
+- ファイル名の生成・バッチファイルの検索・重複チェック・インデックスで同じ正規化を使うこと
+- 起動時に設定（file_processing.unicode_normalization）の正規化を反映すること
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import unicodedata
+
+# FileRenamer は src 直下を基準にインポートする
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.models.preset import Preset
+from src.models.batch_file import BatchFile
+from src.services.batch_manager import BatchManager
+from src.services.file_index import FileIndex
+from src.services.filter_engine import FilterEngine
+from src.config.settings import Settings
+from src.main import configure_text_normalizer
+from src.utils.text_normalizer import TextNormalizer, normalize_text, search_key, set_default_normalizer
+from services.file_renamer import FileRenamer
+
+
+class TestTextNormalizer(unittest.TestCase):
+    """TextNormalizerのテスト"""
+
+    def test_width_folding_and_composition(self):
+        """NFKC で全角英数字・半角カナ・濁点を統一し、全角の無効文字は保持する"""
+        self.assertEqual(normalize_text("ＡＢＣ１２３"), "ABC123")
+        self.assertEqual(normalize_text("ｷｬﾗ名"), "キャラ名")
+        self.assertEqual(normalize_text(unicodedata.normalize("NFD", "ガイド")), "ガイド")
+        self.assertEqual(normalize_text("陣営：赤？"), "陣営：赤？")
+        self.assertEqual(search_key("Ｃａｔ"), "cat")
+
+    def test_nfc_mode_keeps_width(self):
+        """fold_width=False では結合文字の合成のみ行う"""
+        normalizer = TextNormalizer(fold_width=False)
+        self.assertEqual(normalizer.normalize("ＡＢ" + unicodedata.normalize("NFD", "が")), "ＡＢが")
+
+    def test_ascii_fast_path_and_cache(self):
+        """ASCII の文字列はそのまま返し、それ以外は文字列ごとにキャッシュする"""
+        normalizer = TextNormalizer(cache_size=2)
+        text = "IMG_0001.jpg"
+        self.assertIs(normalizer.normalize(text), text)
+        for value in ["ａ", "ｂ", "ｃ"]:
+            normalizer.normalize(value)
+        self.assertLessEqual(len(normalizer._cache), 2)
+
+
+class TestNormalizationIsApplied(unittest.TestCase):
+    """ファイル名の生成・検索・重複チェック・インデックスでの正規化のテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_generate_filename_and_duplicate_check(self):
+        """生成されるファイル名は正規化され、NFD の既存ファイルも重複とみなす"""
+        renamer = FileRenamer()
+        preset = Preset(name="テスト", fields=["キャラ名", "番号"], naming_pattern="{キャラ名}_{番号}", id="B63EF9")
+        values = {"キャラ名": "ｶﾞｲﾄﾞ", "番号": "００１"}
+        self.assertEqual(renamer.generate_filename(preset, values, ".PNG"), "ガイド_001.png")
+
+        open(os.path.join(self.temp_dir, unicodedata.normalize("NFD", "ガイド_001.png")), "wb").close()
+        self.assertTrue(renamer.check_duplicate(preset, values, ".PNG", self.temp_dir))
+        self.assertFalse(renamer.check_duplicate(preset, dict(values, 番号="002"), ".PNG", self.temp_dir))
+
+    def test_batch_search_and_filename_match(self):
+        """バッチファイルの検索・ファイル名での取得は全角・半角の違いを区別しない"""
+        manager = BatchManager()
+        batch_file = BatchFile("B63EF9", "テスト", {"陣営": "ＲＥＤ軍", "キャラ名": "ｷｬﾗ"})
+        manager._batch_files = [batch_file]
+
+        self.assertEqual(batch_file.get_batch_filename(), "B63EF9_RED軍_キャラ.bat")
+        self.assertEqual(manager.search_batch_files({"陣営": "red"}), [batch_file])
+        self.assertEqual(manager.search_batch_files({"キャラ名": "キャラ"}), [batch_file])
+        self.assertIs(manager.find_batch_file("B63EF9_ＲＥＤ軍_ｷｬﾗ.bat"), batch_file)
+
+    def test_index_and_filter_engine_agree(self):
+        """インデックスと FilterEngine は正規化した値で同じ結果を返す"""
+        for filename in ["B63EF9_ＲＥＤ_ｷｬﾗ_A00001.png", "B63EF9_RED_キャラ_A00002.png", "B63EF9_BLUE_キャラ_A00003.png"]:
+            open(os.path.join(self.temp_dir, filename), "wb").close()
+        index = FileIndex()
+        try:
+            index.sync_directory(self.temp_dir)
+            conditions = {"陣営": "RED", "キャラ名": "ｷｬﾗ"}
+            expected = ["B63EF9_RED_キャラ_A00002.png", "B63EF9_ＲＥＤ_ｷｬﾗ_A00001.png"]
+            self.assertEqual(index.query(self.temp_dir, conditions), sorted(expected))
+            self.assertEqual(sorted(FilterEngine().find_matches(self.temp_dir, conditions)), sorted(expected))
+        finally:
+            index.close()
+
+
+
+class TestNormalizerFromSettings(unittest.TestCase):
+    """設定による正規化の切り替えのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.temp_dir, "tadakan_config.json")
+
+    def tearDown(self):
+        set_default_normalizer(None)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _configure(self, form):
+        settings = Settings(self.config_file)
+        settings.set("file_processing.unicode_normalization", form)
+        settings.save()
+        configure_text_normalizer(Settings(self.config_file))
+
+    def test_setting_changes_normalize_text(self):
+        """unicode_normalization を NFC にすると全角・半角を統一しなくなり、NFKC に戻すと統一する"""
+        preset = Preset(name="テスト", fields=["キャラ名"], naming_pattern="{キャラ名}", id="B63EF9")
+
+        self._configure("NFC")
+        self.assertEqual(normalize_text("ＡＢＣ"), "ＡＢＣ")
+        self.assertEqual(FileRenamer().generate_filename(preset, {"キャラ名": "ＡＢＣ"}, ".png"), "ＡＢＣ.png")
+
+        self._configure("NFKC")
+        self.assertEqual(normalize_text("ＡＢＣ"), "ABC")
+        self.assertEqual(FileRenamer().generate_filename(preset, {"キャラ名": "ＡＢＣ"}, ".png"), "ABC.png")
+
+
+if __name__ == '__main__':
+    unittest.main()
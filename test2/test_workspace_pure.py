@@ -410,6 +410,8 @@ class TestWorkspaceIntegration(unittest.TestCase):
         
         try:
             main_window = MainWindow(root)
+            # ワークスペースの初期化はウィンドウ表示後にバックグラウンドで行われる
+            main_window.wait_until_interactive()
             
             # ワークスペースパスが表示されることを期待
             self.assertIsNotNone(main_window.workspace_path_label)
@@ -432,6 +434,7 @@ class TestWorkspaceIntegration(unittest.TestCase):
         
         try:
             main_window = MainWindow(root)
+            main_window.wait_until_interactive()
             
             # 起動時にワークスペースが自動初期化されることを期待
             self.assertIsNotNone(main_window.current_workspace)